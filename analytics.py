@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Analytics sidecar for reports and wallet research.
+
+Reports used to scan the live polymarket_notifier.db while the bot writes
+to it. AnalyticsStore copies the database to a snapshot file with SQLite's
+online backup API (one read transaction; under WAL the bot keeps writing),
+and, when DuckDB is installed, loads the snapshot tables into a columnar
+analytics.duckdb where scans, GROUP BYs and joins run vectorized. Without
+DuckDB, queries run against the SQLite snapshot, which still keeps them off
+the live file. Parquet export needs DuckDB.
+
+Usage:
+    python analytics.py refresh
+    python analytics.py query "SELECT category, COUNT(*) FROM wallet_closed_positions GROUP BY 1"
+    python analytics.py categories --days 30
+    python analytics.py export parquet_dir
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+from wallet_ids import ADDRESS_HEX_SQL
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    duckdb = None
+    DUCKDB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Tables copied into DuckDB (the SQLite snapshot always holds the whole database)
+SNAPSHOT_TABLES = (
+    "wallets",
+    "wallet_ids",
+    "wallet_analysis_jobs",
+    "wallet_analysis_cache",
+    "wallet_category_stats",
+    "wallet_closed_positions",
+    "condition_categories",
+    "raw_collected_wallets",
+    "market_trades",
+    "whale_positions",
+    "alerts_sent",
+    "open_interest_hourly",
+    "stat_daily",
+)
+
+# Fact tables keyed by wallet_ids.id, exposed with the hex address for ad-hoc queries
+WALLET_VIEWS = {
+    "market_trades_by_wallet": "market_trades",
+    "whale_positions_by_wallet": "whale_positions",
+}
+
+CATEGORY_PERFORMANCE_SQL = """
+    SELECT COALESCE(category, 'unknown') AS category,
+           COUNT(*) AS positions,
+           COUNT(DISTINCT address) AS wallets,
+           SUM(realized_pnl) AS pnl,
+           SUM(volume) AS volume,
+           AVG(CASE WHEN realized_pnl > 0 THEN 1.0 ELSE 0.0 END) AS win_rate
+    FROM wallet_closed_positions
+    WHERE closed_ts >= ?
+    GROUP BY 1
+    ORDER BY pnl DESC
+"""
+
+TOP_WALLETS_SQL = """
+    SELECT p.address,
+           COUNT(*) AS positions,
+           SUM(p.realized_pnl) AS pnl,
+           SUM(p.volume) AS volume,
+           AVG(CASE WHEN p.realized_pnl > 0 THEN 1.0 ELSE 0.0 END) AS win_rate,
+           w.win_rate AS tracked_win_rate,
+           w.source
+    FROM wallet_closed_positions p
+    LEFT JOIN wallets w ON w.address = p.address
+    WHERE p.closed_ts >= ?
+    GROUP BY p.address, w.win_rate, w.source
+    HAVING COUNT(*) >= ?
+    ORDER BY pnl DESC
+    LIMIT ?
+"""
+
+
+class AnalyticsStore:
+    """Read-only analytics copy of the bot database"""
+
+    def __init__(self, db_path: Optional[str] = None, store_dir: Optional[str] = None):
+        self.db_path = os.path.abspath(db_path or os.getenv("DB_PATH", "polymarket_notifier.db"))
+        self.store_dir = store_dir or os.getenv(
+            "ANALYTICS_DIR", os.path.join(os.path.dirname(self.db_path), "analytics")
+        )
+        self.snapshot_path = os.path.join(self.store_dir, "snapshot.db")
+        self.duckdb_path = os.path.join(self.store_dir, "analytics.duckdb")
+
+    @property
+    def engine(self) -> str:
+        return "duckdb" if DUCKDB_AVAILABLE else "sqlite"
+
+    def snapshot(self) -> str:
+        """Consistent copy of the live database; returns the snapshot path"""
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_path = self.snapshot_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        source = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=30.0)
+        target = sqlite3.connect(tmp_path)
+        try:
+            # pages=-1: the whole copy runs in one read transaction, so it is never
+            # restarted by the bot's writes and never blocks them
+            source.backup(target)
+            # Stand-alone file: no WAL/shm companions needed to open it read-only
+            target.execute("PRAGMA journal_mode=DELETE")
+            for view, table in WALLET_VIEWS.items():
+                target.execute(f"""
+                    CREATE VIEW IF NOT EXISTS {view} AS
+                    SELECT {ADDRESS_HEX_SQL.format('w.address')} AS wallet, t.*
+                    FROM {table} t JOIN wallet_ids w ON w.id = t.wallet_id
+                """)
+            target.commit()
+        finally:
+            target.close()
+            source.close()
+        os.replace(tmp_path, self.snapshot_path)
+        return self.snapshot_path
+
+    def refresh(self, tables: Sequence[str] = SNAPSHOT_TABLES) -> Dict[str, int]:
+        """Take a new snapshot and (with DuckDB) reload the columnar tables; returns row counts"""
+        started = time.monotonic()
+        snapshot_path = self.snapshot()
+        with closing(sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)) as snapshot:
+            existing = {
+                row[0] for row in snapshot.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
+        tables = [table for table in tables if table in existing]
+
+        counts: Dict[str, int] = {}
+        if DUCKDB_AVAILABLE:
+            conn = duckdb.connect(self.duckdb_path)
+            try:
+                # sqlite scanner extension (downloaded by DuckDB on first use)
+                conn.execute("INSTALL sqlite")
+                conn.execute("LOAD sqlite")
+                conn.execute(f"ATTACH '{snapshot_path}' AS live (TYPE sqlite, READ_ONLY)")
+                for table in tables:
+                    conn.execute(f"CREATE OR REPLACE TABLE main.{table} AS SELECT * FROM live.{table}")
+                    counts[table] = conn.execute(f"SELECT COUNT(*) FROM main.{table}").fetchone()[0]
+                conn.execute("DETACH live")
+                for view, table in WALLET_VIEWS.items():
+                    if table in counts and "wallet_ids" in counts:
+                        conn.execute(f"""
+                            CREATE OR REPLACE VIEW {view} AS
+                            SELECT {ADDRESS_HEX_SQL.format('w.address')} AS wallet, t.*
+                            FROM {table} t JOIN wallet_ids w ON w.id = t.wallet_id
+                        """)
+            finally:
+                conn.close()
+        else:
+            with self.connection() as conn:
+                for table in tables:
+                    counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+        logger.info(f"[Analytics] Refreshed {len(counts)} tables ({self.engine}) in {time.monotonic() - started:.1f}s")
+        return counts
+
+    @contextmanager
+    def connection(self):
+        """Read-only connection to the analytics copy (DuckDB if installed, else the SQLite snapshot)"""
+        if DUCKDB_AVAILABLE:
+            if not os.path.exists(self.duckdb_path):
+                self.refresh()
+            conn = duckdb.connect(self.duckdb_path, read_only=True)
+        else:
+            if not os.path.exists(self.snapshot_path):
+                self.snapshot()
+            conn = sqlite3.connect(f"file:{self.snapshot_path}?mode=ro", uri=True)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """Run a query against the analytics copy; rows as dicts"""
+        with self.connection() as conn:
+            cursor = conn.execute(sql, tuple(params))
+            columns = [column[0] for column in cursor.description or ()]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def category_performance(self, days: int = 30) -> List[Dict[str, Any]]:
+        """Closed-position PnL, volume and win rate per market category over the last N days"""
+        return self.query(CATEGORY_PERFORMANCE_SQL, (int(time.time()) - days * 86400,))
+
+    def top_wallets(self, days: int = 30, min_positions: int = 10, limit: int = 50) -> List[Dict[str, Any]]:
+        """Wallets ranked by closed-position PnL over the last N days"""
+        return self.query(TOP_WALLETS_SQL, (int(time.time()) - days * 86400, min_positions, limit))
+
+    def export_parquet(self, out_dir: str, tables: Sequence[str] = SNAPSHOT_TABLES) -> List[str]:
+        """Write the DuckDB tables as Parquet files; returns the paths written"""
+        if not DUCKDB_AVAILABLE:
+            raise RuntimeError("Parquet export needs DuckDB. Install with: pip install duckdb")
+        os.makedirs(out_dir, exist_ok=True)
+        written = []
+        with self.connection() as conn:
+            existing = {row[0] for row in conn.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+            for table in tables:
+                if table not in existing:
+                    continue
+                path = os.path.join(out_dir, f"{table}.parquet")
+                conn.execute(f"COPY {table} TO '{path}' (FORMAT parquet)")
+                written.append(path)
+        return written
+
+
+def _print_rows(rows: List[Dict[str, Any]]):
+    if not rows:
+        print("(no rows)")
+        return
+    columns = list(rows[0])
+    print("\t".join(columns))
+    for row in rows:
+        print("\t".join("" if row[column] is None else str(row[column]) for column in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics snapshot of the bot database for reports and research")
+    parser.add_argument("--db", default=None, help="Database path (default: $DB_PATH or polymarket_notifier.db)")
+    parser.add_argument("--dir", default=None, help="Analytics directory (default: $ANALYTICS_DIR or ./analytics)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("refresh", help="Snapshot the live database and reload the analytics tables")
+    query_parser = subparsers.add_parser("query", help="Run SQL against the analytics copy")
+    query_parser.add_argument("sql")
+    categories_parser = subparsers.add_parser("categories", help="Closed-position performance by category")
+    categories_parser.add_argument("--days", type=int, default=30)
+    wallets_parser = subparsers.add_parser("wallets", help="Top wallets by closed-position PnL")
+    wallets_parser.add_argument("--days", type=int, default=30)
+    wallets_parser.add_argument("--min-positions", type=int, default=10)
+    wallets_parser.add_argument("--limit", type=int, default=50)
+    export_parser = subparsers.add_parser("export", help="Export the analytics tables as Parquet (needs DuckDB)")
+    export_parser.add_argument("out_dir")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    store = AnalyticsStore(args.db, args.dir)
+
+    if args.command == "refresh":
+        for table, count in store.refresh().items():
+            print(f"{table}\t{count}")
+    elif args.command == "query":
+        _print_rows(store.query(args.sql))
+    elif args.command == "categories":
+        _print_rows(store.category_performance(args.days))
+    elif args.command == "wallets":
+        _print_rows(store.top_wallets(args.days, args.min_positions, args.limit))
+    elif args.command == "export":
+        for path in store.export_parquet(args.out_dir):
+            print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 import json
 
+from db import PolymarketDB
+
 
 def normalize_timestamp(timestamp_value: Union[int, float, str]) -> datetime:
     """
@@ -154,8 +156,9 @@ class TelegramNotifier:
 class BetDetector:
     """Detects matching bets from multiple wallets"""
     
-    def __init__(self, db_path: str = "polymarket_notifier.db"):
+    def __init__(self, db_path: str = "polymarket_notifier.db", db: Optional[PolymarketDB] = None):
         self.db_path = db_path
+        self.db = db or PolymarketDB(db_path)
         self.active_positions: Dict[str, List[BetPosition]] = {}
         self.matching_bets: Dict[str, MatchingBet] = {}
         self.sent_alerts: Set[str] = set()
@@ -314,12 +317,7 @@ class BetDetector:
     def _get_wallet_winrate(self, wallet_address: str) -> str:
         """Get wallet winrate from database if available"""
         try:
-            import sqlite3
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT win_rate FROM wallets WHERE address = ?', (wallet_address,))
-            result = cursor.fetchone()
-            conn.close()
+            result = self.db.get_wallet_win_rates([wallet_address]).get(wallet_address)
             if result and result[0]:
                 return f"{result[0]:.1%}"
             return "Unknown"
@@ -335,14 +333,10 @@ class BetDetector:
         
         # Get wallet info with winrates
         wallet_info = []
+        win_rates = self.db.get_wallet_win_rates(matching_bet.wallets[:4])
         for i, wallet in enumerate(matching_bet.wallets[:4], 1):
             try:
-                import sqlite3
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('SELECT win_rate FROM wallets WHERE address = ?', (wallet,))
-                result = cursor.fetchone()
-                conn.close()
+                result = win_rates.get(wallet)
                 
                 short_addr = f"{wallet[:8]}...{wallet[-4:]}"
                 if result and result[0]:
@@ -461,15 +455,14 @@ async def main():
         return
     
     # Load wallet addresses from our database
-    import sqlite3
     db_path = os.getenv('DB_PATH', 'polymarket_notifier.db')
+    db = PolymarketDB(db_path)
     
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT address FROM wallets ORDER BY realized_pnl_total DESC LIMIT 50")
-        wallet_addresses = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT address FROM wallets ORDER BY realized_pnl_total DESC LIMIT 50")
+            wallet_addresses = [row[0] for row in cursor.fetchall()]
         
         logger.info(f"Loaded {len(wallet_addresses)} wallets from database")
         
@@ -478,7 +471,7 @@ async def main():
         return
     
     # Initialize components
-    bet_detector = BetDetector(db_path)
+    bet_detector = BetDetector(db_path, db=db)
     
     async with TelegramNotifier(bot_token, chat_id) as telegram_notifier:
         # Send startup message
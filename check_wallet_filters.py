@@ -10,7 +10,7 @@ import os
 import sys
 import logging
 from dotenv import load_dotenv
-from db import PolymarketDB
+from analytics import AnalyticsStore
 
 load_dotenv()
 
@@ -26,7 +26,9 @@ def check_wallet_filters():
     if not os.path.isabs(db_path):
         db_path = os.path.abspath(db_path)
     
-    db = PolymarketDB(db_path)
+    # Scans run on the analytics snapshot, not the database the bot is writing to
+    store = AnalyticsStore(db_path)
+    store.refresh()
     
     print("=" * 80)
     print("📊 ПРОВЕРКА НОВЫХ ФИЛЬТРОВ КОШЕЛЬКОВ")
@@ -42,7 +44,7 @@ def check_wallet_filters():
     print(f"   • Максимум трейдов/день: {MAX_DAILY_FREQUENCY}")
     print(f"   • Минимум средний PnL/рынок: ${MIN_AVG_PNL:.0f}")
     
-    with db.get_connection() as conn:
+    with store.connection() as conn:
         cursor = conn.cursor()
         
         # Получаем все кошельки
@@ -72,12 +74,13 @@ def check_wallet_filters():
             SELECT 
                 wallet_address,
                 SUM(markets) as total_markets,
-                SUM(pnl) as total_pnl
+                SUM(pnl) as total_pnl,
+                SUM(volume) as total_volume
             FROM wallet_category_stats
             GROUP BY wallet_address
         """)
         
-        category_stats = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        category_stats = {row[0]: (row[1], row[2], row[3]) for row in cursor.fetchall()}
         
         for wallet in wallets:
             address, traded_total, daily_freq, pnl_total = wallet
@@ -92,7 +95,7 @@ def check_wallet_filters():
             
             # Проверка avg_pnl
             if address in category_stats:
-                total_markets, total_pnl = category_stats[address]
+                total_markets, total_pnl, _ = category_stats[address]
                 if total_markets > 0:
                     avg_pnl = total_pnl / total_markets
                     if avg_pnl >= MIN_AVG_PNL:
@@ -100,17 +103,9 @@ def check_wallet_filters():
             
             # Проверка volume через category_stats
             if address in category_stats:
-                total_markets, total_pnl = category_stats[address]
-                # Приблизительный volume (используем pnl как proxy или получаем из category_stats)
-                cursor.execute("""
-                    SELECT SUM(volume) FROM wallet_category_stats
-                    WHERE wallet_address = ?
-                """, (address,))
-                volume_result = cursor.fetchone()
-                if volume_result and volume_result[0]:
-                    volume = volume_result[0]
-                    if volume >= MIN_VOLUME:
-                        passed_volume.append(address)
+                volume = category_stats[address][2]
+                if volume and volume >= MIN_VOLUME:
+                    passed_volume.append(address)
             
             # Проверка всех критериев
             if (address in passed_frequency and 
@@ -33,8 +33,14 @@ def get_daily_stats(db: PolymarketDB, date: datetime = None) -> dict:
     day_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
     day_end = day_start + timedelta(days=1)
     
-    day_start_iso = day_start.isoformat()
-    day_end_iso = day_end.isoformat()
+    # Range filters use the indexed INTEGER epoch columns (*_ts)
+    day_start_ts = int(day_start.timestamp())
+    day_end_ts = int(day_end.timestamp())
+    three_months_ago_ts = int(datetime.now(timezone.utc).timestamp()) - 90 * 86400
+    
+    # Counts kept by triggers (stat_counters / stat_daily), no table scans
+    counters = db.get_stat_counters()
+    daily = db.get_daily_counters(day_start.date().isoformat())
     
     with db.get_connection() as conn:
         cursor = conn.cursor()
@@ -42,8 +48,7 @@ def get_daily_stats(db: PolymarketDB, date: datetime = None) -> dict:
         stats = {}
         
         # Total wallets
-        cursor.execute("SELECT COUNT(*) FROM wallets")
-        stats['total_wallets'] = cursor.fetchone()[0]
+        stats['total_wallets'] = int(counters.get('wallets_total', 0))
         
         # Tracked wallets (meeting criteria)
         cursor.execute("""
@@ -53,25 +58,19 @@ def get_daily_stats(db: PolymarketDB, date: datetime = None) -> dict:
             AND win_rate >= 0.70
             AND win_rate <= 1.0
             AND (daily_trading_frequency IS NULL OR daily_trading_frequency <= 25.0)
-            AND last_trade_at IS NOT NULL
-            AND datetime(last_trade_at) >= datetime('now', '-90 days')
-        """)
+            AND last_trade_ts >= ?
+        """, (three_months_ago_ts,))
         stats['tracked_wallets'] = cursor.fetchone()[0]
         
         # Wallets added today
-        cursor.execute("""
-            SELECT COUNT(*) FROM wallets 
-            WHERE datetime(added_at) >= datetime(?)
-            AND datetime(added_at) < datetime(?)
-        """, (day_start_iso, day_end_iso))
-        stats['wallets_added_today'] = cursor.fetchone()[0]
+        stats['wallets_added_today'] = int(daily.get('wallets_added', 0))
         
         # Wallets updated today
         cursor.execute("""
             SELECT COUNT(*) FROM wallets 
-            WHERE datetime(updated_at) >= datetime(?)
-            AND datetime(updated_at) < datetime(?)
-        """, (day_start_iso, day_end_iso))
+            WHERE updated_ts >= ?
+            AND updated_ts < ?
+        """, (day_start_ts, day_end_ts))
         stats['wallets_updated_today'] = cursor.fetchone()[0]
         
         # Queue statistics
@@ -82,23 +81,9 @@ def get_daily_stats(db: PolymarketDB, date: datetime = None) -> dict:
         stats['queue_failed'] = queue_stats.get('failed_jobs', 0)
         stats['queue_total'] = queue_stats.get('total_jobs', 0)
         
-        # Jobs completed today
-        cursor.execute("""
-            SELECT COUNT(*) FROM wallet_analysis_jobs 
-            WHERE status = 'completed'
-            AND datetime(updated_at) >= datetime(?)
-            AND datetime(updated_at) < datetime(?)
-        """, (day_start_iso, day_end_iso))
-        stats['jobs_completed_today'] = cursor.fetchone()[0]
-        
-        # Jobs failed today
-        cursor.execute("""
-            SELECT COUNT(*) FROM wallet_analysis_jobs 
-            WHERE status = 'failed'
-            AND datetime(updated_at) >= datetime(?)
-            AND datetime(updated_at) < datetime(?)
-        """, (day_start_iso, day_end_iso))
-        stats['jobs_failed_today'] = cursor.fetchone()[0]
+        # Jobs completed / failed today
+        stats['jobs_completed_today'] = int(daily.get('jobs_completed', 0))
+        stats['jobs_failed_today'] = int(daily.get('jobs_failed', 0))
         
         # Failed rate
         if stats['jobs_completed_today'] + stats['jobs_failed_today'] > 0:
@@ -107,16 +92,10 @@ def get_daily_stats(db: PolymarketDB, date: datetime = None) -> dict:
             stats['failed_rate'] = 0.0
         
         # Average processing time (from completed jobs today)
-        cursor.execute("""
-            SELECT AVG(
-                (julianday(updated_at) - julianday(created_at)) * 86400
-            ) FROM wallet_analysis_jobs 
-            WHERE status = 'completed'
-            AND datetime(updated_at) >= datetime(?)
-            AND datetime(updated_at) < datetime(?)
-        """, (day_start_iso, day_end_iso))
-        avg_time = cursor.fetchone()[0]
-        stats['avg_processing_time_sec'] = avg_time if avg_time else 0
+        if stats['jobs_completed_today'] > 0:
+            stats['avg_processing_time_sec'] = daily.get('jobs_completed_seconds', 0) / stats['jobs_completed_today']
+        else:
+            stats['avg_processing_time_sec'] = 0
         
         # Processing speed (jobs per hour)
         if stats['jobs_completed_today'] > 0:
@@ -131,22 +110,17 @@ def get_daily_stats(db: PolymarketDB, date: datetime = None) -> dict:
             stats['estimated_clear_time_hours'] = None
         
         # New wallets from different sources (if source tracking exists)
-        cursor.execute("""
-            SELECT source, COUNT(*) FROM wallets 
-            WHERE datetime(added_at) >= datetime(?)
-            AND datetime(added_at) < datetime(?)
-            GROUP BY source
-        """, (day_start_iso, day_end_iso))
-        sources = dict(cursor.fetchall())
-        stats['wallets_by_source'] = sources
+        stats['wallets_by_source'] = {
+            (name.split(':', 1)[1] or None): int(value)
+            for name, value in daily.items()
+            if name.startswith('wallets_added:') and value
+        }
         
         # Jobs by status (current state)
-        cursor.execute("""
-            SELECT status, COUNT(*) FROM wallet_analysis_jobs
-            GROUP BY status
-        """)
-        job_statuses = dict(cursor.fetchall())
-        stats['jobs_by_status'] = job_statuses
+        stats['jobs_by_status'] = {
+            name[5:]: int(value) for name, value in counters.items()
+            if name.startswith('jobs:') and value
+        }
         
         # Alert configuration (from environment)
         stats['min_consensus'] = int(os.getenv("MIN_CONSENSUS", "3"))
@@ -145,12 +145,12 @@ async def main():
         
         # Count wallets added today (approximate - wallets updated in last hour)
         from datetime import timedelta
-        one_hour_ago = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        one_hour_ago = int(datetime.now(timezone.utc).timestamp()) - 3600
         with db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT COUNT(*) FROM wallets 
-                WHERE datetime(updated_at) >= datetime(?)
+                WHERE updated_ts >= ?
             """, (one_hour_ago,))
             wallets_updated_recently = cursor.fetchone()[0]
         
@@ -490,7 +490,11 @@ async def main():
         logger.info("Daily wallet analysis complete")
 
 async def recompute_all_categories():
-    """Recompute category statistics for all existing wallets"""
+    """Recompute category statistics for all existing wallets.
+
+    Wallets already in the local closed-position store are recomputed offline;
+    only wallets that were never synced are queued for a network fetch.
+    """
     load_dotenv()
     
     start_time = datetime.now(timezone.utc)
@@ -539,49 +543,61 @@ async def recompute_all_categories():
         logger.info(f"  - raw_collected_wallets: {len(wallets_from_raw)}")
         logger.info(f"  - Total unique wallets: {len(all_wallets)}")
     
+    # Offline pass: wallets whose closed positions are already in the local store
+    # are recomputed from SQLite without any API traffic
+    synced_wallets = db.get_position_store_addresses()
+    offline_summary = analyzer.recompute_from_store()
+    pending_wallets = [w for w in all_wallets if w.lower() not in synced_wallets]
+    logger.info(
+        f"Offline recompute: {offline_summary['wallets_in_store']} wallets from local store "
+        f"({offline_summary['category_rows']} category rows, {offline_summary['wallets_updated']} wallets updated); "
+        f"{len(pending_wallets)} wallets have no local positions yet and will be fetched"
+    )
+    
+    if not pending_wallets:
+        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        category_stats = db.get_category_stats_summary()
+        logger.info("=" * 80)
+        logger.info("Category recomputation complete (offline only):")
+        logger.info(f"  Duration: {duration:.1f} seconds")
+        logger.info(f"  Wallets with A List status: {category_stats.get('wallets_with_a_list', 0)}")
+        logger.info("=" * 80)
+        return
+    
     # Start workers
     logger.info("Starting wallet analyzer workers...")
     analyzer.start_workers()
     
     try:
-        # Clear ALL existing jobs for these wallets first (to force recomputation)
-        logger.info("Clearing ALL existing jobs for recomputation...")
+        # Clear existing jobs for the wallets that still need a network fetch
+        logger.info("Clearing existing jobs for wallets without local positions...")
         with db.get_connection() as conn:
             cursor = conn.cursor()
             # Get count before deletion
             cursor.execute("SELECT COUNT(*) FROM wallet_analysis_jobs")
             total_before = cursor.fetchone()[0]
             
-            # Delete ALL jobs for wallets we want to recompute
-            cursor.execute("""
-                DELETE FROM wallet_analysis_jobs 
-                WHERE address IN (
-                    SELECT DISTINCT address FROM (
-                        SELECT address FROM wallets
-                        UNION
-                        SELECT address FROM wallet_analysis_cache
-                        UNION
-                        SELECT address FROM raw_collected_wallets
-                    )
-                )
-            """)
+            cursor.executemany(
+                "DELETE FROM wallet_analysis_jobs WHERE address = ?",
+                [(w.lower(),) for w in pending_wallets]
+            )
             cleared = cursor.rowcount
             conn.commit()
             logger.info(f"Cleared {cleared} existing jobs (total before: {total_before})")
         
-        # Add all wallets to queue
-        logger.info(f"Adding {len(all_wallets)} wallets to recomputation queue...")
+        # Add remaining wallets to queue
+        logger.info(f"Adding {len(pending_wallets)} wallets to recomputation queue...")
         added_count = 0
         batch_size = 100
-        for i in range(0, len(all_wallets), batch_size):
-            batch = all_wallets[i:i+batch_size]
+        for i in range(0, len(pending_wallets), batch_size):
+            batch = pending_wallets[i:i+batch_size]
             for wallet_address in batch:
                 if db.add_wallet_to_queue(wallet_address, None, "recompute"):
                     added_count += 1
-            if (i + batch_size) % 500 == 0 or i + batch_size >= len(all_wallets):
-                logger.info(f"Progress: added {added_count}/{len(all_wallets)} wallets to queue...")
+            if (i + batch_size) % 500 == 0 or i + batch_size >= len(pending_wallets):
+                logger.info(f"Progress: added {added_count}/{len(pending_wallets)} wallets to queue...")
         
-        logger.info(f"Added {added_count} wallets to recomputation queue (out of {len(all_wallets)} total)")
+        logger.info(f"Added {added_count} wallets to recomputation queue (out of {len(pending_wallets)} without local positions)")
         
         if added_count == 0:
             logger.error("No wallets were added to queue! This should not happen after clearing all jobs.")
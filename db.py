@@ -5,17 +5,104 @@ Handles all database operations for wallets, trades, and alerts
 
 import sqlite3
 import json
+import atexit
 import hashlib
 import logging
+import threading
+import time
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Callable
 from contextlib import contextmanager
 
+from trade_events import TradeEvent
+from db_writer import DBWriter
+from db_migrations import OPEN_INTEREST_RAW, migrate, schema_version
+from job_priority import job_priority
+from partitions import epoch_seconds
+from wallet_ids import ADDRESS_HEX_SQL, WalletIds, address_bytes
+
 logger = logging.getLogger(__name__)
 
 class PolymarketDB:
+    # Max entries kept in the in-memory suppressed-alert ledger
+    SUPPRESSED_CACHE_MAX = 20000
+    # Suppressed ledger rows older than this are purged by cleanup_old_data
+    SUPPRESSED_RETENTION_HOURS = 24
+    
+    # Max rolling windows kept in memory in front of rolling_buys
+    WINDOW_CACHE_MAX = 5000
+    
+    # First-entry (market_trades) write-through batching
+    MARKET_TRADES_FLUSH_SIZE = 50
+    MARKET_TRADES_FLUSH_INTERVAL_SEC = 5.0
+    # Max markets whose first-entry sets are kept in memory
+    MARKET_TRADES_CACHE_MAX = 5000
+    
+    # Claimed analysis jobs whose lease expires are handed to the next claimer
+    JOB_LEASE_SECONDS = 900
+    # A wallet that entered a market this recently gets the consensus bonus when queued
+    # (matches the default ALERT_WINDOW_MIN)
+    JOB_CONSENSUS_WINDOW_SEC = 20 * 60
+    
+    # Analysis cache TTL (analysis_ttl_hours): a wallet's result is kept for about
+    # ANALYSIS_TTL_TRADES_PER_REFRESH trades at its daily frequency, at least half
+    # its idle time, and within [MIN, MAX] hours
+    ANALYSIS_TTL_DEFAULT_HOURS = 24
+    ANALYSIS_TTL_MIN_HOURS = 6
+    ANALYSIS_TTL_MAX_HOURS = 7 * 24
+    ANALYSIS_TTL_TRADES_PER_REFRESH = 20
+    # invalidate_analysis leaves results younger than this alone
+    ANALYSIS_INVALIDATE_MIN_AGE_HOURS = 1
+    
+    # Wallets inactive this long drop out of the tracked set
+    TRACKED_ACTIVITY_DAYS = 90
+    
+    # whale_positions row as callers see it (wallet_id resolved back to user_address)
+    WHALE_POSITION_COLUMNS = (
+        f"p.id, {ADDRESS_HEX_SQL.format('w.address')} AS user_address, p.condition_id, p.outcome_index, "
+        "p.position_size_usd, p.position_type, p.detected_at, p.alerted"
+    )
+    
+    # Time-series retention (prune_time_series): raw open interest is kept as whole
+    # daily partitions, its hourly rollup and the event tables much longer
+    OI_RAW_RETENTION_DAYS = 2
+    OI_HOURLY_RETENTION_DAYS = 90
+    EVENT_RETENTION_DAYS = 30
+    
+    # Longest a caller blocks on a queued write (_write with wait=True)
+    WRITE_TIMEOUT_SEC = 30.0
+    
+    # Prepared statements kept per connection (sqlite3 default is 128)
+    CONNECTION_STATEMENT_CACHE = 512
+    
     def __init__(self, db_path: str = "polymarket_notifier.db"):
         self.db_path = db_path
+        # One long-lived connection per thread (get_connection)
+        self._local = threading.local()
+        # Writes queued to the single writer thread (_write), started on first use
+        self._writer: Optional[DBWriter] = None
+        self._writer_lock = threading.Lock()
+        # In-process intern table for wallet_ids (address -> surrogate key)
+        self._wallet_ids = WalletIds()
+        # condition_id -> {(wallet key, side)} loaded lazily from market_trades;
+        # the wallet key is its wallet_ids id (the address itself if it is not a hex address)
+        self._market_trades_cache: Dict[str, set] = {}
+        self._market_trades_used: Dict[str, float] = {}
+        self._market_trades_resolved: Dict[str, None] = {}
+        self._market_trades_pending: List[Tuple[int, str, str, float]] = []
+        self._market_trades_last_flush = time.monotonic()
+        self._market_trades_lock = threading.RLock()
+        # rolling_buys key -> {"events": [TradeEvent, ...], "first_ts", "last_ts"}
+        self._window_cache: Dict[str, Dict[str, Any]] = {}
+        self._window_lock = threading.Lock()
+        # (condition_id, outcome_index, side, reason) -> last sent epoch (sent keys only)
+        self._suppressed_cache: Dict[Tuple[str, int, str, str], int] = {}
+        self._suppressed_lock = threading.Lock()
+        # get_tracked_wallets arguments (or ("count",)) -> (wallets generation, valid until epoch, result)
+        self._tracked_cache: Dict[Tuple, Tuple[int, float, Any]] = {}
+        self._tracked_lock = threading.Lock()
+        # Callbacks run when jobs are queued in this process (wakes idle dispatchers)
+        self._job_listeners: List[Any] = []
         # Log absolute path to ensure we're using the correct database
         import os
         abs_path = os.path.abspath(self.db_path)
@@ -23,298 +110,112 @@ class PolymarketDB:
         self._init_database()
     
     def _init_database(self):
-        """Initialize database tables if they don't exist"""
+        """Bring the schema up to date (see db_migrations)"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Enable WAL mode for better concurrency
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA synchronous=NORMAL")
-            cursor.execute("PRAGMA cache_size=10000")
-            cursor.execute("PRAGMA temp_store=MEMORY")
-            
-            # Wallets table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS wallets(
-                    address TEXT PRIMARY KEY,
-                    display TEXT,
-                    traded_total INTEGER,
-                    win_rate REAL,
-                    realized_pnl_total REAL,
-                    daily_trading_frequency REAL,
-                    source TEXT,
-                    added_at TEXT,
-                    updated_at TEXT
-                )
-            """)
-            
-            # Add insider detection columns if they don't exist
-            for alter in (
-                "ALTER TABLE wallets ADD COLUMN total_markets_traded INTEGER",
-                "ALTER TABLE wallets ADD COLUMN is_insider_candidate BOOLEAN DEFAULT 0",
-                "ALTER TABLE wallets ADD COLUMN insider_detection_reason TEXT",
-                "ALTER TABLE wallets ADD COLUMN insider_detected_at TEXT",
-            ):
-                try:
-                    cursor.execute(alter)
-                except sqlite3.OperationalError:
-                    pass
-            
-            # Add quality metrics columns if they don't exist (for strict filtering criteria)
-            for alter in (
-                "ALTER TABLE wallets ADD COLUMN total_volume REAL",
-                "ALTER TABLE wallets ADD COLUMN roi REAL",
-                "ALTER TABLE wallets ADD COLUMN avg_pnl_per_market REAL",
-                "ALTER TABLE wallets ADD COLUMN avg_stake REAL",
-            ):
-                try:
-                    cursor.execute(alter)
-                except sqlite3.OperationalError:
-                    pass
-            
-            # Last trades tracking
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS last_trades(
-                    address TEXT PRIMARY KEY,
-                    last_seen_trade_id TEXT,
-                    updated_at TEXT
-                )
-            """)
-            
-            # Alerts sent (for deduplication)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS alerts_sent(
-                    alert_key TEXT PRIMARY KEY,
-                    sent_at TEXT,
-                    condition_id TEXT,
-                    outcome_index INTEGER,
-                    wallet_count INTEGER,
-                    side TEXT,
-                    price REAL,
-                    wallets_csv TEXT
-                )
-            """)
-            
-            # Add new columns if they don't exist (for existing databases)
-            for alter in (
-                "ALTER TABLE alerts_sent ADD COLUMN condition_id TEXT",
-                "ALTER TABLE alerts_sent ADD COLUMN outcome_index INTEGER",
-                "ALTER TABLE alerts_sent ADD COLUMN wallet_count INTEGER",
-                "ALTER TABLE alerts_sent ADD COLUMN side TEXT",
-                "ALTER TABLE alerts_sent ADD COLUMN price REAL",
-                "ALTER TABLE alerts_sent ADD COLUMN wallets_csv TEXT",
-                "ALTER TABLE alerts_sent ADD COLUMN wallet_details_json TEXT",
-                "ALTER TABLE alerts_sent ADD COLUMN first_total_usd REAL",
-                "ALTER TABLE wallets ADD COLUMN last_trade_at TEXT",
-                "ALTER TABLE wallets ADD COLUMN source TEXT",  # Ensure source column exists
-            ):
-                try:
-                    cursor.execute(alter)
-                except sqlite3.OperationalError:
-                    pass
-            
-            # Rolling buys window
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS rolling_buys(
-                    k TEXT PRIMARY KEY,
-                    data TEXT,
-                    updated_at TEXT
-                )
-            """)
-            
-            # Track first entry per wallet per market direction
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS market_trades(
-                    wallet TEXT,
-                    condition_id TEXT,
-                    side TEXT,
-                    first_trade_id TEXT,
-                    first_ts REAL,
-                    PRIMARY KEY (wallet, condition_id, side)
-                )
-            """)
-            
-            # Wallet analysis jobs queue
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS wallet_analysis_jobs(
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    address TEXT NOT NULL,
-                    display TEXT,
-                    source TEXT,
-                    status TEXT DEFAULT 'pending',
-                    retry_count INTEGER DEFAULT 0,
-                    max_retries INTEGER DEFAULT 6,
-                    next_retry_at TEXT,
-                    created_at TEXT,
-                    updated_at TEXT,
-                    error_message TEXT,
-                    UNIQUE(address)
-                )
-            """)
-            
-            # Wallet analysis cache - stores analysis results to avoid re-analyzing
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS wallet_analysis_cache(
-                    address TEXT PRIMARY KEY,
-                    traded_total INTEGER,
-                    win_rate REAL,
-                    realized_pnl_total REAL,
-                    daily_trading_frequency REAL,
-                    analysis_result TEXT,
-                    analyzed_at TEXT,
-                    expires_at TEXT,
-                    last_trade_at TEXT,
-                    source TEXT
-                )
-            """)
-            
-            # Wallet category statistics - stores per-category metrics for each wallet
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS wallet_category_stats(
-                    wallet_address TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    markets INTEGER DEFAULT 0,
-                    volume REAL DEFAULT 0.0,
-                    pnl REAL DEFAULT 0.0,
-                    winrate REAL DEFAULT 0.0,
-                    roi REAL DEFAULT 0.0,
-                    avg_pnl REAL DEFAULT 0.0,
-                    is_a_list_trader BOOLEAN DEFAULT 0,
-                    updated_at TEXT,
-                    PRIMARY KEY (wallet_address, category)
-                )
-            """)
-            
-            # Raw collected wallets - tracks all wallets collected from different sources
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS raw_collected_wallets(
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    address TEXT NOT NULL,
-                    source TEXT NOT NULL,
-                    collected_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Add new columns if they don't exist (for existing databases)
-            for alter in (
-                "ALTER TABLE wallet_analysis_cache ADD COLUMN last_trade_at TEXT",
-                "ALTER TABLE wallet_analysis_cache ADD COLUMN source TEXT",
-                "ALTER TABLE wallet_analysis_cache ADD COLUMN created_at TEXT",  # For legacy cleanup operations
-                "ALTER TABLE wallet_analysis_cache ADD COLUMN is_insider_candidate BOOLEAN DEFAULT 0",
-                "ALTER TABLE wallet_analysis_cache ADD COLUMN insider_detection_reason TEXT",
-                "ALTER TABLE wallet_analysis_cache ADD COLUMN total_markets_traded INTEGER",
-            ):
-                try:
-                    cursor.execute(alter)
-                except sqlite3.OperationalError:
-                    pass
-            
-            # Backfill created_at for existing records (use analyzed_at if created_at is NULL)
-            try:
-                cursor.execute("""
-                    UPDATE wallet_analysis_cache 
-                    SET created_at = analyzed_at 
-                    WHERE created_at IS NULL AND analyzed_at IS NOT NULL
-                """)
-            except sqlite3.OperationalError:
-                pass  # Column might not exist yet
-            
-            # Create indexes for better performance
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_traded ON wallets(traded_total)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_winrate ON wallets(win_rate)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_pnl ON wallets(realized_pnl_total)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_condition ON alerts_sent(condition_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_sent_at ON alerts_sent(sent_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON wallet_analysis_jobs(status)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_next_retry ON wallet_analysis_jobs(next_retry_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_address ON wallet_analysis_jobs(address)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_address ON wallet_analysis_cache(address)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON wallet_analysis_cache(expires_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_raw_collected_address ON raw_collected_wallets(address)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_raw_collected_source ON raw_collected_wallets(source)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_raw_collected_at ON raw_collected_wallets(collected_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_wallet ON wallet_category_stats(wallet_address)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_category ON wallet_category_stats(category)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_a_list ON wallet_category_stats(is_a_list_trader)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_insider ON wallets(is_insider_candidate, insider_detected_at)")
-            
-            # Open interest history table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS open_interest_history(
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    condition_id TEXT NOT NULL,
-                    open_interest REAL,
-                    timestamp TEXT,
-                    created_at TEXT
-                )
-            """)
-            
-            # Whale positions table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS whale_positions(
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_address TEXT NOT NULL,
-                    condition_id TEXT NOT NULL,
-                    outcome_index INTEGER,
-                    position_size_usd REAL,
-                    position_type TEXT,
-                    detected_at TEXT,
-                    alerted BOOLEAN DEFAULT 0
-                )
-            """)
-            
-            # Create indexes for open interest history
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_oi_condition_timestamp ON open_interest_history(condition_id, timestamp)")
-            
-            # Create indexes for whale positions
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_whale_user_condition ON whale_positions(user_address, condition_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_whale_alerted_detected ON whale_positions(alerted, detected_at)")
-            
-            # Order flow metrics table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS order_flow_metrics(
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    condition_id TEXT NOT NULL,
-                    outcome_index INTEGER,
-                    window_start TEXT,
-                    window_end TEXT,
-                    buy_count INTEGER DEFAULT 0,
-                    sell_count INTEGER DEFAULT 0,
-                    buy_volume REAL DEFAULT 0.0,
-                    sell_volume REAL DEFAULT 0.0,
-                    buy_sell_ratio REAL,
-                    is_imbalanced BOOLEAN DEFAULT 0,
-                    imbalance_direction TEXT,
-                    detected_at TEXT,
-                    alerted BOOLEAN DEFAULT 0
-                )
-            """)
-            
-            # Create indexes for order flow metrics
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_flow_condition_window ON order_flow_metrics(condition_id, window_end)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_flow_alerted_detected ON order_flow_metrics(alerted, detected_at)")
-            
-            conn.commit()
+            applied = migrate(conn)
+            if applied:
+                logger.info(f"[DB] Applied {applied} schema migration(s), now at version {schema_version(conn)}")
             logger.info("Database initialized successfully")
     
+    def _thread_connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened (and PRAGMAs applied) on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path, 
+                check_same_thread=False,
+                timeout=5.0,  # Wait up to 5 seconds for lock
+                cached_statements=self.CONNECTION_STATEMENT_CACHE
+            )
+            conn.row_factory = sqlite3.Row  # Enable dict-like access
+            
+            # Set pragmas for better concurrency
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")  # Wait 5 seconds on lock
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=10000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            # REPLACE deletes the old row; fire its DELETE triggers so stat counters stay exact
+            conn.execute("PRAGMA recursive_triggers=ON")
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+    
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections with improved concurrency settings"""
-        conn = sqlite3.connect(
-            self.db_path, 
-            check_same_thread=False,
-            timeout=5.0  # Wait up to 5 seconds for lock
-        )
-        conn.row_factory = sqlite3.Row  # Enable dict-like access
-        
-        # Set pragmas for better concurrency
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=5000")  # Wait 5 seconds on lock
+        """Context manager for the calling thread's long-lived connection
         
+        Each thread opens one connection and keeps it, so PRAGMAs run once and
+        sqlite3's statement cache survives between calls. Nested blocks share
+        the connection; when the outermost block exits, anything left
+        uncommitted is rolled back, as closing a per-call connection did.
+        """
+        conn = self._thread_connection()
+        self._local.depth += 1
         try:
             yield conn
         finally:
-            conn.close()
+            self._local.depth -= 1
+            if self._local.depth == 0 and conn.in_transaction:
+                try:
+                    conn.rollback()
+                except sqlite3.Error as e:
+                    logger.warning(f"Dropping connection after failed rollback: {e}")
+                    self.close_connection()
+    
+    def _get_writer(self) -> DBWriter:
+        with self._writer_lock:
+            if self._writer is None or not self._writer.alive:
+                if self._writer is not None:
+                    logger.warning("[DB] Writer thread is not running, starting a new one")
+                self._writer = DBWriter(self.db_path)
+                atexit.register(self._writer.close)
+            return self._writer
+    
+    def _write(self, op: Callable[[sqlite3.Cursor], Any], wait: bool = True, what: str = "") -> Any:
+        """Run op(cursor) on the writer thread as part of its next group commit
+        
+        op runs its statements without committing. wait=True blocks until the
+        group is committed and returns op's result (or raises its error, or
+        concurrent.futures.TimeoutError after WRITE_TIMEOUT_SEC); wait=False
+        returns the Future at once and logs a failure as "Error {what}".
+        """
+        future = self._get_writer().submit(op)
+        if wait:
+            return future.result(self.WRITE_TIMEOUT_SEC)
+        if what:
+            def log_failure(f):
+                if not f.cancelled() and f.exception() is not None:
+                    logger.error(f"Error {what}: {f.exception()}")
+            future.add_done_callback(log_failure)
+        return future
+    
+    def _wallet_id(self, address: str) -> Optional[int]:
+        """wallet_ids key for an address, or None if unknown (or not an address)
+        
+        Never waits for the writer: new addresses get their wallet_ids row
+        inside the write that first records a fact for them (see
+        flush_market_trades and insert_whale_position).
+        """
+        wallet_id = self._wallet_ids.cached(address)
+        if wallet_id is not None:
+            return wallet_id
+        with self.get_connection() as conn:
+            return self._wallet_ids.lookup(conn.cursor(), address)
+    
+    def flush_writes(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every write queued so far is committed"""
+        return self._writer.flush(timeout) if self._writer is not None else True
+    
+    def close_connection(self):
+        """Close the calling thread's connection (a new one is opened on next use)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
     
     def now_iso(self) -> str:
         """Get current UTC timestamp in ISO format"""
@@ -333,8 +234,7 @@ class PolymarketDB:
                      avg_pnl_per_market: Optional[float] = None, avg_stake: Optional[float] = None) -> bool:
         """Insert or update wallet information"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 now = self.now_iso()
                 
                 # Build dynamic UPDATE clause for insider fields
@@ -437,13 +337,30 @@ class PolymarketDB:
                 """
                 
                 cursor.execute(query, tuple(values))
-                
-                conn.commit()
                 return True
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error upserting wallet {address}: {e}")
             return False
     
+    def get_wallet_win_rates(self, addresses: List[str]) -> Dict[str, Tuple[Optional[float], Optional[int]]]:
+        """address -> (win_rate, traded_total) for the given wallets, in one query"""
+        addresses = [address for address in addresses if address]
+        if not addresses:
+            return {}
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                placeholders = ",".join("?" * len(addresses))
+                cursor.execute(
+                    f"SELECT address, win_rate, traded_total FROM wallets WHERE address IN ({placeholders})",
+                    addresses
+                )
+                return {row["address"]: (row["win_rate"], row["traded_total"]) for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error getting win rates for {len(addresses)} wallets: {e}")
+            return {}
+    
     def get_wallet(self, address: str) -> Optional[Dict[str, Any]]:
         """Get wallet information by address"""
         try:
@@ -466,6 +383,10 @@ class PolymarketDB:
         - If last_trade_at IS NULL: include wallet (activity unknown, decide by other criteria)
         - If last_trade_at is not NULL: only include if last_trade_at >= 90 days ago
         
+        Results are cached per argument set and reused until the wallets
+        generation changes (a wallet added, removed or re-scored, by any
+        process) or the least recently active wallet in the result ages out.
+        
         If use_strict_criteria=True, applies all strict quality filters:
         - MINIMUM_MARKETS (12)
         - MINIMUM_VOLUME ($25,000)
@@ -480,19 +401,32 @@ class PolymarketDB:
                 MINIMUM_AVG_PNL, MINIMUM_AVG_STAKE
             )
             
+            key = (min_trades, max_trades, min_win_rate, max_win_rate, max_daily_freq, limit, use_strict_criteria)
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                # Read before the query: a write in between only forces a recompute next time
+                generation = self.get_table_generation("wallets", cursor)
+                now_ts = time.time()
+                with self._tracked_lock:
+                    cached = self._tracked_cache.get(key)
+                if cached and cached[0] == generation and now_ts < cached[1]:
+                    return list(cached[2])
+                
+                # Walking idx_wallets_tracked in PnL order and stopping at LIMIT beats the
+                # planner's win_rate range + sort; the index covers every filter column
+                
                 # Calculate 3 months ago threshold
-                three_months_ago = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
+                activity_sec = self.TRACKED_ACTIVITY_DAYS * 86400
+                three_months_ago = int(now_ts) - activity_sec
                 
                 if use_strict_criteria:
                     # Use strict criteria - check all quality metrics
                     cursor.execute("""
-                        SELECT address FROM wallets
+                        SELECT address, last_trade_ts FROM wallets INDEXED BY idx_wallets_tracked
                         WHERE traded_total >= ? AND traded_total <= ?
                         AND win_rate >= ? AND win_rate <= ?
                         AND (daily_trading_frequency IS NULL OR daily_trading_frequency <= ?)
-                        AND (last_trade_at IS NULL OR last_trade_at >= ?)
+                        AND (last_trade_ts IS NULL OR last_trade_ts >= ?)
                         AND (total_markets_traded IS NULL OR total_markets_traded >= ?)
                         AND (total_volume IS NULL OR total_volume >= ?)
                         AND (roi IS NULL OR roi >= ?)
@@ -507,21 +441,42 @@ class PolymarketDB:
                 else:
                     # Use relaxed criteria (for new wallets without data)
                     cursor.execute("""
-                        SELECT address FROM wallets
+                        SELECT address, last_trade_ts FROM wallets INDEXED BY idx_wallets_tracked
                         WHERE traded_total >= ? AND traded_total <= ?
                         AND win_rate >= ? AND win_rate <= ?
                         AND (daily_trading_frequency IS NULL OR daily_trading_frequency <= ?)
-                        AND (last_trade_at IS NULL OR last_trade_at >= ?)
+                        AND (last_trade_ts IS NULL OR last_trade_ts >= ?)
                         ORDER BY realized_pnl_total DESC, traded_total DESC
                         LIMIT ?
                     """, (min_trades, max_trades, min_win_rate, max_win_rate, 
                          max_daily_freq, three_months_ago, limit))
                 
-                return [row[0] for row in cursor.fetchall()]
+                rows = cursor.fetchall()
+            addresses = [row[0] for row in rows]
+            # Valid until the first included wallet passes the activity cutoff
+            oldest = min((row[1] for row in rows if row[1] is not None), default=None)
+            valid_until = oldest + activity_sec if oldest is not None else float("inf")
+            if generation >= 0:
+                with self._tracked_lock:
+                    self._tracked_cache[key] = (generation, valid_until, addresses)
+            return list(addresses)
         except Exception as e:
             logger.error(f"Error getting tracked wallets: {e}")
             return []
     
+    def get_table_generation(self, name: str, cursor: Optional[sqlite3.Cursor] = None) -> int:
+        """Change counter for a table, bumped by triggers on every relevant write (-1 if unknown)"""
+        try:
+            if cursor is None:
+                with self.get_connection() as conn:
+                    return self.get_table_generation(name, conn.cursor())
+            cursor.execute("SELECT generation FROM table_generations WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            return row[0] if row else -1
+        except Exception as e:
+            logger.error(f"Error getting {name} generation: {e}")
+            return -1
+    
     def get_wallet_stats(self) -> Dict[str, int]:
         """Get database statistics"""
         try:
@@ -529,62 +484,97 @@ class PolymarketDB:
                 cursor = conn.cursor()
                 
                 stats = {}
+                counters = self.get_stat_counters(cursor)
                 
                 # Total wallets
-                cursor.execute("SELECT COUNT(*) FROM wallets")
-                stats['total_wallets'] = cursor.fetchone()[0]
+                stats['total_wallets'] = int(counters.get('wallets_total', 0))
                 
                 # Wallets meeting STRICT tracking criteria (for statistics display)
-                # This matches get_tracked_wallets() with use_strict_criteria=True
-                # Import strict criteria constants
-                from wallet_analyzer import (
-                    MIN_TRADES, WIN_RATE_THRESHOLD, MAX_DAILY_FREQUENCY,
-                    MINIMUM_MARKETS, MINIMUM_VOLUME, MINIMUM_ROI,
-                    MINIMUM_AVG_PNL, MINIMUM_AVG_STAKE
-                )
-                
-                three_months_ago = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
-                # Use STRICT filtering criteria: all quality metrics checked
-                cursor.execute("""
-                    SELECT COUNT(*) FROM wallets
-                    WHERE traded_total >= ? AND traded_total <= 1500
-                    AND win_rate >= ? AND win_rate <= 1.0
-                    AND (daily_trading_frequency IS NULL OR daily_trading_frequency <= ?)
-                    AND (last_trade_at IS NULL OR last_trade_at >= ?)
-                    AND (total_markets_traded IS NULL OR total_markets_traded >= ?)
-                    AND (total_volume IS NULL OR total_volume >= ?)
-                    AND (roi IS NULL OR roi >= ?)
-                    AND (avg_pnl_per_market IS NULL OR avg_pnl_per_market >= ?)
-                    AND (avg_stake IS NULL OR avg_stake >= ?)
-                """, (MIN_TRADES, WIN_RATE_THRESHOLD, MAX_DAILY_FREQUENCY, three_months_ago,
-                     MINIMUM_MARKETS, MINIMUM_VOLUME, MINIMUM_ROI,
-                     MINIMUM_AVG_PNL, MINIMUM_AVG_STAKE))
-                stats['tracked_wallets'] = cursor.fetchone()[0]
+                # This matches get_tracked_wallets() with use_strict_criteria=True and,
+                # like it, is cached until the wallets generation changes
+                generation = self.get_table_generation("wallets", cursor)
+                now_ts = time.time()
+                with self._tracked_lock:
+                    cached = self._tracked_cache.get(("count",))
+                if cached and cached[0] == generation and now_ts < cached[1]:
+                    stats['tracked_wallets'] = cached[2]
+                else:
+                    stats['tracked_wallets'] = self._count_tracked_wallets(cursor, generation, now_ts)
                 
                 # Win rate distribution
-                cursor.execute("""
-                    SELECT 
-                        COUNT(CASE WHEN win_rate >= 0.8 THEN 1 END) as high_winrate,
-                        COUNT(CASE WHEN win_rate >= 0.7 AND win_rate < 0.8 THEN 1 END) as medium_winrate,
-                        COUNT(CASE WHEN win_rate < 0.7 THEN 1 END) as low_winrate
-                    FROM wallets
-                """)
-                row = cursor.fetchone()
-                stats['high_winrate'] = row[0]
-                stats['medium_winrate'] = row[1]
-                stats['low_winrate'] = row[2]
+                stats['high_winrate'] = int(counters.get('wallets_winrate_high', 0))
+                stats['medium_winrate'] = int(counters.get('wallets_winrate_medium', 0))
+                stats['low_winrate'] = int(counters.get('wallets_winrate_low', 0))
                 
                 return stats
         except Exception as e:
             logger.error(f"Error getting wallet stats: {e}")
             return {}
     
-    def cleanup_old_wallets(self, max_trades: int = 1500, max_wallets: int = 200):
-        """Remove wallets that exceed limits"""
+    def _count_tracked_wallets(self, cursor: sqlite3.Cursor, generation: int, now_ts: float) -> int:
+        """Count wallets meeting the strict criteria and cache it like get_tracked_wallets"""
+        # Import strict criteria constants
+        from wallet_analyzer import (
+            MIN_TRADES, WIN_RATE_THRESHOLD, MAX_DAILY_FREQUENCY,
+            MINIMUM_MARKETS, MINIMUM_VOLUME, MINIMUM_ROI,
+            MINIMUM_AVG_PNL, MINIMUM_AVG_STAKE
+        )
+        
+        activity_sec = self.TRACKED_ACTIVITY_DAYS * 86400
+        three_months_ago = int(now_ts) - activity_sec
+        # Use STRICT filtering criteria: all quality metrics checked
+        cursor.execute("""
+            SELECT COUNT(*), MIN(last_trade_ts) FROM wallets INDEXED BY idx_wallets_tracked
+            WHERE traded_total >= ? AND traded_total <= 1500
+            AND win_rate >= ? AND win_rate <= 1.0
+            AND (daily_trading_frequency IS NULL OR daily_trading_frequency <= ?)
+            AND (last_trade_ts IS NULL OR last_trade_ts >= ?)
+            AND (total_markets_traded IS NULL OR total_markets_traded >= ?)
+            AND (total_volume IS NULL OR total_volume >= ?)
+            AND (roi IS NULL OR roi >= ?)
+            AND (avg_pnl_per_market IS NULL OR avg_pnl_per_market >= ?)
+            AND (avg_stake IS NULL OR avg_stake >= ?)
+        """, (MIN_TRADES, WIN_RATE_THRESHOLD, MAX_DAILY_FREQUENCY, three_months_ago,
+             MINIMUM_MARKETS, MINIMUM_VOLUME, MINIMUM_ROI,
+             MINIMUM_AVG_PNL, MINIMUM_AVG_STAKE))
+        count, oldest = cursor.fetchone()
+        valid_until = oldest + activity_sec if oldest is not None else float("inf")
+        if generation >= 0:
+            with self._tracked_lock:
+                self._tracked_cache[("count",)] = (generation, valid_until, count)
+        return count
+    
+    def get_stat_counters(self, cursor: Optional[sqlite3.Cursor] = None) -> Dict[str, float]:
+        """Running totals kept by triggers: wallets_total, wallets_winrate_*, jobs_total, jobs:<status>"""
+        try:
+            if cursor is None:
+                with self.get_connection() as conn:
+                    return self.get_stat_counters(conn.cursor())
+            cursor.execute("SELECT name, value FROM stat_counters")
+            return {row[0]: row[1] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error getting stat counters: {e}")
+            return {}
+    
+    def get_daily_counters(self, day: str) -> Dict[str, float]:
+        """Per-day counts kept by triggers for a UTC date (YYYY-MM-DD).
+
+        wallets_added, wallets_added:<source>, jobs_completed, jobs_failed and
+        jobs_completed_seconds (total time from queueing to completion).
+        """
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
+                cursor.execute("SELECT name, value FROM stat_daily WHERE day = ?", (day,))
+                return {row[0]: row[1] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error getting daily counters for {day}: {e}")
+            return {}
+    
+    def cleanup_old_wallets(self, max_trades: int = 1500, max_wallets: int = 200):
+        """Remove wallets that exceed limits"""
+        try:
+            def write(cursor):
                 # Remove wallets with too many trades
                 cursor.execute("DELETE FROM wallets WHERE traded_total > ?", (max_trades,))
                 removed_trades = cursor.rowcount
@@ -602,11 +592,10 @@ class PolymarketDB:
                 """, (max_trades, max_wallets))
                 removed_limit = cursor.rowcount
                 
-                conn.commit()
-                
                 if removed_trades > 0 or removed_limit > 0:
                     logger.info(f"Cleaned up {removed_trades + removed_limit} wallets")
                     
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error cleaning up wallets: {e}")
     
@@ -627,8 +616,7 @@ class PolymarketDB:
     def set_last_seen_trade_id(self, address: str, trade_id: str) -> bool:
         """Set last seen trade ID for wallet"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 now = self.now_iso()
                 
                 cursor.execute("""
@@ -638,138 +626,353 @@ class PolymarketDB:
                         last_seen_trade_id=excluded.last_seen_trade_id,
                         updated_at=excluded.updated_at
                 """, (address.lower(), trade_id, now))
-                
-                conn.commit()
-                return True
+            self._write(write, wait=False, what=f"setting last trade ID for {address}")
+            return True
         except Exception as e:
             logger.error(f"Error setting last trade ID for {address}: {e}")
             return False
     
+    def set_last_seen_trade_ids(self, trade_ids: Dict[str, str]) -> bool:
+        """Set last seen trade IDs for several wallets in one write
+        
+        Args:
+            trade_ids: Wallet address -> newest trade ID seen
+        """
+        if not trade_ids:
+            return True
+        try:
+            def write(cursor):
+                now = self.now_iso()
+                cursor.executemany("""
+                    INSERT INTO last_trades(address, last_seen_trade_id, updated_at)
+                    VALUES(?,?,?)
+                    ON CONFLICT(address) DO UPDATE SET
+                        last_seen_trade_id=excluded.last_seen_trade_id,
+                        updated_at=excluded.updated_at
+                """, [(address.lower(), trade_id, now) for address, trade_id in trade_ids.items()])
+            self._write(write)
+            return True
+        except Exception as e:
+            logger.error(f"Error setting last trade IDs for {len(trade_ids)} wallets: {e}")
+            return False
+    
     # Rolling window operations
+    @staticmethod
+    def _merge_window(obj: Optional[Dict[str, Any]], new_events: List[TradeEvent],
+                      window_minutes: float) -> Dict[str, Any]:
+        """Merge new events into a window object in one pass
+        
+        Keeps the latest event per wallet and drops events older than
+        window_minutes before the most recent event in the window.
+        """
+        events = (obj["events"] + new_events) if obj else list(new_events)
+        if not events:
+            return {"events": [], "first_ts": 0, "last_ts": 0}
+        latest_ts = max(e.ts for e in events)
+        window_start_ts = latest_ts - (window_minutes * 60)
+        by_wallet = {}
+        for e in events:
+            if e.ts < window_start_ts:
+                continue
+            prev = by_wallet.get(e.wallet)
+            if prev is None or e.ts > prev.ts:
+                by_wallet[e.wallet] = e
+        kept = list(by_wallet.values())
+        return {
+            "events": kept,
+            "first_ts": min(e.ts for e in kept),
+            "last_ts": latest_ts,
+        }
+    
+    @staticmethod
+    def _window_to_json(obj: Dict[str, Any]) -> str:
+        """Serialize a window in the rolling_buys JSON layout"""
+        return json.dumps({
+            "events": [e.to_window_dict() for e in obj["events"]],
+            "first_ts": obj["first_ts"],
+            "last_ts": obj["last_ts"],
+        })
+    
+    @staticmethod
+    def _window_from_json(data: str) -> Dict[str, Any]:
+        raw = json.loads(data)
+        return {
+            "events": [TradeEvent.from_window_dict(e) for e in raw.get("events", [])],
+            "first_ts": raw.get("first_ts", 0),
+            "last_ts": raw.get("last_ts", 0),
+        }
+    
+    def _load_windows(self, cursor, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return windows for keys from the in-memory cache, reading misses from rolling_buys"""
+        with self._window_lock:
+            found = {k: self._window_cache[k] for k in keys if k in self._window_cache}
+        missing = [k for k in keys if k not in found]
+        for i in range(0, len(missing), 500):
+            chunk = missing[i:i + 500]
+            cursor.execute(
+                f"SELECT k, data FROM rolling_buys WHERE k IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for row in cursor.fetchall():
+                found[row["k"]] = self._window_from_json(row["data"])
+        return found
+    
+    def _cache_windows(self, windows: Dict[str, Dict[str, Any]]):
+        with self._window_lock:
+            self._window_cache.update(windows)
+            overflow = len(self._window_cache) - self.WINDOW_CACHE_MAX
+            if overflow > 0:
+                # Drop the windows that went quiet longest ago
+                stale = sorted(self._window_cache, key=lambda k: self._window_cache[k]["last_ts"])[:overflow]
+                for k in stale:
+                    del self._window_cache[k]
+    
     def update_rolling_window(self, condition_id: str, outcome_index: int, 
                             wallet: str, trade_id: str, timestamp: float,
                             window_minutes: float = 10.0, market_title: str = "", 
                             market_slug: str = "", price: float = 0, side: str = "BUY",
                             usd_amount: float = 0.0, quantity: float = 0.0) -> Tuple[str, Dict[str, Any]]:
-        """Update rolling window for consensus detection grouped by side"""
-        try:
-            # Group by side (direction)
-            key = self.sha(f"{condition_id}:{outcome_index}:{side}")
-            window_start = timestamp - (window_minutes * 60)
-            entry = {
-                "wallet": wallet, 
-                "trade_id": trade_id, 
-                "ts": timestamp, 
-                "price": price,
-                "conditionId": condition_id,  # Сохраняем condition_id
-                "outcomeIndex": outcome_index,  # Сохраняем outcome_index
-                "side": side  # Сохраняем side
-            }
-            if market_title:
-                entry["marketTitle"] = market_title
-            if market_slug:
-                entry["marketSlug"] = market_slug
-            # Store USD amount and quantity for position size calculation
-            if usd_amount and usd_amount > 0:
-                entry["usd"] = float(usd_amount)
-            if quantity and quantity > 0:
-                entry["quantity"] = float(quantity)
-            
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT data FROM rolling_buys WHERE k = ?", (key,))
-                row = cursor.fetchone()
-                
-                if not row:
-                    obj = {"events": [entry], "first_ts": timestamp, "last_ts": timestamp}
-                else:
-                    obj = json.loads(row[0])
-                    # Add new event first
-                    obj["events"].append(entry)
-                    # Deduplicate wallets (keep latest per wallet) before filtering
-                    obj["events"] = self._dedupe_wallets(obj["events"])
-                    
-                    # CRITICAL FIX: Filter events based on the LATEST event timestamp, not the new event
-                    # This ensures the window is calculated from the most recent event in the window
-                    if obj["events"]:
-                        latest_ts = max(e["ts"] for e in obj["events"])
-                        window_start_ts = latest_ts - (window_minutes * 60)
-                        # Remove stale events (events outside the window from the latest event)
-                        obj["events"] = [e for e in obj["events"] if e["ts"] >= window_start_ts]
-                    
-                    # Update timestamps
-                    if obj["events"]:
-                        obj["first_ts"] = min(e["ts"] for e in obj["events"])
-                        obj["last_ts"] = max(e["ts"] for e in obj["events"])
-                
-                updated_at_iso = self.now_iso()
-                data_json = json.dumps(obj)
-                cursor.execute("""
-                    INSERT INTO rolling_buys(k, data, updated_at)
-                    VALUES(?,?,?)
-                    ON CONFLICT(k) DO UPDATE SET 
-                        data=excluded.data, 
-                        updated_at=excluded.updated_at
-                """, (key, data_json, updated_at_iso))
-                
-                try:
-                    conn.commit()
-                    # Verify the commit worked by checking if row exists
-                    cursor.execute("SELECT updated_at FROM rolling_buys WHERE k = ?", (key,))
-                    verify_row = cursor.fetchone()
-                    events_count = len(obj.get('events', []))
-                    wallets_count = len({e.get('wallet') for e in obj.get('events', [])})
-                    if verify_row:
-                        logger.info(f"[DB] ✅ Updated rolling_buys: key={key[:20]}... updated_at={updated_at_iso} events={events_count} wallets={wallets_count} VERIFIED")
-                    else:
-                        logger.error(f"[DB] ❌ Commit failed - row not found after commit: key={key[:20]}...")
-                except Exception as commit_error:
-                    logger.error(f"[DB] ❌ Commit error: {commit_error} for key={key[:20]}...")
-                    conn.rollback()
-                    raise
-                return key, obj
-                
-        except Exception as e:
-            logger.error(f"Error updating rolling window: {e}")
+        """Update rolling window for consensus detection grouped by side
+        
+        Returns the window key and {"events": [TradeEvent, ...], "first_ts", "last_ts"}.
+        """
+        event = TradeEvent.create(
+            wallet, trade_id, timestamp, price, condition_id, outcome_index, side,
+            usd=usd_amount, quantity=quantity, market_title=market_title, market_slug=market_slug
+        )
+        gkey = event.window_key
+        result = self.update_rolling_windows_batch({gkey: [event]}, window_minutes)
+        if gkey not in result:
             return "", {}
+        key, obj, _ = result[gkey]
+        return key, obj
     
-    def _dedupe_wallets(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Keep latest event per wallet"""
-        by_wallet = {}
-        for e in events:
-            w = e["wallet"]
-            if w not in by_wallet or e["ts"] > by_wallet[w]["ts"]:
-                by_wallet[w] = e
-        return list(by_wallet.values())
+    def update_rolling_windows_batch(self, groups: Dict[Tuple[str, int, str], List[TradeEvent]],
+                                     window_minutes: float = 10.0) -> Dict[Tuple[str, int, str], Tuple[str, Dict[str, Any], set]]:
+        """Merge a sweep's events into their rolling windows in one write
+        
+        Windows are served from an in-memory cache and only read from
+        rolling_buys on a miss; every update is still written through as JSON
+        by the writer thread.
+        
+        Args:
+            groups: (condition_id, outcome_index, side) -> TradeEvents for that window
+            window_minutes: Rolling window size
+        
+        Returns:
+            (condition_id, outcome_index, side) -> (key, updated window, wallets in window before the merge)
+        """
+        if not groups:
+            return {}
+        keys = {gkey: self.sha(f"{gkey[0]}:{gkey[1]}:{gkey[2]}") for gkey in groups}
+        try:
+            with self.get_connection() as conn:
+                existing = self._load_windows(conn.cursor(), list(keys.values()))
+            
+            results = {}
+            updated = {}
+            rows = []
+            updated_at_iso = self.now_iso()
+            for gkey, new_events in groups.items():
+                key = keys[gkey]
+                prev = existing.get(key)
+                prev_wallets = {e.wallet for e in prev["events"]} if prev else set()
+                obj = self._merge_window(prev, new_events, window_minutes)
+                results[gkey] = (key, obj, prev_wallets)
+                updated[key] = obj
+                rows.append((key, self._window_to_json(obj), updated_at_iso))
+            
+            # The cache serves the merged windows; rolling_buys is written behind
+            self._cache_windows(updated)
+            self._write(lambda cursor: cursor.executemany("""
+                INSERT INTO rolling_buys(k, data, updated_at)
+                VALUES(?,?,?)
+                ON CONFLICT(k) DO UPDATE SET 
+                    data=excluded.data, 
+                    updated_at=excluded.updated_at
+            """, rows), wait=False, what="writing rolling windows")
+            logger.info(f"[DB] ✅ Updated rolling_buys: windows={len(rows)} events={sum(len(v) for v in groups.values())}")
+            return results
+        except Exception as e:
+            logger.error(f"Error updating rolling windows: {e}")
+            return {}
     
     # Alert operations
     def has_traded_market(self, wallet: str, condition_id: str, side: str) -> bool:
-        """Check if wallet has already traded this market in this direction"""
+        """Check if wallet has already traded this market in this direction
+        
+        Served from the in-memory first-entry set; the market's rows are
+        loaded from market_trades the first time it is seen.
+        """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 1 FROM market_trades 
-                    WHERE wallet = ? AND condition_id = ? AND side = ?
-                """, (wallet, condition_id, side))
-                return cursor.fetchone() is not None
+            wallet_id = self._wallet_id(wallet)
+            with self._market_trades_lock:
+                entries = self._load_market_trades(condition_id)
+                # A wallet first seen this process is keyed by address until its id exists
+                return (wallet, side) in entries or (wallet_id is not None and (wallet_id, side) in entries)
         except Exception as e:
             logger.error(f"Error checking market trade: {e}")
             return False
     
     def mark_market_traded(self, wallet: str, condition_id: str, side: str, timestamp: float):
-        """Mark wallet as having traded this market in this direction"""
+        """Mark wallet as having traded this market in this direction
+        
+        The entry is visible to has_traded_market immediately; the SQLite
+        write is queued and flushed in batches (see flush_market_trades).
+        """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO market_trades(wallet, condition_id, side, first_ts)
-                    VALUES(?, ?, ?, ?)
-                """, (wallet, condition_id, side, timestamp))
-                conn.commit()
+            # Resolved before taking the lock; a new address has no id until the flush
+            wallet_id = self._wallet_id(wallet)
+            with self._market_trades_lock:
+                entries = self._load_market_trades(condition_id)
+                if (wallet, side) in entries or (wallet_id is not None and (wallet_id, side) in entries):
+                    return
+                key = wallet if wallet_id is None else wallet_id
+                entries.add((key, side))
+                if wallet_id is None and address_bytes(wallet) is None:
+                    # Not a hex address: tracked in memory only
+                    return
+                self._market_trades_pending.append((key, condition_id, side, timestamp))
+                should_flush = (
+                    len(self._market_trades_pending) >= self.MARKET_TRADES_FLUSH_SIZE
+                    or time.monotonic() - self._market_trades_last_flush >= self.MARKET_TRADES_FLUSH_INTERVAL_SEC
+                )
+            if should_flush:
+                self.flush_market_trades()
         except Exception as e:
             logger.error(f"Error marking market trade: {e}")
     
+    def flush_market_trades(self, wait: bool = False) -> int:
+        """Hand queued first-entry rows to the writer as one executemany
+        
+        Args:
+            wait: Block until the rows are committed; a failed write is
+                re-queued and its error raised
+        
+        Returns:
+            Number of rows flushed
+        """
+        with self._market_trades_lock:
+            pending = self._market_trades_pending
+            self._market_trades_pending = []
+            self._market_trades_last_flush = time.monotonic()
+        if not pending:
+            return 0
+        
+        known = [row for row in pending if isinstance(row[0], int)]
+        new = [(address_bytes(row[0]),) + row[1:] for row in pending if not isinstance(row[0], int)]
+        
+        def write(cursor):
+            # OR IGNORE keeps the original first_ts if another process already recorded the entry
+            cursor.executemany("""
+                INSERT OR IGNORE INTO market_trades(wallet_id, condition_id, side, first_ts)
+                VALUES(?, ?, ?, ?)
+            """, known)
+            if new:
+                # Wallets without an id yet get their wallet_ids row in the same commit
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO wallet_ids(address) VALUES(?)",
+                    [(row[0],) for row in new]
+                )
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO market_trades(wallet_id, condition_id, side, first_ts)
+                    SELECT id, ?, ?, ? FROM wallet_ids WHERE address = ?
+                """, [row[1:] + row[:1] for row in new])
+        
+        def requeue_on_failure(future):
+            if future.exception() is not None:
+                logger.error(f"Error flushing {len(pending)} market trades: {future.exception()}")
+                # Put rows back so the next flush retries them
+                with self._market_trades_lock:
+                    self._market_trades_pending = pending + self._market_trades_pending
+        
+        future = self._write(write, wait=False)
+        future.add_done_callback(requeue_on_failure)
+        if wait:
+            future.result(self.WRITE_TIMEOUT_SEC)
+        return len(pending)
+    
+    def evict_idle_market_trades(self, idle_seconds: float = 6 * 3600) -> int:
+        """Drop in-memory first-entry sets for markets not touched recently
+        
+        Evicted markets are reloaded lazily from SQLite if they show up again.
+        
+        Returns:
+            Number of markets evicted
+        """
+        cutoff = time.monotonic() - idle_seconds
+        with self._market_trades_lock:
+            idle = [cid for cid, last_used in self._market_trades_used.items() if last_used < cutoff]
+            for cid in idle:
+                self._market_trades_cache.pop(cid, None)
+                self._market_trades_used.pop(cid, None)
+        return len(idle)
+    
+    def forget_resolved_market(self, condition_id: str) -> int:
+        """Remove first-entry tracking for a market that has closed or resolved
+        
+        Wallets that had entered the market get their cached analysis
+        invalidated, since the resolution changes their closed positions.
+        
+        Returns:
+            Number of market_trades rows deleted
+        """
+        with self._market_trades_lock:
+            entries = self._market_trades_cache.pop(condition_id, None)
+            had_entries = bool(entries)
+            keys = {key for key, _ in entries or ()}
+            self._market_trades_used.pop(condition_id, None)
+            keys.update(row[0] for row in self._market_trades_pending if row[1] == condition_id)
+            wallet_ids = {key for key in keys if isinstance(key, int)}
+            wallets = {key for key in keys if isinstance(key, str)}
+            self._market_trades_pending = [
+                row for row in self._market_trades_pending if row[1] != condition_id
+            ]
+            # Only hit SQLite once per resolved market unless new entries were recorded since
+            already_forgotten = condition_id in self._market_trades_resolved
+            self._market_trades_resolved[condition_id] = None
+            while len(self._market_trades_resolved) > self.MARKET_TRADES_CACHE_MAX:
+                del self._market_trades_resolved[next(iter(self._market_trades_resolved))]
+        if already_forgotten and not had_entries:
+            return 0
+        try:
+            # Runs after any first entries already handed to the writer
+            def write(cursor):
+                cursor.execute("SELECT wallet_id FROM market_trades WHERE condition_id = ?", (condition_id,))
+                found = [row[0] for row in cursor.fetchall()]
+                cursor.execute("DELETE FROM market_trades WHERE condition_id = ?", (condition_id,))
+                return found, cursor.rowcount
+            found, removed = self._write(write)
+            wallet_ids.update(found)
+            with self.get_connection() as conn:
+                wallets.update(self._wallet_ids.addresses(conn.cursor(), wallet_ids).values())
+        except Exception as e:
+            logger.error(f"Error removing market trades for {condition_id}: {e}")
+            return 0
+        if wallets:
+            self.invalidate_analysis(wallets, "monitor_market_resolved")
+        return removed
+    
+    def _load_market_trades(self, condition_id: str) -> set:
+        """Return the (wallet, side) set for a market, loading it on first use (caller holds _market_trades_lock)"""
+        self._market_trades_used[condition_id] = time.monotonic()
+        entries = self._market_trades_cache.get(condition_id)
+        if entries is not None:
+            return entries
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT wallet_id, side FROM market_trades WHERE condition_id = ?",
+                (condition_id,)
+            )
+            entries = {(row["wallet_id"], row["side"]) for row in cursor.fetchall()}
+        self._market_trades_cache[condition_id] = entries
+        if len(self._market_trades_cache) > self.MARKET_TRADES_CACHE_MAX:
+            oldest = min(self._market_trades_used, key=self._market_trades_used.get)
+            self._market_trades_cache.pop(oldest, None)
+            self._market_trades_used.pop(oldest, None)
+        return entries
+    
     def is_alert_sent(self, condition_id: str, outcome_index: int, 
                      first_ts: float, last_ts: float, alert_key: str = "") -> bool:
         """Check if alert was already sent for this consensus"""
@@ -795,6 +998,10 @@ class PolymarketDB:
         Check if suppressed alert was already sent for this market/outcome/side/reason
         within the last window_minutes minutes
         
+        Sends inside the window are answered from the in-memory ledger;
+        anything else falls back to the suppressed_alerts primary key, so a
+        send recorded by another process (or before a restart) is seen.
+        
         Args:
             condition_id: Market condition ID
             outcome_index: Outcome index
@@ -805,36 +1012,36 @@ class PolymarketDB:
         Returns:
             True if suppressed alert was sent recently, False otherwise
         """
+        key = (condition_id, int(outcome_index), side, reason)
+        threshold_ts = int(time.time() - window_minutes * 60)
+        
+        with self._suppressed_lock:
+            cached_ts = self._suppressed_cache.get(key)
+        # An older cached send may have been superseded by another process, so only
+        # an in-window hit is answered from memory
+        if cached_ts is not None and cached_ts >= threshold_ts:
+            return True
+        
         try:
-            from datetime import datetime, timezone, timedelta
-            
-            # Calculate time threshold
-            threshold_time = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
-            threshold_iso = threshold_time.isoformat()
-            
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                # Check if there's a suppressed alert for this market/outcome/side/reason
-                # in the last window_minutes minutes
-                # We'll use a simple key based on condition_id, outcome_index, side, and reason
-                suppressed_key = f"SUPPRESSED:{condition_id}:{outcome_index}:{side}:{reason}"
-                
-                # Check alerts_sent table for suppressed alerts
-                # We'll look for alerts with a specific pattern in the alert_key
                 cursor.execute("""
-                    SELECT 1 FROM alerts_sent
-                    WHERE condition_id = ? 
-                    AND outcome_index = ?
-                    AND sent_at >= ?
-                    AND alert_key LIKE ?
-                    LIMIT 1
-                """, (condition_id, outcome_index, threshold_iso, f"%{suppressed_key}%"))
-                
-                return cursor.fetchone() is not None
-                
+                    SELECT sent_ts FROM suppressed_alerts
+                    WHERE condition_id = ? AND outcome_index = ? AND side = ? AND reason = ?
+                """, key)
+                row = cursor.fetchone()
         except Exception as e:
             logger.debug(f"Error checking suppressed alert status: {e}")
             return False
+        
+        # Misses are not cached: another process may mark the key at any time,
+        # and a miss is normally followed by mark_suppressed_alert_sent anyway
+        if row is None:
+            return False
+        sent_ts = int(row["sent_ts"])
+        with self._suppressed_lock:
+            self._remember_suppressed(key, sent_ts)
+        return sent_ts >= threshold_ts
     
     def mark_suppressed_alert_sent(self, condition_id: str, outcome_index: int,
                                   side: str, reason: str, wallet_count: int = 0) -> bool:
@@ -851,32 +1058,37 @@ class PolymarketDB:
         Returns:
             True if marked successfully, False otherwise
         """
+        key = (condition_id, int(outcome_index), side, reason)
+        sent_ts = int(time.time())
+        with self._suppressed_lock:
+            self._remember_suppressed(key, sent_ts)
+        
         try:
-            suppressed_key = f"SUPPRESSED:{condition_id}:{outcome_index}:{side}:{reason}"
-            key_hash = self.sha(suppressed_key)
-            
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO alerts_sent(
-                        condition_id, outcome_index, alert_key, 
-                        wallet_count, sent_at, side
-                    )
-                    VALUES(?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(alert_key) DO UPDATE SET
-                        sent_at = excluded.sent_at,
-                        wallet_count = excluded.wallet_count
-                """, (
-                    condition_id, outcome_index, key_hash,
-                    wallet_count, self.now_iso(), side
-                ))
-                conn.commit()
-                return True
+            # The in-memory ledger answers is_suppressed_alert_sent; the row is written behind
+            self._write(lambda cursor: cursor.execute("""
+                INSERT INTO suppressed_alerts(
+                    condition_id, outcome_index, side, reason, wallet_count, sent_ts
+                )
+                VALUES(?, ?, ?, ?, ?, ?)
+                ON CONFLICT(condition_id, outcome_index, side, reason) DO UPDATE SET
+                    sent_ts = excluded.sent_ts,
+                    wallet_count = excluded.wallet_count
+            """, key + (wallet_count, sent_ts)), wait=False, what="marking suppressed alert as sent")
+            return True
                 
         except Exception as e:
             logger.error(f"Error marking suppressed alert as sent: {e}")
             return False
     
+    def _remember_suppressed(self, key: Tuple[str, int, str, str], sent_ts: int):
+        """Store key in the in-memory suppression ledger (caller holds _suppressed_lock)"""
+        cache = self._suppressed_cache
+        cache.pop(key, None)
+        cache[key] = sent_ts
+        # Insertion order == recency, so trim from the front once over capacity
+        while len(cache) > self.SUPPRESSED_CACHE_MAX:
+            del cache[next(iter(cache))]
+    
     def mark_alert_sent(self, condition_id: str, outcome_index: int, 
                        wallet_count: int, first_ts: float, last_ts: float, alert_key: str = "", side: str = "BUY",
                        price: float = 0.0, wallets_csv: str = "", wallet_details_json: str = "", 
@@ -897,9 +1109,7 @@ class PolymarketDB:
             alert_id = key[:8]
             now_iso = self.now_iso()
             
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
+            def write(cursor):
                 if is_repeat:
                     # Update first_total_usd for the first alert of this (condition_id, outcome_index, side)
                     cursor.execute("""
@@ -907,7 +1117,7 @@ class PolymarketDB:
                         SET first_total_usd = ?
                         WHERE condition_id = ? AND outcome_index = ? AND side = ?
                         AND first_total_usd IS NULL
-                        ORDER BY sent_at ASC
+                        ORDER BY sent_ts ASC
                         LIMIT 1
                     """, (total_usd, condition_id, outcome_index, side))
                     logger.info(f"[Alerts] Updated first_total_usd to ${total_usd:.2f} for repeat alert")
@@ -918,8 +1128,6 @@ class PolymarketDB:
                     VALUES(?,?,?,?,?,?,?,?,?,?)
                 """, (key, now_iso, condition_id, outcome_index, wallet_count, side, float(price or 0.0), wallets_csv, wallet_details_json, total_usd if not is_repeat else None))
                 
-                conn.commit()
-                
                 # Log successful save
                 wallet_addresses = wallets_csv.split(",") if wallets_csv else []
                 logger.info(
@@ -929,6 +1137,7 @@ class PolymarketDB:
                 
                 return True
                 
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error marking alert as sent for {condition_id}:{outcome_index}: {e}", exc_info=True)
             return False
@@ -942,7 +1151,7 @@ class PolymarketDB:
                     SELECT first_total_usd FROM alerts_sent
                     WHERE condition_id = ? AND outcome_index = ? AND side = ?
                     AND first_total_usd IS NOT NULL
-                    ORDER BY sent_at ASC
+                    ORDER BY sent_ts ASC
                     LIMIT 1
                 """, (condition_id, outcome_index, side))
                 row = cursor.fetchone()
@@ -971,17 +1180,16 @@ class PolymarketDB:
     def has_recent_alert(self, condition_id: str, outcome_index: int, side: str, cooldown_min: float) -> bool:
         """Check if a recent alert for the same market/side was sent within cooldown."""
         try:
-            cutoff = (datetime.now(timezone.utc).timestamp() - cooldown_min * 60)
-            cutoff_iso = datetime.fromtimestamp(cutoff, tz=timezone.utc).isoformat()
+            cutoff = int(time.time() - cooldown_min * 60)
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
                     SELECT 1 FROM alerts_sent
-                    WHERE condition_id = ? AND outcome_index = ? AND side = ? AND sent_at >= ?
+                    WHERE condition_id = ? AND outcome_index = ? AND side = ? AND sent_ts >= ?
                     LIMIT 1
                     """,
-                    (condition_id, outcome_index, side, cutoff_iso)
+                    (condition_id, outcome_index, side, cutoff)
                 )
                 return cursor.fetchone() is not None
         except Exception as e:
@@ -1002,7 +1210,7 @@ class PolymarketDB:
                     SELECT sent_at, side, wallet_count, price, wallets_csv, outcome_index
                     FROM alerts_sent
                     WHERE condition_id = ? AND outcome_index = ?
-                    ORDER BY sent_at DESC
+                    ORDER BY sent_ts DESC
                     LIMIT ?
                     """,
                     (condition_id, outcome_index, limit)
@@ -1022,7 +1230,7 @@ class PolymarketDB:
                     cursor.execute(
                         """
                         SELECT COUNT(*) FROM alerts_sent
-                        WHERE datetime(sent_at) >= datetime(?)
+                        WHERE sent_ts >= CAST(strftime('%s', ?) AS INTEGER)
                         """,
                         (since,)
                     )
@@ -1039,133 +1247,240 @@ class PolymarketDB:
             cutoff_date = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
             cutoff_date = cutoff_date.replace(day=cutoff_date.day - days_to_keep)
             cutoff_iso = cutoff_date.isoformat()
+            cutoff_ts = int(cutoff_date.timestamp())
             
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
+            def write(cursor):
                 # Clean old alerts
-                cursor.execute("DELETE FROM alerts_sent WHERE sent_at < ?", (cutoff_iso,))
+                cursor.execute("DELETE FROM alerts_sent WHERE sent_ts < ?", (cutoff_ts,))
                 alerts_removed = cursor.rowcount
                 
+                # Clean old suppressed-alert ledger entries
+                suppressed_cutoff = int(time.time() - self.SUPPRESSED_RETENTION_HOURS * 3600)
+                cursor.execute("DELETE FROM suppressed_alerts WHERE sent_ts < ?", (suppressed_cutoff,))
+                
                 # Clean old rolling buys (keep only recent ones)
-                cursor.execute("DELETE FROM rolling_buys WHERE updated_at < ?", (cutoff_iso,))
+                cursor.execute("DELETE FROM rolling_buys WHERE updated_ts < ?", (cutoff_ts,))
                 rolling_removed = cursor.rowcount
                 
                 # Clean old order flow metrics
                 cursor.execute("DELETE FROM order_flow_metrics WHERE detected_at < ?", (cutoff_iso,))
                 order_flow_removed = cursor.rowcount
                 
-                conn.commit()
-                
                 if alerts_removed > 0 or rolling_removed > 0 or order_flow_removed > 0:
                     logger.info(f"Cleaned up {alerts_removed} old alerts, {rolling_removed} old rolling buys, and {order_flow_removed} old order flow metrics")
                     
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error cleaning up old data: {e}")
     
     # Wallet analysis jobs queue operations
-    def add_wallet_to_queue(self, address: str, display: str = None, source: str = None) -> bool:
-        """Add wallet to analysis queue"""
+    def add_wallet_to_queue(self, address: str, display: str = None, source: str = None,
+                            rank: Optional[int] = None, pnl: Optional[float] = None,
+                            in_consensus: Optional[bool] = None) -> bool:
+        """Add wallet to analysis queue.
+
+        The job's priority combines the source, optional leaderboard rank / PnL
+        hints, whether the wallet entered a market inside the consensus window
+        (looked up in market_trades / whale_positions unless in_consensus is
+        given) and how long ago it was last analyzed. A completed job is
+        re-opened once its cached analysis has expired; re-queueing a wallet
+        that is still pending only ever raises its priority.
+        """
+        meta = {"display": display, "source": source, "rank": rank, "pnl": pnl, "in_consensus": in_consensus}
+        return self.add_wallets_to_queue({address: meta}) > 0
+    
+    def add_wallets_to_queue(self, wallets: Dict[str, Dict[str, Any]]) -> int:
+        """Add several wallets to the analysis queue with one read pass and one write.
+        
+        Args:
+            wallets: Address -> meta with optional "display", "source", "rank",
+                "pnl" and "in_consensus" (same meaning as add_wallet_to_queue)
+        
+        Returns:
+            Number of jobs added or re-opened
+        """
         try:
+            queued = {}
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                since = time.time() - self.JOB_CONSENSUS_WINDOW_SEC
+                since_iso = datetime.fromtimestamp(since, timezone.utc).isoformat()
+                for address, meta in wallets.items():
+                    address = address.lower()
+                    in_consensus = meta.get("in_consensus")
+                    if in_consensus is None:
+                        wallet_id = self._wallet_ids.lookup(cursor, address)
+                        cursor.execute("""
+                            SELECT 1 FROM market_trades WHERE wallet_id = ? AND first_ts >= ?
+                            UNION ALL
+                            SELECT 1 FROM whale_positions WHERE wallet_id = ? AND detected_at >= ?
+                            LIMIT 1
+                        """, (wallet_id, since, wallet_id, since_iso))
+                        in_consensus = cursor.fetchone() is not None
+                    cursor.execute("SELECT analyzed_at FROM wallet_analysis_cache WHERE address = ?", (address,))
+                    cached = cursor.fetchone()
+                    priority = job_priority(meta.get("source"), rank=meta.get("rank"), pnl=meta.get("pnl"),
+                                            in_consensus=in_consensus,
+                                            last_analyzed_at=cached[0] if cached else None)
+                    queued[address] = (meta.get("display"), meta.get("source"), priority)
+            if not queued:
+                return 0
+            
+            def write(cursor):
                 now = self.now_iso()
-                
+                added = 0
+                for address, (display, source, priority) in queued.items():
+                    cursor.execute("""
+                        INSERT OR IGNORE INTO wallet_analysis_jobs(
+                            address, display, source, status, priority, created_at, updated_at
+                        )
+                        VALUES(?,?,?,?,?,?,?)
+                    """, (address, display, source, 'pending', priority, now, now))
+                    if cursor.rowcount > 0:
+                        added += 1
+                        continue
+                    # Completed jobs are re-opened once the cached result has expired
+                    cursor.execute("""
+                        UPDATE wallet_analysis_jobs
+                        SET status = 'pending', priority = ?, retry_count = 0, next_retry_at = NULL,
+                            error_message = NULL, updated_at = ?
+                        WHERE address = ? AND status = 'completed'
+                        AND NOT EXISTS (
+                            SELECT 1 FROM wallet_analysis_cache WHERE address = ? AND expires_at > ?
+                        )
+                    """, (priority, now, address, address, now))
+                    if cursor.rowcount > 0:
+                        added += 1
+                        continue
+                    cursor.execute("""
+                        UPDATE wallet_analysis_jobs SET priority = ?, updated_at = ?
+                        WHERE address = ? AND status = 'pending' AND COALESCE(priority, 0) < ?
+                    """, (priority, now, address, priority))
+                return added
+            
+            added = self._write(write)
+            if added:
+                self._notify_job_listeners()
+            return added
+        except Exception as e:
+            logger.error(f"Error adding {len(wallets)} wallets to queue: {e}")
+            return 0
+    
+    def claim_jobs(self, worker_id: str, limit: int = 10,
+                   lease_seconds: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Atomically lease up to limit ready jobs to worker_id in one statement.
+
+        Picks pending jobs whose retry time has passed, plus 'processing' jobs
+        whose lease expired (crashed or stopped worker) or that have no lease
+        at all (left behind by the old unleased claim path), marks them
+        processing and returns the claimed rows highest priority first
+        (oldest first among equal priorities).
+        """
+        try:
+            lease = lease_seconds or self.JOB_LEASE_SECONDS
+            now = self.now_iso()
+            now_ts = int(time.time())
+            lease_expires_at = (datetime.now(timezone.utc) + timedelta(seconds=lease)).isoformat()
+            def write(cursor):
                 cursor.execute("""
-                    INSERT OR IGNORE INTO wallet_analysis_jobs(
-                        address, display, source, status, created_at, updated_at
+                    UPDATE wallet_analysis_jobs
+                    SET status = 'processing', leased_by = ?, lease_expires_at = ?, updated_at = ?
+                    WHERE id IN (
+                        SELECT id FROM wallet_analysis_jobs
+                        WHERE (status = 'pending' AND (next_retry_at IS NULL OR next_retry_ts <= ?))
+                           OR (status = 'processing' AND (lease_expires_ts < ? OR lease_expires_ts IS NULL))
+                        ORDER BY priority DESC, created_at ASC
+                        LIMIT ?
                     )
-                    VALUES(?,?,?,?,?,?)
-                """, (address.lower(), display, source, 'pending', now, now))
-                
-                conn.commit()
-                return cursor.rowcount > 0
+                    RETURNING *
+                """, (worker_id, lease_expires_at, now, now_ts, now_ts, limit))
+                return [dict(row) for row in cursor.fetchall()]
+            jobs = self._write(write)
+            jobs.sort(key=lambda job: (-(job.get('priority') or 0), job.get('created_at') or ''))
+            return jobs
         except Exception as e:
-            logger.error(f"Error adding wallet to queue {address}: {e}")
-            return False
+            logger.error(f"Error claiming jobs for {worker_id}: {e}")
+            return []
     
-    def get_pending_jobs(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get pending jobs ready for processing"""
+    def renew_job_leases(self, worker_id: str, job_ids: List[int],
+                         lease_seconds: Optional[int] = None) -> int:
+        """Extend worker_id's leases on jobs it is still processing; returns how many it still held"""
+        if not job_ids:
+            return 0
         try:
-            with self.get_connection() as conn:
-                # Ensure we can read uncommitted changes in WAL mode
-                conn.execute("PRAGMA read_uncommitted = 1")
-                cursor = conn.cursor()
-                now = self.now_iso()
-                
-                logger.debug(f"get_pending_jobs(limit={limit}) called, now={now}")
-                
+            lease = lease_seconds or self.JOB_LEASE_SECONDS
+            lease_expires_at = (datetime.now(timezone.utc) + timedelta(seconds=lease)).isoformat()
+            def write(cursor):
                 cursor.execute("""
-                    SELECT * FROM wallet_analysis_jobs
-                    WHERE status = 'pending' 
-                    AND (next_retry_at IS NULL OR next_retry_at <= ?)
-                    ORDER BY created_at ASC
-                    LIMIT ?
-                """, (now, limit))
-                
-                rows = cursor.fetchall()
-                result = [dict(row) for row in rows]
-                
-                logger.debug(f"get_pending_jobs(limit={limit}) returned {len(result)} jobs")
-                
-                # Debug logging if no results but jobs exist
-                if not result:
-                    cursor.execute("SELECT COUNT(*) FROM wallet_analysis_jobs WHERE status = 'pending'")
-                    total_pending = cursor.fetchone()[0]
-                    if total_pending > 0:
-                        cursor.execute("SELECT COUNT(*) FROM wallet_analysis_jobs WHERE status = 'pending' AND (next_retry_at IS NULL OR next_retry_at <= ?)", (now,))
-                        ready_count = cursor.fetchone()[0]
-                        # Log more details for debugging
-                        cursor.execute("SELECT COUNT(*) FROM wallet_analysis_jobs WHERE status = 'pending' AND next_retry_at IS NOT NULL AND next_retry_at > ?", (now,))
-                        delayed_count = cursor.fetchone()[0]
-                        logger.warning(f"get_pending_jobs: total_pending={total_pending}, ready={ready_count}, delayed={delayed_count}, limit={limit}, now={now}")
-                        # If we have ready jobs but query returned nothing, there might be a transaction issue
-                        if ready_count > 0:
-                            logger.error(f"get_pending_jobs: BUG DETECTED - {ready_count} ready jobs exist but query returned 0! This may indicate a transaction isolation issue.")
-                else:
-                    logger.debug(f"get_pending_jobs: returning {len(result)} jobs")
-                
-                return result
+                    UPDATE wallet_analysis_jobs SET lease_expires_at = ?
+                    WHERE id IN (SELECT value FROM json_each(?))
+                    AND status = 'processing' AND leased_by = ?
+                """, (lease_expires_at, json.dumps(list(job_ids)), worker_id))
+                return cursor.rowcount
+            return self._write(write)
         except Exception as e:
-            logger.error(f"Error getting pending jobs: {e}", exc_info=True)
-            return []
+            logger.error(f"Error renewing job leases for {worker_id}: {e}")
+            return 0
+    
+    def add_job_listener(self, callback) -> None:
+        """Register a no-argument callback run whenever a job is queued"""
+        self._job_listeners.append(callback)
+    
+    def remove_job_listener(self, callback) -> None:
+        try:
+            self._job_listeners.remove(callback)
+        except ValueError:
+            pass
+    
+    def _notify_job_listeners(self) -> None:
+        for callback in list(self._job_listeners):
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"Job listener failed: {e}")
     
-    def claim_job(self, job_id: int) -> bool:
-        """Atomically claim a job for processing"""
+    def seconds_until_next_job(self, max_wait: float = 30.0) -> float:
+        """Seconds until the earliest delayed retry or lease expiry (capped at max_wait).
+
+        Idle dispatchers sleep this long unless a job listener fires first, so
+        jobs queued by other processes are picked up within max_wait.
+        """
         try:
+            now = time.time()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                now = self.now_iso()
-                
-                # Try to claim the job by updating status to 'processing'
                 cursor.execute("""
-                    UPDATE wallet_analysis_jobs
-                    SET status = 'processing', updated_at = ?
-                    WHERE id = ? AND status = 'pending'
-                """, (now, job_id))
-                
-                conn.commit()
-                return cursor.rowcount > 0
+                    SELECT MIN(due) FROM (
+                        SELECT MIN(next_retry_ts) AS due FROM wallet_analysis_jobs
+                        WHERE status = 'pending' AND next_retry_ts > ?
+                        UNION ALL
+                        SELECT MIN(lease_expires_ts) FROM wallet_analysis_jobs
+                        WHERE status = 'processing' AND lease_expires_ts IS NOT NULL
+                    )
+                """, (int(now),))
+                row = cursor.fetchone()
+            if not row or row[0] is None:
+                return max_wait
+            return min(max(row[0] - now, 0.0), max_wait)
         except Exception as e:
-            logger.error(f"Error claiming job {job_id}: {e}")
-            return False
+            logger.debug(f"Error computing next job due time: {e}")
+            return max_wait
     
     def update_job_status(self, job_id: int, status: str, error_message: str = None, 
-                         next_retry_at: str = None) -> bool:
-        """Update job status"""
+                         next_retry_at: str = None, worker_id: Optional[str] = None) -> bool:
+        """Update job status (only while worker_id still holds the job's lease; None for unleased jobs)"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 now = self.now_iso()
                 
                 cursor.execute("""
                     UPDATE wallet_analysis_jobs
-                    SET status = ?, error_message = ?, next_retry_at = ?, updated_at = ?
-                    WHERE id = ?
-                """, (status, error_message, next_retry_at, now, job_id))
-                
-                conn.commit()
+                    SET status = ?, error_message = ?, next_retry_at = ?, updated_at = ?,
+                        leased_by = NULL, lease_expires_at = NULL
+                    WHERE id = ? AND leased_by IS ?
+                """, (status, error_message, next_retry_at, now, job_id, worker_id))
                 return cursor.rowcount > 0
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error updating job status {job_id}: {e}")
             return False
@@ -1184,11 +1499,14 @@ class PolymarketDB:
             logger.error(f"Error getting job {job_id}: {e}")
             return None
     
-    def increment_job_retry(self, job_id: int, next_retry_at: str, error_message: str = None) -> bool:
-        """Increment retry count, set next retry time, and reset status to pending"""
+    def increment_job_retry(self, job_id: int, next_retry_at: str, error_message: str = None,
+                            worker_id: Optional[str] = None) -> bool:
+        """Increment retry count, set next retry time, and reset status to pending
+        
+        Like complete_job, only applies while worker_id still holds the lease.
+        """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 now = self.now_iso()
                 
                 cursor.execute("""
@@ -1197,29 +1515,33 @@ class PolymarketDB:
                         next_retry_at = ?,
                         error_message = ?,
                         status = 'pending',
+                        leased_by = NULL,
+                        lease_expires_at = NULL,
                         updated_at = ?
-                    WHERE id = ?
-                """, (next_retry_at, error_message, now, job_id))
-                
-                conn.commit()
+                    WHERE id = ? AND leased_by IS ?
+                """, (next_retry_at, error_message, now, job_id, worker_id))
                 return cursor.rowcount > 0
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error incrementing job retry {job_id}: {e}")
             return False
     
-    def complete_job(self, job_id: int) -> bool:
-        """Mark job as completed"""
+    def complete_job(self, job_id: int, worker_id: Optional[str] = None) -> bool:
+        """Mark job as completed
+        
+        worker_id is the lease owner from claim_jobs. Returns False if the
+        lease expired and the job was handed to another worker in the meantime.
+        """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 now = self.now_iso()
                 cursor.execute("""
                     UPDATE wallet_analysis_jobs
-                    SET status = 'completed', updated_at = ?
-                    WHERE id = ?
-                """, (now, job_id))
-                conn.commit()
+                    SET status = 'completed', updated_at = ?, leased_by = NULL, lease_expires_at = NULL
+                    WHERE id = ? AND leased_by IS ?
+                """, (now, job_id, worker_id))
                 return cursor.rowcount > 0
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error completing job {job_id}: {e}")
             return False
@@ -1232,39 +1554,23 @@ class PolymarketDB:
                 
                 stats = {}
                 
-                # Clean up stuck processing jobs (older than 1 hour)
-                now = self.now_iso()
-                one_hour_ago = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
-                cursor.execute("""
-                    UPDATE wallet_analysis_jobs
-                    SET status = 'pending', updated_at = ?
-                    WHERE status = 'processing' AND updated_at < ?
-                """, (now, one_hour_ago))
-                stuck_reset = cursor.rowcount
-                if stuck_reset > 0:
-                    logger.warning(f"Reset {stuck_reset} stuck processing jobs back to pending")
-                    conn.commit()
-                
-                # Count by status
-                cursor.execute("""
-                    SELECT status, COUNT(*) FROM wallet_analysis_jobs
-                    GROUP BY status
-                """)
+                now_ts = int(time.time())
                 
-                for row in cursor.fetchall():
-                    stats[f"{row[0]}_jobs"] = row[1]
+                # Count by status (trigger-maintained counters)
+                counters = self.get_stat_counters(cursor)
+                for name, value in counters.items():
+                    if name.startswith("jobs:"):
+                        stats[f"{name[5:]}_jobs"] = int(value)
                 
                 # Total jobs
-                cursor.execute("SELECT COUNT(*) FROM wallet_analysis_jobs")
-                stats['total_jobs'] = cursor.fetchone()[0]
+                stats['total_jobs'] = int(counters.get('jobs_total', 0))
                 
-                # Jobs ready for retry
+                # Jobs ready for retry: pending minus those still waiting (index range count)
                 cursor.execute("""
                     SELECT COUNT(*) FROM wallet_analysis_jobs
-                    WHERE status = 'pending' 
-                    AND (next_retry_at IS NULL OR next_retry_at <= ?)
-                """, (now,))
-                stats['ready_jobs'] = cursor.fetchone()[0]
+                    WHERE status = 'pending' AND next_retry_ts > ?
+                """, (now_ts,))
+                stats['ready_jobs'] = max(0, stats.get('pending_jobs', 0) - cursor.fetchone()[0])
                 
                 return stats
         except Exception as e:
@@ -1282,12 +1588,11 @@ class PolymarketDB:
             logger.info(f"Queue status counts: {status_counts}")
             
             # Ready jobs (pending with no retry delay or retry time passed)
-            now = self.now_iso()
             cursor.execute("""
                 SELECT COUNT(*) FROM wallet_analysis_jobs 
                 WHERE status='pending' 
-                AND (next_retry_at IS NULL OR next_retry_at <= ?)
-            """, (now,))
+                AND (next_retry_at IS NULL OR next_retry_ts <= ?)
+            """, (int(time.time()),))
             ready_count = cursor.fetchone()[0]
             logger.info(f"Ready jobs (can be processed now): {ready_count}")
             
@@ -1330,17 +1635,46 @@ class PolymarketDB:
             logger.error(f"Error getting cached analysis for {address}: {e}")
             return None
     
+    @classmethod
+    def analysis_ttl_hours(cls, daily_frequency: Optional[float], last_trade_at: Optional[str],
+                           analysis_result: Optional[str] = None) -> float:
+        """Cache lifetime for an analysis result, from the wallet's activity.
+
+        Hyperactive wallets expire after roughly ANALYSIS_TTL_TRADES_PER_REFRESH
+        trades; wallets idle for a while keep their result for at least half
+        their idle time. API errors get the minimum so they are retried soon.
+        """
+        if analysis_result == "rejected_api_error":
+            return float(cls.ANALYSIS_TTL_MIN_HOURS)
+        
+        ttl = None
+        if daily_frequency and daily_frequency > 0:
+            ttl = 24.0 * cls.ANALYSIS_TTL_TRADES_PER_REFRESH / daily_frequency
+        if last_trade_at:
+            try:
+                last_trade = datetime.fromisoformat(str(last_trade_at).replace("Z", "+00:00"))
+                if last_trade.tzinfo is None:
+                    last_trade = last_trade.replace(tzinfo=timezone.utc)
+                idle_hours = (datetime.now(timezone.utc) - last_trade).total_seconds() / 3600.0
+                ttl = max(ttl or 0.0, idle_hours / 2.0)
+            except (ValueError, TypeError):
+                pass
+        if ttl is None:
+            return float(cls.ANALYSIS_TTL_DEFAULT_HOURS)
+        return min(max(ttl, cls.ANALYSIS_TTL_MIN_HOURS), cls.ANALYSIS_TTL_MAX_HOURS)
+    
     def cache_analysis_result(self, address: str, traded_total: int, win_rate: float,
                              realized_pnl_total: float, daily_frequency: float,
-                             analysis_result: str, ttl_hours: int = 24,
+                             analysis_result: str, ttl_hours: Optional[float] = None,
                              last_trade_at: Optional[str] = None, source: Optional[str] = None,
                              is_insider_candidate: Optional[bool] = None,
                              insider_detection_reason: Optional[str] = None,
                              total_markets_traded: Optional[int] = None) -> bool:
-        """Cache analysis result for wallet"""
+        """Cache analysis result for wallet (ttl_hours defaults to analysis_ttl_hours)"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            if ttl_hours is None:
+                ttl_hours = self.analysis_ttl_hours(daily_frequency, last_trade_at, analysis_result)
+            def write(cursor):
                 now = datetime.now(timezone.utc)
                 expires_at = now + timedelta(hours=ttl_hours)
                 
@@ -1413,50 +1747,306 @@ class PolymarketDB:
                     """
                 
                 cursor.execute(query, tuple(insert_values))
-                
-                conn.commit()
                 return True
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error caching analysis result for {address}: {e}")
             return False
     
+    def invalidate_analysis(self, addresses, reason: str) -> int:
+        """Expire cached analyses whose inputs changed and re-queue those wallets.
+
+        Called by the monitor when a wallet closes positions or a market it
+        holds resolves. Results younger than ANALYSIS_INVALIDATE_MIN_AGE_HOURS
+        are left alone so a busy wallet is not re-analyzed on every sweep.
+        Returns the number of wallets re-queued.
+        """
+        addresses = sorted({address.lower() for address in addresses if address})
+        if not addresses:
+            return 0
+        try:
+            now = self.now_iso()
+            min_age = (datetime.now(timezone.utc) - timedelta(hours=self.ANALYSIS_INVALIDATE_MIN_AGE_HOURS)).isoformat()
+            def write(cursor):
+                expired = []
+                # Chunked to stay under SQLite's bound-parameter limit
+                for start in range(0, len(addresses), 500):
+                    chunk = addresses[start:start + 500]
+                    cursor.execute(f"""
+                        UPDATE wallet_analysis_cache SET expires_at = ?
+                        WHERE address IN ({','.join('?' * len(chunk))}) AND expires_at > ? AND analyzed_at <= ?
+                        RETURNING address
+                    """, (now, *chunk, now, min_age))
+                    expired.extend(row[0] for row in cursor.fetchall())
+                return expired
+            expired = self._write(write)
+        except Exception as e:
+            logger.error(f"Error invalidating cached analyses ({reason}): {e}")
+            return 0
+        
+        # Only wallets whose result was actually expired; younger results keep their job closed
+        requeued = self.add_wallets_to_queue({address: {"source": reason} for address in expired})
+        if expired:
+            logger.info(f"[CACHE] Invalidated {len(expired)} cached analyses, re-queued {requeued} wallets ({reason})")
+        return requeued
+    
     def cleanup_expired_cache(self) -> int:
         """Remove expired cache entries"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 now = self.now_iso()
                 
                 cursor.execute("DELETE FROM wallet_analysis_cache WHERE expires_at <= ?", (now,))
                 removed_count = cursor.rowcount
                 
-                conn.commit()
-                
                 if removed_count > 0:
                     logger.info(f"Cleaned up {removed_count} expired cache entries")
                 
                 return removed_count
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error cleaning up expired cache: {e}")
             return 0
     
     def insert_raw_collected_wallet(self, address: str, source: str) -> None:
         """Insert a raw collected wallet address with its source"""
+        try:
+            self._write(lambda cursor: cursor.execute(
+                """
+                INSERT INTO raw_collected_wallets (address, source, collected_at)
+                VALUES (?, ?, ?)
+                """,
+                (address.lower(), source, self.now_iso())
+            ), wait=False, what=f"inserting raw collected wallet {address} from {source}")
+        except Exception as e:
+            logger.error(f"Failed to insert raw collected wallet {address} from {source}: {e}")
+    
+    # Closed-position ledger operations
+    def get_position_watermark(self, address: str) -> Optional[int]:
+        """Newest closed_ts stored for a wallet, or None if it was never synced"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                now = self.now_iso()
-                
                 cursor.execute(
-                    """
-                    INSERT INTO raw_collected_wallets (address, source, collected_at)
-                    VALUES (?, ?, ?)
-                    """,
-                    (address.lower(), source, now)
+                    "SELECT last_closed_ts FROM wallet_position_watermarks WHERE address = ?",
+                    (address.lower(),)
+                )
+                row = cursor.fetchone()
+                return int(row[0]) if row and row[0] is not None else None
+        except Exception as e:
+            logger.error(f"Error getting position watermark for {address}: {e}")
+            return None
+    
+    def store_closed_positions(self, address: str, positions: List[Dict[str, Any]],
+                               watermark: Optional[int], prune_before_ts: Optional[int] = None) -> bool:
+        """Upsert compact closed positions, advance the watermark and drop rows older than prune_before_ts.
+
+        Each position dict carries position_key, condition_id, closed_ts,
+        realized_pnl, volume, stake, total_bought, avg_price and category.
+        """
+        address = address.lower()
+        try:
+            def write(cursor):
+                if positions:
+                    cursor.executemany("""
+                        INSERT INTO wallet_closed_positions(
+                            address, position_key, condition_id, closed_ts,
+                            realized_pnl, volume, stake, total_bought, avg_price, category
+                        )
+                        VALUES(?,?,?,?,?,?,?,?,?,?)
+                        ON CONFLICT(address, position_key) DO UPDATE SET
+                            closed_ts=excluded.closed_ts,
+                            realized_pnl=excluded.realized_pnl,
+                            volume=excluded.volume,
+                            stake=excluded.stake,
+                            total_bought=excluded.total_bought,
+                            avg_price=excluded.avg_price,
+                            category=COALESCE(excluded.category, wallet_closed_positions.category)
+                    """, [
+                        (address, p['position_key'], p.get('condition_id'), p.get('closed_ts'),
+                         p.get('realized_pnl', 0.0), p.get('volume', 0.0), p.get('stake', 0.0),
+                         p.get('total_bought'), p.get('avg_price'), p.get('category'))
+                        for p in positions
+                    ])
+                if prune_before_ts is not None:
+                    cursor.execute(
+                        "DELETE FROM wallet_closed_positions WHERE address = ? AND closed_ts < ?",
+                        (address, prune_before_ts)
+                    )
+                cursor.execute("""
+                    INSERT INTO wallet_position_watermarks(address, last_closed_ts, updated_at)
+                    VALUES(?,?,?)
+                    ON CONFLICT(address) DO UPDATE SET
+                        last_closed_ts=MAX(COALESCE(wallet_position_watermarks.last_closed_ts, 0),
+                                           COALESCE(excluded.last_closed_ts, 0)),
+                        updated_at=excluded.updated_at
+                """, (address, watermark, self.now_iso()))
+                return True
+            return self._write(write)
+        except Exception as e:
+            logger.error(f"Error storing closed positions for {address}: {e}")
+            return False
+    
+    def set_closed_position_categories(self, address: str, categories: List[Tuple[str, str]]) -> bool:
+        """Store classifier output for ledger rows: categories is [(category, position_key), ...]"""
+        try:
+            def write(cursor):
+                cursor.executemany(
+                    "UPDATE wallet_closed_positions SET category = ? WHERE address = ? AND position_key = ?",
+                    [(category, address.lower(), key) for category, key in categories]
                 )
+                return True
+            return self._write(write)
+        except Exception as e:
+            logger.error(f"Error storing position categories for {address}: {e}")
+            return False
+    
+    def get_closed_positions_window(self, address: str, since_ts: int, limit: int) -> List[Dict[str, Any]]:
+        """Most recent stored closed positions at or after since_ts (undated rows last)"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT position_key, condition_id, closed_ts, realized_pnl, volume, stake, category
+                    FROM wallet_closed_positions
+                    WHERE address = ? AND (closed_ts >= ? OR closed_ts IS NULL)
+                    ORDER BY closed_ts IS NULL, closed_ts DESC
+                    LIMIT ?
+                """, (address.lower(), since_ts, limit))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error reading closed positions for {address}: {e}")
+            return []
+    
+    # Per-wallet analysis window over the closed-position store: the newest
+    # max_positions rows closed at or after since_ts (undated rows last)
+    _POSITION_WINDOW_CTE = """
+        WITH position_window AS (
+            SELECT * FROM (
+                SELECT address, condition_id, realized_pnl, volume, stake, category,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY address ORDER BY closed_ts IS NULL, closed_ts DESC
+                       ) AS rn
+                FROM wallet_closed_positions
+                WHERE closed_ts >= ? OR closed_ts IS NULL
+            )
+            WHERE rn <= ?
+        )
+    """
+    
+    def get_position_store_addresses(self) -> set:
+        """Addresses whose closed positions have been synced into the local store"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT address FROM wallet_position_watermarks")
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error reading position store addresses: {e}")
+            return set()
+    
+    def recompute_category_stats_from_positions(self, since_ts: int, max_positions: int,
+                                                a_list_min_winrate: float, a_list_min_markets: int) -> int:
+        """Rebuild wallet_category_stats for every stored wallet in one set-based pass (no network).
+
+        Rows for a stored wallet are replaced so categories that dropped out of
+        its window disappear. Returns the number of category rows written.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                now = self.now_iso()
+                cursor.execute("""
+                    DELETE FROM wallet_category_stats
+                    WHERE wallet_address IN (SELECT address FROM wallet_position_watermarks)
+                """)
+                cursor.execute(self._POSITION_WINDOW_CTE + """
+                    INSERT INTO wallet_category_stats(
+                        wallet_address, category, markets, volume, pnl, winrate, roi,
+                        avg_pnl, is_a_list_trader, updated_at
+                    )
+                    SELECT address, category, markets, volume, pnl,
+                           CAST(win_markets AS REAL) / markets,
+                           CASE WHEN volume > 0 THEN pnl / volume ELSE 0.0 END,
+                           pnl / markets,
+                           CASE WHEN CAST(win_markets AS REAL) / markets >= ? AND markets > ? THEN 1 ELSE 0 END,
+                           ?
+                    FROM (
+                        SELECT address, category,
+                               COUNT(*) AS markets,
+                               COALESCE(SUM(volume), 0.0) AS volume,
+                               COALESCE(SUM(realized_pnl), 0.0) AS pnl,
+                               SUM(realized_pnl > 0) AS win_markets
+                        FROM position_window
+                        WHERE condition_id IS NOT NULL AND category IS NOT NULL
+                        GROUP BY address, category
+                    )
+                """, (since_ts, max_positions, a_list_min_winrate, a_list_min_markets, now))
+                cursor.execute("SELECT changes()")
+                written = cursor.fetchone()[0]
                 conn.commit()
+                return written
         except Exception as e:
-            logger.error(f"Failed to insert raw collected wallet {address} from {source}: {e}")
+            logger.error(f"Error recomputing category stats from position store: {e}", exc_info=True)
+            return 0
+    
+    def get_position_window_metrics(self, since_ts: int, max_positions: int) -> List[Dict[str, Any]]:
+        """Per-wallet aggregates over the stored analysis window, joined with wallets.traded_total"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(self._POSITION_WINDOW_CTE + """
+                    SELECT pw.address,
+                           COUNT(*) AS positions,
+                           SUM(pw.realized_pnl > 0) AS wins,
+                           COALESCE(SUM(pw.realized_pnl), 0.0) AS pnl_total,
+                           COALESCE(SUM(pw.volume), 0.0) AS total_volume,
+                           COALESCE(MAX(pw.stake), 0.0) AS max_stake,
+                           COUNT(DISTINCT pw.condition_id) AS markets_traded,
+                           w.traded_total AS traded_total
+                    FROM position_window pw
+                    LEFT JOIN wallets w ON w.address = pw.address
+                    GROUP BY pw.address
+                """, (since_ts, max_positions))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error reading position window metrics: {e}", exc_info=True)
+            return []
+    
+    def update_wallet_metrics_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """Write recomputed quality metrics and insider flags for existing wallets in one executemany"""
+        if not rows:
+            return 0
+        try:
+            def write(cursor):
+                now = self.now_iso()
+                cursor.executemany("""
+                    UPDATE wallets SET
+                        win_rate = ?,
+                        realized_pnl_total = ?,
+                        total_markets_traded = ?,
+                        total_volume = ?,
+                        roi = ?,
+                        avg_pnl_per_market = ?,
+                        avg_stake = ?,
+                        is_insider_candidate = ?,
+                        insider_detection_reason = ?,
+                        insider_detected_at = CASE WHEN ? THEN COALESCE(insider_detected_at, ?) ELSE NULL END,
+                        updated_at = ?
+                    WHERE address = ?
+                """, [
+                    (r['win_rate'], r['pnl_total'], r['total_markets_traded'], r['total_volume'],
+                     r['roi'], r['avg_pnl_per_market'], r['avg_stake'],
+                     1 if r['is_insider_candidate'] else 0, r['insider_detection_reason'],
+                     1 if r['is_insider_candidate'] else 0, now, now, r['address'])
+                    for r in rows
+                ])
+                updated = cursor.rowcount
+                return updated
+            return self._write(write)
+        except Exception as e:
+            logger.error(f"Error updating wallet metrics batch: {e}", exc_info=True)
+            return 0
     
     # Wallet category statistics operations
     def upsert_wallet_category_stats(self, wallet_address: str, category: str, markets: int,
@@ -1464,8 +2054,7 @@ class PolymarketDB:
                                      avg_pnl: float, is_a_list_trader: bool) -> bool:
         """Insert or update wallet category statistics"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 now = self.now_iso()
                 
                 cursor.execute("""
@@ -1485,13 +2074,94 @@ class PolymarketDB:
                         updated_at=excluded.updated_at
                 """, (wallet_address.lower(), category, markets, volume, pnl, winrate, roi,
                      avg_pnl, 1 if is_a_list_trader else 0, now))
-                
-                conn.commit()
                 return True
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error upserting wallet category stats for {wallet_address}/{category}: {e}")
             return False
     
+    def upsert_wallet_category_stats_batch(self, wallet_address: str, rows: List[Dict[str, Any]]) -> bool:
+        """Insert or update all category rows for a wallet in one executemany.
+
+        Each row carries category, markets, volume, pnl, winrate, roi, avg_pnl
+        and is_a_list_trader (same fields as upsert_wallet_category_stats).
+        """
+        if not rows:
+            return True
+        try:
+            def write(cursor):
+                now = self.now_iso()
+                address = wallet_address.lower()
+                cursor.executemany("""
+                    INSERT INTO wallet_category_stats(
+                        wallet_address, category, markets, volume, pnl, winrate, roi,
+                        avg_pnl, is_a_list_trader, updated_at
+                    )
+                    VALUES(?,?,?,?,?,?,?,?,?,?)
+                    ON CONFLICT(wallet_address, category) DO UPDATE SET
+                        markets=excluded.markets,
+                        volume=excluded.volume,
+                        pnl=excluded.pnl,
+                        winrate=excluded.winrate,
+                        roi=excluded.roi,
+                        avg_pnl=excluded.avg_pnl,
+                        is_a_list_trader=excluded.is_a_list_trader,
+                        updated_at=excluded.updated_at
+                """, [
+                    (address, r['category'], r['markets'], r['volume'], r['pnl'], r['winrate'],
+                     r['roi'], r['avg_pnl'], 1 if r['is_a_list_trader'] else 0, now)
+                    for r in rows
+                ])
+                return True
+            return self._write(write)
+        except Exception as e:
+            logger.error(f"Error upserting wallet category stats for {wallet_address}: {e}")
+            return False
+    
+    # Market category cache operations
+    def get_condition_categories(self, condition_ids: List[str]) -> Dict[str, str]:
+        """Cached categories for the given condition ids (keys as passed in; misses are absent)"""
+        if not condition_ids:
+            return {}
+        by_lower = {cid.lower(): cid for cid in condition_ids}
+        found: Dict[str, str] = {}
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                keys = list(by_lower)
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor.execute(
+                        f"SELECT condition_id, category FROM condition_categories WHERE condition_id IN ({placeholders})",
+                        chunk
+                    )
+                    for condition_id, category in cursor.fetchall():
+                        found[by_lower[condition_id]] = category
+        except Exception as e:
+            logger.error(f"Error reading condition categories: {e}")
+        return found
+    
+    def save_condition_categories(self, categories: List[Tuple[str, str]]) -> bool:
+        """Store (condition_id, category) pairs in the shared category cache"""
+        if not categories:
+            return True
+        try:
+            def write(cursor):
+                now = self.now_iso()
+                cursor.executemany("""
+                    INSERT INTO condition_categories(condition_id, category, updated_at)
+                    VALUES(?,?,?)
+                    ON CONFLICT(condition_id) DO UPDATE SET
+                        category=excluded.category,
+                        updated_at=excluded.updated_at
+                """, [(cid.lower(), category, now) for cid, category in categories])
+                return True
+            return self._write(write)
+        except Exception as e:
+            logger.error(f"Error saving condition categories: {e}")
+            return False
+    
     def get_wallet_category_stats(self, wallet_address: str, category: str) -> Optional[Dict[str, Any]]:
         """Get category statistics for a wallet"""
         try:
@@ -1588,8 +2258,7 @@ class PolymarketDB:
     def mark_wallet_as_insider_candidate(self, address: str, reason: str, total_markets_traded: Optional[int] = None) -> bool:
         """Mark wallet as insider candidate with reason"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 now = self.now_iso()
                 
                 update_fields = [
@@ -1614,8 +2283,8 @@ class PolymarketDB:
                 """
                 
                 cursor.execute(query, tuple(values))
-                conn.commit()
                 return cursor.rowcount > 0
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error marking wallet as insider candidate {address}: {e}")
             return False
@@ -1650,8 +2319,7 @@ class PolymarketDB:
     def clear_insider_flag(self, address: str) -> bool:
         """Clear insider flag for a wallet"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 now = self.now_iso()
                 
                 cursor.execute("""
@@ -1662,51 +2330,103 @@ class PolymarketDB:
                         updated_at = ?
                     WHERE address = ?
                 """, (now, address.lower()))
-                
-                conn.commit()
                 return cursor.rowcount > 0
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error clearing insider flag for {address}: {e}")
             return False
     
     # Open Interest operations
     def insert_open_interest(self, condition_id: str, open_interest: float, timestamp: str) -> bool:
-        """Insert open interest data point"""
+        """Insert open interest data point
+        
+        The raw sample goes to today's OPEN_INTEREST_RAW partition and is folded
+        into open_interest_hourly in the same write.
+        """
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                now = self.now_iso()
-                
+            now_ts = time.time()
+            sample_ts = epoch_seconds(timestamp)
+            sample_ts = int(sample_ts if sample_ts is not None else now_ts)
+            
+            def write(cursor):
+                table = OPEN_INTEREST_RAW.ensure(cursor, now_ts)
+                cursor.execute(f"""
+                    INSERT INTO {table}(condition_id, open_interest, timestamp, timestamp_ts, created_at)
+                    VALUES(?, ?, ?, ?, ?)
+                """, (condition_id, open_interest, timestamp, sample_ts, self.now_iso()))
+                if open_interest is None:
+                    return
                 cursor.execute("""
-                    INSERT INTO open_interest_history(condition_id, open_interest, timestamp, created_at)
-                    VALUES(?, ?, ?, ?)
-                """, (condition_id, open_interest, timestamp, now))
-                
-                conn.commit()
-                return True
+                    INSERT INTO open_interest_hourly(
+                        condition_id, hour_ts, open_oi, close_oi, min_oi, max_oi, samples, first_ts, last_ts
+                    )
+                    VALUES(?, ?, ?, ?, ?, ?, 1, ?, ?)
+                    ON CONFLICT(condition_id, hour_ts) DO UPDATE SET
+                        open_oi = CASE WHEN excluded.first_ts < first_ts THEN excluded.open_oi ELSE open_oi END,
+                        close_oi = CASE WHEN excluded.last_ts >= last_ts THEN excluded.close_oi ELSE close_oi END,
+                        min_oi = MIN(min_oi, excluded.min_oi),
+                        max_oi = MAX(max_oi, excluded.max_oi),
+                        samples = samples + 1,
+                        first_ts = MIN(first_ts, excluded.first_ts),
+                        last_ts = MAX(last_ts, excluded.last_ts)
+                """, (condition_id, sample_ts // 3600 * 3600, open_interest, open_interest,
+                      open_interest, open_interest, sample_ts, sample_ts))
+            self._write(write)
+            return True
         except Exception as e:
             logger.error(f"Error inserting open interest for {condition_id}: {e}")
             return False
     
+    def _select_open_interest(self, cursor: sqlite3.Cursor, condition_id: str, since_ts: Optional[int] = None,
+                              limit: Optional[int] = None) -> List[sqlite3.Row]:
+        """Raw samples for a market across the partitions that can hold them, newest first"""
+        tables = OPEN_INTEREST_RAW.tables(cursor, start_ts=since_ts)
+        if not tables:
+            return []
+        where = "condition_id = ?" + (" AND timestamp_ts >= ?" if since_ts is not None else "")
+        params: List[Any] = []
+        for _ in tables:
+            params.append(condition_id)
+            if since_ts is not None:
+                params.append(since_ts)
+        query = " UNION ALL ".join(
+            f"SELECT condition_id, open_interest, timestamp, timestamp_ts, created_at FROM {table} WHERE {where}"
+            for table in tables
+        ) + " ORDER BY timestamp_ts DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        cursor.execute(query, tuple(params))
+        return cursor.fetchall()
+    
     def get_recent_open_interest(self, condition_id: str, minutes: int = 5) -> List[Dict[str, Any]]:
-        """Get open interest history for last N minutes"""
+        """Get open interest history for last N minutes (raw samples; see get_open_interest_hourly)"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cutoff_time = (datetime.now(timezone.utc) - timedelta(minutes=minutes)).isoformat()
-                
-                cursor.execute("""
-                    SELECT * FROM open_interest_history
-                    WHERE condition_id = ? AND timestamp >= ?
-                    ORDER BY timestamp DESC
-                """, (condition_id, cutoff_time))
-                
-                rows = cursor.fetchall()
+                cutoff_ts = int(time.time()) - minutes * 60
+                rows = self._select_open_interest(cursor, condition_id, since_ts=cutoff_ts)
                 return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting recent open interest for {condition_id}: {e}")
             return []
     
+    def get_open_interest_hourly(self, condition_id: str, hours: int = 24) -> List[Dict[str, Any]]:
+        """Hourly open/close/min/max open interest for the last N hours, newest first"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cutoff_ts = (int(time.time()) - hours * 3600) // 3600 * 3600
+                cursor.execute("""
+                    SELECT * FROM open_interest_hourly
+                    WHERE condition_id = ? AND hour_ts >= ?
+                    ORDER BY hour_ts DESC
+                """, (condition_id, cutoff_ts))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error getting hourly open interest for {condition_id}: {e}")
+            return []
+    
     def calculate_oi_spike(self, condition_id: str, threshold_percent: float = 20.0, max_minutes: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """Calculate if open interest spiked above threshold within a time window
         
@@ -1723,48 +2443,25 @@ class PolymarketDB:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Get the two most recent OI data points
-                cursor.execute("""
-                    SELECT open_interest, timestamp
-                    FROM open_interest_history
-                    WHERE condition_id = ?
-                    ORDER BY timestamp DESC
-                    LIMIT 2
-                """, (condition_id,))
-                
-                rows = cursor.fetchall()
+                # Get the two most recent OI data points (raw partitions only hold recent days)
+                rows = self._select_open_interest(cursor, condition_id, limit=2)
                 if len(rows) < 2:
                     return None  # Need at least 2 data points to calculate spike
                 
                 new_oi = rows[0]['open_interest']
                 old_oi = rows[1]['open_interest']
-                new_timestamp_str = rows[0]['timestamp']
-                old_timestamp_str = rows[1]['timestamp']
+                new_ts = rows[0]['timestamp_ts']
+                old_ts = rows[1]['timestamp_ts']
                 
                 if old_oi is None or old_oi == 0 or new_oi is None:
                     return None
                 
                 # Enforce time window if max_minutes is specified
                 if max_minutes is not None:
-                    try:
-                        # Parse timestamps (assuming ISO format)
-                        new_timestamp = datetime.fromisoformat(new_timestamp_str.replace('Z', '+00:00'))
-                        old_timestamp = datetime.fromisoformat(old_timestamp_str.replace('Z', '+00:00'))
-                        
-                        # Ensure both timestamps are timezone-aware
-                        if new_timestamp.tzinfo is None:
-                            new_timestamp = new_timestamp.replace(tzinfo=timezone.utc)
-                        if old_timestamp.tzinfo is None:
-                            old_timestamp = old_timestamp.replace(tzinfo=timezone.utc)
-                        
-                        time_diff = (new_timestamp - old_timestamp).total_seconds() / 60.0  # Convert to minutes
-                        
-                        if time_diff > max_minutes:
-                            logger.debug(f"OI spike check skipped: time difference {time_diff:.1f} min exceeds max window {max_minutes} min for {condition_id[:20]}...")
-                            return None
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"Could not parse timestamps for OI spike check: {e}")
-                        # Continue without time constraint if parsing fails
+                    time_diff = (new_ts - old_ts) / 60.0  # Convert to minutes
+                    if time_diff > max_minutes:
+                        logger.debug(f"OI spike check skipped: time difference {time_diff:.1f} min exceeds max window {max_minutes} min for {condition_id[:20]}...")
+                        return None
                 
                 spike_percent = ((new_oi - old_oi) / old_oi) * 100.0
                 
@@ -1782,56 +2479,97 @@ class PolymarketDB:
             return None
     
     def cleanup_old_oi_data(self, days_to_keep: int = 7) -> int:
-        """Clean up old open interest history data"""
+        """Drop raw open interest partitions older than days_to_keep; returns partitions dropped"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days_to_keep)).isoformat()
-                
-                cursor.execute("DELETE FROM open_interest_history WHERE created_at < ?", (cutoff_date,))
-                removed_count = cursor.rowcount
+            def write(cursor):
+                cutoff_ts = int(time.time()) - days_to_keep * 86400
                 
-                conn.commit()
+                removed_count = OPEN_INTEREST_RAW.drop_before(cursor, cutoff_ts)
                 
                 if removed_count > 0:
-                    logger.info(f"Cleaned up {removed_count} old OI data points")
+                    logger.info(f"Dropped {removed_count} old OI partitions")
                 
                 return removed_count
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error cleaning up old OI data: {e}")
             return 0
     
+    def prune_time_series(self) -> Dict[str, int]:
+        """Apply retention to the time-series tables (run periodically by the monitor)
+        
+        Raw open interest keeps OI_RAW_RETENTION_DAYS of whole daily partitions
+        and the hourly rollup OI_HOURLY_RETENTION_DAYS. Order flow metrics and
+        whale positions older than EVENT_RETENTION_DAYS are deleted, except each
+        wallet's latest position per market, which get_last_whale_position
+        compares against.
+        """
+        removed = {'oi_partitions': self.cleanup_old_oi_data(self.OI_RAW_RETENTION_DAYS)}
+        try:
+            now_ts = int(time.time())
+            def write(cursor):
+                counts = {}
+                cursor.execute("DELETE FROM open_interest_hourly WHERE hour_ts < ?",
+                               (now_ts - self.OI_HOURLY_RETENTION_DAYS * 86400,))
+                counts['oi_hourly'] = cursor.rowcount
+                
+                event_cutoff = datetime.fromtimestamp(now_ts - self.EVENT_RETENTION_DAYS * 86400, tz=timezone.utc).isoformat()
+                cursor.execute("DELETE FROM order_flow_metrics WHERE detected_at < ?", (event_cutoff,))
+                counts['order_flow'] = cursor.rowcount
+                cursor.execute("""
+                    DELETE FROM whale_positions
+                    WHERE detected_at < ?
+                    AND id NOT IN (SELECT MAX(id) FROM whale_positions GROUP BY wallet_id, condition_id)
+                """, (event_cutoff,))
+                counts['whale_positions'] = cursor.rowcount
+                return counts
+            removed.update(self._write(write))
+            if any(removed.values()):
+                logger.info(f"[DB] Time-series retention: {removed}")
+            return removed
+        except Exception as e:
+            logger.error(f"Error pruning time series: {e}")
+            return removed
+    
     # Whale position operations
     def insert_whale_position(self, user_address: str, condition_id: str, outcome_index: int,
                             position_size_usd: float, position_type: str) -> bool:
         """Insert whale position change"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            blob = address_bytes(user_address)
+            if blob is None:
+                logger.warning(f"Skipping whale position for non-hex address {user_address}")
+                return False
+            
+            def write(cursor):
                 now = self.now_iso()
                 
+                # A new wallet gets its wallet_ids row in the same commit
+                cursor.execute("INSERT OR IGNORE INTO wallet_ids(address) VALUES(?)", (blob,))
                 cursor.execute("""
-                    INSERT INTO whale_positions(user_address, condition_id, outcome_index, 
+                    INSERT INTO whale_positions(wallet_id, condition_id, outcome_index, 
                                               position_size_usd, position_type, detected_at, alerted)
-                    VALUES(?, ?, ?, ?, ?, ?, 0)
-                """, (user_address.lower(), condition_id, outcome_index, position_size_usd, position_type, now))
-                
-                conn.commit()
-                return True
+                    SELECT id, ?, ?, ?, ?, ?, 0 FROM wallet_ids WHERE address = ?
+                """, (condition_id, outcome_index, position_size_usd, position_type, now, blob))
+            self._write(write, wait=False, what=f"inserting whale position for {user_address}")
+            return True
         except Exception as e:
             logger.error(f"Error inserting whale position for {user_address}: {e}")
             return False
     
     def get_pending_whale_alerts(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get whale positions that haven't been alerted yet"""
+        # Whale positions are written behind; make this loop's inserts visible
+        self.flush_writes()
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute("""
-                    SELECT * FROM whale_positions
-                    WHERE alerted = 0
-                    ORDER BY detected_at DESC
+                cursor.execute(f"""
+                    SELECT {self.WHALE_POSITION_COLUMNS}
+                    FROM whale_positions p JOIN wallet_ids w ON w.id = p.wallet_id
+                    WHERE p.alerted = 0
+                    ORDER BY p.detected_at DESC
                     LIMIT ?
                 """, (limit,))
                 
@@ -1844,17 +2582,14 @@ class PolymarketDB:
     def mark_whale_position_alerted(self, id: int) -> bool:
         """Mark whale position as alerted"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
+            def write(cursor):
                 cursor.execute("""
                     UPDATE whale_positions
                     SET alerted = 1
                     WHERE id = ?
                 """, (id,))
-                
-                conn.commit()
                 return cursor.rowcount > 0
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error marking whale position as alerted {id}: {e}")
             return False
@@ -1865,12 +2600,16 @@ class PolymarketDB:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute("""
-                    SELECT * FROM whale_positions
-                    WHERE user_address = ? AND condition_id = ?
-                    ORDER BY detected_at DESC
+                wallet_id = self._wallet_ids.lookup(cursor, user_address.lower())
+                if wallet_id is None:
+                    return None
+                cursor.execute(f"""
+                    SELECT {self.WHALE_POSITION_COLUMNS}
+                    FROM whale_positions p JOIN wallet_ids w ON w.id = p.wallet_id
+                    WHERE p.wallet_id = ? AND p.condition_id = ?
+                    ORDER BY p.detected_at DESC
                     LIMIT 1
-                """, (user_address.lower(), condition_id))
+                """, (wallet_id, condition_id))
                 
                 row = cursor.fetchone()
                 return dict(row) if row else None
@@ -1887,14 +2626,14 @@ class PolymarketDB:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cutoff_time = (datetime.now(timezone.utc) - timedelta(minutes=minutes)).isoformat()
+                cutoff_ts = int(time.time()) - minutes * 60
                 
                 cursor.execute("""
                     SELECT DISTINCT json_extract(data, '$.events[0].conditionId') as condition_id
                     FROM rolling_buys
-                    WHERE updated_at >= ?
+                    WHERE updated_ts >= ?
                     AND json_extract(data, '$.events[0].conditionId') IS NOT NULL
-                """, (cutoff_time,))
+                """, (cutoff_ts,))
                 
                 rows = cursor.fetchall()
                 condition_ids = [row[0] for row in rows if row[0]]
@@ -1945,8 +2684,7 @@ class PolymarketDB:
                                  imbalance_direction: str) -> bool:
         """Insert order flow metric record"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 now = self.now_iso()
                 
                 cursor.execute("""
@@ -1961,9 +2699,8 @@ class PolymarketDB:
                     buy_count, sell_count, buy_volume, sell_volume,
                     buy_sell_ratio, 1 if is_imbalanced else 0, imbalance_direction, now
                 ))
-                
-                conn.commit()
                 return True
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error inserting order flow metric for {condition_id}: {e}")
             return False
@@ -2015,17 +2752,14 @@ class PolymarketDB:
     def mark_order_flow_alerted(self, id: int) -> bool:
         """Mark order flow metric as alerted"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
+            def write(cursor):
                 cursor.execute("""
                     UPDATE order_flow_metrics
                     SET alerted = 1
                     WHERE id = ?
                 """, (id,))
-                
-                conn.commit()
                 return cursor.rowcount > 0
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error marking order flow metric as alerted {id}: {e}")
             return False
@@ -2033,19 +2767,17 @@ class PolymarketDB:
     def cleanup_old_order_flow_metrics(self, days_to_keep: int = 7) -> int:
         """Delete order flow metrics older than specified days"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            def write(cursor):
                 cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days_to_keep)).isoformat()
                 
                 cursor.execute("DELETE FROM order_flow_metrics WHERE detected_at < ?", (cutoff_date,))
                 removed_count = cursor.rowcount
                 
-                conn.commit()
-                
                 if removed_count > 0:
                     logger.info(f"Cleaned up {removed_count} old order flow metrics")
                 
                 return removed_count
+            return self._write(write)
         except Exception as e:
             logger.error(f"Error cleaning up old order flow metrics: {e}")
             return 0
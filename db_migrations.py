@@ -0,0 +1,818 @@
+"""
+Versioned schema migrations for PolymarketDB.
+
+Every migration runs once per database file and is recorded in
+schema_version, so opening an up-to-date database is a single SELECT
+instead of re-running every CREATE, ALTER and backfill. Databases created
+before schema_version existed run the baseline, which is safe on any
+earlier layout (CREATE ... IF NOT EXISTS, columns added only when missing).
+
+To change the schema, append a (version, description, function) entry to
+MIGRATIONS. Never edit a migration that has already shipped.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from typing import Callable, List, Tuple
+
+from job_priority import source_priority
+from partitions import DailyPartitions
+from wallet_ids import address_bytes
+
+logger = logging.getLogger(__name__)
+
+# Raw open interest samples, one table per UTC day (see PolymarketDB.insert_open_interest)
+OPEN_INTEREST_RAW = DailyPartitions(
+    "open_interest",
+    """
+        condition_id TEXT NOT NULL,
+        open_interest REAL,
+        timestamp TEXT,
+        timestamp_ts INTEGER,
+        created_at TEXT
+    """,
+    indexes=("condition_id, timestamp_ts",),
+)
+
+
+def _add_columns(cursor: sqlite3.Cursor, table: str, columns) -> None:
+    """Add the (name, declaration) columns that table does not have yet"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cursor.fetchall()}
+    for name, declaration in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+
+
+def _baseline(cursor: sqlite3.Cursor) -> None:
+    """Schema as of the introduction of schema_version"""
+    # Wallets table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS wallets(
+            address TEXT PRIMARY KEY,
+            display TEXT,
+            traded_total INTEGER,
+            win_rate REAL,
+            realized_pnl_total REAL,
+            daily_trading_frequency REAL,
+            source TEXT,
+            added_at TEXT,
+            updated_at TEXT
+        )
+    """)
+
+    # Add insider detection columns if they don't exist
+    _add_columns(cursor, "wallets", (
+        ("total_markets_traded", "INTEGER"),
+        ("is_insider_candidate", "BOOLEAN DEFAULT 0"),
+        ("insider_detection_reason", "TEXT"),
+        ("insider_detected_at", "TEXT"),
+    ))
+
+    # Add quality metrics columns if they don't exist (for strict filtering criteria)
+    _add_columns(cursor, "wallets", (
+        ("total_volume", "REAL"),
+        ("roi", "REAL"),
+        ("avg_pnl_per_market", "REAL"),
+        ("avg_stake", "REAL"),
+    ))
+
+    # Last trades tracking
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS last_trades(
+            address TEXT PRIMARY KEY,
+            last_seen_trade_id TEXT,
+            updated_at TEXT
+        )
+    """)
+
+    # Alerts sent (for deduplication)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS alerts_sent(
+            alert_key TEXT PRIMARY KEY,
+            sent_at TEXT,
+            condition_id TEXT,
+            outcome_index INTEGER,
+            wallet_count INTEGER,
+            side TEXT,
+            price REAL,
+            wallets_csv TEXT
+        )
+    """)
+
+    # Add new columns if they don't exist (for existing databases)
+    _add_columns(cursor, "alerts_sent", (
+        ("condition_id", "TEXT"),
+        ("outcome_index", "INTEGER"),
+        ("wallet_count", "INTEGER"),
+        ("side", "TEXT"),
+        ("price", "REAL"),
+        ("wallets_csv", "TEXT"),
+        ("wallet_details_json", "TEXT"),
+        ("first_total_usd", "REAL"),
+    ))
+    _add_columns(cursor, "wallets", (
+        ("last_trade_at", "TEXT"),
+        ("source", "TEXT"),  # Ensure source column exists
+    ))
+
+    # Suppressed alert ledger (dedupe for suppressed-alert details, one row per market/outcome/side/reason)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS suppressed_alerts(
+            condition_id TEXT NOT NULL,
+            outcome_index INTEGER NOT NULL,
+            side TEXT NOT NULL,
+            reason TEXT NOT NULL,
+            wallet_count INTEGER DEFAULT 0,
+            sent_ts INTEGER NOT NULL,
+            PRIMARY KEY (condition_id, outcome_index, side, reason)
+        )
+    """)
+
+    # Rolling buys window
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rolling_buys(
+            k TEXT PRIMARY KEY,
+            data TEXT,
+            updated_at TEXT
+        )
+    """)
+
+    # Track first entry per wallet per market direction
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS market_trades(
+            wallet TEXT,
+            condition_id TEXT,
+            side TEXT,
+            first_trade_id TEXT,
+            first_ts REAL,
+            PRIMARY KEY (wallet, condition_id, side)
+        )
+    """)
+
+    # Wallet analysis jobs queue
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS wallet_analysis_jobs(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            address TEXT NOT NULL,
+            display TEXT,
+            source TEXT,
+            status TEXT DEFAULT 'pending',
+            retry_count INTEGER DEFAULT 0,
+            max_retries INTEGER DEFAULT 6,
+            next_retry_at TEXT,
+            created_at TEXT,
+            updated_at TEXT,
+            error_message TEXT,
+            UNIQUE(address)
+        )
+    """)
+
+    # Wallet analysis cache - stores analysis results to avoid re-analyzing
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS wallet_analysis_cache(
+            address TEXT PRIMARY KEY,
+            traded_total INTEGER,
+            win_rate REAL,
+            realized_pnl_total REAL,
+            daily_trading_frequency REAL,
+            analysis_result TEXT,
+            analyzed_at TEXT,
+            expires_at TEXT,
+            last_trade_at TEXT,
+            source TEXT
+        )
+    """)
+
+    # Wallet category statistics - stores per-category metrics for each wallet
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS wallet_category_stats(
+            wallet_address TEXT NOT NULL,
+            category TEXT NOT NULL,
+            markets INTEGER DEFAULT 0,
+            volume REAL DEFAULT 0.0,
+            pnl REAL DEFAULT 0.0,
+            winrate REAL DEFAULT 0.0,
+            roi REAL DEFAULT 0.0,
+            avg_pnl REAL DEFAULT 0.0,
+            is_a_list_trader BOOLEAN DEFAULT 0,
+            updated_at TEXT,
+            PRIMARY KEY (wallet_address, category)
+        )
+    """)
+
+    # Market category cache - classify_market result per condition_id,
+    # shared by every wallet that traded the market
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS condition_categories(
+            condition_id TEXT PRIMARY KEY,
+            category TEXT NOT NULL,
+            updated_at TEXT
+        )
+    """)
+
+    # Closed-position ledger - compact per-wallet copy of recent closed positions
+    # so re-analysis only fetches positions closed since the watermark
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS wallet_closed_positions(
+            address TEXT NOT NULL,
+            position_key TEXT NOT NULL,
+            condition_id TEXT,
+            closed_ts INTEGER,
+            realized_pnl REAL DEFAULT 0.0,
+            volume REAL DEFAULT 0.0,
+            stake REAL DEFAULT 0.0,
+            total_bought REAL,
+            avg_price REAL,
+            category TEXT,
+            PRIMARY KEY (address, position_key)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS wallet_position_watermarks(
+            address TEXT PRIMARY KEY,
+            last_closed_ts INTEGER,
+            updated_at TEXT
+        )
+    """)
+
+    # Raw collected wallets - tracks all wallets collected from different sources
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS raw_collected_wallets(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            address TEXT NOT NULL,
+            source TEXT NOT NULL,
+            collected_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Add new columns if they don't exist (for existing databases)
+    _add_columns(cursor, "wallet_analysis_cache", (
+        ("last_trade_at", "TEXT"),
+        ("source", "TEXT"),
+        ("created_at", "TEXT"),  # For legacy cleanup operations
+        ("is_insider_candidate", "BOOLEAN DEFAULT 0"),
+        ("insider_detection_reason", "TEXT"),
+        ("total_markets_traded", "INTEGER"),
+    ))
+
+    # Raw position size columns for the closed-position store
+    _add_columns(cursor, "wallet_closed_positions", (
+        ("total_bought", "REAL"),
+        ("avg_price", "REAL"),
+    ))
+
+    # Job lease columns (claim_jobs)
+    _add_columns(cursor, "wallet_analysis_jobs", (
+        ("leased_by", "TEXT"),
+        ("lease_expires_at", "TEXT"),
+    ))
+
+    # Job priority (claim_jobs drains highest first); jobs queued before the
+    # column existed get their source score
+    _add_columns(cursor, "wallet_analysis_jobs", (
+        ("priority", "REAL"),
+    ))
+    cursor.execute("SELECT id, source FROM wallet_analysis_jobs WHERE priority IS NULL")
+    unscored = cursor.fetchall()
+    if unscored:
+        cursor.executemany(
+            "UPDATE wallet_analysis_jobs SET priority = ? WHERE id = ?",
+            [(source_priority(source), job_id) for job_id, source in unscored]
+        )
+
+    # Backfill created_at for existing records (use analyzed_at if created_at is NULL)
+    cursor.execute("""
+        UPDATE wallet_analysis_cache
+        SET created_at = analyzed_at
+        WHERE created_at IS NULL AND analyzed_at IS NOT NULL
+    """)
+
+    # Create indexes for better performance
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_traded ON wallets(traded_total)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_winrate ON wallets(win_rate)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_pnl ON wallets(realized_pnl_total)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_condition ON alerts_sent(condition_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_sent_at ON alerts_sent(sent_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_suppressed_sent_ts ON suppressed_alerts(sent_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_market_trades_condition ON market_trades(condition_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON wallet_analysis_jobs(status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_next_retry ON wallet_analysis_jobs(next_retry_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_address ON wallet_analysis_jobs(address)")
+    cursor.execute("DROP INDEX IF EXISTS idx_jobs_claim")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_priority ON wallet_analysis_jobs(status, priority DESC, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_address ON wallet_analysis_cache(address)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON wallet_analysis_cache(expires_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_raw_collected_address ON raw_collected_wallets(address)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_raw_collected_source ON raw_collected_wallets(source)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_raw_collected_at ON raw_collected_wallets(collected_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_wallet ON wallet_category_stats(wallet_address)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_closed_positions_ts ON wallet_closed_positions(address, closed_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_closed_positions_condition ON wallet_closed_positions(condition_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_category ON wallet_category_stats(category)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_a_list ON wallet_category_stats(is_a_list_trader)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_insider ON wallets(is_insider_candidate, insider_detected_at)")
+
+    # Open interest history table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS open_interest_history(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            condition_id TEXT NOT NULL,
+            open_interest REAL,
+            timestamp TEXT,
+            created_at TEXT
+        )
+    """)
+
+    # Whale positions table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS whale_positions(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_address TEXT NOT NULL,
+            condition_id TEXT NOT NULL,
+            outcome_index INTEGER,
+            position_size_usd REAL,
+            position_type TEXT,
+            detected_at TEXT,
+            alerted BOOLEAN DEFAULT 0
+        )
+    """)
+
+    # Create indexes for open interest history
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_oi_condition_timestamp ON open_interest_history(condition_id, timestamp)")
+
+    # Create indexes for whale positions
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_whale_user_condition ON whale_positions(user_address, condition_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_whale_alerted_detected ON whale_positions(alerted, detected_at)")
+
+    # Order flow metrics table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS order_flow_metrics(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            condition_id TEXT NOT NULL,
+            outcome_index INTEGER,
+            window_start TEXT,
+            window_end TEXT,
+            buy_count INTEGER DEFAULT 0,
+            sell_count INTEGER DEFAULT 0,
+            buy_volume REAL DEFAULT 0.0,
+            sell_volume REAL DEFAULT 0.0,
+            buy_sell_ratio REAL,
+            is_imbalanced BOOLEAN DEFAULT 0,
+            imbalance_direction TEXT,
+            detected_at TEXT,
+            alerted BOOLEAN DEFAULT 0
+        )
+    """)
+
+    # Create indexes for order flow metrics
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_flow_condition_window ON order_flow_metrics(condition_id, window_end)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_flow_alerted_detected ON order_flow_metrics(alerted, detected_at)")
+
+
+def _epoch(column: str) -> str:
+    """Integer epoch seconds of an ISO-8601 TEXT column (NULL if unparseable)"""
+    return f"INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', {column}) AS INTEGER)) VIRTUAL"
+
+
+def _epoch_columns(cursor: sqlite3.Cursor) -> None:
+    """INTEGER epoch twins of the ISO timestamps used in range filters.
+
+    The *_ts columns are virtual generated columns: SQLite derives them from
+    the TEXT column on every write, whoever the writer is, and their indexes
+    turn cooldown checks, retention deletes and report windows into integer
+    range scans (string comparison also mis-ordered mixed +00:00/naive values).
+    """
+    _add_columns(cursor, "alerts_sent", (
+        ("sent_ts", _epoch("sent_at")),
+    ))
+    _add_columns(cursor, "rolling_buys", (
+        ("updated_ts", _epoch("updated_at")),
+    ))
+    _add_columns(cursor, "wallets", (
+        ("last_trade_ts", _epoch("last_trade_at")),
+        ("added_ts", _epoch("added_at")),
+        ("updated_ts", _epoch("updated_at")),
+    ))
+    _add_columns(cursor, "wallet_analysis_jobs", (
+        ("next_retry_ts", _epoch("next_retry_at")),
+        ("updated_ts", _epoch("updated_at")),
+    ))
+    _add_columns(cursor, "open_interest_history", (
+        ("timestamp_ts", _epoch("timestamp")),
+        ("created_ts", _epoch("created_at")),
+    ))
+
+    cursor.execute("DROP INDEX IF EXISTS idx_alerts_sent_at")
+    cursor.execute("DROP INDEX IF EXISTS idx_jobs_next_retry")
+    cursor.execute("DROP INDEX IF EXISTS idx_oi_condition_timestamp")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_sent_ts ON alerts_sent(sent_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_market_side_ts ON alerts_sent(condition_id, outcome_index, side, sent_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rolling_buys_updated_ts ON rolling_buys(updated_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_last_trade_ts ON wallets(last_trade_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_added_ts ON wallets(added_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_wallets_updated_ts ON wallets(updated_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_next_retry_ts ON wallet_analysis_jobs(status, next_retry_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_updated_ts ON wallet_analysis_jobs(status, updated_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_oi_condition_ts ON open_interest_history(condition_id, timestamp_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_oi_created_ts ON open_interest_history(created_ts)")
+
+
+# wallets columns read by get_tracked_wallets (filters and ORDER BY)
+TRACKED_WALLET_COLUMNS = (
+    "traded_total", "win_rate", "realized_pnl_total", "daily_trading_frequency",
+    "last_trade_at", "total_markets_traded", "total_volume", "roi",
+    "avg_pnl_per_market", "avg_stake",
+)
+
+
+def _tracked_wallets(cursor: sqlite3.Cursor) -> None:
+    """Change counter and covering index for the tracked-wallet set.
+
+    Triggers bump table_generations['wallets'] whenever a wallet is added or
+    removed, or one of TRACKED_WALLET_COLUMNS actually changes value, so
+    PolymarketDB can reuse get_tracked_wallets results until the wallet
+    universe changes, whichever process wrote it. The index is ordered like
+    the query and carries every filter column, so the query walks it from the
+    top and stops at LIMIT without touching the table.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS table_generations(
+            name TEXT PRIMARY KEY,
+            generation INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO table_generations(name, generation) VALUES('wallets', 0)")
+
+    bump = "UPDATE table_generations SET generation = generation + 1 WHERE name = 'wallets';"
+    changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in TRACKED_WALLET_COLUMNS)
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_wallets_generation_insert AFTER INSERT ON wallets BEGIN {bump} END")
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_wallets_generation_delete AFTER DELETE ON wallets BEGIN {bump} END")
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_wallets_generation_update
+        AFTER UPDATE OF {", ".join(TRACKED_WALLET_COLUMNS)} ON wallets
+        WHEN {changed}
+        BEGIN {bump} END
+    """)
+
+    cursor.execute("DROP INDEX IF EXISTS idx_wallets_pnl")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_wallets_tracked ON wallets(
+            realized_pnl_total DESC, traded_total DESC, win_rate, daily_trading_frequency,
+            last_trade_ts, total_markets_traded, total_volume, roi, avg_pnl_per_market,
+            avg_stake, address
+        )
+    """)
+
+
+def _bump(table: str, key_sql: str, delta_sql: str, where: str = "1") -> str:
+    """Trigger statement adding delta_sql to the counter named key_sql (skipped unless where holds)"""
+    key_columns = "day, name" if table == "stat_daily" else "name"
+    return f"""
+        INSERT INTO {table}({key_columns}, value) SELECT {key_sql}, {delta_sql} WHERE {where}
+        ON CONFLICT({key_columns}) DO UPDATE SET value = value + excluded.value;"""
+
+
+def _winrate_bucket(row: str) -> str:
+    return (f"CASE WHEN {row}.win_rate >= 0.8 THEN 'wallets_winrate_high' "
+            f"WHEN {row}.win_rate >= 0.7 THEN 'wallets_winrate_medium' "
+            f"ELSE 'wallets_winrate_low' END")
+
+
+def _stat_counters(cursor: sqlite3.Cursor) -> None:
+    """Trigger-maintained counters for heartbeats and reports.
+
+    stat_counters holds running totals: total wallets, wallets per win-rate
+    bucket, and jobs per status. stat_daily holds per-UTC-day counts:
+    wallets added (overall and per source), jobs completed or failed, and
+    the seconds spent on completed jobs. Triggers keep them current for
+    every writer. The initial values are backfilled from existing rows in
+    the same transaction.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stat_counters(
+            name TEXT PRIMARY KEY,
+            value REAL NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stat_daily(
+            day TEXT NOT NULL,
+            name TEXT NOT NULL,
+            value REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY(day, name)
+        )
+    """)
+
+    # wallets: total, win-rate buckets, daily additions
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_wallets_stats_insert AFTER INSERT ON wallets BEGIN
+            {_bump("stat_counters", "'wallets_total'", "1")}
+            {_bump("stat_counters", _winrate_bucket("NEW"), "1", "NEW.win_rate IS NOT NULL")}
+            {_bump("stat_daily", "date(NEW.added_at), 'wallets_added'", "1", "date(NEW.added_at) IS NOT NULL")}
+            {_bump("stat_daily", "date(NEW.added_at), 'wallets_added:' || COALESCE(NEW.source, '')", "1",
+                   "date(NEW.added_at) IS NOT NULL")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_wallets_stats_delete AFTER DELETE ON wallets BEGIN
+            {_bump("stat_counters", "'wallets_total'", "-1")}
+            {_bump("stat_counters", _winrate_bucket("OLD"), "-1", "OLD.win_rate IS NOT NULL")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_wallets_stats_winrate AFTER UPDATE OF win_rate ON wallets
+        WHEN OLD.win_rate IS NOT NEW.win_rate BEGIN
+            {_bump("stat_counters", _winrate_bucket("OLD"), "-1", "OLD.win_rate IS NOT NULL")}
+            {_bump("stat_counters", _winrate_bucket("NEW"), "1", "NEW.win_rate IS NOT NULL")}
+        END
+    """)
+
+    # wallet_analysis_jobs: per-status totals, daily completions/failures
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_stats_insert AFTER INSERT ON wallet_analysis_jobs BEGIN
+            {_bump("stat_counters", "'jobs_total'", "1")}
+            {_bump("stat_counters", "'jobs:' || COALESCE(NEW.status, '')", "1")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_stats_delete AFTER DELETE ON wallet_analysis_jobs BEGIN
+            {_bump("stat_counters", "'jobs_total'", "-1")}
+            {_bump("stat_counters", "'jobs:' || COALESCE(OLD.status, '')", "-1")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_stats_status AFTER UPDATE OF status ON wallet_analysis_jobs
+        WHEN OLD.status IS NOT NEW.status BEGIN
+            {_bump("stat_counters", "'jobs:' || COALESCE(OLD.status, '')", "-1")}
+            {_bump("stat_counters", "'jobs:' || COALESCE(NEW.status, '')", "1")}
+            {_bump("stat_daily", "date(NEW.updated_at), 'jobs_' || NEW.status", "1",
+                   "NEW.status IN ('completed', 'failed') AND date(NEW.updated_at) IS NOT NULL")}
+            {_bump("stat_daily", "date(NEW.updated_at), 'jobs_completed_seconds'",
+                   "(julianday(NEW.updated_at) - julianday(NEW.created_at)) * 86400",
+                   "NEW.status = 'completed' AND date(NEW.updated_at) IS NOT NULL "
+                   "AND julianday(NEW.created_at) IS NOT NULL")}
+        END
+    """)
+
+    # Backfill from existing rows
+    cursor.execute("DELETE FROM stat_counters")
+    cursor.execute("DELETE FROM stat_daily")
+    cursor.execute("INSERT INTO stat_counters(name, value) SELECT 'wallets_total', COUNT(*) FROM wallets")
+    cursor.execute(f"""
+        INSERT INTO stat_counters(name, value)
+        SELECT {_winrate_bucket("wallets")}, COUNT(*) FROM wallets
+        WHERE win_rate IS NOT NULL GROUP BY 1
+    """)
+    cursor.execute("INSERT INTO stat_counters(name, value) SELECT 'jobs_total', COUNT(*) FROM wallet_analysis_jobs")
+    cursor.execute("""
+        INSERT INTO stat_counters(name, value)
+        SELECT 'jobs:' || COALESCE(status, ''), COUNT(*) FROM wallet_analysis_jobs GROUP BY 1
+    """)
+    cursor.execute("""
+        INSERT INTO stat_daily(day, name, value)
+        SELECT date(added_at), 'wallets_added', COUNT(*) FROM wallets
+        WHERE date(added_at) IS NOT NULL GROUP BY 1
+    """)
+    cursor.execute("""
+        INSERT INTO stat_daily(day, name, value)
+        SELECT date(added_at), 'wallets_added:' || COALESCE(source, ''), COUNT(*) FROM wallets
+        WHERE date(added_at) IS NOT NULL GROUP BY 1, 2
+    """)
+    cursor.execute("""
+        INSERT INTO stat_daily(day, name, value)
+        SELECT date(updated_at), 'jobs_' || status, COUNT(*) FROM wallet_analysis_jobs
+        WHERE status IN ('completed', 'failed') AND date(updated_at) IS NOT NULL GROUP BY 1, 2
+    """)
+    cursor.execute("""
+        INSERT INTO stat_daily(day, name, value)
+        SELECT date(updated_at), 'jobs_completed_seconds',
+               SUM((julianday(updated_at) - julianday(created_at)) * 86400)
+        FROM wallet_analysis_jobs
+        WHERE status = 'completed' AND date(updated_at) IS NOT NULL AND julianday(created_at) IS NOT NULL
+        GROUP BY 1
+    """)
+
+
+def _time_series(cursor: sqlite3.Cursor) -> None:
+    """Partitioned open interest with an hourly rollup; retention indexes for event tables.
+
+    open_interest_history is split into daily OPEN_INTEREST_RAW partitions
+    (only the last two days are carried over, the raw retention) and an
+    hourly open/close/min/max rollup built from all of it, then dropped.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS open_interest_hourly(
+            condition_id TEXT NOT NULL,
+            hour_ts INTEGER NOT NULL,
+            open_oi REAL,
+            close_oi REAL,
+            min_oi REAL,
+            max_oi REAL,
+            samples INTEGER NOT NULL DEFAULT 0,
+            first_ts INTEGER,
+            last_ts INTEGER,
+            PRIMARY KEY(condition_id, hour_ts)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_oi_hourly_hour ON open_interest_hourly(hour_ts)")
+
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'open_interest_history'")
+    if cursor.fetchone():
+        cursor.execute("""
+            INSERT OR REPLACE INTO open_interest_hourly(
+                condition_id, hour_ts, open_oi, close_oi, min_oi, max_oi, samples, first_ts, last_ts
+            )
+            SELECT condition_id, hour_ts,
+                   MAX(CASE WHEN first_rank = 1 THEN open_interest END),
+                   MAX(CASE WHEN last_rank = 1 THEN open_interest END),
+                   MIN(open_interest), MAX(open_interest), COUNT(*), MIN(ts), MAX(ts)
+            FROM (
+                SELECT condition_id, open_interest, ts, ts / 3600 * 3600 AS hour_ts,
+                       ROW_NUMBER() OVER (PARTITION BY condition_id, ts / 3600 ORDER BY ts, id) AS first_rank,
+                       ROW_NUMBER() OVER (PARTITION BY condition_id, ts / 3600 ORDER BY ts DESC, id DESC) AS last_rank
+                FROM (
+                    SELECT id, condition_id, open_interest,
+                           CAST(strftime('%s', COALESCE(timestamp, created_at)) AS INTEGER) AS ts
+                    FROM open_interest_history
+                    WHERE open_interest IS NOT NULL
+                )
+                WHERE ts IS NOT NULL
+            )
+            GROUP BY condition_id, hour_ts
+        """)
+
+        cursor.execute("""
+            SELECT condition_id, open_interest, timestamp,
+                   CAST(strftime('%s', COALESCE(timestamp, created_at)) AS INTEGER) AS ts,
+                   created_at, CAST(strftime('%s', created_at) AS INTEGER) AS created_ts
+            FROM open_interest_history
+            WHERE CAST(strftime('%s', created_at) AS INTEGER) >= CAST(strftime('%s', 'now', '-2 days') AS INTEGER)
+        """)
+        for row in cursor.fetchall():
+            condition_id, open_interest, timestamp, ts, created_at, created_ts = row
+            table = OPEN_INTEREST_RAW.ensure(cursor, created_ts)
+            cursor.execute(
+                f"INSERT INTO {table}(condition_id, open_interest, timestamp, timestamp_ts, created_at) VALUES(?, ?, ?, ?, ?)",
+                (condition_id, open_interest, timestamp, ts, created_at)
+            )
+        cursor.execute("DROP TABLE open_interest_history")
+
+    # Event tables keep their rows (alerted flags are updated by id) but get retention
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_flow_market_detected ON order_flow_metrics(condition_id, outcome_index, detected_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_flow_detected ON order_flow_metrics(detected_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_whale_detected ON whale_positions(detected_at)")
+
+
+def _wallet_ids(cursor: sqlite3.Cursor) -> None:
+    """wallet_ids dimension; market_trades and whale_positions keyed by wallet id.
+
+    SQLite here has no unhex(), so addresses are converted in Python and the
+    fact tables are rebuilt through a temporary text -> id map. Rows whose
+    wallet is not a 0x-prefixed 20-byte hex address cannot get an id and are
+    dropped.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS wallet_ids(
+            id INTEGER PRIMARY KEY,
+            address BLOB NOT NULL UNIQUE
+        )
+    """)
+
+    texts = set()
+    for query in ("SELECT DISTINCT address FROM wallets",
+                  "SELECT DISTINCT wallet FROM market_trades",
+                  "SELECT DISTINCT user_address FROM whale_positions"):
+        cursor.execute(query)
+        texts.update(row[0] for row in cursor.fetchall())
+    blobs = {text: address_bytes(text) for text in texts}
+    blobs = {text: blob for text, blob in blobs.items() if blob is not None}
+    cursor.executemany("INSERT OR IGNORE INTO wallet_ids(address) VALUES(?)",
+                       [(blob,) for blob in set(blobs.values())])
+    cursor.execute("SELECT id, address FROM wallet_ids")
+    ids = {bytes(address): wallet_id for wallet_id, address in cursor.fetchall()}
+    cursor.execute("CREATE TEMP TABLE wallet_id_map(address TEXT PRIMARY KEY, id INTEGER NOT NULL)")
+    cursor.executemany("INSERT INTO wallet_id_map(address, id) VALUES(?, ?)",
+                       [(text, ids[blob]) for text, blob in blobs.items()])
+
+    cursor.execute("""
+        CREATE TABLE market_trades_new(
+            condition_id TEXT NOT NULL,
+            wallet_id INTEGER NOT NULL,
+            side TEXT NOT NULL,
+            first_trade_id TEXT,
+            first_ts REAL,
+            PRIMARY KEY (condition_id, wallet_id, side)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO market_trades_new(condition_id, wallet_id, side, first_trade_id, first_ts)
+        SELECT t.condition_id, m.id, t.side, t.first_trade_id, t.first_ts
+        FROM market_trades t JOIN wallet_id_map m ON m.address = t.wallet
+        WHERE t.condition_id IS NOT NULL AND t.side IS NOT NULL
+    """)
+    cursor.execute("DROP TABLE market_trades")
+    cursor.execute("ALTER TABLE market_trades_new RENAME TO market_trades")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_market_trades_wallet ON market_trades(wallet_id, first_ts)")
+
+    cursor.execute("""
+        CREATE TABLE whale_positions_new(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            wallet_id INTEGER NOT NULL,
+            condition_id TEXT NOT NULL,
+            outcome_index INTEGER,
+            position_size_usd REAL,
+            position_type TEXT,
+            detected_at TEXT,
+            alerted BOOLEAN DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO whale_positions_new(id, wallet_id, condition_id, outcome_index,
+                                        position_size_usd, position_type, detected_at, alerted)
+        SELECT p.id, m.id, p.condition_id, p.outcome_index,
+               p.position_size_usd, p.position_type, p.detected_at, p.alerted
+        FROM whale_positions p JOIN wallet_id_map m ON m.address = p.user_address
+    """)
+    cursor.execute("DROP TABLE whale_positions")
+    cursor.execute("ALTER TABLE whale_positions_new RENAME TO whale_positions")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_whale_wallet_condition ON whale_positions(wallet_id, condition_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_whale_alerted_detected ON whale_positions(alerted, detected_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_whale_detected ON whale_positions(detected_at)")
+
+    cursor.execute("DROP TABLE temp.wallet_id_map")
+
+
+def _lease_expiry_ts(cursor: sqlite3.Cursor) -> None:
+    """Integer epoch twin of wallet_analysis_jobs.lease_expires_at.
+
+    claim_jobs reclaims expired leases and seconds_until_next_job sleeps
+    until the earliest one; both compare lease_expires_ts against time.time()
+    through the (status, lease_expires_ts) index.
+    """
+    _add_columns(cursor, "wallet_analysis_jobs", (
+        ("lease_expires_ts", _epoch("lease_expires_at")),
+    ))
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_lease_expires_ts ON wallet_analysis_jobs(status, lease_expires_ts)")
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "baseline schema", _baseline),
+    (2, "integer epoch columns for time filters", _epoch_columns),
+    (3, "wallets generation counter and tracked-set index", _tracked_wallets),
+    (4, "trigger-maintained stat counters", _stat_counters),
+    (5, "partitioned open interest with hourly rollup", _time_series),
+    (6, "wallet_ids dimension for market_trades and whale_positions", _wallet_ids),
+    (7, "integer epoch column for job lease expiry", _lease_expiry_ts),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Highest applied migration, 0 for a database that predates schema_version"""
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations; returns how many ran.
+
+    Pending migrations run in one BEGIN IMMEDIATE transaction, and the
+    version is re-read under that lock, so processes starting together apply
+    each migration exactly once.
+    """
+    if schema_version(conn) >= LATEST_VERSION:
+        return 0
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version(
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TEXT
+            )
+        """)
+        current = schema_version(conn)
+        applied = 0
+        for version, description, apply in MIGRATIONS:
+            if version <= current:
+                continue
+            logger.info(f"[DB] Applying schema migration {version}: {description}")
+            apply(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version(version, description, applied_at) VALUES(?, ?, ?)",
+                (version, description, datetime.now(timezone.utc).isoformat())
+            )
+            applied += 1
+        conn.commit()
+        return applied
+    except Exception:
+        conn.rollback()
+        raise
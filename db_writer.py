@@ -0,0 +1,174 @@
+"""
+Single-writer thread for PolymarketDB with group commit.
+
+Write operations are callables that take a cursor and run their statements
+without committing. They are queued from any thread, and the writer applies
+everything queued by the time it picks up work (plus whatever arrives within
+GROUP_COMMIT_MS) in one transaction: one WAL write lock and one fsync per
+group instead of per call. Operations queued while a group commits form the
+next group, so groups grow with load without adding latency when idle.
+Each operation runs inside its own SAVEPOINT, so a failing operation is
+rolled back on its own and only its Future carries the error. If the thread
+itself dies (e.g. the database cannot be opened), every queued and later
+submitted operation fails instead of waiting forever.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class DBWriter:
+    """Dedicated connection and thread that owns all queued writes"""
+
+    # Extra time to hold a group open for more writes (0 = commit what is queued)
+    GROUP_COMMIT_MS = 0
+    MAX_GROUP_SIZE = 1000
+
+    def __init__(self, db_path: str, group_commit_ms: Optional[float] = None,
+                 max_group_size: Optional[int] = None):
+        self.db_path = db_path
+        self.group_commit_sec = (self.GROUP_COMMIT_MS if group_commit_ms is None else group_commit_ms) / 1000.0
+        self.max_group_size = max_group_size or self.MAX_GROUP_SIZE
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        # Guards _closed/_error together with enqueueing, so nothing lands behind _STOP
+        self._lock = threading.Lock()
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="PolymarketDB-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, op: Callable[[sqlite3.Cursor], Any]) -> Future:
+        """Queue op(cursor); the Future resolves to its result once the group commits"""
+        future: Future = Future()
+        with self._lock:
+            if not self._closed:
+                self._queue.put((op, future))
+                return future
+            error = self._error
+        future.set_exception(RuntimeError(f"DB writer is {'dead: ' + str(error) if error else 'closed'}"))
+        return future
+
+    @property
+    def alive(self) -> bool:
+        """False once the writer thread has stopped (closed or failed)"""
+        return self._thread.is_alive() and self._error is None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is committed"""
+        try:
+            self.submit(lambda cursor: None).result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Commit what is queued and stop the thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly per group
+        conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None, cached_statements=512)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        # Durable at checkpoints rather than per commit; WAL stays consistent on crash
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # REPLACE deletes the old row; fire its DELETE triggers so stat counters stay exact
+        conn.execute("PRAGMA recursive_triggers=ON")
+        return conn
+
+    def _run(self):
+        try:
+            self._serve()
+        except BaseException as e:
+            logger.error(f"[DB] Writer thread failed: {e}")
+            with self._lock:
+                self._closed = True
+                self._error = e
+            self._fail_queued(e)
+
+    def _fail_queued(self, error: BaseException):
+        """Fail everything still in the queue (nothing can be added once _closed is set)"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is _STOP:
+                continue
+            _, future = item
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError(f"DB writer is dead: {error}"))
+
+    def _serve(self):
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            group = [item]
+            deadline = time.monotonic() + self.group_commit_sec
+            while len(group) < self.max_group_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                group.append(item)
+            self._apply(conn, group)
+        conn.close()
+
+    def _apply(self, conn: sqlite3.Connection, group: List[Tuple[Callable, Future]]):
+        """Run a group in one transaction, isolating each op in a savepoint"""
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.cursor()
+            for op, future in group:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT op")
+                try:
+                    results.append((future, op(cursor), None))
+                    conn.execute("RELEASE op")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"[DB] Group commit of {len(group)} writes failed: {e}")
+            if conn.in_transaction:
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+            for op, future in group:
+                if future.done():
+                    continue
+                if future.running() or future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            return
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
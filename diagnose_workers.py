@@ -29,49 +29,39 @@ def main():
     print(f"   В обработке: {stats.get('processing_jobs', 0)}")
     print(f"   Готово к обработке: {stats.get('ready_jobs', 0)}")
     
-    # 2. Check if get_pending_jobs works
-    print("\n2️⃣ Проверка получения задач:")
-    jobs = db.get_pending_jobs(limit=10)
-    print(f"   get_pending_jobs(limit=10) вернул: {len(jobs)} задач")
+    # 2. Claim one ready job the same way the dispatcher does
+    print("\n2️⃣ Проверка захвата задачи:")
+    config = AnalysisConfig(api_max_workers=1, api_timeout_sec=12)
+    analyzer = WalletAnalyzer(db, config)
+    worker_id = analyzer.worker_id
+    jobs = db.claim_jobs(worker_id, limit=1)
+    print(f"   claim_jobs({worker_id}, limit=1) вернул: {len(jobs)} задач")
     
     if jobs:
         job = jobs[0]
-        print(f"   Первая задача: ID={job.get('id')}, Address={job.get('address')[:20]}..., Status={job.get('status')}")
-        
-        # 3. Test claim_job
-        print("\n3️⃣ Проверка захвата задачи:")
         job_id = job.get('id')
-        claimed = db.claim_job(job_id)
-        print(f"   claim_job({job_id}) вернул: {claimed}")
+        print(f"   Задача: ID={job_id}, Address={job.get('address')[:20]}..., Status={job.get('status')}, "
+              f"Lease до {job.get('lease_expires_at')}")
         
-        if claimed:
-            # Check status after claim
-            job_after = db.get_job_by_id(job_id)
-            if job_after:
-                print(f"   Статус после захвата: {job_after.get('status')}")
-            
-            # 4. Test analysis
-            print("\n4️⃣ Проверка анализа кошелька:")
-            config = AnalysisConfig(api_max_workers=1, api_timeout_sec=12)
-            analyzer = WalletAnalyzer(db, config)
+        # 3. Test analysis
+        print("\n3️⃣ Проверка анализа кошелька:")
+        try:
+            result = analyzer._analyze_wallet(job)
+            print(f"   Анализ завершен: {result}")
             
-            try:
-                result = analyzer._analyze_wallet(job)
-                print(f"   Анализ завершен: {result}")
-                
-                if result:
-                    db.complete_job(job_id)
+            if result:
+                if db.complete_job(job_id, worker_id):
                     print(f"   Задача {job_id} завершена и удалена из очереди")
                 else:
-                    print(f"   Задача {job_id} не прошла анализ (вернется в очередь)")
-            except Exception as e:
-                print(f"   ❌ Ошибка при анализе: {e}")
-                import traceback
-                traceback.print_exc()
-        else:
-            print(f"   ❌ Не удалось захватить задачу {job_id}")
-            # Reset to pending
-            db.update_job_status(job_id, 'pending')
+                    print(f"   ❌ Не удалось завершить задачу {job_id} (lease потерян?)")
+            else:
+                print(f"   Задача {job_id} не прошла анализ (вернется в очередь)")
+        except Exception as e:
+            print(f"   ❌ Ошибка при анализе: {e}")
+            import traceback
+            traceback.print_exc()
+            # Release the lease so the job goes back to the queue
+            db.update_job_status(job_id, 'pending', worker_id=worker_id)
     else:
         print("   ❌ Нет доступных задач!")
         
@@ -93,8 +83,8 @@ def main():
             ready = cursor.fetchone()[0]
             print(f"   Из них готово к обработке: {ready}")
     
-    # 5. Check for stuck processing jobs
-    print("\n5️⃣ Проверка застрявших задач:")
+    # 4. Check for stuck processing jobs
+    print("\n4️⃣ Проверка застрявших задач:")
     with db.get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT COUNT(*) FROM wallet_analysis_jobs WHERE status = 'processing'")
@@ -114,8 +104,8 @@ def main():
             for row in stuck:
                 print(f"     ID: {row[0]}, Address: {row[1][:20]}..., Updated: {row[2]}")
     
-    # 6. Check cache
-    print("\n6️⃣ Проверка кэша:")
+    # 5. Check cache
+    print("\n5️⃣ Проверка кэша:")
     with db.get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT COUNT(*) FROM wallet_analysis_cache")
@@ -6,7 +6,7 @@ import os
 import logging
 import json
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -24,6 +24,8 @@ GRAPHQL_ENDPOINT_ALT = "https://polymarket.com/graphql"
 # Конфигурация таймаутов
 REQUEST_TIMEOUT = 5  # секунды
 GRAPHQL_TIMEOUT = 10  # секунды для GraphQL запросов
+# Максимум condition_id в одном пакетном запросе /markets
+MARKETS_BATCH_SIZE = 50
 
 
 def get_event_by_slug(slug: str) -> Optional[Dict[str, Any]]:
@@ -614,3 +616,63 @@ def get_event_by_id(event_id: str | int) -> Optional[Dict[str, Any]]:
     logger.warning(f"[GAMMA] ❌ Failed to get canonical event by id={event_id} from all endpoints")
     return None
 
+
+def get_events_by_condition_ids(condition_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Пакетная версия get_event_by_condition_id.
+    Запрашивает /markets?condition_ids=...&condition_ids=... пачками по MARKETS_BATCH_SIZE
+    вместо отдельного GraphQL/REST запроса на каждый condition_id.
+    
+    Args:
+        condition_ids: список condition_id (hex strings)
+        
+    Returns:
+        dict: condition_id (lower) -> объект события в том же формате, что и get_event_by_condition_id
+              (с полем markets, содержащим этот рынок). Ненайденные condition_id отсутствуют в результате.
+    
+    Raises:
+        requests.exceptions.RequestException: если запрос не удался, чтобы вызывающий код
+        мог вернуться к поштучным запросам
+    """
+    result: Dict[str, Dict[str, Any]] = {}
+    unique_ids = list(dict.fromkeys(cid for cid in condition_ids if cid))
+    
+    for start in range(0, len(unique_ids), MARKETS_BATCH_SIZE):
+        chunk = unique_ids[start:start + MARKETS_BATCH_SIZE]
+        params = [("condition_ids", cid) for cid in chunk] + [("limit", len(chunk))]
+        
+        logger.debug(f"[GAMMA] Batch request for {len(chunk)} condition_ids")
+        response = requests.get(f"{GAMMA_BASE_URL}/markets", params=params, timeout=REQUEST_TIMEOUT * 2)
+        response.raise_for_status()
+        data = response.json()
+        markets = data if isinstance(data, list) else (data.get("data") or data.get("markets") or [])
+        
+        for market in markets:
+            market_condition_id = (market.get("conditionId") or market.get("condition_id") or "").lower()
+            if not market_condition_id:
+                continue
+            market_entry = {
+                "conditionId": market_condition_id,
+                "slug": market.get("slug"),
+                "question": market.get("question"),
+                "id": market.get("id")
+            }
+            events = market.get("events") or []
+            event_data = events[0] if events and isinstance(events[0], dict) else None
+            if event_data:
+                event = dict(event_data)
+                event["markets"] = [market_entry]
+            else:
+                # Нет event - минимальная структура из данных рынка (как в GraphQL ветке)
+                event = {
+                    "id": market.get("id"),
+                    "slug": market.get("slug"),
+                    "title": market.get("title") or market.get("question"),
+                    "category": market.get("category"),
+                    "tags": market.get("tags"),
+                    "markets": [market_entry]
+                }
+            result[market_condition_id] = event
+    
+    logger.info(f"[GAMMA] Batch resolved {len(result)}/{len(unique_ids)} condition_ids")
+    return result
@@ -29,35 +29,14 @@ def get_daily_job_stats(db: PolymarketDB, date: datetime = None):
         
         stats = {}
         
-        # Jobs completed today
-        cursor.execute("""
-            SELECT COUNT(*) FROM wallet_analysis_jobs 
-            WHERE status = 'completed'
-            AND datetime(updated_at) >= datetime(?)
-            AND datetime(updated_at) < datetime(?)
-        """, (day_start_iso, day_end_iso))
-        stats['completed_today'] = cursor.fetchone()[0]
-        
-        # Jobs failed today
-        cursor.execute("""
-            SELECT COUNT(*) FROM wallet_analysis_jobs 
-            WHERE status = 'failed'
-            AND datetime(updated_at) >= datetime(?)
-            AND datetime(updated_at) < datetime(?)
-        """, (day_start_iso, day_end_iso))
-        stats['failed_today'] = cursor.fetchone()[0]
-        
-        # Average processing time for completed jobs today
-        cursor.execute("""
-            SELECT AVG(
-                (julianday(updated_at) - julianday(created_at)) * 86400
-            ) FROM wallet_analysis_jobs 
-            WHERE status = 'completed'
-            AND datetime(updated_at) >= datetime(?)
-            AND datetime(updated_at) < datetime(?)
-        """, (day_start_iso, day_end_iso))
-        avg_time = cursor.fetchone()[0]
-        stats['avg_processing_time_sec'] = avg_time if avg_time else 0
+        # Jobs completed / failed today and their average time (trigger-maintained counters)
+        daily = db.get_daily_counters(day_start.date().isoformat())
+        stats['completed_today'] = int(daily.get('jobs_completed', 0))
+        stats['failed_today'] = int(daily.get('jobs_failed', 0))
+        if stats['completed_today'] > 0:
+            stats['avg_processing_time_sec'] = daily.get('jobs_completed_seconds', 0) / stats['completed_today']
+        else:
+            stats['avg_processing_time_sec'] = 0
         
         # Failed rate
         total_processed = stats['completed_today'] + stats['failed_today']
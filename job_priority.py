@@ -0,0 +1,77 @@
+"""
+Priority scores for the wallet analysis queue.
+
+claim_jobs hands out pending jobs highest priority first (oldest first among
+equals), so a bulk import of thousands of addresses no longer holds back
+fresh leaderboard winners. The score is a sum of bounded terms:
+
+- source quality: leaderboards and analytics rank above bulk/CSV imports
+- rank / PnL hints from collection (top of a leaderboard, large realized PnL)
+- consensus: the wallet entered a market inside the live alert window
+- staleness: never analyzed, or analyzed long ago
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Optional
+
+# (substring of source, score) - first match wins, so specific entries go first
+SOURCE_PRIORITY = (
+    ("top_3000", 10.0),
+    ("csv", 10.0),
+    ("restored", 15.0),
+    ("batch", 20.0),
+    ("recompute", 25.0),
+    ("polymarket_api", 25.0),
+    ("hashdive_whale", 40.0),
+    ("hashdive", 35.0),
+    ("polymarket_analytics", 35.0),
+    ("leaderboard", 50.0),  # leaderboards_html and leaderboard URLs
+    ("monitor_", 45.0),  # Re-queued by the monitor after new activity (invalidate_analysis)
+)
+DEFAULT_SOURCE_PRIORITY = 20.0
+
+RANK_WEIGHT = 30.0  # Rank 1 -> 30, rank 1000+ -> 0 (log scale)
+PNL_WEIGHT = 20.0  # $1M+ realized PnL -> 20 (log scale)
+CONSENSUS_BONUS = 40.0
+STALENESS_WEIGHT = 15.0  # Never analyzed, or analyzed STALENESS_FULL_DAYS+ ago
+STALENESS_FULL_DAYS = 30.0
+
+
+def source_priority(source: Optional[str]) -> float:
+    """Base score for where the wallet was collected from"""
+    source = (source or "").lower()
+    for marker, score in SOURCE_PRIORITY:
+        if marker in source:
+            return score
+    return DEFAULT_SOURCE_PRIORITY
+
+
+def job_priority(source: Optional[str], rank: Optional[int] = None, pnl: Optional[float] = None,
+                 in_consensus: bool = False, last_analyzed_at: Optional[str] = None,
+                 now: Optional[datetime] = None) -> float:
+    """Queue priority for a wallet; higher is analyzed sooner"""
+    score = source_priority(source)
+
+    if rank is not None and rank >= 1:
+        score += RANK_WEIGHT * max(0.0, 1.0 - math.log10(rank) / 3.0)
+    if pnl is not None and pnl > 0:
+        score += PNL_WEIGHT * min(1.0, math.log10(1.0 + pnl) / 6.0)
+    if in_consensus:
+        score += CONSENSUS_BONUS
+
+    age_days = None
+    if last_analyzed_at:
+        try:
+            analyzed = datetime.fromisoformat(last_analyzed_at.replace("Z", "+00:00"))
+            if analyzed.tzinfo is None:
+                analyzed = analyzed.replace(tzinfo=timezone.utc)
+            age_days = ((now or datetime.now(timezone.utc)) - analyzed).total_seconds() / 86400.0
+        except (ValueError, TypeError):
+            pass
+    if age_days is None:
+        score += STALENESS_WEIGHT
+    else:
+        score += STALENESS_WEIGHT * min(1.0, max(0.0, age_days) / STALENESS_FULL_DAYS)
+
+    return round(score, 2)
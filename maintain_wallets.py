@@ -12,6 +12,8 @@ import logging
 from datetime import datetime, timezone
 from typing import List, Dict
 
+from wallet_ids import address_bytes
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -43,7 +45,10 @@ class WalletMaintainer:
                     # Delete from all tables
                     cursor.execute("DELETE FROM wallets WHERE address = ?", (address,))
                     cursor.execute("DELETE FROM last_trades WHERE address = ?", (address,))
-                    cursor.execute("DELETE FROM market_trades WHERE wallet = ?", (address,))
+                    cursor.execute(
+                        "DELETE FROM market_trades WHERE wallet_id IN (SELECT id FROM wallet_ids WHERE address = ?)",
+                        (address_bytes(address),)
+                    )
                     
                     removed_count += 1
             
@@ -6,7 +6,7 @@ Uses expanded keyword lists based on Polymarket analysis
 
 import logging
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -139,6 +139,201 @@ TECH_KEYWORDS = [
     "go live", "polymarket us", "us go live"
 ]
 
+# Keyword groups used by classify_market beyond the category lists above
+RAISE_CRYPTO_EXCLUDE = ["bitcoin", "btc", "ethereum", "eth", "solana", "sol", "crypto"]
+AI_PRODUCT_KEYWORDS = ["chatgpt", "openai", "sora", "gemini", "gpt", "ai", "artificial intelligence"]
+RELEASE_KEYWORDS = ["app store", "apple app store", "be released", "will be released", "go live"]
+MOVIE_KEYWORDS = ["netflix", "box office", "oscar", "emmy", "golden globe", "movie", "film", "series", "tv show"]
+MOVIE_SPORTS_CONTEXT = ["world series", "super bowl", "champions league"]
+MUSIC_KEYWORDS = ["grammy", "billboard", "spotify", "album", "song", "artist", "chart", "top chart", "music", "single"]
+SEARCH_KEYWORDS = ["most searched", "top searched", "#1 searched", "searched person"]
+APP_STORE_KEYWORDS = ["app store", "apple app store", "#1 free app"]
+APP_STORE_AI_KEYWORDS = ["chatgpt", "sora", "openai"]
+POLITICS_ENTERTAINMENT_EXCLUDE = ["netflix", "movie", "film", "series", "tv show", "box office", "oscar", "emmy",
+                                  "grammy", "billboard", "spotify", "album", "song", "artist"]
+US_POLITICS_KEYWORDS = ["us", "usa", "united states", "america", "american", "biden", "trump",
+                        "harris", "pence", "congress", "senate", "house of representatives",
+                        "electoral college", "electoral", "presidential election", "republican",
+                        "democrat", "youngkin", "desantis", "haley"]
+CRYPTO_UPDOWN_COINS = ["bitcoin", "btc", "ethereum", "eth", "solana", "sol", "xrp"]
+BTC_KEYWORDS = ["bitcoin", "btc"]
+# Altcoins that rule out a BTC-only market
+BTC_EXCLUDE_ALTCOINS = ["ethereum", "eth", "solana", "sol", "cardano", "ada", "polygon",
+                        "matic", "avalanche", "avax", "chainlink", "link", "uniswap",
+                        "doge", "dogecoin", "shiba", "meme coin", "opensea", "blur", "fdv"]
+STOCKS_CRYPTO_EXCLUDE = ["bitcoin", "btc", "ethereum", "eth", "solana", "sol", "crypto", "cryptocurrency"]
+DATE_SPORTS_KEYWORDS = ["game", "match", "vs", "versus", "championship", "playoff", "nfl", "nba", "nhl", "mlb"]
+ESPORTS_KEYWORDS = ["lol", "league of legends", "worlds", "worlds 2025", "cs2", "counter-strike",
+                    "esports", "valorant", "dota", "rolster", "gen.g", "ctbc", "flying oyster",
+                    "hanwha life esports", "t1", "kt rolster", "bo1", "bo5", "best of"]
+SOCCER_TEAMS = ["brighton", "arsenal", "barcelona", "madrid", "atlético", "atletico", "chelsea",
+                "liverpool", "manchester", "city", "united", "tottenham", "spurs", "newcastle",
+                "west ham", "aston villa", "crystal palace", "fulham", "wolves", "everton",
+                "burnley", "sheffield", "luton", "nottingham", "forest", "bournemouth", "brentford"]
+SOCCER_KEYWORDS = ["uefa", "uef", "fifa", "fif", "soccer", "world cup", "worldcup",
+                   "champions league", "premier league", "la liga", "serie a", "bundesliga",
+                   "euro", "euros", "copa", "confederations cup", "epl", "ucl", "psg", "paris",
+                   "brighton", "arsenal", "barcelona", "madrid", "atlético", "atletico"]
+TENNIS_KEYWORDS = ["djokovic", "pegula", "rybakina", "paolini", "musetti", "djere", "spizzirri",
+                   "hellenic", "wta finals", "atp finals"]
+TENNIS_MATCH_KEYWORDS = ["vs", "versus", "championship", "finals"]
+# NHL-only team names checked first in "vs" matches ("kings" is left to NBA)
+NHL_SPECIFIC_TEAMS = ["bruins", "blackhawks", "capitals", "stars", "jets", "senators", "lightning",
+                      "maple leafs", "hurricanes", "blue jackets", "devils", "islanders", "rangers",
+                      "flyers", "penguins", "avalanche", "wild", "predators", "blues", "ducks",
+                      "coyotes", "flames", "oilers", "sharks", "kraken", "canucks",
+                      "golden knights", "vegas", "sabres", "red wings", "panthers", "canadiens"]
+NBA_SPECIFIC_TEAMS = ["bulls", "heat", "lakers", "76ers", "sixers", "wizards", "raptors", "spurs",
+                      "pacers", "trail blazers", "blazers", "pelicans", "timberwolves", "wolves",
+                      "grizzlies", "hornets", "magic", "pistons", "cavaliers", "cavs", "kings"]
+SPORTS_KEYWORDS = ["basketball", "hockey", "baseball", "tennis", "golf", "olympics", "olympic",
+                   "ncaa", "college football", "college basketball", "ufc", "boxing", "mma",
+                   "formula 1", "f1", "nascar", "racing", "championship", "playoff", "ncaab",
+                   "ncaaf", "march madness", "final four", "game winner"]
+GAMING_KEYWORDS = ["game", "gaming", "steam", "playstation", "xbox", "nintendo", "console"]
+PRICE_CRYPTO_CONTEXT = ["bitcoin", "btc", "ethereum", "eth", "crypto", "cryptocurrency"]
+PRICE_STOCK_CONTEXT = ["stock", "share", "nasdaq", "sp500", "dow", "tsla", "aapl", "nvda"]
+PRICE_MACRO_CONTEXT = ["fed", "federal reserve", "interest rate", "inflation", "gdp"]
+# Single tokens tested on their own
+MARKER_KEYWORDS = ["metadao", "committed", "raise", "updown", "fc", "club", "hellenic", "spread:",
+                   "super bowl", "superbowl", "world series", "atp", "wta", "masters",
+                   "rolex", "nfl", "nba", "nhl", "mlb"]
+
+_MONTHS = r'(january|february|march|april|may|june|july|august|september|october|november|december)'
+_CRYPTO_COINS = r'(bitcoin|ethereum|solana|btc|eth|sol|xrp|cardano|ada|polygon|matic|avalanche|avax|chainlink|link|uniswap|doge|dogecoin|shiba)'
+_STOCK_NAMES = r'(tsla|tesla|nvda|nvidia|aapl|apple|msft|microsoft|googl|google|amzn|amazon|meta|facebook|pltr|palantir|gme|gamestop|amc)'
+
+
+def _word_alternation(words) -> str:
+    return r'\b(?:' + '|'.join(re.escape(word) for word in words) + r')\b'
+
+
+# Patterns are compiled once at import; classify_market runs for every closed position
+_TECH_RELEASE_RE = re.compile(r'\b(release|launch|update|version|beta|alpha)\b', re.IGNORECASE)
+_MOVIE_SPORTS_TEAM_RE = re.compile(_word_alternation([
+    "dodgers", "yankees", "red sox", "blue jays", "world series",
+    "lakers", "warriors", "celtics", "heat", "bulls",
+    "bruins", "blackhawks", "capitals", "stars",
+    "chiefs", "packers", "cowboys", "patriots"
+]), re.IGNORECASE)
+_VS_RE = re.compile(r'\b\w+\s+vs\.?\s+\w+\b', re.IGNORECASE)
+_HOUSE_POLITICS_RE = re.compile(
+    r'\bhouse\s+of\s+(representatives|commons|lords)|\bhouse\s+(vote|passes|approves|rejects|bill|act)',
+    re.IGNORECASE
+)
+_CRYPTO_UPDOWN_RE = re.compile(r'\b' + _CRYPTO_COINS + r'\s+up\s+or\s+down', re.IGNORECASE)
+_BTC_UPDOWN_RE = re.compile(r'\b(bitcoin|btc)\s+up\s+or\s+down', re.IGNORECASE)
+_UP_OR_DOWN_RE = re.compile(r'\bup\s+or\s+down', re.IGNORECASE)
+_BTC_WORD_RE = re.compile(r'\b(bitcoin|btc)\b', re.IGNORECASE)
+_CRYPTO_UPDOWN_COMPACT_RE = re.compile(r'\b' + _CRYPTO_COINS + r'\s+updown', re.IGNORECASE)
+_BTC_UPDOWN_COMPACT_RE = re.compile(r'\b(bitcoin|btc)\s+updown', re.IGNORECASE)
+_CRYPTO_WORD_RE = re.compile(r'\b' + _CRYPTO_COINS + r'\b', re.IGNORECASE)
+_STOCKS_UPDOWN_RE = re.compile(r'\b' + _STOCK_NAMES + r'\s+up\s+or\s+down', re.IGNORECASE)
+_STOCKS_MOVE_RE = re.compile(r'\b(up\s+or\s+down|close\s+above|close\s+below)', re.IGNORECASE)
+_TICKER_RE = re.compile(r'\([A-Z]{1,5}\)')
+_DEADLINE_RE = re.compile(
+    r'\b(deadline|event|happen|release|launch|announcement)\s+(on|by|before)\s+'
+    r'|\bby\s+(end\s+of\s+)?' + _MONTHS + r'\b',
+    re.IGNORECASE
+)
+_DATE_RE = re.compile(
+    r'\d{4}-\d{2}-\d{2}'
+    r'|\d{1,2}/\d{1,2}/\d{4}'
+    r'|\b' + _MONTHS + r'\s+\d{1,2}\b'
+    r'|\b\d{1,2}\s+' + _MONTHS + r'\b',
+    re.IGNORECASE
+)
+_SPORTS_TEAM_WORD_RE = re.compile(_word_alternation(NFL_TEAMS + NBA_TEAMS + NHL_TEAMS + MLB_TEAMS), re.IGNORECASE)
+_SOCCER_WIN_RE = re.compile(r'will\s+\w+\s+(win|fc|club|atlético|atletico)', re.IGNORECASE)
+_SOCCER_DATE_RE = re.compile(r'\b(202[4-9]|20[3-9][0-9])-\d{2}-\d{2}\b')
+_PRICE_RE = re.compile(r'\$[\d,]+|\d+\.\d+%|\d+%|\d+[km]')
+
+# Slug and last-resort heuristics (run on slug / question text, not the combined text)
+_SLUG_NFL_RE = re.compile(r'nfl-|nfl_|nfl\s')
+_SLUG_NBA_RE = re.compile(r'nba-|nba_|nba\s')
+_SLUG_BTC_RE = re.compile(r'bitcoin|btc-|btc_|btc\s', re.IGNORECASE)
+_SLUG_ALTCOIN_RE = re.compile(r'ethereum|eth-|eth_|eth\s|solana|sol-|sol_', re.IGNORECASE)
+_SLUG_UPDOWN_RE = re.compile(r'up-or-down|updown|up-down', re.IGNORECASE)
+_SLUG_GAMING_RE = re.compile(r'lol-|lol_|lol\s|cs2-|cs2_|counter-strike', re.IGNORECASE)
+_SLUG_TENNIS_RE = re.compile(r'atp-|atp_|atp\s|tennis', re.IGNORECASE)
+_SLUG_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_ELECTION_RE = re.compile(r'\b(win|winner|election|vote|president|senate|house|parliamentary)\b', re.IGNORECASE)
+_SPREAD_RE = re.compile(r'\bspread\b|o/u|over/under', re.IGNORECASE)
+_UPDOWN_HEURISTIC_RE = re.compile(r'\bup\s+or\s+down\b|\bupdown\b|\bup-down\b', re.IGNORECASE)
+_PRICE_MOVE_RE = re.compile(r'\b(price|above|below|close|reach|hit)\b', re.IGNORECASE)
+_GAME_MATCH_RE = re.compile(r'\b(game|match|vs|versus|team|player|winner)\b', re.IGNORECASE)
+_MONTH_YEAR_RE = re.compile(
+    r'\b(november|october|december|january|february|march|april|may|june|july|august|september)\s+\d+'
+    r'|\b(202[4-9]|20[3-9][0-9])\b',
+    re.IGNORECASE
+)
+
+
+def _compile_keyword_scanner(keywords):
+    """
+    Compile keywords into one trie-shaped regex that reports, at every text
+    position, the longest keyword starting there (zero-width lookahead, so
+    matches may overlap). Shorter keywords starting at the same position are
+    exactly the keyword prefixes of that match, precomputed in the second
+    return value.
+    """
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def emit(node) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    prefixes = {
+        keyword: frozenset(other for other in keywords if keyword.startswith(other))
+        for keyword in keywords
+    }
+    return re.compile("(?=(" + emit(trie) + "))"), prefixes
+
+
+_KEYWORD_GROUPS = [
+    NFL_TEAMS, NBA_TEAMS, NHL_TEAMS, MLB_TEAMS, CRYPTO_KEYWORDS, POLITICS_KEYWORDS,
+    MACRO_KEYWORDS, STOCKS_KEYWORDS, ENTERTAINMENT_KEYWORDS, TECH_KEYWORDS,
+    RAISE_CRYPTO_EXCLUDE, AI_PRODUCT_KEYWORDS, RELEASE_KEYWORDS, MOVIE_KEYWORDS,
+    MOVIE_SPORTS_CONTEXT, MUSIC_KEYWORDS, SEARCH_KEYWORDS, APP_STORE_KEYWORDS,
+    APP_STORE_AI_KEYWORDS, POLITICS_ENTERTAINMENT_EXCLUDE, US_POLITICS_KEYWORDS,
+    CRYPTO_UPDOWN_COINS, BTC_KEYWORDS, BTC_EXCLUDE_ALTCOINS, STOCKS_CRYPTO_EXCLUDE,
+    DATE_SPORTS_KEYWORDS, ESPORTS_KEYWORDS, SOCCER_TEAMS, SOCCER_KEYWORDS, TENNIS_KEYWORDS,
+    TENNIS_MATCH_KEYWORDS, NHL_SPECIFIC_TEAMS, NBA_SPECIFIC_TEAMS, SPORTS_KEYWORDS,
+    GAMING_KEYWORDS, PRICE_CRYPTO_CONTEXT, PRICE_STOCK_CONTEXT, PRICE_MACRO_CONTEXT,
+    MARKER_KEYWORDS,
+]
+_KEYWORD_RE, _KEYWORD_PREFIXES = _compile_keyword_scanner(
+    sorted({keyword for group in _KEYWORD_GROUPS for keyword in group})
+)
+
+_NFL = frozenset(NFL_TEAMS)
+_NBA = frozenset(NBA_TEAMS)
+_NHL = frozenset(NHL_TEAMS)
+_MLB = frozenset(MLB_TEAMS)
+_ALL_TEAMS = _NFL | _NBA | _NHL | _MLB
+_CRYPTO = frozenset(CRYPTO_KEYWORDS)
+_POLITICS = frozenset(POLITICS_KEYWORDS)
+_MACRO = frozenset(MACRO_KEYWORDS)
+_STOCKS = frozenset(STOCKS_KEYWORDS)
+_ENTERTAINMENT = frozenset(ENTERTAINMENT_KEYWORDS)
+_TECH = frozenset(TECH_KEYWORDS)
+
+
+def _match_keywords(text: str) -> set:
+    """Return every classifier keyword that occurs in text as a substring, in one regex pass"""
+    hits = set()
+    for longest in _KEYWORD_RE.findall(text):
+        hits |= _KEYWORD_PREFIXES[longest]
+    return hits
+
 
 def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question: Optional[str] = None) -> str:
     """
@@ -172,6 +367,76 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
     Returns:
         str: Category string (e.g., "sports/NFL", "politics/US")
     """
+    category = _classify_by_rules(event, slug, question)
+    if category:
+        return category
+    
+    # ML fallback, then slug/context heuristics
+    combined_text = _combined_text(slug, question)
+    if combined_text:
+        ml_category = _classify_with_ml([combined_text])[0]
+        if ml_category:
+            return ml_category
+    return _classify_by_patterns(slug, combined_text)
+
+
+def classify_markets(markets: List[Tuple[Optional[Dict[str, Any]], Optional[str], Optional[str]]]) -> List[str]:
+    """
+    Classify many markets at once; same results as calling classify_market on each.
+    
+    Rule-based checks run per market; the markets that fall through to the ML
+    fallback are classified together in one batch per model.
+    
+    Args:
+        markets: (event, slug, question) tuples
+        
+    Returns:
+        List of category strings, in input order
+    """
+    categories: List[Optional[str]] = [
+        _classify_by_rules(event or {}, slug, question) for event, slug, question in markets
+    ]
+    combined = [
+        _combined_text(slug, question) if category is None else ""
+        for category, (_, slug, question) in zip(categories, markets)
+    ]
+    pending = [i for i, text in enumerate(combined) if text]
+    if pending:
+        for i, ml_category in zip(pending, _classify_with_ml([combined[i] for i in pending])):
+            categories[i] = ml_category
+    
+    return [
+        category or _classify_by_patterns(slug, combined_text)
+        for category, combined_text, (_, slug, _question) in zip(categories, combined, markets)
+    ]
+
+
+def _combined_text(slug: Optional[str], question: Optional[str]) -> str:
+    return f"{(question or '').lower()} {(slug or '').lower()}".strip()
+
+
+def _classify_with_ml(texts: List[str]) -> List[Optional[str]]:
+    """ML fallback: standard model first, then the aggressive model for what is left"""
+    try:
+        from ml_classifier import classify_batch
+    except Exception as e:
+        logger.debug(f"[CATEGORY] ML classification failed: {e}")
+        return [None] * len(texts)
+    
+    categories = classify_batch(texts)
+    remaining = [i for i, category in enumerate(categories) if not category]
+    if remaining:
+        aggressive = classify_batch([texts[i] for i in remaining], aggressive=True)
+        for i, category in zip(remaining, aggressive):
+            categories[i] = category
+    for text, category in zip(texts, categories):
+        if category:
+            logger.debug(f"[CATEGORY] ML classified '{text[:50]}...' as '{category}'")
+    return categories
+
+
+def _classify_by_rules(event: Dict[str, Any], slug: Optional[str], question: Optional[str]) -> Optional[str]:
+    """Keyword and pattern rules of classify_market; None when no rule matches"""
     # Normalize inputs
     slug_lower = (slug or "").lower()
     question_lower = (question or "").lower()
@@ -186,81 +451,63 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
     
     # Combine all text for analysis
     all_text = f"{slug_lower} {question_lower} {event_category} {event_group_type} {' '.join(event_tags_lower)}"
+    # Every keyword test below is a set lookup against this single scan
+    hits = _match_keywords(all_text)
     
     # Check categories in order of specificity
     # IMPORTANT: Tech and Entertainment BEFORE Politics to avoid false positives (e.g., "US Apple App Store" -> tech, not politics)
     
     # STOCKS CLASSIFICATION - MetaDAO/raise patterns FIRST (before tech/crypto, as they might contain crypto-like tokens)
-    # Improved patterns: "over $Xm committed to the Y raise on metadao", "raise on metadao", "committed to raise"
-    metadao_patterns = [
-        r'\braise\s+on\s+metadao',
-        r'\bcommitted\s+to\s+.*\s+raise\s+on\s+metadao',
-        r'\bover\s+\$?\d+[km]?\s+committed\s+to\s+.*\s+raise\s+on\s+metadao',
-        r'\bmetadao.*raise',
-        r'\braise.*metadao'
-    ]
-    if "metadao" in all_text or any(re.search(pattern, all_text, re.IGNORECASE) for pattern in metadao_patterns):
+    # ("over $Xm committed to the Y raise on metadao", "raise on metadao" all contain "metadao")
+    if "metadao" in hits:
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=stocks/Companies")
         return "stocks/Companies"
     
     # Also check for "committed to raise" pattern (MetaDAO raises) - but exclude crypto
-    if ("committed" in all_text and "raise" in all_text) or ("raise on" in all_text and "committed" in all_text):
+    if "committed" in hits and "raise" in hits:
         # Check if it's about MetaDAO or companies (not crypto)
-        if not any(crypto in all_text for crypto in ["bitcoin", "btc", "ethereum", "eth", "solana", "sol", "crypto"]):
+        if hits.isdisjoint(RAISE_CRYPTO_EXCLUDE):
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=stocks/Companies")
             return "stocks/Companies"
     
     # TECH CLASSIFICATION (check AFTER stocks to avoid conflicts with MetaDAO)
-    if any(keyword in all_text for keyword in TECH_KEYWORDS):
+    if not hits.isdisjoint(_TECH):
         # Check for specific tech products
-        if any(keyword in all_text for keyword in ["chatgpt", "openai", "sora", "gemini", "gpt", "ai", "artificial intelligence"]):
+        if not hits.isdisjoint(AI_PRODUCT_KEYWORDS):
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=tech/Releases")
             return "tech/Releases"
         # Check for app store / releases
-        if any(keyword in all_text for keyword in ["app store", "apple app store", "be released", "will be released", "go live"]):
+        if not hits.isdisjoint(RELEASE_KEYWORDS):
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=tech/Releases")
             return "tech/Releases"
         # Generic tech release
-        if re.search(r'\b(release|launch|update|version|beta|alpha)\b', all_text, re.IGNORECASE):
+        if _TECH_RELEASE_RE.search(all_text):
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=tech/Releases")
             return "tech/Releases"
     
     # ENTERTAINMENT CLASSIFICATION (check BEFORE politics and BEFORE sports to avoid conflicts)
     # Movies/TV - check FIRST before sports to avoid false positives
-    if any(keyword in all_text for keyword in ["netflix", "box office", "oscar", "emmy", "golden globe", "movie", "film", "series", "tv show"]):
+    if not hits.isdisjoint(MOVIE_KEYWORDS):
         # Exclude if it's clearly about sports (e.g., "Los Angeles Dodgers" is MLB, not entertainment)
-        # But use word boundaries to avoid false positives (e.g., "global" containing "bal" from MLB_TEAMS)
-        # Check for explicit sports context first
-        if "world series" in all_text or "super bowl" in all_text or "champions league" in all_text:
-            # This is clearly sports, skip entertainment
-            pass
-        else:
-            # Check for sports teams using word boundaries to avoid partial matches
-            sports_team_patterns = [
-                r'\bdodgers\b', r'\byankees\b', r'\bred sox\b', r'\bblue jays\b', r'\bworld series\b',
-                r'\blakers\b', r'\bwarriors\b', r'\bceltics\b', r'\bheat\b', r'\bbulls\b',
-                r'\bbruins\b', r'\bblackhawks\b', r'\bcapitals\b', r'\bstars\b',
-                r'\bchiefs\b', r'\bpackers\b', r'\bcowboys\b', r'\bpatriots\b'
-            ]
-            has_sports_team = any(re.search(pattern, all_text, re.IGNORECASE) for pattern in sports_team_patterns)
-            if not has_sports_team:
-                logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=entertainment/Movies")
-                return "entertainment/Movies"
+        # Sports teams are matched on word boundaries (e.g., "global" must not match "bal" from MLB_TEAMS)
+        if hits.isdisjoint(MOVIE_SPORTS_CONTEXT) and not _MOVIE_SPORTS_TEAM_RE.search(all_text):
+            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=entertainment/Movies")
+            return "entertainment/Movies"
     
     # Music
-    if any(keyword in all_text for keyword in ["grammy", "billboard", "spotify", "album", "song", "artist", "chart", "top chart", "music", "single"]):
+    if not hits.isdisjoint(MUSIC_KEYWORDS):
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=entertainment/Music")
         return "entertainment/Music"
     
     # STOCKS - Additional patterns (App Store rankings, searches) - BEFORE politics
     # Check for "searched person" or "most searched" patterns (these are about Google searches, not tech releases)
-    if any(keyword in all_text for keyword in ["most searched", "top searched", "#1 searched", "searched person"]):
+    if not hits.isdisjoint(SEARCH_KEYWORDS):
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=stocks/Companies")
         return "stocks/Companies"
     
     # Check for App Store rankings
-    if any(keyword in all_text for keyword in ["app store", "apple app store", "#1 free app"]):
-        if any(keyword in all_text for keyword in ["chatgpt", "sora", "openai"]):
+    if not hits.isdisjoint(APP_STORE_KEYWORDS):
+        if not hits.isdisjoint(APP_STORE_AI_KEYWORDS):
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=tech/Releases")
             return "tech/Releases"
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=stocks/Companies")
@@ -269,77 +516,39 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
     # POLITICS CLASSIFICATION (check after tech/entertainment to avoid false positives)
     # BUT exclude if it's a sports match (has "vs" and sports teams)
     # Also exclude if it's entertainment (movies, music, etc.)
-    vs_pattern = r'\b\w+\s+vs\.?\s+\w+\b'
-    is_sports_match = re.search(vs_pattern, all_text, re.IGNORECASE)
-    
-    # Check for politics keywords, but exclude common false positives
-    # "house" alone is not enough - need "house of representatives" or political context
-    politics_matches = []
-    for keyword in POLITICS_KEYWORDS:
-        if keyword in all_text:
-            # Special handling for "house" - only match if it's in political context
-            if keyword == "house":
-                # Check if it's "house of representatives" or "house of commons" or similar
-                if re.search(r'\bhouse\s+of\s+(representatives|commons|lords)', all_text, re.IGNORECASE):
-                    politics_matches.append(keyword)
-                # Or if it's clearly political context (e.g., "house vote", "house passes")
-                elif re.search(r'\bhouse\s+(vote|passes|approves|rejects|bill|act)', all_text, re.IGNORECASE):
-                    politics_matches.append(keyword)
-                # Skip if it's just "house" in a movie title or similar
-            else:
-                politics_matches.append(keyword)
+    is_sports_match = _VS_RE.search(all_text)
+    
+    # "house" alone is not enough - need "house of representatives" or political context ("house vote", "house passes")
+    politics_matches = hits & _POLITICS
+    if "house" in politics_matches and not _HOUSE_POLITICS_RE.search(all_text):
+        politics_matches.discard("house")
     
     if politics_matches:
         # Exclude if it's entertainment (movies, music, etc.)
-        if any(keyword in all_text for keyword in ["netflix", "movie", "film", "series", "tv show", "box office", "oscar", "emmy", "grammy", "billboard", "spotify", "album", "song", "artist"]):
-            # Skip politics classification if it's clearly entertainment
+        # or a sports match (e.g., "bruins vs. senators" is NHL, not politics)
+        if not hits.isdisjoint(POLITICS_ENTERTAINMENT_EXCLUDE):
             pass
-        # Exclude if it's a sports match (e.g., "bruins vs. senators" is NHL, not politics)
-        elif is_sports_match:
-            # Check if it contains sports teams
-            all_sports_teams = NFL_TEAMS + NBA_TEAMS + NHL_TEAMS + MLB_TEAMS
-            if any(team in all_text for team in all_sports_teams):
-                # This is likely a sports match, not politics
-                pass  # Continue to sports classification
-            else:
-                # Check if US-specific
-                us_keywords = ["us", "usa", "united states", "america", "american", "biden", "trump",
-                              "harris", "pence", "congress", "senate", "house of representatives",
-                              "electoral college", "electoral", "presidential election", "republican",
-                              "democrat", "youngkin", "desantis", "haley"]
-                if any(keyword in all_text for keyword in us_keywords):
-                    logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=politics/US")
-                    return "politics/US"
-                else:
-                    logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=politics/Global")
-                    return "politics/Global"
+        elif is_sports_match and not hits.isdisjoint(_ALL_TEAMS):
+            pass  # Continue to sports classification
+        elif not hits.isdisjoint(US_POLITICS_KEYWORDS):
+            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=politics/US")
+            return "politics/US"
         else:
-            # Check if US-specific
-            us_keywords = ["us", "usa", "united states", "america", "american", "biden", "trump",
-                          "harris", "pence", "congress", "senate", "house of representatives",
-                          "electoral college", "electoral", "presidential election", "republican",
-                          "democrat", "youngkin", "desantis", "haley"]
-            if any(keyword in all_text for keyword in us_keywords):
-                logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=politics/US")
-                return "politics/US"
-            else:
-                logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=politics/Global")
-                return "politics/Global"
+            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=politics/Global")
+            return "politics/Global"
     
     # MACRO CLASSIFICATION
-    if any(keyword in all_text for keyword in MACRO_KEYWORDS):
+    if not hits.isdisjoint(_MACRO):
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=macro/Fed")
         return "macro/Fed"
     
     
     # CRYPTO CLASSIFICATION (check before other stocks to avoid conflicts)
     # First check for "up or down" patterns (most common crypto pattern)
-    # IMPROVED: Allow for dates/times after "up or down" (including "- october 10, 2:30pm" format)
     # Pattern matches: "bitcoin up or down", "bitcoin up or down on november 5", "bitcoin up or down - october 10"
-    crypto_updown_pattern = r'\b(bitcoin|ethereum|solana|btc|eth|sol|xrp|cardano|ada|polygon|matic|avalanche|avax|chainlink|link|uniswap|doge|dogecoin|shiba)\s+up\s+or\s+down'
-    if re.search(crypto_updown_pattern, all_text, re.IGNORECASE):
+    if _CRYPTO_UPDOWN_RE.search(all_text):
         # Check if BTC
-        if re.search(r'\b(bitcoin|btc)\s+up\s+or\s+down', all_text, re.IGNORECASE):
+        if _BTC_UPDOWN_RE.search(all_text):
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/BTC")
             return "crypto/BTC"
         # Otherwise altcoins
@@ -348,221 +557,136 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
     
     # Also check for crypto keywords with "up or down" pattern that might have been missed
     # This catches cases like "bitcoin" + "up or down" separated by other words
-    if any(keyword in all_text for keyword in ["bitcoin", "btc", "ethereum", "eth", "solana", "sol", "xrp"]):
-        if re.search(r'\bup\s+or\s+down', all_text, re.IGNORECASE):
-            if re.search(r'\b(bitcoin|btc)\b', all_text, re.IGNORECASE):
+    if not hits.isdisjoint(CRYPTO_UPDOWN_COINS):
+        if _UP_OR_DOWN_RE.search(all_text):
+            if _BTC_WORD_RE.search(all_text):
                 logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/BTC")
                 return "crypto/BTC"
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/Altcoins")
             return "crypto/Altcoins"
     
     # Also check for "updown" (no spaces) pattern
-    crypto_updown_compact = r'\b(bitcoin|ethereum|solana|btc|eth|sol|xrp|cardano|ada|polygon|matic|avalanche|avax|chainlink|link|uniswap|doge|dogecoin|shiba)\s+updown'
-    if re.search(crypto_updown_compact, all_text, re.IGNORECASE):
-        if re.search(r'\b(bitcoin|btc)\s+updown', all_text, re.IGNORECASE):
+    if _CRYPTO_UPDOWN_COMPACT_RE.search(all_text):
+        if _BTC_UPDOWN_COMPACT_RE.search(all_text):
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/BTC")
             return "crypto/BTC"
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/Altcoins")
         return "crypto/Altcoins"
     
     # Check for crypto keywords (including "updown" standalone)
-    if "updown" in all_text:
+    if "updown" in hits:
         # Check if it's about crypto (has crypto keywords nearby)
-        crypto_context = r'\b(bitcoin|ethereum|solana|btc|eth|sol|xrp|cardano|ada|polygon|matic|avalanche|avax|chainlink|link|uniswap|doge|dogecoin|shiba)\b'
-        if re.search(crypto_context, all_text, re.IGNORECASE):
-            if re.search(r'\b(bitcoin|btc)\b', all_text, re.IGNORECASE):
+        if _CRYPTO_WORD_RE.search(all_text):
+            if _BTC_WORD_RE.search(all_text):
                 logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/BTC")
                 return "crypto/BTC"
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/Altcoins")
             return "crypto/Altcoins"
     
-    if any(keyword in all_text for keyword in CRYPTO_KEYWORDS):
-        # Check for BTC specifically
-        btc_keywords = ["bitcoin", "btc"]
-        if any(keyword in all_text for keyword in btc_keywords):
-            # Check if it's specifically about BTC (not altcoins)
-            altcoin_keywords = ["ethereum", "eth", "solana", "sol", "cardano", "ada", "polygon",
-                               "matic", "avalanche", "avax", "chainlink", "link", "uniswap",
-                               "doge", "dogecoin", "shiba", "meme coin", "opensea", "blur", "fdv"]
-            if not any(keyword in all_text for keyword in altcoin_keywords):
-                logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/BTC")
-                return "crypto/BTC"
-        
-        # Altcoins
-        altcoin_keywords = ["ethereum", "eth", "solana", "sol", "cardano", "ada", "polygon",
-                           "matic", "avalanche", "avax", "chainlink", "link", "uniswap",
-                           "doge", "dogecoin", "shiba", "meme coin", "altcoin", "alt coin",
-                           "opensea", "blur", "fdv", "token"]
-        if any(keyword in all_text for keyword in altcoin_keywords):
-            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/Altcoins")
-            return "crypto/Altcoins"
+    if not hits.isdisjoint(_CRYPTO):
+        # Check for BTC specifically (not altcoins)
+        if not hits.isdisjoint(BTC_KEYWORDS) and hits.isdisjoint(BTC_EXCLUDE_ALTCOINS):
+            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/BTC")
+            return "crypto/BTC"
         
-        # Generic crypto (fallback)
+        # Altcoins, and generic crypto as the fallback
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=crypto/Altcoins")
         return "crypto/Altcoins"
     
     # STOCKS CLASSIFICATION (check after crypto to avoid conflicts)
     # Check for stock tickers and "up or down" pattern
-    stocks_updown_pattern = r'\b(tsla|tesla|nvda|nvidia|aapl|apple|msft|microsoft|googl|google|amzn|amazon|meta|facebook|pltr|palantir|gme|gamestop|amc)\s+up\s+or\s+down'
-    if re.search(stocks_updown_pattern, all_text, re.IGNORECASE):
+    if _STOCKS_UPDOWN_RE.search(all_text):
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=stocks/Companies")
         return "stocks/Companies"
     
     # Check for stock keywords
-    if any(keyword in all_text for keyword in STOCKS_KEYWORDS):
+    if not hits.isdisjoint(_STOCKS):
         # Check for "up or down" pattern with stock names (but not crypto)
-        if re.search(r'\b(up\s+or\s+down|close\s+above|close\s+below)', all_text, re.IGNORECASE):
-            # Make sure it's not crypto
-            crypto_keywords_in_text = ["bitcoin", "btc", "ethereum", "eth", "solana", "sol", "crypto", "cryptocurrency"]
-            if not any(ckw in all_text for ckw in crypto_keywords_in_text):
-                logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=stocks/Companies")
-                return "stocks/Companies"
+        if _STOCKS_MOVE_RE.search(all_text) and hits.isdisjoint(STOCKS_CRYPTO_EXCLUDE):
+            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=stocks/Companies")
+            return "stocks/Companies"
         # Check for stock ticker patterns like "(PLTR)", "(AAPL)", etc.
-        if re.search(r'\([A-Z]{1,5}\)', all_text):
+        if _TICKER_RE.search(all_text):
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=stocks/Companies")
             return "stocks/Companies"
     
     # DATE-BASED CLASSIFICATION (check BEFORE sports to avoid false positives)
-    # Check for deadline/event patterns FIRST
-    deadline_patterns = [
-        r'\b(deadline|event|happen|release|launch|announcement)\s+(on|by|before)\s+',
-        r'\bby\s+(end\s+of\s+)?(january|february|march|april|may|june|july|august|september|october|november|december)\b',
-        r'\b(deadline|event|happen|release|launch|announcement)\s+(on|by|before)\s+\d{4}',
-    ]
-    has_deadline_pattern = any(re.search(pattern, all_text, re.IGNORECASE) for pattern in deadline_patterns)
-    
-    date_patterns = [
-        r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-        r'\d{1,2}/\d{1,2}/\d{4}',  # MM/DD/YYYY
-        r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}\b',  # Month Day (word boundaries)
-        r'\b\d{1,2}\s+(january|february|march|april|may|june|july|august|september|october|november|december)\b',  # Day Month (word boundaries)
-    ]
-    has_date_pattern = any(re.search(pattern, all_text, re.IGNORECASE) for pattern in date_patterns)
-    
-    if has_deadline_pattern or has_date_pattern:
+    # Deadline/event patterns ("release on", "by end of march") and dates
+    # (YYYY-MM-DD, MM/DD/YYYY, "Month Day", "Day Month")
+    if _DEADLINE_RE.search(all_text) or _DATE_RE.search(all_text):
         # Check if it's a sports date (has team names or sports keywords)
-        # Use word boundaries to avoid false positives (e.g., "December" containing "ember")
-        all_sports_teams = NFL_TEAMS + NBA_TEAMS + NHL_TEAMS + MLB_TEAMS
-        has_sports_team = any(re.search(r'\b' + re.escape(team) + r'\b', all_text, re.IGNORECASE) for team in all_sports_teams)
-        has_sports_keyword = any(keyword in all_text for keyword in ["game", "match", "vs", "versus", "championship", "playoff", "nfl", "nba", "nhl", "mlb"])
-        
-        if has_sports_team or has_sports_keyword:
-            # Continue to sports classification below
-            pass
-        else:
+        # Team names use word boundaries to avoid false positives (e.g., "December" containing "ember")
+        if hits.isdisjoint(DATE_SPORTS_KEYWORDS) and not _SPORTS_TEAM_WORD_RE.search(all_text):
             # It's likely a macro event or deadline
             logger.debug(f"[CATEGORY] Date pattern detected → macro/Events")
             return "macro/Events"
+        # Otherwise continue to sports classification below
     
     # SPORTS CLASSIFICATION
     
     # Check for specific sports keywords first (to avoid false positives)
     # Tennis
-    if "atp" in all_text or "wta" in all_text:
+    if "atp" in hits or "wta" in hits:
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/Other")
         return "sports/Other"
     
     # Golf
-    if "masters" in all_text or "rolex" in all_text:
+    if "masters" in hits or "rolex" in hits:
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/Other")
         return "sports/Other"
     
     # Esports/Gaming (check before general sports)
-    esports_keywords = ["lol", "league of legends", "worlds", "worlds 2025", "cs2", "counter-strike",
-                       "esports", "valorant", "dota", "rolster", "gen.g", "ctbc", "flying oyster",
-                       "hanwha life esports", "t1", "kt rolster", "bo1", "bo5", "best of"]
-    if any(keyword in all_text for keyword in esports_keywords):
+    if not hits.isdisjoint(ESPORTS_KEYWORDS):
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=entertainment/Gaming")
         return "entertainment/Gaming"
     
     # Check for Soccer
-    # First check for "will [team] win" pattern (common soccer pattern)
-    # Improved: also check for dates in format "2025-11-01" or "on 2025-11-01"
-    soccer_win_pattern = r'will\s+\w+\s+(win|fc|club|atlético|atletico)'
-    soccer_date_pattern = r'\b(202[4-9]|20[3-9][0-9])-\d{2}-\d{2}\b'  # Matches dates like "2025-11-01"
-    
-    if re.search(soccer_win_pattern, all_text, re.IGNORECASE) or re.search(soccer_date_pattern, all_text):
+    # First check for "will [team] win" pattern (common soccer pattern) or dates like "2025-11-01"
+    if _SOCCER_WIN_RE.search(all_text) or _SOCCER_DATE_RE.search(all_text):
         # Check for soccer teams
-        soccer_teams = ["brighton", "arsenal", "barcelona", "madrid", "atlético", "atletico", "chelsea",
-                       "liverpool", "manchester", "city", "united", "tottenham", "spurs", "newcastle",
-                       "west ham", "aston villa", "crystal palace", "fulham", "wolves", "everton",
-                       "burnley", "sheffield", "luton", "nottingham", "forest", "bournemouth", "brentford"]
-        if any(team in all_text for team in soccer_teams) or "fc" in all_text or "club" in all_text:
+        if not hits.isdisjoint(SOCCER_TEAMS) or "fc" in hits or "club" in hits:
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/Soccer")
             return "sports/Soccer"
     
-    soccer_keywords = ["uefa", "uef", "fifa", "fif", "soccer", "world cup", "worldcup",
-                      "champions league", "premier league", "la liga", "serie a", "bundesliga",
-                      "euro", "euros", "copa", "confederations cup", "epl", "ucl", "psg", "paris",
-                      "brighton", "arsenal", "barcelona", "madrid", "atlético", "atletico"]
-    if any(keyword in all_text for keyword in soccer_keywords):
+    if not hits.isdisjoint(SOCCER_KEYWORDS):
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/Soccer")
         return "sports/Soccer"
     
     # Check for explicit league indicators FIRST (before team checks)
-    if "nfl" in all_text:
+    if "nfl" in hits:
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NFL")
         return "sports/NFL"
-    if "nba" in all_text:
+    if "nba" in hits:
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NBA")
         return "sports/NBA"
-    if "nhl" in all_text:
+    if "nhl" in hits:
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NHL")
         return "sports/NHL"
-    if "mlb" in all_text:
+    if "mlb" in hits:
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/MLB")
         return "sports/MLB"
     
     # Check for Tennis tournaments FIRST (before NBA/NHL to avoid false positives)
-    tennis_keywords = ["djokovic", "pegula", "rybakina", "paolini", "musetti", "djere", "spizzirri", 
-                      "hellenic", "wta finals", "atp finals"]
-    if any(keyword in all_text for keyword in tennis_keywords):
-        # Check if it's a tennis match (has "vs" and tennis keywords)
-        if "vs" in all_text or "versus" in all_text or "championship" in all_text or "finals" in all_text:
-            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/Other")
-            return "sports/Other"
+    # - a tennis match has "vs" (or championship/finals) and tennis keywords
+    if not hits.isdisjoint(TENNIS_KEYWORDS) and not hits.isdisjoint(TENNIS_MATCH_KEYWORDS):
+        logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/Other")
+        return "sports/Other"
     
     # Check for Tennis BEFORE NBA/NHL checks (to catch "hellenic championship")
-    if "hellenic" in all_text and ("vs" in all_text or "championship" in all_text):
+    if "hellenic" in hits and ("vs" in hits or "championship" in hits):
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/Other")
         return "sports/Other"
     
     # Check for NHL FIRST in "vs" matches (to avoid false positives with NBA)
-    # Check for specific NHL teams first (to avoid false positives with "senators" = politics)
-    nhl_specific_teams = ["bruins", "blackhawks", "capitals", "stars", "jets", "senators", "lightning", 
-                         "maple leafs", "hurricanes", "blue jackets", "devils", "islanders", "rangers", 
-                         "flyers", "penguins", "avalanche", "wild", "predators", "blues", "ducks", 
-                         "coyotes", "flames", "oilers", "sharks", "kraken", "canucks", 
-                         "golden knights", "vegas", "sabres", "red wings", "panthers", "canadiens"]
-    # Note: "kings" removed from nhl_specific_teams as it exists in both NBA and NHL
-    # NBA-specific teams (not in NHL)
-    nba_specific_teams = ["bulls", "heat", "lakers", "76ers", "sixers", "wizards", "raptors", "spurs", 
-                         "pacers", "trail blazers", "blazers", "pelicans", "timberwolves", "wolves",
-                         "grizzlies", "hornets", "magic", "pistons", "cavaliers", "cavs", "kings"]
-    # Note: "kings" added to nba_specific_teams as it's more commonly NBA (Sacramento Kings)
-    
+    # (league indicators already returned above)
     if is_sports_match:
-        # If it's "Team vs Team" format, check both teams
-        # Check for explicit league indicators first
-        if "nfl" in all_text:
-            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NFL")
-            return "sports/NFL"
-        if "nba" in all_text:
-            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NBA")
-            return "sports/NBA"
-        if "nhl" in all_text:
-            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NHL")
-            return "sports/NHL"
-        
-        # Check teams (NHL before NFL to avoid false positives)
-        has_nfl_team = any(team in all_text for team in NFL_TEAMS)
-        has_nba_specific = any(team in all_text for team in nba_specific_teams)
-        has_nhl_specific = any(team in all_text for team in nhl_specific_teams)
+        # Check teams (NHL-specific before NBA-specific, NFL last)
+        has_nfl_team = not hits.isdisjoint(_NFL)
         
-        if has_nhl_specific:
+        if not hits.isdisjoint(NHL_SPECIFIC_TEAMS):
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NHL")
             return "sports/NHL"
-        elif has_nba_specific and not has_nfl_team:
+        elif not hits.isdisjoint(NBA_SPECIFIC_TEAMS) and not has_nfl_team:
             logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NBA")
             return "sports/NBA"
         elif has_nfl_team:
@@ -570,66 +694,35 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
             return "sports/NFL"
     
     # Check for MLB FIRST (before NBA/NHL to avoid conflicts with city names)
-    if any(team in all_text for team in MLB_TEAMS) or "mlb" in all_text or "world series" in all_text:
+    if not hits.isdisjoint(_MLB) or "world series" in hits:
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/MLB")
         return "sports/MLB"
     
     # Check for NBA (after MLB check)
-    if any(team in all_text for team in NBA_TEAMS) or "nba" in all_text:
+    if not hits.isdisjoint(_NBA):
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NBA")
         return "sports/NBA"
     
     # Check for NHL (general check)
-    if any(team in all_text for team in NHL_TEAMS) or "nhl" in all_text:
+    if not hits.isdisjoint(_NHL):
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NHL")
         return "sports/NHL"
     
-    # Check for NFL - improved pattern matching
-    # Check for "Team vs Team" pattern first (most common)
-    vs_pattern = r'\b\w+\s+vs\.?\s+\w+\b'
-    if re.search(vs_pattern, all_text, re.IGNORECASE):
-        # Check if it contains NFL team names
-        if any(team in all_text for team in NFL_TEAMS):
-            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NFL")
-            return "sports/NFL"
-        # Check for NBA teams
-        if any(team in all_text for team in NBA_TEAMS):
-            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NBA")
-            return "sports/NBA"
-        # Check for NHL teams
-        if any(team in all_text for team in NHL_TEAMS):
-            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NHL")
-            return "sports/NHL"
-        # Check for MLB teams
-        if any(team in all_text for team in MLB_TEAMS):
-            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/MLB")
-            return "sports/MLB"
-    
-    # Check for "spread:" pattern (common in NFL betting)
-    if "spread:" in all_text or ("spread" in all_text and any(team in all_text for team in NFL_TEAMS)):
-        logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NFL")
-        return "sports/NFL"
-    
-    # General NFL check
-    if any(team in all_text for team in NFL_TEAMS) or "nfl" in all_text or "super bowl" in all_text or "superbowl" in all_text:
+    # NFL: "spread:" (common in NFL betting), spread + team, or any NFL team / super bowl
+    if "spread:" in hits or not hits.isdisjoint(_NFL) or "super bowl" in hits or "superbowl" in hits:
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/NFL")
         return "sports/NFL"
     
     
     # Check for other sports (general keywords)
-    sports_keywords = ["basketball", "hockey", "baseball", "tennis", "golf", "olympics", "olympic",
-                      "ncaa", "college football", "college basketball", "ufc", "boxing", "mma",
-                      "formula 1", "f1", "nascar", "racing", "championship", "playoff", "ncaab",
-                      "ncaaf", "march madness", "final four", "game winner"]
-    if any(keyword in all_text for keyword in sports_keywords):
+    if not hits.isdisjoint(SPORTS_KEYWORDS):
         logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=sports/Other")
         return "sports/Other"
     
     # Gaming (already checked above in sports section, but double-check here)
-    if any(keyword in all_text for keyword in ENTERTAINMENT_KEYWORDS):
-        if any(keyword in all_text for keyword in ["game", "gaming", "steam", "playstation", "xbox", "nintendo", "console"]):
-            logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=entertainment/Gaming")
-            return "entertainment/Gaming"
+    if not hits.isdisjoint(_ENTERTAINMENT) and not hits.isdisjoint(GAMING_KEYWORDS):
+        logger.debug(f"[CATEGORY] condition={slug[:30] if slug else 'N/A'}... → category=entertainment/Gaming")
+        return "entertainment/Gaming"
     
     # AGGRESSIVE FALLBACK CLASSIFICATION (to reduce Unknown %)
     
@@ -649,22 +742,16 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
             logger.debug(f"[CATEGORY] Using event.category={event_category} → {mapped_category}")
             return mapped_category
     
-    # 2. Number/price-based classification
-    price_patterns = [
-        r'\$[\d,]+',  # $100,000
-        r'\d+\.\d+%',  # 5.5%
-        r'\d+%',  # 5%
-        r'\d+[km]',  # 100k, 5m
-    ]
-    if any(re.search(pattern, all_text) for pattern in price_patterns):
+    # 2. Number/price-based classification ($100,000, 5.5%, 5%, 100k, 5m)
+    if _PRICE_RE.search(all_text):
         # Check context
-        if any(keyword in all_text for keyword in ["bitcoin", "btc", "ethereum", "eth", "crypto", "cryptocurrency"]):
+        if not hits.isdisjoint(PRICE_CRYPTO_CONTEXT):
             logger.debug(f"[CATEGORY] Price + crypto context → crypto/BTC")
             return "crypto/BTC"
-        elif any(keyword in all_text for keyword in ["stock", "share", "nasdaq", "sp500", "dow", "tsla", "aapl", "nvda"]):
+        elif not hits.isdisjoint(PRICE_STOCK_CONTEXT):
             logger.debug(f"[CATEGORY] Price + stock context → stocks/Companies")
             return "stocks/Companies"
-        elif any(keyword in all_text for keyword in ["fed", "federal reserve", "interest rate", "inflation", "gdp"]):
+        elif not hits.isdisjoint(PRICE_MACRO_CONTEXT):
             logger.debug(f"[CATEGORY] Price + macro context → macro/Fed")
             return "macro/Fed"
         else:
@@ -672,64 +759,12 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
             logger.debug(f"[CATEGORY] Price pattern detected → macro/Fed")
             return "macro/Fed"
     
-    # 4. Very short text classification (use ML more aggressively)
-    combined_text = f"{question_lower} {slug_lower}".strip()
-    if combined_text and len(combined_text) < 30:
-        try:
-            from ml_classifier import classify_with_ml
-            ml_category = classify_with_ml(combined_text)
-            if ml_category and ml_category != "other/Unknown":
-                logger.debug(f"[CATEGORY] ML (short text) classified '{combined_text[:50]}...' as '{ml_category}'")
-                return ml_category
-        except Exception as e:
-            logger.debug(f"[CATEGORY] ML classification failed: {e}")
-    
-    # 5. Try ML classifier as fallback (standard)
-    if combined_text:
-        try:
-            from ml_classifier import classify_with_ml
-            ml_category = classify_with_ml(combined_text)
-            if ml_category and ml_category != "other/Unknown":
-                logger.debug(f"[CATEGORY] ML classified '{combined_text[:50]}...' as '{ml_category}'")
-                return ml_category
-        except Exception as e:
-            logger.debug(f"[CATEGORY] ML classification failed: {e}")
-    
-    # 6. Very aggressive ML fallback (even lower threshold)
-    if combined_text:
-        try:
-            from ml_classifier import classify_with_ml
-            # Try to get prediction even with very low confidence
-            import sys
-            import os
-            sys.path.insert(0, os.path.dirname(__file__))
-            from ml_classifier import SKLEARN_AVAILABLE
-            if SKLEARN_AVAILABLE:
-                from sklearn.feature_extraction.text import TfidfVectorizer
-                from sklearn.linear_model import LogisticRegression
-                from sklearn.pipeline import Pipeline
-                from ml_classifier import TRAINING_DATA
-                
-                # Quick ML prediction with very low threshold
-                texts = [text for text, _ in TRAINING_DATA]
-                labels = [label for _, label in TRAINING_DATA]
-                
-                pipeline = Pipeline([
-                    ('tfidf', TfidfVectorizer(max_features=500, ngram_range=(1, 2))),
-                    ('clf', LogisticRegression(max_iter=1000, random_state=42))
-                ])
-                pipeline.fit(texts, labels)
-                
-                prediction = pipeline.predict([combined_text.lower()])[0]
-                probabilities = pipeline.predict_proba([combined_text.lower()])[0]
-                max_prob = max(probabilities)
-                
-                # Very aggressive: accept even 1% confidence (reduced from 5%)
-                if max_prob > 0.01 and prediction != "other/Unknown":
-                    logger.debug(f"[CATEGORY] Aggressive ML classified '{combined_text[:50]}...' as '{prediction}' (confidence: {max_prob:.2f})")
-                    return prediction
-        except Exception as e:
-            logger.debug(f"[CATEGORY] Aggressive ML failed: {e}")
+    return None
+
+
+def _classify_by_patterns(slug: Optional[str], combined_text: str) -> str:
+    """Last-resort slug and context heuristics of classify_market"""
+    slug_lower = (slug or "").lower()
     
     # 7. Slug/condition_id pattern classification (before context heuristics)
     # Many Unknown markets have patterns in slug/condition_id
@@ -739,26 +774,26 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
     # Check slug patterns
     if slug_text:
         # NFL patterns in slug
-        if re.search(r'nfl-|nfl_|nfl\s', slug_text) or any(team in slug_text for team in ["bal-", "mia-", "car-", "atl-", "sf-", "ari-", "phi-", "gb-", "jax-", "hou-"]):
+        if _SLUG_NFL_RE.search(slug_text) or any(team in slug_text for team in ["bal-", "mia-", "car-", "atl-", "sf-", "ari-", "phi-", "gb-", "jax-", "hou-"]):
             logger.debug(f"[CATEGORY] Slug pattern: NFL → sports/NFL")
             return "sports/NFL"
         
         # NBA patterns
-        if re.search(r'nba-|nba_|nba\s', slug_text):
+        if _SLUG_NBA_RE.search(slug_text):
             logger.debug(f"[CATEGORY] Slug pattern: NBA → sports/NBA")
             return "sports/NBA"
         
         # Crypto patterns
-        if re.search(r'bitcoin|btc-|btc_|btc\s', slug_text, re.IGNORECASE):
+        if _SLUG_BTC_RE.search(slug_text):
             logger.debug(f"[CATEGORY] Slug pattern: Bitcoin → crypto/BTC")
             return "crypto/BTC"
         
-        if re.search(r'ethereum|eth-|eth_|eth\s|solana|sol-|sol_', slug_text, re.IGNORECASE):
+        if _SLUG_ALTCOIN_RE.search(slug_text):
             logger.debug(f"[CATEGORY] Slug pattern: Altcoin → crypto/Altcoins")
             return "crypto/Altcoins"
         
         # Up or down patterns in slug
-        if re.search(r'up-or-down|updown|up-down', slug_text, re.IGNORECASE):
+        if _SLUG_UPDOWN_RE.search(slug_text):
             if "bitcoin" in slug_text or "btc" in slug_text:
                 return "crypto/BTC"
             elif "ethereum" in slug_text or "eth" in slug_text:
@@ -767,17 +802,17 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
                 return "crypto/BTC"  # Default to BTC for up/down
         
         # LoL/Gaming patterns
-        if re.search(r'lol-|lol_|lol\s|cs2-|cs2_|counter-strike', slug_text, re.IGNORECASE):
+        if _SLUG_GAMING_RE.search(slug_text):
             logger.debug(f"[CATEGORY] Slug pattern: Gaming → entertainment/Gaming")
             return "entertainment/Gaming"
         
         # ATP/Tennis patterns
-        if re.search(r'atp-|atp_|atp\s|tennis', slug_text, re.IGNORECASE):
+        if _SLUG_TENNIS_RE.search(slug_text):
             logger.debug(f"[CATEGORY] Slug pattern: Tennis → sports/Other")
             return "sports/Other"
         
         # Date patterns in slug (YYYY-MM-DD)
-        if re.search(r'\d{4}-\d{2}-\d{2}', slug_text):
+        if _SLUG_DATE_RE.search(slug_text):
             # If it's a sports slug with date, classify as sports
             if any(sport in slug_text for sport in ["nfl", "nba", "nhl", "mlb", "lol", "cs2", "atp"]):
                 if "nfl" in slug_text:
@@ -798,7 +833,7 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
         # Check for common patterns even in short/partial text
         
         # Election patterns (check FIRST before up/down to avoid false positives)
-        if re.search(r'\b(win|winner|election|vote|president|senate|house|parliamentary)\b', combined_text, re.IGNORECASE):
+        if _ELECTION_RE.search(combined_text):
             if any(kw in combined_text for kw in ["us", "usa", "united states", "biden", "trump", "harris"]):
                 logger.debug(f"[CATEGORY] Heuristic: US election pattern → politics/US")
                 return "politics/US"
@@ -807,12 +842,12 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
                 return "politics/Global"
         
         # Spread/O/U patterns (NFL betting)
-        if re.search(r'\bspread\b|o/u|over/under', combined_text, re.IGNORECASE):
+        if _SPREAD_RE.search(combined_text):
             logger.debug(f"[CATEGORY] Heuristic: spread/o/u pattern → sports/NFL")
             return "sports/NFL"
         
         # Up or down patterns (very common in Unknown)
-        if re.search(r'\bup\s+or\s+down\b|\bupdown\b|\bup-down\b', combined_text, re.IGNORECASE):
+        if _UPDOWN_HEURISTIC_RE.search(combined_text):
             if any(kw in combined_text for kw in ["bitcoin", "btc"]):
                 logger.debug(f"[CATEGORY] Heuristic: up/down + bitcoin → crypto/BTC")
                 return "crypto/BTC"
@@ -825,12 +860,12 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
                 return "crypto/BTC"
         
         # Spread/O/U patterns (NFL betting)
-        if re.search(r'\bspread\b|o/u|over/under', combined_text, re.IGNORECASE):
+        if _SPREAD_RE.search(combined_text):
             logger.debug(f"[CATEGORY] Heuristic: spread/o/u pattern → sports/NFL")
             return "sports/NFL"
         
         # Election patterns
-        if re.search(r'\b(win|winner|election|vote|president|senate|house|parliamentary)\b', combined_text, re.IGNORECASE):
+        if _ELECTION_RE.search(combined_text):
             if any(kw in combined_text for kw in ["us", "usa", "united states", "biden", "trump", "harris"]):
                 logger.debug(f"[CATEGORY] Heuristic: US election pattern → politics/US")
                 return "politics/US"
@@ -839,7 +874,7 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
                 return "politics/Global"
         
         # Price patterns
-        elif re.search(r'\b(price|above|below|close|reach|hit)\b', combined_text, re.IGNORECASE):
+        elif _PRICE_MOVE_RE.search(combined_text):
             # Generic price movement → likely crypto or macro
             if any(kw in combined_text for kw in ["bitcoin", "btc", "crypto"]):
                 logger.debug(f"[CATEGORY] Heuristic: price + crypto → crypto/BTC")
@@ -852,7 +887,7 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
                 return "macro/Fed"
         
         # Game/match patterns
-        elif re.search(r'\b(game|match|vs|versus|team|player|winner)\b', combined_text, re.IGNORECASE):
+        elif _GAME_MATCH_RE.search(combined_text):
             # Check for specific sports
             if any(kw in combined_text for kw in ["nfl", "football", "super bowl"]):
                 logger.debug(f"[CATEGORY] Heuristic: game + NFL → sports/NFL")
@@ -868,7 +903,7 @@ def classify_market(event: Dict[str, Any], slug: Optional[str] = None, question:
                 return "sports/Other"
         
         # Month/year patterns (dates)
-        elif re.search(r'\b(november|october|december|january|february|march|april|may|june|july|august|september)\s+\d+|\b(202[4-9]|20[3-9][0-9])\b', combined_text, re.IGNORECASE):
+        elif _MONTH_YEAR_RE.search(combined_text):
             # If it's clearly crypto with date
             if any(kw in combined_text for kw in ["bitcoin", "btc", "ethereum", "eth", "up or down", "updown"]):
                 if "bitcoin" in combined_text or "btc" in combined_text:
@@ -4,10 +4,13 @@ Uses TF-IDF and Logistic Regression for text classification
 Requires scikit-learn: pip install scikit-learn
 """
 
+import hashlib
+import json
 import logging
 import pickle
 import os
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +20,7 @@ try:
     from sklearn.linear_model import LogisticRegression
     from sklearn.pipeline import Pipeline
     import numpy as np
+    import sklearn
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
@@ -263,83 +267,186 @@ TRAINING_DATA = [
     ("o/u", "sports/NFL"),
 ]
 
+# Model artifact: both pipelines are trained offline (python ml_classifier.py --build)
+# and unpickled once per process. Bump MODEL_VERSION when the pipeline parameters change;
+# edits to TRAINING_DATA or a scikit-learn upgrade are detected through the fingerprint
+# stored in the artifact.
+MODEL_VERSION = 1
+MODEL_PATH = os.getenv(
+    "ML_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", f"market_classifier_v{MODEL_VERSION}.pkl")
+)
+
+# Standard model (classify_with_ml) and the smaller "aggressive" last-resort model
+# used by market_utils.classify_market
+STANDARD_MAX_FEATURES = 1000
+AGGRESSIVE_MAX_FEATURES = 500
+STANDARD_THRESHOLD = 0.005
+AGGRESSIVE_THRESHOLD = 0.01
+
 # Initialize classifier
 _classifier = None
 _vectorizer = None
+_aggressive_classifier = None
+_models_lock = threading.Lock()
 
-def _train_classifier():
-    """Train ML classifier on training data"""
-    global _classifier, _vectorizer
+
+def _training_fingerprint() -> str:
+    payload = json.dumps([MODEL_VERSION, sklearn.__version__, STANDARD_MAX_FEATURES, AGGRESSIVE_MAX_FEATURES,
+                          TRAINING_DATA])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _build_pipeline(max_features: int):
+    """Fit a TF-IDF + LogisticRegression pipeline on TRAINING_DATA"""
+    texts = [text for text, _ in TRAINING_DATA]
+    labels = [label for _, label in TRAINING_DATA]
+    pipeline = Pipeline([
+        ('tfidf', TfidfVectorizer(max_features=max_features, ngram_range=(1, 2))),
+        ('clf', LogisticRegression(max_iter=1000, random_state=42))
+    ])
+    pipeline.fit(texts, labels)
+    return pipeline
+
+
+def build_model_artifact(path: str = MODEL_PATH) -> bool:
+    """Train both pipelines and write the versioned artifact (atomic replace)"""
+    if not SKLEARN_AVAILABLE:
+        logger.warning("[ML] scikit-learn not available, cannot build model artifact")
+        return False
+    try:
+        artifact = {
+            "version": MODEL_VERSION,
+            "fingerprint": _training_fingerprint(),
+            "standard": _build_pipeline(STANDARD_MAX_FEATURES),
+            "aggressive": _build_pipeline(AGGRESSIVE_MAX_FEATURES),
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        logger.info(f"[ML] Built model artifact v{MODEL_VERSION} on {len(TRAINING_DATA)} examples → {path}")
+        return True
+    except Exception as e:
+        logger.warning(f"[ML] Failed to build model artifact: {e}")
+        return False
+
+
+def _load_model_artifact(path: str = MODEL_PATH):
+    """Return the artifact dict, or None if it is missing, unreadable or stale"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            artifact = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"[ML] Failed to load model artifact {path}: {e}")
+        return None
+    if artifact.get("version") != MODEL_VERSION or artifact.get("fingerprint") != _training_fingerprint():
+        logger.warning(f"[ML] Model artifact {path} is stale (rebuild with: python ml_classifier.py --build)")
+        return None
+    return artifact
+
+
+def _load_models():
+    """Load both pipelines once per process (artifact first, in-process training as fallback)"""
+    global _classifier, _vectorizer, _aggressive_classifier
     
     if not SKLEARN_AVAILABLE:
         return None, None
     
-    if _classifier is not None:
-        return _classifier, _vectorizer
-    
-    try:
-        # Prepare training data
-        texts = [text for text, _ in TRAINING_DATA]
-        labels = [label for _, label in TRAINING_DATA]
-        
-        # Create pipeline
-        _classifier = Pipeline([
-            ('tfidf', TfidfVectorizer(max_features=1000, ngram_range=(1, 2))),
-            ('clf', LogisticRegression(max_iter=1000, random_state=42))
-        ])
-        
-        # Train
-        _classifier.fit(texts, labels)
-        
-        logger.info(f"[ML] Trained classifier on {len(TRAINING_DATA)} examples")
-        return _classifier, _classifier.named_steps['tfidf']
-    except Exception as e:
-        logger.warning(f"[ML] Failed to train classifier: {e}")
+    if _classifier is not None and _aggressive_classifier is not None:
+        return _classifier, _aggressive_classifier
+    
+    with _models_lock:
+        if _classifier is not None and _aggressive_classifier is not None:
+            return _classifier, _aggressive_classifier
+        try:
+            artifact = _load_model_artifact()
+            if artifact is not None:
+                # A classifier installed with load_classifier() takes precedence
+                standard = _classifier or artifact["standard"]
+                aggressive = artifact["aggressive"]
+                logger.info(f"[ML] Loaded model artifact v{MODEL_VERSION} from {MODEL_PATH}")
+            else:
+                standard = _classifier or _build_pipeline(STANDARD_MAX_FEATURES)
+                aggressive = _build_pipeline(AGGRESSIVE_MAX_FEATURES)
+                logger.info(f"[ML] Trained classifier on {len(TRAINING_DATA)} examples (no model artifact)")
+            _aggressive_classifier = aggressive
+            _classifier = standard
+            _vectorizer = standard.named_steps['tfidf']
+        except Exception as e:
+            logger.warning(f"[ML] Failed to load classifier: {e}")
+            return None, None
+    return _classifier, _aggressive_classifier
+
+
+def _train_classifier():
+    """Standard classifier and its vectorizer (loaded from the model artifact when available)"""
+    classifier, _ = _load_models()
+    if classifier is None:
         return None, None
+    return classifier, classifier.named_steps['tfidf']
 
-def classify_with_ml(text: str) -> Optional[str]:
+
+def classify_batch(texts: List[str], aggressive: bool = False) -> List[Optional[str]]:
     """
-    Classify text using ML classifier
+    Classify many texts with one vectorizer pass and one predict_proba call
     
     Args:
-        text: Text to classify
+        texts: Texts to classify
+        aggressive: Use the smaller last-resort model (1% confidence threshold)
         
     Returns:
-        Category string or None if classification fails
+        Category string or None per input text
     """
-    if not SKLEARN_AVAILABLE:
-        return None
+    results: List[Optional[str]] = [None] * len(texts)
+    if not SKLEARN_AVAILABLE or not texts:
+        return results
     
-    if not text or len(text.strip()) < 3:
-        return None
+    min_length = 1 if aggressive else 3
+    indexes = [i for i, text in enumerate(texts) if text and len(text.strip()) >= min_length]
+    if not indexes:
+        return results
     
     try:
-        classifier, vectorizer = _train_classifier()
+        standard, aggressive_model = _load_models()
+        classifier = aggressive_model if aggressive else standard
         if classifier is None:
-            return None
-        
-        # Predict
-        prediction = classifier.predict([text.lower()])[0]
-        probabilities = classifier.predict_proba([text.lower()])[0]
-        max_prob = max(probabilities)
-        
-        # Very aggressive classification to reduce Unknown % to 20%
-        # Accept predictions with very low confidence
-        threshold = 0.01  # Very low threshold for aggressive classification (reduced from 0.05)
+            return results
         
-        if max_prob > threshold and prediction != "other/Unknown":
-            logger.debug(f"[ML] Classified '{text[:50]}...' as '{prediction}' (confidence: {max_prob:.2f})")
-            return prediction
+        # predict() is the argmax of predict_proba for LogisticRegression
+        probabilities = classifier.predict_proba([texts[i].lower() for i in indexes])
+        best = np.argmax(probabilities, axis=1)
+        classes = classifier.classes_
+        # Very aggressive classification to reduce Unknown % to 20%:
+        # accept any non-Unknown prediction above the (very low) threshold
+        threshold = AGGRESSIVE_THRESHOLD if aggressive else STANDARD_THRESHOLD
         
-        # Even more aggressive: accept any non-Unknown prediction with > 0.5% confidence
-        if max_prob > 0.005 and prediction != "other/Unknown":
-            logger.debug(f"[ML] Very low-confidence classification '{text[:50]}...' as '{prediction}' (confidence: {max_prob:.2f})")
-            return prediction
-        
-        return None
+        for row, i in enumerate(indexes):
+            prediction = classes[best[row]]
+            max_prob = probabilities[row, best[row]]
+            if max_prob > threshold and prediction != "other/Unknown":
+                logger.debug(f"[ML] Classified '{texts[i][:50]}...' as '{prediction}' (confidence: {max_prob:.2f})")
+                results[i] = str(prediction)
+        return results
     except Exception as e:
         logger.debug(f"[ML] Classification error: {e}")
-        return None
+        return results
+
+
+def classify_with_ml(text: str) -> Optional[str]:
+    """
+    Classify text using ML classifier
+    
+    Args:
+        text: Text to classify
+        
+    Returns:
+        Category string or None if classification fails
+    """
+    return classify_batch([text])[0]
 
 def save_classifier(path: str = "market_classifier.pkl"):
     """Save trained classifier to file"""
@@ -365,3 +472,11 @@ def load_classifier(path: str = "market_classifier.pkl"):
         logger.warning(f"[ML] Failed to load classifier: {e}")
     return False
 
+
+if __name__ == "__main__":
+    import sys
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if "--build" in sys.argv:
+        sys.exit(0 if build_model_artifact() else 1)
+    print("Usage: python ml_classifier.py --build   # write the versioned model artifact")
@@ -28,7 +28,8 @@ logger = logging.getLogger(__name__)
 
 class TelegramNotifier:
     def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None, 
-                 reports_chat_id: Optional[str] = None, hashdive_client: Optional[Any] = None):
+                 reports_chat_id: Optional[str] = None, hashdive_client: Optional[Any] = None,
+                 db: Optional[Any] = None):
         self.bot_token = bot_token or os.getenv("TELEGRAM_BOT_TOKEN")
         self.chat_id = chat_id or os.getenv("TELEGRAM_CHAT_ID")  # public signals
         # admin/reports channel; default to provided id if env not set
@@ -74,6 +75,9 @@ class TelegramNotifier:
         # Store HashiDive client for price fallback
         self.hashdive_client = hashdive_client
         
+        # PolymarketDB for wallet win rates in alerts (opened on first use if not shared)
+        self.db = db
+        
         # Initialize Polymarket authentication (optional)
         self.polymarket_auth = None
         if POLYMARKET_AUTH_AVAILABLE:
@@ -85,6 +89,13 @@ class TelegramNotifier:
         if not self.bot_token or not self.chat_id:
             logger.warning("Telegram credentials not configured. Notifications will be printed to console.")
     
+    def _get_db(self):
+        """Shared PolymarketDB, or one opened on DB_PATH the first time it is needed"""
+        if self.db is None:
+            from db import PolymarketDB
+            self.db = PolymarketDB(os.getenv("DB_PATH", "polymarket_notifier.db"))
+        return self.db
+    
     def _make_authenticated_get(self, url: str, timeout: int = 5) -> requests.Response:
         """Make authenticated GET request to Polymarket API if auth is available"""
         # TEMPORARILY DISABLED: Builder API authentication disabled (keys not visible on site)
@@ -861,14 +872,14 @@ class TelegramNotifier:
         
         # Get wallet info with winrates and prices from database
         wallet_info = []
+        try:
+            win_rates = self._get_db().get_wallet_win_rates(wallets[:4])
+        except Exception as e:
+            logger.debug(f"Failed to load wallet win rates: {e}")
+            win_rates = {}
         for i, wallet in enumerate(wallets[:4], 1):
             try:
-                import sqlite3
-                conn = sqlite3.connect('polymarket_notifier.db')
-                cursor = conn.cursor()
-                cursor.execute('SELECT win_rate, traded_total FROM wallets WHERE address = ?', (wallet,))
-                result = cursor.fetchone()
-                conn.close()
+                result = win_rates.get(wallet)
                 
                 # Mask address: keep first 3 hex after '0x' and last 3 chars
                 try:
@@ -0,0 +1,96 @@
+"""
+Daily partition tables for append-only time series.
+
+Each UTC day of a series lives in its own table, <base>_YYYYMMDD, created on
+first write. Reads open only the partitions that overlap the requested
+window, and retention drops whole partitions (DROP TABLE) instead of
+deleting rows one by one, so the database file stops growing with history
+and old data costs nothing to remove.
+"""
+
+import re
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Sequence
+
+
+def epoch_seconds(value: Any) -> Optional[float]:
+    """Epoch seconds from an ISO/'YYYY-MM-DD HH:MM:SS' string or a (milli)second number"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value:
+        return value / 1000.0 if value > 1e10 else float(value)
+    if isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return None
+
+
+class DailyPartitions:
+    """One table per UTC day for a series with a fixed column layout"""
+
+    def __init__(self, base: str, columns: str, indexes: Sequence[str] = ()):
+        """columns is the column list of CREATE TABLE; indexes are column lists, one index each"""
+        self.base = base
+        self.columns = columns
+        self.indexes = tuple(indexes)
+        self._pattern = re.compile(rf"^{re.escape(base)}_(\d{{8}})$")
+
+    @staticmethod
+    def day_of(ts: float) -> str:
+        return time.strftime("%Y%m%d", time.gmtime(ts))
+
+    def table(self, day: str) -> str:
+        return f"{self.base}_{day}"
+
+    def ensure(self, cursor: sqlite3.Cursor, ts: float) -> str:
+        """Partition table for ts, created with its indexes if missing
+
+        Runs CREATE ... IF NOT EXISTS on every call (a schema lookup when the
+        table exists) inside the caller's transaction, so the table is there
+        whichever database the cursor belongs to, whatever another process
+        dropped, and even if an earlier create was rolled back.
+        """
+        name = self.table(self.day_of(ts))
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {name}({self.columns})")
+        for i, index_columns in enumerate(self.indexes):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{i} ON {name}({index_columns})")
+        return name
+
+    def days(self, cursor: sqlite3.Cursor) -> List[str]:
+        """Existing partition days, newest first (read from the schema, so other processes' partitions count)"""
+        # LIKE's "_" matches any character; the pattern check below is exact
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?",
+            (f"{self.base}_%",)
+        )
+        days = []
+        for (name,) in cursor.fetchall():
+            match = self._pattern.match(name)
+            if match:
+                days.append(match.group(1))
+        return sorted(days, reverse=True)
+
+    def tables(self, cursor: sqlite3.Cursor, start_ts: Optional[float] = None,
+               end_ts: Optional[float] = None) -> List[str]:
+        """Existing partitions overlapping [start_ts, end_ts], newest first"""
+        first = self.day_of(start_ts) if start_ts is not None else None
+        last = self.day_of(end_ts) if end_ts is not None else None
+        return [
+            self.table(day) for day in self.days(cursor)
+            if (first is None or day >= first) and (last is None or day <= last)
+        ]
+
+    def drop_before(self, cursor: sqlite3.Cursor, cutoff_ts: float) -> int:
+        """Drop partitions whose whole day is older than cutoff_ts; returns how many"""
+        cutoff_day = self.day_of(cutoff_ts)
+        dropped = 0
+        for day in self.days(cursor):
+            if day < cutoff_day:
+                cursor.execute(f"DROP TABLE IF EXISTS {self.table(day)}")
+                dropped += 1
+        return dropped
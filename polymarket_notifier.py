@@ -10,7 +10,7 @@ import logging
 import threading
 import json
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -25,6 +25,7 @@ except Exception as e:
     PLAYWRIGHT_AVAILABLE = False
 
 from db import PolymarketDB
+from trade_events import TradeEvent
 from notify import TelegramNotifier
 from market_utils import classify_market
 from wallet_analyzer import WalletAnalyzer, AnalysisConfig, WIN_RATE_THRESHOLD, MAX_DAILY_FREQUENCY, MIN_TRADES
@@ -182,7 +183,8 @@ class PolymarketNotifier:
         self.notifier = TelegramNotifier(
             self.telegram_token, 
             self.telegram_chat_id,
-            hashdive_client=self.hashdive_client
+            hashdive_client=self.hashdive_client,
+            db=self.db
         )
         
         # Initialize ClickHouse client
@@ -249,7 +251,7 @@ class PolymarketNotifier:
             f"check_interval={self.order_flow_check_interval_min:.1f}min"
         )
         if BET_MONITOR_AVAILABLE:
-            self.bet_detector = BetDetector(self.db_path)
+            self.bet_detector = BetDetector(self.db_path, db=self.db)
         else:
             self.bet_detector = None
         
@@ -320,6 +322,14 @@ class PolymarketNotifier:
             'by_reason': {}
         }
         
+        # Consensus pipeline stage counters: stage -> passed/dropped/time_ms
+        self.consensus_stage_stats: Dict[str, Dict[str, float]] = {}
+        
+        # Market status cache: (condition_id, outcome_index) -> (checked_at, is_active)
+        self._market_status_cache: Dict[Tuple[str, Optional[int]], Tuple[float, bool]] = {}
+        self.market_status_ttl_active_sec = self._get_env_float("MARKET_STATUS_TTL_ACTIVE_SEC", 60.0)
+        self.market_status_ttl_closed_sec = self._get_env_float("MARKET_STATUS_TTL_CLOSED_SEC", 3600.0)
+        
     def validate_config(self) -> bool:
         """Validate configuration and environment variables"""
         if not self.telegram_token or not self.telegram_chat_id:
@@ -685,11 +695,12 @@ class PolymarketNotifier:
                 logger.info(f"Got {len(addresses)} addresses from polymarketanalytics.com")
                 
                 # Convert to expected format and log to raw_collected_wallets
-                for addr in addresses:
+                for rank, addr in enumerate(addresses, start=1):
                     addr_lower = addr.lower()
                     wallets[addr_lower] = {
                         "display": addr_lower,
-                        "source": "polymarket_analytics"
+                        "source": "polymarket_analytics",
+                        "rank": rank  # API returns traders best first
                     }
                     # Log to raw_collected_wallets
                     self.db.insert_raw_collected_wallet(addr_lower, "polymarket_analytics")
@@ -902,14 +913,15 @@ class PolymarketNotifier:
                     leaderboard_wallets = {}
             
             # Merge leaderboard wallets into all_wallets and log to raw_collected_wallets
-            for addr, info in leaderboard_wallets.items():
+            for rank, (addr, info) in enumerate(leaderboard_wallets.items(), start=1):
                 addr_lower = addr.lower()
                 # Log to raw_collected_wallets
                 self.db.insert_raw_collected_wallet(addr_lower, "leaderboards_html")
                 if addr_lower not in all_wallets:
                     all_wallets[addr_lower] = {
                         "display": info.get("display", addr_lower),
-                        "source": info.get("source", "leaderboards_html")
+                        "source": info.get("source", "leaderboards_html"),
+                        "rank": info.get("rank", rank)  # Scrape order follows the leaderboard
                     }
             
             logger.info(f"[COLLECTION] ✅ Leaderboards HTML: collected {len(leaderboard_wallets)} wallets from {len(self.leaderboard_urls)} URLs")
@@ -1024,7 +1036,7 @@ class PolymarketNotifier:
         
         return added_count
     
-    def get_new_trades(self, address: str, last_seen_trade_id: Optional[str], side: str = "BUY") -> tuple[List[Dict[str, Any]], Optional[str]]:
+    def get_new_trades(self, address: str, last_seen_trade_id: Optional[str], side: str = "BUY") -> tuple[List[TradeEvent], Optional[str]]:
         """Get new trades for a wallet filtered by side (BUY/SELL), with HashiDive fallback"""
         try:
             params = {"user": address, "side": side, "limit": 50}
@@ -1293,18 +1305,10 @@ class PolymarketNotifier:
                 if usd_amount == 0.0:
                     logger.warning(f"Warning: USD amount is 0 for trade {trade_id[:8]}, price={price}, quantity={quantity}, available_keys={list(trade.keys())}")
                 
-                new_events.append({
-                    "trade_id": trade_id,
-                    "conditionId": condition_id,
-                    "outcomeIndex": int(outcome_index),
-                    "timestamp": float(timestamp),
-                    "marketTitle": market_title,  # Store title for alerts
-                    "marketSlug": market_slug,  # Store slug for URL
-                    "price": price,  # Store entry price
-                    "side": side,  # Store direction
-                    "usd": usd_amount,
-                    "quantity": quantity  # Store quantity for fallback calculation
-                })
+                new_events.append(TradeEvent.create(
+                    address, trade_id, timestamp, price, condition_id, outcome_index, side,
+                    usd=usd_amount, quantity=quantity, market_title=market_title
+                ))
                 
                 if newest_id is None:
                     newest_id = trade_id
@@ -1541,73 +1545,81 @@ class PolymarketNotifier:
                     pass
             return True # Assume active on error to avoid blocking valid markets
     
+    def is_market_active_cached(self, condition_id: str, outcome_index: Optional[int] = None) -> bool:
+        """
+        is_market_active with a short-lived in-memory cache.
+        
+        Active results expire after MARKET_STATUS_TTL_ACTIVE_SEC, closed ones after
+        MARKET_STATUS_TTL_CLOSED_SEC (markets rarely reopen).
+        """
+        cache_key = (condition_id, outcome_index)
+        now = time.time()
+        cached = self._market_status_cache.get(cache_key)
+        if cached is not None:
+            checked_at, is_active = cached
+            ttl = self.market_status_ttl_active_sec if is_active else self.market_status_ttl_closed_sec
+            if now - checked_at < ttl:
+                return is_active
+        
+        is_active = self.is_market_active(condition_id, outcome_index)
+        self._market_status_cache[cache_key] = (now, is_active)
+        if len(self._market_status_cache) > 10000:
+            cutoff = now - self.market_status_ttl_closed_sec
+            self._market_status_cache = {
+                k: v for k, v in self._market_status_cache.items() if v[0] >= cutoff
+            }
+        return is_active
+    
+    def _enter_stage(self, trace: Dict[str, Any], stage: str):
+        """Close the current consensus stage as passed and start timing the next one"""
+        now = time.perf_counter()
+        self._close_stage(trace, dropped=False, now=now)
+        trace["stage"] = stage
+        trace["started"] = now
+    
+    def _close_stage(self, trace: Dict[str, Any], dropped: bool = True, now: Optional[float] = None):
+        """Record the current consensus stage (if any) as passed or dropped"""
+        stage = trace.pop("stage", None)
+        if stage is None:
+            return
+        if now is None:
+            now = time.perf_counter()
+        stats = self.consensus_stage_stats.setdefault(stage, {'passed': 0, 'dropped': 0, 'time_ms': 0.0})
+        stats['dropped' if dropped else 'passed'] += 1
+        stats['time_ms'] += (now - trace.pop("started", now)) * 1000.0
+    
+    def format_consensus_stage_stats(self) -> str:
+        """One-line summary of consensus stage counters for [STATS] logs"""
+        parts = []
+        for stage, stats in self.consensus_stage_stats.items():
+            total = stats['passed'] + stats['dropped']
+            avg_ms = stats['time_ms'] / total if total else 0.0
+            parts.append(f"{stage}={stats['passed']}/{total} (drop={stats['dropped']}, avg={avg_ms:.1f}ms)")
+        return " ".join(parts) if parts else "none"
+    
     def check_consensus_and_alert(self, condition_id: str, outcome_index: int, 
                                  wallet: str, trade_id: str, timestamp: float, 
                                  price: float = 0, side: str = "BUY", 
                                  market_title: str = "", market_slug: str = "",
                                  usd_amount: float = 0.0, quantity: float = 0.0):
-        """Check for consensus and send alert if threshold met"""
+        """Check for consensus and send alert if threshold met
+        
+        Single-event entry point: updates the rolling window, applies the
+        first-entry gate and hands the window to _evaluate_consensus.
+        The monitor loop uses process_sweep_events instead.
+        """
+        trace = {}
         try:
-            # Get unique wallets in window first to log candidate
+            self._enter_stage(trace, "window")
+            # Update rolling window grouped by direction
             key, window_data = self.db.update_rolling_window(
                 condition_id, outcome_index, wallet, trade_id, timestamp, 
                 self.alert_window_min, market_title, market_slug, price, side,
                 usd_amount=usd_amount, quantity=quantity
             )
-            # CRITICAL: Filter events by time window before counting wallets
-            # Only include events within the alert_window_min from the most recent event
-            events = window_data.get("events", [])
-            if events:
-                # Get the most recent event timestamp
-                latest_event_ts = max(e["ts"] for e in events)
-                window_start_ts = latest_event_ts - (self.alert_window_min * 60)
-                
-                # Filter events to only include those within the time window
-                recent_events = [e for e in events if e["ts"] >= window_start_ts]
-                
-                # Log if we filtered out old events
-                if len(recent_events) < len(events):
-                    filtered_count = len(events) - len(recent_events)
-                    logger.warning(
-                        f"[CONSENSUS] ⚠️  Filtered out {filtered_count} old event(s) outside {self.alert_window_min}min window. "
-                        f"Events: {len(events)} -> {len(recent_events)} (window: {window_start_ts:.0f} to {latest_event_ts:.0f})"
-                    )
-                
-                events = recent_events
-            
-            wallets_in_window = sorted({e["wallet"] for e in events})
-            # Save a copy of wallets_in_window for database storage (to prevent modification)
-            wallets_for_db = list(wallets_in_window) if wallets_in_window else []
-            
-            # Log candidate with detailed info
-            if not hasattr(self, 'monitoring_stats'):
-                self.monitoring_stats = {"total_consensus_candidates": 0, "total_alerts_blocked": 0, "blocked_reasons": {}}
-            self.monitoring_stats["total_consensus_candidates"] = self.monitoring_stats.get("total_consensus_candidates", 0) + 1
-            
-            logger.info(
-                f"[CONSENSUS] 🔍 Candidate #{self.monitoring_stats['total_consensus_candidates']}: "
-                f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                f"wallets={len(wallets_in_window)}/{self.min_consensus} window={self.alert_window_min} min"
-            )
-            
-            # FIRST CHECK: Skip markets that are already closed/resolved (check at entry)
-            # Skip this check if condition_id is a fallback (starts with SLUG: or TITLE:)
-            # This allows signals even when condition_id is not available
-            if condition_id and not condition_id.startswith(("SLUG:", "TITLE:")):
-                if not self.is_market_active(condition_id, outcome_index):
-                    self.suppressed_counts['market_closed'] = self.suppressed_counts.get('market_closed', 0) + 1
-                    if not hasattr(self, 'monitoring_stats'):
-                        self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                    self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                    reason = "market_inactive_early"
-                    self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                    logger.info(
-                        f"[CONSENSUS] ❌ BLOCKED (early check): Market {condition_id[:20]}... is closed or not found (404). Skipping signal. "
-                        f"wallets={len(wallets_in_window)}/{self.min_consensus} outcome={outcome_index} side={side}"
-                    )
-                    # Don't send suppressed alert here - will be sent in final check if consensus reached
-                    return
             
+            # First entry for this wallet in this market direction
+            self._enter_stage(trace, "first_entry")
             # Check if this is first entry for this wallet in this market direction
             # Skip this check for fallback condition_ids to allow processing
             if condition_id and not condition_id.startswith(("SLUG:", "TITLE:")):
@@ -1618,399 +1630,485 @@ class PolymarketNotifier:
             # Mark this market as traded for this wallet
             self.db.mark_market_traded(wallet, condition_id, side, timestamp)
             
-            # Update rolling window grouped by direction
-            key, window_data = self.db.update_rolling_window(
-                condition_id, outcome_index, wallet, trade_id, timestamp, 
-                self.alert_window_min, market_title, market_slug, price, side,
-                usd_amount=usd_amount, quantity=quantity
-            )
-            
-            # Get unique wallets in window for this direction
-            # CRITICAL: Filter events by time window before counting wallets
-            # Only include events within the alert_window_min from the most recent event
-            all_events = window_data.get("events", [])
-            filtered_events = all_events  # Will be filtered below
-            
-            if all_events:
-                # Get the most recent event timestamp
-                latest_event_ts = max(e["ts"] for e in all_events)
-                window_start_ts = latest_event_ts - (self.alert_window_min * 60)
-                
-                # Filter events to only include those within the time window
-                filtered_events = [e for e in all_events if e["ts"] >= window_start_ts]
-                
-                # Log if we filtered out old events
-                if len(filtered_events) < len(all_events):
-                    filtered_count = len(all_events) - len(filtered_events)
-                    logger.warning(
-                        f"[CONSENSUS] ⚠️  Filtered out {filtered_count} old event(s) outside {self.alert_window_min}min window. "
-                        f"Events: {len(all_events)} -> {len(filtered_events)} (window: {window_start_ts:.0f} to {latest_event_ts:.0f})"
-                    )
-                
-                # Calculate actual time window for recent events
-                if filtered_events:
-                    first_recent_ts = min(e["ts"] for e in filtered_events)
-                    actual_window_minutes = (latest_event_ts - first_recent_ts) / 60.0
-                    logger.info(
-                        f"[CONSENSUS] Time window check: {len(filtered_events)} events within {self.alert_window_min}min window, "
-                        f"actual span: {actual_window_minutes:.1f} minutes"
-                    )
-            
-            wallets_in_window = sorted({e["wallet"] for e in filtered_events})
-            # Save a copy of wallets_in_window for database storage (to prevent modification)
-            wallets_for_db = list(wallets_in_window) if wallets_in_window else []
-            
-            if len(wallets_in_window) < self.min_consensus:
-                if not hasattr(self, 'monitoring_stats'):
-                    self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                reason = "below_threshold"
-                self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                logger.debug(
-                    f"[CONSENSUS] Not enough wallets for market {condition_id[:20]}...: "
-                    f"{len(wallets_in_window)}/{self.min_consensus} within window={self.alert_window_min} min"
-                )
-                logger.info(
-                    f"[CONSENSUS] ⏭️  BLOCKED: Below threshold - {len(wallets_in_window)} < {self.min_consensus} wallets "
-                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} window={self.alert_window_min} min"
+            self._evaluate_consensus(condition_id, outcome_index, side, key, window_data, trace)
+        except Exception as e:
+            logger.error(f"Error checking consensus: {e}")
+        finally:
+            self._close_stage(trace)
+    
+    def process_sweep_events(self, events: List[TradeEvent]) -> int:
+        """Batch consensus for all new events from one monitor sweep
+        
+        Events are grouped by (condition_id, outcome_index, side) in one pass and
+        merged into their rolling windows in a single transaction. Only windows
+        that gained a wallet through a first entry are evaluated. Events with a
+        fallback SLUG:/TITLE: id have no first-entry gate, so they keep the
+        per-event path (check_consensus_and_alert): every repeat trade
+        re-evaluates its window, e.g. for the price-change refresh.
+        
+        Args:
+            events: New trades from this sweep
+        
+        Returns:
+            Number of windows evaluated
+        """
+        if not events:
+            return 0
+        
+        groups: Dict[Tuple[str, int, str], List[TradeEvent]] = {}
+        first_entry_keys = set()
+        fe_trace = {}
+        evaluated = 0
+        # Chronological order so the earliest trade is the one recorded as first entry
+        for event in sorted(events, key=lambda e: e.ts):
+            condition_id = event.condition_id
+            side = event.side
+            if not condition_id or condition_id.startswith(("SLUG:", "TITLE:")):
+                self.check_consensus_and_alert(
+                    condition_id, event.outcome_index, event.wallet, event.trade_id, event.ts,
+                    price=event.price, side=side, market_title=event.market_title or "",
+                    market_slug=event.market_slug, usd_amount=event.usd, quantity=event.quantity
                 )
-                return
+                evaluated += 1
+                continue
+            gkey = event.window_key
+            groups.setdefault(gkey, []).append(event)
+            
+            self._enter_stage(fe_trace, "first_entry")
+            if self.db.has_traded_market(event.wallet, condition_id, side):
+                self._close_stage(fe_trace)
+                continue
+            self.db.mark_market_traded(event.wallet, condition_id, side, event.ts)
+            self._close_stage(fe_trace, dropped=False)
+            first_entry_keys.add(gkey)
+        
+        windows = self.db.update_rolling_windows_batch(groups, self.alert_window_min)
+        
+        for gkey in first_entry_keys:
+            if gkey not in windows:
+                continue
+            key, window_data, prev_wallets = windows[gkey]
+            current_wallets = {e.wallet for e in window_data.get("events", [])}
+            if current_wallets == prev_wallets:
+                continue
+            condition_id, outcome_index, side = gkey
+            trace = {}
+            try:
+                self._evaluate_consensus(condition_id, outcome_index, side, key, window_data, trace)
+            except Exception as e:
+                logger.error(f"Error checking consensus: {e}")
+            finally:
+                self._close_stage(trace)
+            evaluated += 1
+        
+        logger.info(
+            f"[CONSENSUS] Sweep batch: events={len(events)} windows={len(groups)} "
+            f"first_entries={len(first_entry_keys)} evaluated={evaluated}"
+        )
+        return evaluated
+    
+    def _evaluate_consensus(self, condition_id: str, outcome_index: int, side: str,
+                            key: str, window_data: Dict[str, Any], trace: Dict[str, Any]):
+        """Run the consensus gates on an updated rolling window and send the alert if all pass
+        
+        Gates are ordered by cost so most windows exit before any network call:
+        in-memory checks (wallet count, price divergence, position size), then
+        indexed alert lookups (already sent, cooldown), then cached market status,
+        and only then price/network checks. Time spent and drops per stage are
+        tracked in consensus_stage_stats via trace.
+        """
+        # Get unique wallets in window for this direction
+        # CRITICAL: Filter events by time window before counting wallets
+        # Only include events within the alert_window_min from the most recent event
+        all_events = window_data.get("events", [])
+        filtered_events = all_events  # Will be filtered below
+        
+        if all_events:
+            # Get the most recent event timestamp
+            latest_event_ts = max(e.ts for e in all_events)
+            window_start_ts = latest_event_ts - (self.alert_window_min * 60)
             
-            logger.info(
-                f"[CONSENSUS] ✅ Threshold met: {len(wallets_in_window)} >= {self.min_consensus} wallets "
-                f"condition={condition_id[:20]}... outcome={outcome_index} side={side}"
-            )
+            # Filter events to only include those within the time window
+            filtered_events = [e for e in all_events if e.ts >= window_start_ts]
             
-            # STEP 1: Check if market is active (early check after threshold met)
-            # Skip this check if condition_id is a fallback (starts with SLUG: or TITLE:)
-            # This allows signals even when condition_id is not available
-            logger.info(f"[CONSENSUS] Step 1/7: Checking market status for condition={condition_id[:20]}... outcome={outcome_index}")
-            market_is_active_early = True  # Default to True for fallback condition_ids
-            if condition_id and not condition_id.startswith(("SLUG:", "TITLE:")):
-                market_is_active_early = self.is_market_active(condition_id, outcome_index)
-            logger.info(f"[CONSENSUS] Step 1/7: Market active status = {market_is_active_early}")
-            
-            # EARLY CHECK: If market is already closed, skip processing events from rolling window
-            # This prevents delayed alerts for markets that closed while events were in the window
-            # IMPORTANT: Don't send suppressed alerts for old events from closed markets
-            # Suppressed alerts should only be sent in real-time when consensus is detected but market is closed
-            # Skip this check for fallback condition_ids
-            if not market_is_active_early and condition_id and not condition_id.startswith(("SLUG:", "TITLE:")):
-                self.suppressed_counts['market_closed'] = self.suppressed_counts.get('market_closed', 0) + 1
-                if not hasattr(self, 'monitoring_stats'):
-                    self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                reason = "market_inactive_window"
-                self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                logger.info(
-                    f"[CONSENSUS] ❌ BLOCKED (window check): Market {condition_id[:20]}... is closed or not found (404). Skipping signal. "
-                    f"wallets={len(wallets_in_window)}/{self.min_consensus} outcome={outcome_index} side={side} "
-                    f"(events in window from closed market)"
+            # Log if we filtered out old events
+            if len(filtered_events) < len(all_events):
+                filtered_count = len(all_events) - len(filtered_events)
+                logger.warning(
+                    f"[CONSENSUS] ⚠️  Filtered out {filtered_count} old event(s) outside {self.alert_window_min}min window. "
+                    f"Events: {len(all_events)} -> {len(filtered_events)} (window: {window_start_ts:.0f} to {latest_event_ts:.0f})"
                 )
-                # Don't send suppressed alert here - these are old events from closed markets
-                # Suppressed alerts should only be sent in real-time, not for historical events
-                return
             
-            # STEP 2: Check if alert already sent for this direction
-            logger.info(f"[CONSENSUS] Step 2/7: Checking if alert already sent for condition={condition_id[:20]}... outcome={outcome_index} side={side}")
-            alert_key = f"{condition_id}:{outcome_index}:{side}"
-            already_sent = self.db.is_alert_sent(condition_id, outcome_index, 
-                                    window_data["first_ts"], window_data["last_ts"], alert_key)
-            logger.info(f"[CONSENSUS] Step 2/7: Alert already sent = {already_sent}")
-            if already_sent:
-                if not hasattr(self, 'monitoring_stats'):
-                    self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                reason = "already_sent"
-                self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
+            # Calculate actual time window for recent events
+            if filtered_events:
+                first_recent_ts = min(e.ts for e in filtered_events)
+                actual_window_minutes = (latest_event_ts - first_recent_ts) / 60.0
                 logger.info(
-                    f"[CONSENSUS] ⏭️  BLOCKED: Alert already sent - "
-                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                    f"wallets={len(wallets_in_window)}"
+                    f"[CONSENSUS] Time window check: {len(filtered_events)} events within {self.alert_window_min}min window, "
+                    f"actual span: {actual_window_minutes:.1f} minutes"
                 )
-                return
-            
-            # Extract market info and prices from window events
-            # BEST-EFFORT: Try to get market_title from events (for display purposes only)
-            # NOTE: We NO LONGER extract market_slug from events - all slug normalization
+        
+        wallets_in_window = sorted({e.wallet for e in filtered_events})
+        # Save a copy of wallets_in_window for database storage (to prevent modification)
+        wallets_for_db = list(wallets_in_window) if wallets_in_window else []
+        
+        # Log candidate with detailed info
+        if not hasattr(self, 'monitoring_stats'):
+            self.monitoring_stats = {"total_consensus_candidates": 0, "total_alerts_blocked": 0, "blocked_reasons": {}}
+        self.monitoring_stats["total_consensus_candidates"] = self.monitoring_stats.get("total_consensus_candidates", 0) + 1
+        
+        logger.info(
+            f"[CONSENSUS] 🔍 Candidate #{self.monitoring_stats['total_consensus_candidates']}: "
+            f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+            f"wallets={len(wallets_in_window)}/{self.min_consensus} window={self.alert_window_min} min"
+        )
+        
+        # Minimum number of distinct wallets in window
+        self._enter_stage(trace, "wallet_count")
+        if len(wallets_in_window) < self.min_consensus:
+            if not hasattr(self, 'monitoring_stats'):
+                self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+            self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+            reason = "below_threshold"
+            self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
+            logger.debug(
+                f"[CONSENSUS] Not enough wallets for market {condition_id[:20]}...: "
+                f"{len(wallets_in_window)}/{self.min_consensus} within window={self.alert_window_min} min"
+            )
+            logger.info(
+                f"[CONSENSUS] ⏭️  BLOCKED: Below threshold - {len(wallets_in_window)} < {self.min_consensus} wallets "
+                f"condition={condition_id[:20]}... outcome={outcome_index} side={side} window={self.alert_window_min} min"
+            )
+            return
+        
+        logger.info(
+            f"[CONSENSUS] ✅ Threshold met: {len(wallets_in_window)} >= {self.min_consensus} wallets "
+            f"condition={condition_id[:20]}... outcome={outcome_index} side={side}"
+        )
+        
+        # Entry price divergence across the first wallets in window
+        self._enter_stage(trace, "divergence")
+        # Extract market info and prices from window events
+        # BEST-EFFORT: Try to get market_title from events (for display purposes only)
+        # NOTE: We NO LONGER extract market_slug from events - all slug normalization
+        # is handled by notify.TelegramNotifier._get_event_slug_and_market_id() and _get_market_slug()
+        market_title = ""
+        market_slug = ""  # Always empty - notify.py will fetch and normalize slug via API
+        for event in window_data.get("events", []):
+            if event.market_title:
+                market_title = event.market_title
+                break  # Use first available marketTitle
+        wallet_prices = {}  # Map wallet -> price
+        
+        logger.info(f"[CONSENSUS] Extracting wallet_prices from {len(window_data.get('events', []))} events...")
+        for event in window_data.get("events", []):
+            # BEST-EFFORT: Update market_title if we haven't found one yet
+            if event.market_title and not market_title:
+                market_title = event.market_title
+            # NOTE: We NO LONGER extract marketSlug from events - all slug normalization
             # is handled by notify.TelegramNotifier._get_event_slug_and_market_id() and _get_market_slug()
-            market_title = ""
-            market_slug = ""  # Always empty - notify.py will fetch and normalize slug via API
-            for event in window_data.get("events", []):
-                if event.get("marketTitle"):
-                    market_title = event["marketTitle"]
-                    break  # Use first available marketTitle
-            wallet_prices = {}  # Map wallet -> price
-            
-            logger.info(f"[CONSENSUS] Extracting wallet_prices from {len(window_data.get('events', []))} events...")
-            for event in window_data.get("events", []):
-                # BEST-EFFORT: Update market_title if we haven't found one yet
-                if event.get("marketTitle") and not market_title:
-                    market_title = event["marketTitle"]
-                # NOTE: We NO LONGER extract marketSlug from events - all slug normalization
-                # is handled by notify.TelegramNotifier._get_event_slug_and_market_id() and _get_market_slug()
-                event_price = event.get("price")
-                event_wallet = event.get("wallet")
-                if event_price and event_wallet:
-                    wallet_prices[event_wallet] = event.get("price", 0)
-                    logger.debug(f"[CONSENSUS] Added wallet_price: {event_wallet[:12]}... = {event_price}")
-                else:
-                    logger.debug(f"[CONSENSUS] Skipping event - price={event_price}, wallet={event_wallet}")
-            
-            logger.info(f"[CONSENSUS] Extracted wallet_prices: {len(wallet_prices)} wallets with prices: {wallet_prices}")
-            
-            # STEP 3: Apply entry price divergence rule based on first three traders by time
-            logger.info(f"[CONSENSUS] Step 3/7: Checking price divergence for condition={condition_id[:20]}... outcome={outcome_index}")
-            try:
-                events_sorted = sorted(window_data.get("events", []), key=lambda e: e.get("ts", 0))
-                first_three_prices = []
-                seen_wallets = set()
-                for e in events_sorted:
-                    w = e.get("wallet")
-                    if not w or w in seen_wallets:
-                        continue
-                    seen_wallets.add(w)
-                    p = e.get("price")
-                    if isinstance(p, (int, float)) and p > 0:
-                        first_three_prices.append(float(p))
-                    if len(first_three_prices) == 3:
-                        break
+            event_price = event.price
+            event_wallet = event.wallet
+            if event_price and event_wallet:
+                wallet_prices[event_wallet] = event_price
+                logger.debug(f"[CONSENSUS] Added wallet_price: {event_wallet[:12]}... = {event_price}")
+            else:
+                logger.debug(f"[CONSENSUS] Skipping event - price={event_price}, wallet={event_wallet}")
+        
+        logger.info(f"[CONSENSUS] Extracted wallet_prices: {len(wallet_prices)} wallets with prices: {wallet_prices}")
+        
+        # STEP 3: Apply entry price divergence rule based on first three traders by time
+        logger.info(f"[CONSENSUS] Step 3/7: Checking price divergence for condition={condition_id[:20]}... outcome={outcome_index}")
+        try:
+            events_sorted = sorted(window_data.get("events", []), key=lambda e: e.ts)
+            first_three_prices = []
+            seen_wallets = set()
+            for e in events_sorted:
+                w = e.wallet
+                if not w or w in seen_wallets:
+                    continue
+                seen_wallets.add(w)
+                p = e.price
+                if p > 0:
+                    first_three_prices.append(float(p))
                 if len(first_three_prices) == 3:
-                    p_min = min(first_three_prices)
-                    p_max = max(first_three_prices)
-                    # Determine band thresholds
-                    # Maximum 25% divergence allowed for all prices (as per requirements)
-                    # Calculate divergence as (max - min) / max
-                    divergence = (p_max - p_min) / p_max if p_max > 0 else 0
-                    max_allowed_divergence = 0.25  # 25% maximum divergence
-                    price_ok = divergence <= max_allowed_divergence
-                    if not price_ok:
-                        if not hasattr(self, 'monitoring_stats'):
-                            self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                        self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                        reason = "price_divergence"
-                        self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                        logger.info(
-                            f"[CONSENSUS] ⏭️  BLOCKED: Entry price divergence - "
-                            f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                            f"prices={first_three_prices} (divergence={(p_max - p_min) / p_max * 100:.1f}%) wallets={len(wallets_in_window)}"
-                        )
-                        return
+                    break
+            if len(first_three_prices) == 3:
+                p_min = min(first_three_prices)
+                p_max = max(first_three_prices)
+                # Determine band thresholds
+                # Maximum 25% divergence allowed for all prices (as per requirements)
+                # Calculate divergence as (max - min) / max
+                divergence = (p_max - p_min) / p_max if p_max > 0 else 0
+                max_allowed_divergence = 0.25  # 25% maximum divergence
+                price_ok = divergence <= max_allowed_divergence
+                if not price_ok:
+                    if not hasattr(self, 'monitoring_stats'):
+                        self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+                    self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+                    reason = "price_divergence"
+                    self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
+                    logger.info(
+                        f"[CONSENSUS] ⏭️  BLOCKED: Entry price divergence - "
+                        f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                        f"prices={first_three_prices} (divergence={(p_max - p_min) / p_max * 100:.1f}%) wallets={len(wallets_in_window)}"
+                    )
+                    return
+                else:
+                    logger.info(f"[CONSENSUS] Step 3/7: Price divergence OK (prices={first_three_prices})")
+        except Exception as _e:
+            # If any error occurs during divergence check, do not block alert
+            logger.debug(f"[CONSENSUS] Step 3/7: Price divergence check skipped: {_e}")
+        
+        # Total position size across the window
+        self._enter_stage(trace, "position_usd")
+        # Compute simple avg entry price across wallets in window
+        avg_price = 0.0
+        if wallet_prices:
+            avg_price = sum(wallet_prices.values()) / max(1, len(wallet_prices))
+        # Total USD across events in window (best-effort)
+        total_usd = 0.0
+        try:
+            events = window_data.get("events", [])
+            logger.info(f"Calculating total_usd from {len(events)} events for condition={condition_id}")
+            for i, e in enumerate(events):
+                # Try direct USD field first
+                usd_val = e.usd
+                if usd_val > 0:
+                    total_usd += float(usd_val)
+                    logger.info(f"  Event {i+1}: Added usd={usd_val} from event.usd, total now={total_usd:.2f}")
+                else:
+                    # Fallback: calculate from price * quantity if available
+                    price = e.price
+                    quantity = e.quantity
+                    logger.debug(f"  Event {i+1}: usd={usd_val}, price={price}, quantity={quantity}")
+                    if price > 0 and quantity > 0:
+                        # Price in Polymarket is per share, so USD = price * shares
+                        calculated = float(price) * float(quantity)
+                        total_usd += calculated
+                        logger.info(f"  Event {i+1}: Calculated usd={calculated:.2f} from price={price} * quantity={quantity}, total now={total_usd:.2f}")
                     else:
-                        logger.info(f"[CONSENSUS] Step 3/7: Price divergence OK (prices={first_three_prices})")
-            except Exception as _e:
-                # If any error occurs during divergence check, do not block alert
-                logger.debug(f"[CONSENSUS] Step 3/7: Price divergence check skipped: {_e}")
-            
-            # Compute simple avg entry price across wallets in window
-            avg_price = 0.0
-            if wallet_prices:
-                avg_price = sum(wallet_prices.values()) / max(1, len(wallet_prices))
-            # Total USD across events in window (best-effort)
+                        logger.warning(f"  Event {i+1}: Cannot calculate USD - usd={usd_val}, price={price}, quantity={quantity}")
+            logger.info(f"Final total_usd={total_usd:.2f} for condition={condition_id}, outcome={outcome_index}, events={len(events)}")
+        except Exception as e:
+            logger.error(f"Error calculating total_usd: {e}", exc_info=True)
             total_usd = 0.0
-            try:
-                events = window_data.get("events", [])
-                logger.info(f"Calculating total_usd from {len(events)} events for condition={condition_id}")
-                for i, e in enumerate(events):
-                    # Try direct USD field first
-                    usd_val = e.get("usd")
-                    if isinstance(usd_val, (int, float)) and usd_val > 0:
-                        total_usd += float(usd_val)
-                        logger.info(f"  Event {i+1}: Added usd={usd_val} from event.usd, total now={total_usd:.2f}")
-                    else:
-                        # Fallback: calculate from price * quantity if available
-                        price = e.get("price")
-                        quantity = e.get("quantity")
-                        logger.debug(f"  Event {i+1}: usd={usd_val}, price={price}, quantity={quantity}")
-                        if isinstance(price, (int, float)) and price > 0 and isinstance(quantity, (int, float)) and quantity > 0:
-                            # Price in Polymarket is per share, so USD = price * shares
-                            calculated = float(price) * float(quantity)
-                            total_usd += calculated
-                            logger.info(f"  Event {i+1}: Calculated usd={calculated:.2f} from price={price} * quantity={quantity}, total now={total_usd:.2f}")
-                        else:
-                            logger.warning(f"  Event {i+1}: Cannot calculate USD - usd={usd_val}, price={price}, quantity={quantity}")
-                logger.info(f"Final total_usd={total_usd:.2f} for condition={condition_id}, outcome={outcome_index}, events={len(events)}")
-            except Exception as e:
-                logger.error(f"Error calculating total_usd: {e}", exc_info=True)
-                total_usd = 0.0
-            
-            # STEP 4: Fetch price FIRST using multi-level fallback (including HashiDive API and wallet_prices)
-            # This allows HashiDive to provide accurate prices even if CLOB API shows resolved prices
-            # Only AFTER getting price, we check if market is closed based on the actual price
-            logger.info(f"[CONSENSUS] Step 4/7: Fetching current price for condition_id={condition_id[:20]}... outcome={outcome_index}, wallet_prices provided: {len(wallet_prices) if wallet_prices else 0} wallets")
-            current_price = self._get_current_price(
-                condition_id, 
-                outcome_index,
-                wallet_prices=wallet_prices,
-                slug=market_slug if market_slug else None
+        
+        # STEP 10: Check minimum total position size
+        logger.info(f"[CONSENSUS] Step 10/10: Checking minimum total position size: ${total_usd:.2f} >= ${self.min_total_position_usd:.2f}")
+        if total_usd < self.min_total_position_usd:
+            if not hasattr(self, 'monitoring_stats'):
+                self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+            self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+            reason = "insufficient_position_size"
+            self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
+            logger.info(
+                f"[CONSENSUS] ⏭️  BLOCKED: Insufficient total position size - "
+                f"${total_usd:.2f} < ${self.min_total_position_usd:.2f} "
+                f"condition={condition_id[:20]}... outcome={outcome_index} side={side} wallets={len(wallets_in_window)}"
             )
-            if current_price is None:
-                logger.warning(f"[CONSENSUS] Step 4/7: ⚠️  Price unavailable after all fallbacks for condition_id={condition_id[:20]}... outcome={outcome_index}, wallet_prices: {wallet_prices}")
-            else:
-                logger.info(f"[CONSENSUS] Step 4/7: ✅ Got current price: {current_price:.6f} for condition_id={condition_id[:20]}... outcome={outcome_index}")
-            
-            # Check for insider candidates in consensus
-            insider_wallets = []
-            for w in wallets_in_window:
-                wallet_info = self.db.get_wallet(w)
-                if wallet_info and wallet_info.get('is_insider_candidate'):
-                    insider_wallets.append({
-                        'address': w,
-                        'reason': wallet_info.get('insider_detection_reason'),
-                        'total_trades': wallet_info.get('traded_total'),
-                        'win_rate': wallet_info.get('win_rate'),
-                        'total_markets': wallet_info.get('total_markets_traded')
-                    })
-            
-            # If insider candidates found, send insider alert for each
-            if insider_wallets:
-                logger.info(f"[INSIDER] Detected {len(insider_wallets)} insider candidate(s) in consensus for condition={condition_id[:20]}...")
-                for insider in insider_wallets:
-                    # Calculate position size from events
-                    position_size = 0.0
-                    for e in window_data.get('events', []):
-                        if e.get('wallet') == insider['address']:
-                            position_size += e.get('usd', 0.0)
-                    
-                    # Get category if available
-                    category = None
-                    try:
-                        # Try to get category from market classification
-                        if market_title:
-                            from market_utils import classify_market
-                            event_slug, market_id, market_slug_from_api, event_data = self.notifier._get_event_slug_and_market_id(condition_id)
-                            category = classify_market(event_data or {}, market_slug or market_slug_from_api or "", market_title)
-                    except Exception as e:
-                        logger.debug(f"Error getting category for insider alert: {e}")
+            return
+        
+        # Indexed alert lookups: already sent and cooldown
+        self._enter_stage(trace, "alert_index")
+        # STEP 2: Check if alert already sent for this direction
+        logger.info(f"[CONSENSUS] Step 2/7: Checking if alert already sent for condition={condition_id[:20]}... outcome={outcome_index} side={side}")
+        alert_key = f"{condition_id}:{outcome_index}:{side}"
+        already_sent = self.db.is_alert_sent(condition_id, outcome_index, 
+                                window_data["first_ts"], window_data["last_ts"], alert_key)
+        logger.info(f"[CONSENSUS] Step 2/7: Alert already sent = {already_sent}")
+        if already_sent:
+            if not hasattr(self, 'monitoring_stats'):
+                self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+            self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+            reason = "already_sent"
+            self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
+            logger.info(
+                f"[CONSENSUS] ⏭️  BLOCKED: Alert already sent - "
+                f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                f"wallets={len(wallets_in_window)}"
+            )
+            return
+        
+        # STEP 8: Don't send if we recently alerted same market/side (30-minute cooldown to prevent spam)
+        logger.info(f"[CONSENSUS] Step 8/9: Checking cooldown for condition={condition_id[:20]}... outcome={outcome_index} side={side} (cooldown={self.alert_cooldown_min} min)")
+        has_recent_cooldown = self.db.has_recent_alert(condition_id, outcome_index, side, self.alert_cooldown_min)
+        logger.info(f"[CONSENSUS] Step 8/9: Has recent alert in cooldown = {has_recent_cooldown}")
+        if has_recent_cooldown:
+            self.suppressed_counts['cooldown'] = self.suppressed_counts.get('cooldown', 0) + 1
+            if not hasattr(self, 'monitoring_stats'):
+                self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+            self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+            reason = "cooldown"
+            self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
+            logger.info(
+                f"[CONSENSUS] ⏭️  BLOCKED: Cooldown (30min) - "
+                f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                f"wallets={len(wallets_in_window)}"
+            )
+            return
+        
+        # Market status (cached, CLOB on miss)
+        self._enter_stage(trace, "market_status")
+        # STEP 1: Check if market is active (early check after threshold met)
+        # Skip this check if condition_id is a fallback (starts with SLUG: or TITLE:)
+        # This allows signals even when condition_id is not available
+        logger.info(f"[CONSENSUS] Step 1/7: Checking market status for condition={condition_id[:20]}... outcome={outcome_index}")
+        market_is_active_early = True  # Default to True for fallback condition_ids
+        if condition_id and not condition_id.startswith(("SLUG:", "TITLE:")):
+            market_is_active_early = self.is_market_active_cached(condition_id, outcome_index)
+        logger.info(f"[CONSENSUS] Step 1/7: Market active status = {market_is_active_early}")
+        
+        # EARLY CHECK: If market is already closed, skip processing events from rolling window
+        # This prevents delayed alerts for markets that closed while events were in the window
+        # IMPORTANT: Don't send suppressed alerts for old events from closed markets
+        # Suppressed alerts should only be sent in real-time when consensus is detected but market is closed
+        # Skip this check for fallback condition_ids
+        if not market_is_active_early and condition_id and not condition_id.startswith(("SLUG:", "TITLE:")):
+            self.suppressed_counts['market_closed'] = self.suppressed_counts.get('market_closed', 0) + 1
+            if not hasattr(self, 'monitoring_stats'):
+                self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+            self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+            reason = "market_inactive_window"
+            self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
+            logger.info(
+                f"[CONSENSUS] ❌ BLOCKED (window check): Market {condition_id[:20]}... is closed or not found (404). Skipping signal. "
+                f"wallets={len(wallets_in_window)}/{self.min_consensus} outcome={outcome_index} side={side} "
+                f"(events in window from closed market)"
+            )
+            # Don't send suppressed alert here - these are old events from closed markets
+            # Suppressed alerts should only be sent in real-time, not for historical events
+            return
+        
+        # Current price and price-based resolution checks (network)
+        self._enter_stage(trace, "price")
+        # STEP 4: Fetch price FIRST using multi-level fallback (including HashiDive API and wallet_prices)
+        # This allows HashiDive to provide accurate prices even if CLOB API shows resolved prices
+        # Only AFTER getting price, we check if market is closed based on the actual price
+        logger.info(f"[CONSENSUS] Step 4/7: Fetching current price for condition_id={condition_id[:20]}... outcome={outcome_index}, wallet_prices provided: {len(wallet_prices) if wallet_prices else 0} wallets")
+        current_price = self._get_current_price(
+            condition_id, 
+            outcome_index,
+            wallet_prices=wallet_prices,
+            slug=market_slug if market_slug else None
+        )
+        if current_price is None:
+            logger.warning(f"[CONSENSUS] Step 4/7: ⚠️  Price unavailable after all fallbacks for condition_id={condition_id[:20]}... outcome={outcome_index}, wallet_prices: {wallet_prices}")
+        else:
+            logger.info(f"[CONSENSUS] Step 4/7: ✅ Got current price: {current_price:.6f} for condition_id={condition_id[:20]}... outcome={outcome_index}")
+        
+        # Check for insider candidates in consensus
+        insider_wallets = []
+        for w in wallets_in_window:
+            wallet_info = self.db.get_wallet(w)
+            if wallet_info and wallet_info.get('is_insider_candidate'):
+                insider_wallets.append({
+                    'address': w,
+                    'reason': wallet_info.get('insider_detection_reason'),
+                    'total_trades': wallet_info.get('traded_total'),
+                    'win_rate': wallet_info.get('win_rate'),
+                    'total_markets': wallet_info.get('total_markets_traded')
+                })
+        
+        # If insider candidates found, send insider alert for each
+        if insider_wallets:
+            logger.info(f"[INSIDER] Detected {len(insider_wallets)} insider candidate(s) in consensus for condition={condition_id[:20]}...")
+            for insider in insider_wallets:
+                # Calculate position size from events
+                position_size = 0.0
+                for e in window_data.get('events', []):
+                    if e.wallet == insider['address']:
+                        position_size += e.usd
+                
+                # Get category if available
+                category = None
+                try:
+                    # Try to get category from market classification
+                    if market_title:
+                        event_slug, market_id, market_slug_from_api, event_data = self.notifier._get_event_slug_and_market_id(condition_id)
+                        category = classify_market(event_data or {}, market_slug or market_slug_from_api or "", market_title)
+                except Exception as e:
+                    logger.debug(f"Error getting category for insider alert: {e}")
+                
+                # Send insider alert
+                try:
+                    self.notifier.send_insider_alert(
+                        condition_id=condition_id,
+                        outcome_index=outcome_index,
+                        wallet=insider['address'],
+                        reason=insider['reason'],
+                        market_title=market_title,
+                        market_slug=market_slug,
+                        side=side,
+                        position_size=position_size,
+                        win_rate=insider['win_rate'] or 0.0,
+                        total_trades=insider['total_trades'] or 0,
+                        total_markets=insider['total_markets'] or 0,
+                        current_price=current_price,
+                        category=category
+                    )
+                    logger.info(f"[INSIDER] Sent insider alert for wallet {insider['address'][:12]}... reason={insider['reason']}")
                     
-                    # Send insider alert
+                    # Update insider stats
+                    self.insider_stats['total_detected'] += 1
+                    reason = insider['reason']
+                    self.insider_stats['by_reason'][reason] = self.insider_stats['by_reason'].get(reason, 0) + 1
+                except Exception as e:
+                    logger.error(f"[INSIDER] Failed to send insider alert: {e}", exc_info=True)
+        
+        # STEP 5: Check market status based on the actual price we got
+        # IMPORTANT: First check if market is active, then check price
+        # If market is active, allow alert even if price is high/low (fail-open)
+        # Only block if market is confirmed closed AND price indicates resolved
+        logger.info(f"[CONSENSUS] Step 5/7: Checking price-based market status for condition={condition_id[:20]}... outcome={outcome_index}")
+        if current_price is not None:
+            price_val = float(current_price)
+            logger.info(f"[CONSENSUS] Step 5/7: Price={price_val:.6f} for condition={condition_id[:20]}... outcome={outcome_index}")
+            
+            # First check: Price = 1.0 or 0.0 (or very close) - definitely resolved
+            if price_val >= 0.999 or price_val <= 0.001:
+                self.suppressed_counts['resolved'] = self.suppressed_counts.get('resolved', 0) + 1
+                logger.info(
+                    f"[CONSENSUS] ⏭️  BLOCKED: Market resolved (price={price_val:.6f} >= 0.999 or <= 0.001) "
+                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} wallets={len(wallets_in_window)}"
+                )
+                self.db.forget_resolved_market(condition_id)
+                # Only send suppressed alert if we have consensus (multiple wallets)
+                if len(wallets_in_window) >= self.min_consensus:
                     try:
-                        self.notifier.send_insider_alert(
+                        self.notifier.send_suppressed_alert_details(
+                            reason="resolved",
                             condition_id=condition_id,
                             outcome_index=outcome_index,
-                            wallet=insider['address'],
-                            reason=insider['reason'],
+                            wallets=wallets_in_window,
+                            wallet_prices=wallet_prices,
                             market_title=market_title,
                             market_slug=market_slug,
-                            side=side,
-                            position_size=position_size,
-                            win_rate=insider['win_rate'] or 0.0,
-                            total_trades=insider['total_trades'] or 0,
-                            total_markets=insider['total_markets'] or 0,
                             current_price=current_price,
-                            category=category
+                            side=side,
+                            total_usd=total_usd,
+                            market_active=False  # Market is resolved, not active
                         )
-                        logger.info(f"[INSIDER] Sent insider alert for wallet {insider['address'][:12]}... reason={insider['reason']}")
-                        
-                        # Update insider stats
-                        self.insider_stats['total_detected'] += 1
-                        reason = insider['reason']
-                        self.insider_stats['by_reason'][reason] = self.insider_stats['by_reason'].get(reason, 0) + 1
                     except Exception as e:
-                        logger.error(f"[INSIDER] Failed to send insider alert: {e}", exc_info=True)
-            
-            # STEP 5: Check market status based on the actual price we got
-            # IMPORTANT: First check if market is active, then check price
-            # If market is active, allow alert even if price is high/low (fail-open)
-            # Only block if market is confirmed closed AND price indicates resolved
-            logger.info(f"[CONSENSUS] Step 5/7: Checking price-based market status for condition={condition_id[:20]}... outcome={outcome_index}")
-            if current_price is not None:
-                price_val = float(current_price)
-                logger.info(f"[CONSENSUS] Step 5/7: Price={price_val:.6f} for condition={condition_id[:20]}... outcome={outcome_index}")
-                
-                # First check: Price = 1.0 or 0.0 (or very close) - definitely resolved
-                if price_val >= 0.999 or price_val <= 0.001:
-                    self.suppressed_counts['resolved'] = self.suppressed_counts.get('resolved', 0) + 1
-                    logger.info(
-                        f"[CONSENSUS] ⏭️  BLOCKED: Market resolved (price={price_val:.6f} >= 0.999 or <= 0.001) "
-                        f"condition={condition_id[:20]}... outcome={outcome_index} side={side} wallets={len(wallets_in_window)}"
-                    )
-                    # Only send suppressed alert if we have consensus (multiple wallets)
-                    if len(wallets_in_window) >= self.min_consensus:
-                        try:
-                            self.notifier.send_suppressed_alert_details(
-                                reason="resolved",
-                                condition_id=condition_id,
-                                outcome_index=outcome_index,
-                                wallets=wallets_in_window,
-                                wallet_prices=wallet_prices,
-                                market_title=market_title,
-                                market_slug=market_slug,
-                                current_price=current_price,
-                                side=side,
-                                total_usd=total_usd,
-                                market_active=False  # Market is resolved, not active
-                            )
-                        except Exception as e:
-                            logger.debug(f"Failed to send suppressed alert details: {e}")
-                    else:
-                        logger.debug(f"Skipping suppressed alert for resolved market: only {len(wallets_in_window)} wallet(s), below consensus threshold")
-                    return
-                
-                # Second check: Price >= 0.98 or <= 0.02 - might be closed, but check market status first
-                if price_val >= 0.98 or price_val <= 0.02:
-                    # Check if market is actually active before blocking
-                    market_is_active = self.is_market_active(condition_id, outcome_index)
-                    logger.info(
-                        f"[CONSENSUS PRICE CHECK] price={price_val:.6f} >= 0.98 or <= 0.02, "
-                        f"market_is_active={market_is_active} for condition={condition_id[:20]}... outcome={outcome_index}"
-                    )
-                    
-                    if not market_is_active:
-                        # Market is confirmed closed AND price is high/low - block alert
-                        self.suppressed_counts['market_closed'] = self.suppressed_counts.get('market_closed', 0) + 1
-                        logger.info(
-                            f"[CONSENSUS] ⏭️  BLOCKED: Market closed (price={price_val:.6f} >= 0.98 or <= 0.02 AND market_is_active=False) "
-                            f"condition={condition_id[:20]}... outcome={outcome_index} side={side} wallets={len(wallets_in_window)}"
-                        )
-                        # Only send suppressed alert if we have consensus (multiple wallets)
-                        if len(wallets_in_window) >= self.min_consensus:
-                            try:
-                                self.notifier.send_suppressed_alert_details(
-                                    reason="market_closed",
-                                    condition_id=condition_id,
-                                    outcome_index=outcome_index,
-                                    wallets=wallets_in_window,
-                                    wallet_prices=wallet_prices,
-                                    market_title=market_title,
-                                    market_slug=market_slug,
-                                    current_price=current_price,
-                                    side=side,
-                                    total_usd=total_usd
-                                )
-                            except Exception as e:
-                                logger.debug(f"Failed to send suppressed alert details: {e}")
-                        else:
-                            logger.debug(f"Skipping suppressed alert for closed market: only {len(wallets_in_window)} wallet(s), below consensus threshold")
-                        return
-                    else:
-                        # Market is active but price is high/low - allow alert (fail-open)
-                        # This could be a temporary price spike or market still trading
-                        logger.warning(
-                            f"[CONSENSUS] ⚠️  Price high/low (price={price_val:.6f} >= 0.98 or <= 0.02) BUT market is ACTIVE - "
-                            f"allowing alert to proceed (fail-open) condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                            f"wallets={len(wallets_in_window)}"
-                        )
-                        # Continue to send alert - price will be shown in alert
+                        logger.debug(f"Failed to send suppressed alert details: {e}")
+                else:
+                    logger.debug(f"Skipping suppressed alert for resolved market: only {len(wallets_in_window)} wallet(s), below consensus threshold")
+                return
             
-            # If price is None, check market status via is_market_active (but only as fallback)
-            # This is less reliable than actual price, so we use it only if price unavailable
-            if current_price is None:
-                logger.warning(
-                    f"[CONSENSUS] ⚠️  Price unavailable (None) for condition={condition_id[:20]}... outcome={outcome_index}, "
-                    f"checking market status via is_market_active..."
-                )
-                market_is_active = self.is_market_active(condition_id, outcome_index)
+            # Second check: Price >= 0.98 or <= 0.02 - might be closed, but check market status first
+            if price_val >= 0.98 or price_val <= 0.02:
+                # Check if market is actually active before blocking
+                market_is_active = self.is_market_active_cached(condition_id, outcome_index)
                 logger.info(
-                    f"[CONSENSUS PRICE CHECK] price=None, market_is_active={market_is_active} "
-                    f"for condition={condition_id[:20]}... outcome={outcome_index}"
+                    f"[CONSENSUS PRICE CHECK] price={price_val:.6f} >= 0.98 or <= 0.02, "
+                    f"market_is_active={market_is_active} for condition={condition_id[:20]}... outcome={outcome_index}"
                 )
                 
                 if not market_is_active:
-                    # Market is confirmed closed AND price unavailable - block alert
+                    # Market is confirmed closed AND price is high/low - block alert
                     self.suppressed_counts['market_closed'] = self.suppressed_counts.get('market_closed', 0) + 1
                     logger.info(
-                        f"[CONSENSUS] ⏭️  BLOCKED: Market closed (price unavailable AND market_is_active=False) "
+                        f"[CONSENSUS] ⏭️  BLOCKED: Market closed (price={price_val:.6f} >= 0.98 or <= 0.02 AND market_is_active=False) "
                         f"condition={condition_id[:20]}... outcome={outcome_index} side={side} wallets={len(wallets_in_window)}"
                     )
                     # Only send suppressed alert if we have consensus (multiple wallets)
@@ -2024,10 +2122,9 @@ class PolymarketNotifier:
                                 wallet_prices=wallet_prices,
                                 market_title=market_title,
                                 market_slug=market_slug,
-                                current_price=None,
+                                current_price=current_price,
                                 side=side,
-                                total_usd=total_usd,
-                                market_active=False  # Market is closed, not active
+                                total_usd=total_usd
                             )
                         except Exception as e:
                             logger.debug(f"Failed to send suppressed alert details: {e}")
@@ -2035,247 +2132,299 @@ class PolymarketNotifier:
                         logger.debug(f"Skipping suppressed alert for closed market: only {len(wallets_in_window)} wallet(s), below consensus threshold")
                     return
                 else:
-                    # Market is active but price unavailable - allow alert (fail-open)
+                    # Market is active but price is high/low - allow alert (fail-open)
+                    # This could be a temporary price spike or market still trading
                     logger.warning(
-                        f"[FAIL-OPEN] Market active but price=None — continuing alert with Price: N/A "
-                        f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                        f"[CONSENSUS] ⚠️  Price high/low (price={price_val:.6f} >= 0.98 or <= 0.02) BUT market is ACTIVE - "
+                        f"allowing alert to proceed (fail-open) condition={condition_id[:20]}... outcome={outcome_index} side={side} "
                         f"wallets={len(wallets_in_window)}"
                     )
-                    # Continue to send alert - price will be shown as "N/A" in alert
-            
-            # NOTE: Price and market status checks were already done above (lines 1546-1709)
-            # Import datetime here to avoid conflicts with local imports in nested blocks
-            # Use full module path to avoid conflicts
-            import datetime as dt_module
-            now_iso = dt_module.datetime.now(dt_module.timezone.utc).isoformat()
-            # Continue with deduplication and other checks
+                    # Continue to send alert - price will be shown in alert
+        
+        # If price is None, check market status via is_market_active (but only as fallback)
+        # This is less reliable than actual price, so we use it only if price unavailable
+        if current_price is None:
+            logger.warning(
+                f"[CONSENSUS] ⚠️  Price unavailable (None) for condition={condition_id[:20]}... outcome={outcome_index}, "
+                f"checking market status via is_market_active..."
+            )
+            market_is_active = self.is_market_active_cached(condition_id, outcome_index)
+            logger.info(
+                f"[CONSENSUS PRICE CHECK] price=None, market_is_active={market_is_active} "
+                f"for condition={condition_id[:20]}... outcome={outcome_index}"
+            )
             
-            # Dedupe/trigger rules using recent alerts
-            try:
-                # Additional price check for deduplication logic (if needed)
-                if current_price is not None:
-                    price_val = float(current_price)
-                    logger.debug(f"[DEDUPE PRICE CHECK] condition={condition_id}, outcome={outcome_index}, price={price_val}")
-                    # Price = 1.0 or exactly 0.0 (or very close) means market is resolved - BLOCK ALERT
-                    # (This is a redundant check, but kept for safety in dedupe logic)
-                    if price_val >= 0.999 or price_val <= 0.001:
-                        self.suppressed_counts['resolved'] = self.suppressed_counts.get('resolved', 0) + 1
-                        if not hasattr(self, 'monitoring_stats'):
-                            self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                        self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                        reason = "resolved"
-                        self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                        
-                        # Check if events are recent (within last hour) - only send suppressed alerts for recent events
-                        # Use dt_module to avoid conflicts
-                        now_ts = dt_module.datetime.now(dt_module.timezone.utc).timestamp()
-                        last_event_age = now_ts - window_data.get("last_ts", 0)
-                        recent_threshold = 3600  # 1 hour in seconds
-                        is_recent = last_event_age <= recent_threshold
-                        
-                        logger.info(
-                            f"[CONSENSUS] ⏭️  BLOCKED: Market resolved - "
-                            f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                            f"price={price_val:.6f} wallets={len(wallets_in_window)} "
-                            f"(last event age: {last_event_age/60:.1f} min, recent: {is_recent})"
-                        )
-                        # Only send suppressed alert if events are recent (within last hour)
-                        # AND if we haven't already sent a suppressed alert for this market/outcome/side/reason recently
-                        if len(wallets_in_window) >= self.min_consensus and is_recent:
-                            if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "resolved", window_minutes=30.0):
-                                try:
-                                    self.notifier.send_suppressed_alert_details(
-                                        reason="resolved",
-                                        condition_id=condition_id,
-                                        outcome_index=outcome_index,
-                                        wallets=wallets_in_window,
-                                        wallet_prices=wallet_prices,
-                                        market_title=market_title,
-                                        market_slug=market_slug,
-                                        current_price=current_price,
-                                        side=side,
-                                        total_usd=total_usd
-                                    )
-                                    self.db.mark_suppressed_alert_sent(
-                                        condition_id, outcome_index, side, "resolved",
-                                        wallet_count=len(wallets_in_window)
-                                    )
-                                except Exception as e:
-                                    logger.debug(f"Failed to send suppressed alert details: {e}")
-                            else:
-                                logger.debug(f"Suppressed alert for resolved already sent recently for {condition_id[:20]}... outcome={outcome_index} side={side}")
-                        else:
-                            if not is_recent:
-                                logger.debug(f"Skipping suppressed alert for resolved market: events too old ({last_event_age/60:.1f} min ago)")
-                        return
-                    # Price >= 0.98 or <= 0.02 also indicates closed/almost resolved - BLOCK ALERT  
-                    if price_val >= 0.98 or price_val <= 0.02:
-                        self.suppressed_counts['price_high'] = self.suppressed_counts.get('price_high', 0) + 1
-                        if not hasattr(self, 'monitoring_stats'):
-                            self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                        self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                        reason = "price_high"
-                        self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                        
-                        # Check if events are recent (within last hour) - only send suppressed alerts for recent events
-                        # Use dt_module to avoid conflicts
-                        now_ts = dt_module.datetime.now(dt_module.timezone.utc).timestamp()
-                        last_event_age = now_ts - window_data.get("last_ts", 0)
-                        recent_threshold = 3600  # 1 hour in seconds
-                        is_recent = last_event_age <= recent_threshold
-                        
-                        logger.info(
-                            f"[CONSENSUS] ⏭️  BLOCKED: Price too high/low - "
-                            f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                            f"price={price_val:.6f} wallets={len(wallets_in_window)} "
-                            f"(last event age: {last_event_age/60:.1f} min, recent: {is_recent})"
+            if not market_is_active:
+                # Market is confirmed closed AND price unavailable - block alert
+                self.suppressed_counts['market_closed'] = self.suppressed_counts.get('market_closed', 0) + 1
+                logger.info(
+                    f"[CONSENSUS] ⏭️  BLOCKED: Market closed (price unavailable AND market_is_active=False) "
+                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} wallets={len(wallets_in_window)}"
+                )
+                # Only send suppressed alert if we have consensus (multiple wallets)
+                if len(wallets_in_window) >= self.min_consensus:
+                    try:
+                        self.notifier.send_suppressed_alert_details(
+                            reason="market_closed",
+                            condition_id=condition_id,
+                            outcome_index=outcome_index,
+                            wallets=wallets_in_window,
+                            wallet_prices=wallet_prices,
+                            market_title=market_title,
+                            market_slug=market_slug,
+                            current_price=None,
+                            side=side,
+                            total_usd=total_usd,
+                            market_active=False  # Market is closed, not active
                         )
-                        # Only send suppressed alert if events are recent (within last hour)
-                        # AND if we haven't already sent a suppressed alert for this market/outcome/side/reason recently
-                        if len(wallets_in_window) >= self.min_consensus and is_recent:
-                            if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "price_high", window_minutes=30.0):
-                                try:
-                                    self.notifier.send_suppressed_alert_details(
-                                        reason="price_high",
-                                        condition_id=condition_id,
-                                        outcome_index=outcome_index,
-                                        wallets=wallets_in_window,
-                                        wallet_prices=wallet_prices,
-                                        market_title=market_title,
-                                        market_slug=market_slug,
-                                        current_price=current_price,
-                                        side=side,
-                                        total_usd=total_usd
-                                    )
-                                    self.db.mark_suppressed_alert_sent(
-                                        condition_id, outcome_index, side, "price_high",
-                                        wallet_count=len(wallets_in_window)
-                                    )
-                                except Exception as e:
-                                    logger.debug(f"Failed to send suppressed alert details: {e}")
-                            else:
-                                logger.debug(f"Suppressed alert for price_high already sent recently for {condition_id[:20]}... outcome={outcome_index} side={side}")
-                        else:
-                            if not is_recent:
-                                logger.debug(f"Skipping suppressed alert for closed market: events too old ({last_event_age/60:.1f} min ago)")
-                        return
-                    logger.info(f"[PRICE CHECK] Price OK: {price_val:.6f}, allowing alert")
+                    except Exception as e:
+                        logger.debug(f"Failed to send suppressed alert details: {e}")
                 else:
-                    # Price is None - could mean API error, market not found, or market is closed
-                    # ALWAYS check if market is closed first (more reliable than price check)
-                    # Use get_market_info for comprehensive check
-                    market_info = self.get_market_info(condition_id)
-                    market_closed = False
+                    logger.debug(f"Skipping suppressed alert for closed market: only {len(wallets_in_window)} wallet(s), below consensus threshold")
+                return
+            else:
+                # Market is active but price unavailable - allow alert (fail-open)
+                logger.warning(
+                    f"[FAIL-OPEN] Market active but price=None — continuing alert with Price: N/A "
+                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                    f"wallets={len(wallets_in_window)}"
+                )
+                # Continue to send alert - price will be shown as "N/A" in alert
+        
+        # NOTE: Price and market status checks were already done above (lines 1546-1709)
+        # Import datetime here to avoid conflicts with local imports in nested blocks
+        # Use full module path to avoid conflicts
+        import datetime as dt_module
+        now_iso = dt_module.datetime.now(dt_module.timezone.utc).isoformat()
+        # Continue with deduplication and other checks
+        
+        # Dedupe/trigger rules using recent alerts
+        try:
+            # Additional price check for deduplication logic (if needed)
+            if current_price is not None:
+                price_val = float(current_price)
+                logger.debug(f"[DEDUPE PRICE CHECK] condition={condition_id}, outcome={outcome_index}, price={price_val}")
+                # Price = 1.0 or exactly 0.0 (or very close) means market is resolved - BLOCK ALERT
+                # (This is a redundant check, but kept for safety in dedupe logic)
+                if price_val >= 0.999 or price_val <= 0.001:
+                    self.suppressed_counts['resolved'] = self.suppressed_counts.get('resolved', 0) + 1
+                    if not hasattr(self, 'monitoring_stats'):
+                        self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+                    self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+                    reason = "resolved"
+                    self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
                     
-                    # Check multiple indicators of closed market
-                    if market_info.get("closed") is True:
-                        market_closed = True
-                        logger.debug(f"Market {condition_id[:20]}... closed (closed flag)")
+                    # Check if events are recent (within last hour) - only send suppressed alerts for recent events
+                    # Use dt_module to avoid conflicts
+                    now_ts = dt_module.datetime.now(dt_module.timezone.utc).timestamp()
+                    last_event_age = now_ts - window_data.get("last_ts", 0)
+                    recent_threshold = 3600  # 1 hour in seconds
+                    is_recent = last_event_age <= recent_threshold
                     
-                    # Check end_date
-                    if market_info.get("end_date"):
-                        from datetime import datetime, timezone
-                        end_date = market_info["end_date"]
-                        if end_date.tzinfo is None:
-                            end_date = end_date.replace(tzinfo=timezone.utc)
-                        current_time = datetime.now(timezone.utc)
-                        if current_time > end_date:
-                            market_closed = True
-                            logger.debug(f"Market {condition_id[:20]}... closed (end_date passed)")
+                    logger.info(
+                        f"[CONSENSUS] ⏭️  BLOCKED: Market resolved - "
+                        f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                        f"price={price_val:.6f} wallets={len(wallets_in_window)} "
+                        f"(last event age: {last_event_age/60:.1f} min, recent: {is_recent})"
+                    )
+                    # Only send suppressed alert if events are recent (within last hour)
+                    # AND if we haven't already sent a suppressed alert for this market/outcome/side/reason recently
+                    if len(wallets_in_window) >= self.min_consensus and is_recent:
+                        if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "resolved", window_minutes=30.0):
+                            try:
+                                self.notifier.send_suppressed_alert_details(
+                                    reason="resolved",
+                                    condition_id=condition_id,
+                                    outcome_index=outcome_index,
+                                    wallets=wallets_in_window,
+                                    wallet_prices=wallet_prices,
+                                    market_title=market_title,
+                                    market_slug=market_slug,
+                                    current_price=current_price,
+                                    side=side,
+                                    total_usd=total_usd
+                                )
+                                self.db.mark_suppressed_alert_sent(
+                                    condition_id, outcome_index, side, "resolved",
+                                    wallet_count=len(wallets_in_window)
+                                )
+                            except Exception as e:
+                                logger.debug(f"Failed to send suppressed alert details: {e}")
+                        else:
+                            logger.debug(f"Suppressed alert for resolved already sent recently for {condition_id[:20]}... outcome={outcome_index} side={side}")
+                    else:
+                        if not is_recent:
+                            logger.debug(f"Skipping suppressed alert for resolved market: events too old ({last_event_age/60:.1f} min ago)")
+                    return
+                # Price >= 0.98 or <= 0.02 also indicates closed/almost resolved - BLOCK ALERT  
+                if price_val >= 0.98 or price_val <= 0.02:
+                    self.suppressed_counts['price_high'] = self.suppressed_counts.get('price_high', 0) + 1
+                    if not hasattr(self, 'monitoring_stats'):
+                        self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+                    self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+                    reason = "price_high"
+                    self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
                     
-                    # Check status
-                    status = str(market_info.get("status") or "").lower()
-                    if status in {"resolved", "finished", "closed", "ended", "finalized"}:
-                        market_closed = True
-                        logger.debug(f"Market {condition_id[:20]}... closed (status: {status})")
+                    # Check if events are recent (within last hour) - only send suppressed alerts for recent events
+                    # Use dt_module to avoid conflicts
+                    now_ts = dt_module.datetime.now(dt_module.timezone.utc).timestamp()
+                    last_event_age = now_ts - window_data.get("last_ts", 0)
+                    recent_threshold = 3600  # 1 hour in seconds
+                    is_recent = last_event_age <= recent_threshold
                     
-                    # Check active flag
-                    if market_info.get("active") is False:
+                    logger.info(
+                        f"[CONSENSUS] ⏭️  BLOCKED: Price too high/low - "
+                        f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                        f"price={price_val:.6f} wallets={len(wallets_in_window)} "
+                        f"(last event age: {last_event_age/60:.1f} min, recent: {is_recent})"
+                    )
+                    # Only send suppressed alert if events are recent (within last hour)
+                    # AND if we haven't already sent a suppressed alert for this market/outcome/side/reason recently
+                    if len(wallets_in_window) >= self.min_consensus and is_recent:
+                        if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "price_high", window_minutes=30.0):
+                            try:
+                                self.notifier.send_suppressed_alert_details(
+                                    reason="price_high",
+                                    condition_id=condition_id,
+                                    outcome_index=outcome_index,
+                                    wallets=wallets_in_window,
+                                    wallet_prices=wallet_prices,
+                                    market_title=market_title,
+                                    market_slug=market_slug,
+                                    current_price=current_price,
+                                    side=side,
+                                    total_usd=total_usd
+                                )
+                                self.db.mark_suppressed_alert_sent(
+                                    condition_id, outcome_index, side, "price_high",
+                                    wallet_count=len(wallets_in_window)
+                                )
+                            except Exception as e:
+                                logger.debug(f"Failed to send suppressed alert details: {e}")
+                        else:
+                            logger.debug(f"Suppressed alert for price_high already sent recently for {condition_id[:20]}... outcome={outcome_index} side={side}")
+                    else:
+                        if not is_recent:
+                            logger.debug(f"Skipping suppressed alert for closed market: events too old ({last_event_age/60:.1f} min ago)")
+                    return
+                logger.info(f"[PRICE CHECK] Price OK: {price_val:.6f}, allowing alert")
+            else:
+                # Price is None - could mean API error, market not found, or market is closed
+                # ALWAYS check if market is closed first (more reliable than price check)
+                # Use get_market_info for comprehensive check
+                market_info = self.get_market_info(condition_id)
+                market_closed = False
+                
+                # Check multiple indicators of closed market
+                if market_info.get("closed") is True:
+                    market_closed = True
+                    logger.debug(f"Market {condition_id[:20]}... closed (closed flag)")
+                
+                # Check end_date
+                if market_info.get("end_date"):
+                    from datetime import datetime, timezone
+                    end_date = market_info["end_date"]
+                    if end_date.tzinfo is None:
+                        end_date = end_date.replace(tzinfo=timezone.utc)
+                    current_time = datetime.now(timezone.utc)
+                    if current_time > end_date:
                         market_closed = True
-                        logger.debug(f"Market {condition_id[:20]}... closed (active=False)")
+                        logger.debug(f"Market {condition_id[:20]}... closed (end_date passed)")
+                
+                # Check status
+                status = str(market_info.get("status") or "").lower()
+                if status in {"resolved", "finished", "closed", "ended", "finalized"}:
+                    market_closed = True
+                    logger.debug(f"Market {condition_id[:20]}... closed (status: {status})")
+                
+                # Check active flag
+                if market_info.get("active") is False:
+                    market_closed = True
+                    logger.debug(f"Market {condition_id[:20]}... closed (active=False)")
+                
+                # Also try is_market_active as additional check
+                if not market_closed:
+                    try:
+                        if not self.is_market_active_cached(condition_id, outcome_index):
+                            market_closed = True
+                            logger.debug(f"Market {condition_id[:20]}... closed (is_market_active=False)")
+                    except Exception as e:
+                        logger.debug(f"is_market_active check failed: {e}, using market_info result")
+                
+                if market_closed:
+                    # Market is closed - use market_closed reason
+                    self.suppressed_counts['market_closed'] = self.suppressed_counts.get('market_closed', 0) + 1
+                    if not hasattr(self, 'monitoring_stats'):
+                        self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+                    self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+                    reason = "market_closed_price_unavailable"
+                    self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
                     
-                    # Also try is_market_active as additional check
-                    if not market_closed:
-                        try:
-                            if not self.is_market_active(condition_id, outcome_index):
-                                market_closed = True
-                                logger.debug(f"Market {condition_id[:20]}... closed (is_market_active=False)")
-                        except Exception as e:
-                            logger.debug(f"is_market_active check failed: {e}, using market_info result")
+                    # Check if events are recent (within last hour) - only send suppressed alerts for recent events
+                    # Use dt_module to avoid conflicts
+                    now_ts = dt_module.datetime.now(dt_module.timezone.utc).timestamp()
+                    last_event_age = now_ts - window_data.get("last_ts", 0)
+                    recent_threshold = 3600  # 1 hour in seconds
+                    is_recent = last_event_age <= recent_threshold
                     
-                    if market_closed:
-                        # Market is closed - use market_closed reason
-                        self.suppressed_counts['market_closed'] = self.suppressed_counts.get('market_closed', 0) + 1
-                        if not hasattr(self, 'monitoring_stats'):
-                            self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                        self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                        reason = "market_closed_price_unavailable"
-                        self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                        
-                        # Check if events are recent (within last hour) - only send suppressed alerts for recent events
-                        # Use dt_module to avoid conflicts
-                        now_ts = dt_module.datetime.now(dt_module.timezone.utc).timestamp()
-                        last_event_age = now_ts - window_data.get("last_ts", 0)
-                        recent_threshold = 3600  # 1 hour in seconds
-                        is_recent = last_event_age <= recent_threshold
-                        
-                        logger.info(
-                            f"[CONSENSUS] ⏭️  BLOCKED: Market closed (price unavailable) - "
-                            f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                            f"wallets={len(wallets_in_window)} "
-                            f"(last event age: {last_event_age/60:.1f} min, recent: {is_recent})"
-                        )
-                        # Only send suppressed alert if:
-                        # 1. We have consensus (multiple wallets)
-                        # 2. Events are recent (within last hour) - don't send for old historical events
-                        # 3. We haven't already sent a suppressed alert for this market/outcome/side/reason recently
-                        if len(wallets_in_window) >= self.min_consensus and is_recent:
-                            if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "market_closed", window_minutes=30.0):
-                                try:
-                                    self.notifier.send_suppressed_alert_details(
-                                        reason="market_closed",
-                                        condition_id=condition_id,
-                                        outcome_index=outcome_index,
-                                        wallets=wallets_in_window,
-                                        wallet_prices=wallet_prices,
-                                        market_title=market_title,
-                                        market_slug=market_slug,
-                                        current_price=None,
-                                        side=side,
-                                        total_usd=total_usd
-                                    )
-                                    self.db.mark_suppressed_alert_sent(
-                                        condition_id, outcome_index, side, "market_closed",
-                                        wallet_count=len(wallets_in_window)
-                                    )
-                                except Exception as e:
-                                    logger.debug(f"Failed to send suppressed alert details: {e}")
-                            else:
-                                logger.debug(f"Suppressed alert for market_closed already sent recently for {condition_id[:20]}... outcome={outcome_index} side={side}")
+                    logger.info(
+                        f"[CONSENSUS] ⏭️  BLOCKED: Market closed (price unavailable) - "
+                        f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                        f"wallets={len(wallets_in_window)} "
+                        f"(last event age: {last_event_age/60:.1f} min, recent: {is_recent})"
+                    )
+                    # Only send suppressed alert if:
+                    # 1. We have consensus (multiple wallets)
+                    # 2. Events are recent (within last hour) - don't send for old historical events
+                    # 3. We haven't already sent a suppressed alert for this market/outcome/side/reason recently
+                    if len(wallets_in_window) >= self.min_consensus and is_recent:
+                        if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "market_closed", window_minutes=30.0):
+                            try:
+                                self.notifier.send_suppressed_alert_details(
+                                    reason="market_closed",
+                                    condition_id=condition_id,
+                                    outcome_index=outcome_index,
+                                    wallets=wallets_in_window,
+                                    wallet_prices=wallet_prices,
+                                    market_title=market_title,
+                                    market_slug=market_slug,
+                                    current_price=None,
+                                    side=side,
+                                    total_usd=total_usd
+                                )
+                                self.db.mark_suppressed_alert_sent(
+                                    condition_id, outcome_index, side, "market_closed",
+                                    wallet_count=len(wallets_in_window)
+                                )
+                            except Exception as e:
+                                logger.debug(f"Failed to send suppressed alert details: {e}")
                         else:
-                            if len(wallets_in_window) < self.min_consensus:
-                                logger.debug(f"Skipping suppressed alert: only {len(wallets_in_window)} wallet(s), below consensus threshold")
-                            else:
-                                logger.debug(f"Skipping suppressed alert: events too old ({last_event_age/60:.1f} min ago), not recent enough")
-                        return
+                            logger.debug(f"Suppressed alert for market_closed already sent recently for {condition_id[:20]}... outcome={outcome_index} side={side}")
                     else:
-                        # Price is None but market appears ACTIVE - allow alert to proceed (fail-open)
-                        # This could be a temporary API issue, but market is still trading
-                        # IMPORTANT: Don't block real alerts for active markets just because price is temporarily unavailable
-                        logger.warning(
-                            f"[CONSENSUS] ⚠️  Price unavailable but market is ACTIVE - allowing alert to proceed "
-                            f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                            f"wallets={len(wallets_in_window)} "
-                            f"(price might be temporarily unavailable, but market is still active - fail-open)"
-                        )
-                        # Continue to send real alert (price will be shown as "N/A" or similar)
-                        # The alert will proceed to the next checks (deduplication, etc.)
-                        # current_price remains None, but alert will be sent with Price: N/A
-            except (ValueError, TypeError) as e:
-                logger.error(f"[SUPPRESS] BLOCKING: Error parsing price {current_price}: {e}, condition={condition_id}")
-                # On parsing error, block to be safe
-                self.suppressed_counts['price_check_error'] = self.suppressed_counts.get('price_check_error', 0) + 1
-                # Send suppressed alert details to reports
+                        if len(wallets_in_window) < self.min_consensus:
+                            logger.debug(f"Skipping suppressed alert: only {len(wallets_in_window)} wallet(s), below consensus threshold")
+                        else:
+                            logger.debug(f"Skipping suppressed alert: events too old ({last_event_age/60:.1f} min ago), not recent enough")
+                    return
+                else:
+                    # Price is None but market appears ACTIVE - allow alert to proceed (fail-open)
+                    # This could be a temporary API issue, but market is still trading
+                    # IMPORTANT: Don't block real alerts for active markets just because price is temporarily unavailable
+                    logger.warning(
+                        f"[CONSENSUS] ⚠️  Price unavailable but market is ACTIVE - allowing alert to proceed "
+                        f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                        f"wallets={len(wallets_in_window)} "
+                        f"(price might be temporarily unavailable, but market is still active - fail-open)"
+                    )
+                    # Continue to send real alert (price will be shown as "N/A" or similar)
+                    # The alert will proceed to the next checks (deduplication, etc.)
+                    # current_price remains None, but alert will be sent with Price: N/A
+        except (ValueError, TypeError) as e:
+            logger.error(f"[SUPPRESS] BLOCKING: Error parsing price {current_price}: {e}, condition={condition_id}")
+            # On parsing error, block to be safe
+            self.suppressed_counts['price_check_error'] = self.suppressed_counts.get('price_check_error', 0) + 1
+            # Send suppressed alert details to reports
+            if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "price_check_error", window_minutes=30.0):
                 try:
                     self.notifier.send_suppressed_alert_details(
                         reason="price_check_error",
@@ -2289,107 +2438,114 @@ class PolymarketNotifier:
                         side=side,
                         total_usd=total_usd
                     )
+                    self.db.mark_suppressed_alert_sent(
+                        condition_id, outcome_index, side, "price_check_error",
+                        wallet_count=len(wallets_in_window)
+                    )
                 except Exception as send_err:
                     logger.debug(f"Failed to send suppressed alert details: {send_err}")
-                return
+            return
+        
+        # STEP 6: Final check: Verify market is still active before sending alert
+        # IMPORTANT: Check if events are recent (within window) - don't send suppressed alerts for old events
+        logger.info(f"[CONSENSUS] Step 6/7: Final market status check for condition={condition_id[:20]}... outcome={outcome_index}")
+        market_is_active_final = self.is_market_active_cached(condition_id, outcome_index)
+        logger.info(f"[CONSENSUS] Step 6/7: Final market active status = {market_is_active_final}")
+        if not market_is_active_final:
+            self.suppressed_counts['market_closed'] = self.suppressed_counts.get('market_closed', 0) + 1
+            
+            # Check if events are recent (within last hour) - only send suppressed alerts for recent events
+            # Use dt_module to avoid conflicts
+            now_ts = dt_module.datetime.now(dt_module.timezone.utc).timestamp()
+            last_event_age = now_ts - window_data.get("last_ts", 0)
+            recent_threshold = 3600  # 1 hour in seconds
+            
+            is_recent = last_event_age <= recent_threshold
             
-            # STEP 6: Final check: Verify market is still active before sending alert
-            # IMPORTANT: Check if events are recent (within window) - don't send suppressed alerts for old events
-            logger.info(f"[CONSENSUS] Step 6/7: Final market status check for condition={condition_id[:20]}... outcome={outcome_index}")
-            market_is_active_final = self.is_market_active(condition_id, outcome_index)
-            logger.info(f"[CONSENSUS] Step 6/7: Final market active status = {market_is_active_final}")
-            if not market_is_active_final:
-                self.suppressed_counts['market_closed'] = self.suppressed_counts.get('market_closed', 0) + 1
-                
-                # Check if events are recent (within last hour) - only send suppressed alerts for recent events
+            logger.info(
+                f"[Consensus] skipped: market_inactive (final check) condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                f"(last event age: {last_event_age/60:.1f} min, recent: {is_recent})"
+            )
+            
+            # Only send suppressed alert if:
+            # 1. We have consensus (multiple wallets)
+            # 2. Events are recent (within last hour) - don't send for old historical events
+            # 3. We haven't already sent a suppressed alert for this market/outcome/side/reason recently
+            if len(wallets_in_window) >= self.min_consensus and is_recent:
+                if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "market_closed", window_minutes=30.0):
+                    # Send suppressed alert details to reports (only for recent consensus-level events)
+                    try:
+                        self.notifier.send_suppressed_alert_details(
+                            reason="market_closed",
+                            condition_id=condition_id,
+                            outcome_index=outcome_index,
+                            wallets=wallets_in_window,
+                            wallet_prices=wallet_prices,
+                            market_title=market_title,
+                            market_slug=market_slug,
+                            current_price=current_price,
+                            side=side,
+                            total_usd=total_usd
+                        )
+                        self.db.mark_suppressed_alert_sent(
+                            condition_id, outcome_index, side, "market_closed",
+                            wallet_count=len(wallets_in_window)
+                        )
+                    except Exception as e:
+                        logger.debug(f"Failed to send suppressed alert details: {e}")
+                else:
+                    logger.debug(f"Suppressed alert for market_closed already sent recently for {condition_id[:20]}... outcome={outcome_index} side={side}")
+            else:
+                if len(wallets_in_window) < self.min_consensus:
+                    logger.debug(f"Skipping suppressed alert for closed market: only {len(wallets_in_window)} wallet(s), below consensus threshold")
+                else:
+                    logger.debug(f"Skipping suppressed alert for closed market: events too old ({last_event_age/60:.1f} min ago), not recent enough")
+            return
+
+        # Dedupe/trigger rules against recent alerts
+        self._enter_stage(trace, "dedupe")
+        # STEP 7: Dedupe/trigger rules using recent alerts
+        logger.info(f"[CONSENSUS] Step 7/7: Checking deduplication rules for condition={condition_id[:20]}... outcome={outcome_index} side={side}")
+        recent = self.db.get_recent_alerts(condition_id, outcome_index, limit=3)
+        logger.info(f"[CONSENSUS] Step 7/7: Found {len(recent)} recent alerts")
+        if recent:
+            last = recent[0]
+            # Parse time delta
+            try:
                 # Use dt_module to avoid conflicts
-                now_ts = dt_module.datetime.now(dt_module.timezone.utc).timestamp()
-                last_event_age = now_ts - window_data.get("last_ts", 0)
-                recent_threshold = 3600  # 1 hour in seconds
-                
-                is_recent = last_event_age <= recent_threshold
-                
+                last_ts = dt_module.datetime.fromisoformat(last['sent_at']).replace(tzinfo=dt_module.timezone.utc).timestamp()
+            except Exception:
+                last_ts = time.time() - 999999
+            minutes_since = (time.time() - last_ts) / 60.0
+            last_wallets = int(last.get('wallet_count') or 0)
+            last_price = float(last.get('price') or 0)
+            same_outcome = (outcome_index == int(last.get('outcome_index') or outcome_index))
+            price_change = 0.0
+            if current_price and last_price:
+                price_change = abs(current_price - last_price) / max(1e-9, last_price)
+            
+            # Build set of wallets from last 3 alerts
+            prev_wallets = set()
+            for r in recent:
+                csv = r.get('wallets_csv') or ''
+                for w in csv.split(','):
+                    w = w.strip()
+                    if w:
+                        prev_wallets.add(w)
+            current_wallets_set = set(wallets_in_window)
+            has_new_wallet = len(current_wallets_set - prev_wallets) > 0
+            wallets_grew = len(wallets_in_window) > last_wallets
+            outcome_changed = not same_outcome
+            should_refresh_due_time = minutes_since > self.refresh_interval_min
+            
+            # Global ignore: within 30 minutes for the same market and same outcome
+            if same_outcome and minutes_since < 30.0:
+                self.suppressed_counts['ignore_30m_same_outcome'] += 1
                 logger.info(
-                    f"[Consensus] skipped: market_inactive (final check) condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                    f"(last event age: {last_event_age/60:.1f} min, recent: {is_recent})"
+                    f"[CONSENSUS] ⏭️  BLOCKED: ignore_30m_same_outcome condition={condition_id[:20]}... outcome={outcome_index} side={side} mins={minutes_since:.1f}"
                 )
-                
-                # Only send suppressed alert if:
-                # 1. We have consensus (multiple wallets)
-                # 2. Events are recent (within last hour) - don't send for old historical events
-                # 3. We haven't already sent a suppressed alert for this market/outcome/side/reason recently
-                if len(wallets_in_window) >= self.min_consensus and is_recent:
-                    if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "market_closed", window_minutes=30.0):
-                        # Send suppressed alert details to reports (only for recent consensus-level events)
-                        try:
-                            self.notifier.send_suppressed_alert_details(
-                                reason="market_closed",
-                                condition_id=condition_id,
-                                outcome_index=outcome_index,
-                                wallets=wallets_in_window,
-                                wallet_prices=wallet_prices,
-                                market_title=market_title,
-                                market_slug=market_slug,
-                                current_price=current_price,
-                                side=side,
-                                total_usd=total_usd
-                            )
-                            self.db.mark_suppressed_alert_sent(
-                                condition_id, outcome_index, side, "market_closed",
-                                wallet_count=len(wallets_in_window)
-                            )
-                        except Exception as e:
-                            logger.debug(f"Failed to send suppressed alert details: {e}")
-                    else:
-                        logger.debug(f"Suppressed alert for market_closed already sent recently for {condition_id[:20]}... outcome={outcome_index} side={side}")
-                else:
-                    if len(wallets_in_window) < self.min_consensus:
-                        logger.debug(f"Skipping suppressed alert for closed market: only {len(wallets_in_window)} wallet(s), below consensus threshold")
-                    else:
-                        logger.debug(f"Skipping suppressed alert for closed market: events too old ({last_event_age/60:.1f} min ago), not recent enough")
-                return
-
-            # STEP 7: Dedupe/trigger rules using recent alerts
-            logger.info(f"[CONSENSUS] Step 7/7: Checking deduplication rules for condition={condition_id[:20]}... outcome={outcome_index} side={side}")
-            recent = self.db.get_recent_alerts(condition_id, outcome_index, limit=3)
-            logger.info(f"[CONSENSUS] Step 7/7: Found {len(recent)} recent alerts")
-            if recent:
-                last = recent[0]
-                # Parse time delta
-                try:
-                    # Use dt_module to avoid conflicts
-                    last_ts = dt_module.datetime.fromisoformat(last['sent_at']).replace(tzinfo=dt_module.timezone.utc).timestamp()
-                except Exception:
-                    last_ts = time.time() - 999999
-                minutes_since = (time.time() - last_ts) / 60.0
-                last_wallets = int(last.get('wallet_count') or 0)
-                last_price = float(last.get('price') or 0)
-                same_outcome = (outcome_index == int(last.get('outcome_index') or outcome_index))
-                price_change = 0.0
-                if current_price and last_price:
-                    price_change = abs(current_price - last_price) / max(1e-9, last_price)
-                
-                # Build set of wallets from last 3 alerts
-                prev_wallets = set()
-                for r in recent:
-                    csv = r.get('wallets_csv') or ''
-                    for w in csv.split(','):
-                        w = w.strip()
-                        if w:
-                            prev_wallets.add(w)
-                current_wallets_set = set(wallets_in_window)
-                has_new_wallet = len(current_wallets_set - prev_wallets) > 0
-                wallets_grew = len(wallets_in_window) > last_wallets
-                outcome_changed = not same_outcome
-                should_refresh_due_time = minutes_since > self.refresh_interval_min
-                
-                # Global ignore: within 30 minutes for the same market and same outcome
-                if same_outcome and minutes_since < 30.0:
-                    self.suppressed_counts['ignore_30m_same_outcome'] += 1
-                    logger.info(
-                        f"[CONSENSUS] ⏭️  BLOCKED: ignore_30m_same_outcome condition={condition_id[:20]}... outcome={outcome_index} side={side} mins={minutes_since:.1f}"
-                    )
-                    # Send suppressed alert details to reports
+                # Send suppressed alert details to reports
+                if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "ignore_30m_same_outcome", window_minutes=30.0):
                     try:
                         self.notifier.send_suppressed_alert_details(
                             reason="ignore_30m_same_outcome",
@@ -2403,17 +2559,22 @@ class PolymarketNotifier:
                             side=side,
                             total_usd=total_usd
                         )
+                        self.db.mark_suppressed_alert_sent(
+                            condition_id, outcome_index, side, "ignore_30m_same_outcome",
+                            wallet_count=len(wallets_in_window)
+                        )
                     except Exception as e:
                         logger.debug(f"Failed to send suppressed alert details: {e}")
-                    return
-                # Legacy ignore if within 10 min and none of the triggers met
-                if minutes_since < 10.0 and same_outcome and (not wallets_grew) and (price_change < 0.01):
-                    self.suppressed_counts['dedupe_no_growth_10m'] += 1
-                    logger.info(
-                        f"[CONSENSUS] ⏭️  BLOCKED: dedupe_no_growth_10m condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                        f"(minutes_since={minutes_since:.1f}, wallets_grew={wallets_grew}, price_change={price_change:.4f})"
-                    )
-                    # Send suppressed alert details to reports
+                return
+            # Legacy ignore if within 10 min and none of the triggers met
+            if minutes_since < 10.0 and same_outcome and (not wallets_grew) and (price_change < 0.01):
+                self.suppressed_counts['dedupe_no_growth_10m'] += 1
+                logger.info(
+                    f"[CONSENSUS] ⏭️  BLOCKED: dedupe_no_growth_10m condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                    f"(minutes_since={minutes_since:.1f}, wallets_grew={wallets_grew}, price_change={price_change:.4f})"
+                )
+                # Send suppressed alert details to reports
+                if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "dedupe_no_growth_10m", window_minutes=30.0):
                     try:
                         self.notifier.send_suppressed_alert_details(
                             reason="dedupe_no_growth_10m",
@@ -2427,18 +2588,23 @@ class PolymarketNotifier:
                             side=side,
                             total_usd=total_usd
                         )
+                        self.db.mark_suppressed_alert_sent(
+                            condition_id, outcome_index, side, "dedupe_no_growth_10m",
+                            wallet_count=len(wallets_in_window)
+                        )
                     except Exception as e:
                         logger.debug(f"Failed to send suppressed alert details: {e}")
-                    return
-                # Else proceed only if any trigger met
-                if not (outcome_changed or wallets_grew or has_new_wallet or price_change >= 0.01 or should_refresh_due_time):
-                    self.suppressed_counts['no_trigger_matched'] += 1
-                    logger.info(
-                        f"[CONSENSUS] ⏭️  BLOCKED: no_trigger_matched condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                        f"(outcome_changed={outcome_changed}, wallets_grew={wallets_grew}, has_new_wallet={has_new_wallet}, "
-                        f"price_change={price_change:.4f}, should_refresh={should_refresh_due_time})"
-                    )
-                    # Send suppressed alert details to reports
+                return
+            # Else proceed only if any trigger met
+            if not (outcome_changed or wallets_grew or has_new_wallet or price_change >= 0.01 or should_refresh_due_time):
+                self.suppressed_counts['no_trigger_matched'] += 1
+                logger.info(
+                    f"[CONSENSUS] ⏭️  BLOCKED: no_trigger_matched condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                    f"(outcome_changed={outcome_changed}, wallets_grew={wallets_grew}, has_new_wallet={has_new_wallet}, "
+                    f"price_change={price_change:.4f}, should_refresh={should_refresh_due_time})"
+                )
+                # Send suppressed alert details to reports
+                if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "no_trigger_matched", window_minutes=30.0):
                     try:
                         self.notifier.send_suppressed_alert_details(
                             reason="no_trigger_matched",
@@ -2452,44 +2618,32 @@ class PolymarketNotifier:
                             side=side,
                             total_usd=total_usd
                         )
+                        self.db.mark_suppressed_alert_sent(
+                            condition_id, outcome_index, side, "no_trigger_matched",
+                            wallet_count=len(wallets_in_window)
+                        )
                     except Exception as e:
                         logger.debug(f"Failed to send suppressed alert details: {e}")
-                    return
-            
-            # STEP 8: Don't send if we recently alerted same market/side (30-minute cooldown to prevent spam)
-            logger.info(f"[CONSENSUS] Step 8/9: Checking cooldown for condition={condition_id[:20]}... outcome={outcome_index} side={side} (cooldown={self.alert_cooldown_min} min)")
-            has_recent_cooldown = self.db.has_recent_alert(condition_id, outcome_index, side, self.alert_cooldown_min)
-            logger.info(f"[CONSENSUS] Step 8/9: Has recent alert in cooldown = {has_recent_cooldown}")
-            if has_recent_cooldown:
-                self.suppressed_counts['cooldown'] = self.suppressed_counts.get('cooldown', 0) + 1
-                if not hasattr(self, 'monitoring_stats'):
-                    self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                reason = "cooldown"
-                self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                logger.info(
-                    f"[CONSENSUS] ⏭️  BLOCKED: Cooldown (30min) - "
-                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                    f"wallets={len(wallets_in_window)}"
-                )
                 return
-            # STEP 9: Don't send if there was an opposite-side alert recently (conflict avoidance)
-            logger.info(f"[CONSENSUS] Step 9/9: Checking opposite side alerts for condition={condition_id[:20]}... outcome={outcome_index} side={side}")
-            has_opposite_recent = self.db.has_recent_opposite_alert(condition_id, outcome_index, side, self.conflict_window_min)
-            logger.info(f"[CONSENSUS] Step 9/9: Has recent opposite side alert = {has_opposite_recent}")
-            if has_opposite_recent:
-                self.suppressed_counts['opposite_recent'] = self.suppressed_counts.get('opposite_recent', 0) + 1
-                if not hasattr(self, 'monitoring_stats'):
-                    self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                reason = "opposite_recent"
-                self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                logger.info(
-                    f"[CONSENSUS] ⏭️  BLOCKED: Opposite side recent - "
-                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                    f"wallets={len(wallets_in_window)}"
-                )
-                # Send suppressed alert details to reports
+        
+        # STEP 9: Don't send if there was an opposite-side alert recently (conflict avoidance)
+        logger.info(f"[CONSENSUS] Step 9/9: Checking opposite side alerts for condition={condition_id[:20]}... outcome={outcome_index} side={side}")
+        has_opposite_recent = self.db.has_recent_opposite_alert(condition_id, outcome_index, side, self.conflict_window_min)
+        logger.info(f"[CONSENSUS] Step 9/9: Has recent opposite side alert = {has_opposite_recent}")
+        if has_opposite_recent:
+            self.suppressed_counts['opposite_recent'] = self.suppressed_counts.get('opposite_recent', 0) + 1
+            if not hasattr(self, 'monitoring_stats'):
+                self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+            self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+            reason = "opposite_recent"
+            self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
+            logger.info(
+                f"[CONSENSUS] ⏭️  BLOCKED: Opposite side recent - "
+                f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                f"wallets={len(wallets_in_window)}"
+            )
+            # Send suppressed alert details to reports
+            if not self.db.is_suppressed_alert_sent(condition_id, outcome_index, side, "opposite_recent", window_minutes=30.0):
                 try:
                     self.notifier.send_suppressed_alert_details(
                         reason="opposite_recent",
@@ -2503,320 +2657,310 @@ class PolymarketNotifier:
                         side=side,
                         total_usd=total_usd
                     )
+                    self.db.mark_suppressed_alert_sent(
+                        condition_id, outcome_index, side, "opposite_recent",
+                        wallet_count=len(wallets_in_window)
+                    )
                 except Exception as e:
                     logger.debug(f"Failed to send suppressed alert details: {e}")
-                return
+            return
 
-            # STEP 10: Check minimum total position size
-            logger.info(f"[CONSENSUS] Step 10/10: Checking minimum total position size: ${total_usd:.2f} >= ${self.min_total_position_usd:.2f}")
-            if total_usd < self.min_total_position_usd:
-                if not hasattr(self, 'monitoring_stats'):
-                    self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                reason = "insufficient_position_size"
-                self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                logger.info(
-                    f"[CONSENSUS] ⏭️  BLOCKED: Insufficient total position size - "
-                    f"${total_usd:.2f} < ${self.min_total_position_usd:.2f} "
-                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} wallets={len(wallets_in_window)}"
-                )
-                return
-            
-            # STEP 11: Check if this is a repeat alert (position increased >2x)
-            is_repeat_alert = False
-            has_existing_alert = self.db.has_alert_for_market(condition_id, outcome_index, side)
-            
-            if has_existing_alert:
-                first_total_usd = self.db.get_first_total_usd(condition_id, outcome_index, side)
-                if first_total_usd is not None:
-                    if total_usd >= 2.0 * first_total_usd:
-                        is_repeat_alert = True
-                        logger.info(
-                            f"[CONSENSUS] 🔄 REPEAT ALERT: Position increased >2x - "
-                            f"${total_usd:.2f} >= 2 * ${first_total_usd:.2f} = ${2.0 * first_total_usd:.2f} "
-                            f"condition={condition_id[:20]}... outcome={outcome_index} side={side}"
-                        )
-                    else:
-                        logger.info(
-                            f"[CONSENSUS] ⏭️  BLOCKED: Alert already sent, position not increased >2x - "
-                            f"${total_usd:.2f} < 2 * ${first_total_usd:.2f} = ${2.0 * first_total_usd:.2f} "
-                            f"condition={condition_id[:20]}... outcome={outcome_index} side={side}"
-                        )
-                        return
+        # STEP 11: Check if this is a repeat alert (position increased >2x)
+        is_repeat_alert = False
+        has_existing_alert = self.db.has_alert_for_market(condition_id, outcome_index, side)
+        
+        if has_existing_alert:
+            first_total_usd = self.db.get_first_total_usd(condition_id, outcome_index, side)
+            if first_total_usd is not None:
+                if total_usd >= 2.0 * first_total_usd:
+                    is_repeat_alert = True
+                    logger.info(
+                        f"[CONSENSUS] 🔄 REPEAT ALERT: Position increased >2x - "
+                        f"${total_usd:.2f} >= 2 * ${first_total_usd:.2f} = ${2.0 * first_total_usd:.2f} "
+                        f"condition={condition_id[:20]}... outcome={outcome_index} side={side}"
+                    )
                 else:
-                    # Alert exists but first_total_usd is not set (old alert), treat as first alert
                     logger.info(
-                        f"[CONSENSUS] ℹ️  Alert exists but first_total_usd not set, treating as first alert - "
+                        f"[CONSENSUS] ⏭️  BLOCKED: Alert already sent, position not increased >2x - "
+                        f"${total_usd:.2f} < 2 * ${first_total_usd:.2f} = ${2.0 * first_total_usd:.2f} "
                         f"condition={condition_id[:20]}... outcome={outcome_index} side={side}"
                     )
+                    return
             else:
+                # Alert exists but first_total_usd is not set (old alert), treat as first alert
                 logger.info(
-                    f"[CONSENSUS] ℹ️  First alert for this market - "
-                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} total_usd=${total_usd:.2f}"
+                    f"[CONSENSUS] ℹ️  Alert exists but first_total_usd not set, treating as first alert - "
+                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side}"
                 )
-            
-            # All checks passed! Prepare to send alert
-            alert_type = "REPEAT" if is_repeat_alert else "FIRST"
-            logger.info(f"[CONSENSUS] ✅ All checks passed! Preparing to send {alert_type} alert for condition={condition_id[:20]}... outcome={outcome_index} side={side}")
-            
-            # Get market info to extract end_date
-            market_info = self.get_market_info(condition_id)
-            end_date = market_info.get("end_date") if market_info else None
-            
-            # Get category for this market
-            category = "other/Unknown"
-            try:
-                from gamma_client import get_event_by_condition_id
-                event = get_event_by_condition_id(condition_id)
-                if event:
-                    markets = event.get("markets", [])
-                    for market in markets:
-                        market_condition_id = market.get("conditionId") or market.get("condition_id")
-                        if market_condition_id and market_condition_id.lower() == condition_id.lower():
-                            slug = market.get("slug") or market.get("marketSlug")
-                            question = market.get("question") or market.get("title")
-                            category = classify_market(event, slug, question)
-                            break
-                    if category == "other/Unknown":
-                        slug = event.get("slug") or event.get("eventSlug")
-                        question = event.get("question") or event.get("title")
+        else:
+            logger.info(
+                f"[CONSENSUS] ℹ️  First alert for this market - "
+                f"condition={condition_id[:20]}... outcome={outcome_index} side={side} total_usd=${total_usd:.2f}"
+            )
+        
+        # Enrich and send
+        self._enter_stage(trace, "send")
+        # All checks passed! Prepare to send alert
+        alert_type = "REPEAT" if is_repeat_alert else "FIRST"
+        logger.info(f"[CONSENSUS] ✅ All checks passed! Preparing to send {alert_type} alert for condition={condition_id[:20]}... outcome={outcome_index} side={side}")
+        
+        # Get market info to extract end_date
+        market_info = self.get_market_info(condition_id)
+        end_date = market_info.get("end_date") if market_info else None
+        
+        # Get category for this market
+        category = "other/Unknown"
+        try:
+            from gamma_client import get_event_by_condition_id
+            event = get_event_by_condition_id(condition_id)
+            if event:
+                markets = event.get("markets", [])
+                for market in markets:
+                    market_condition_id = market.get("conditionId") or market.get("condition_id")
+                    if market_condition_id and market_condition_id.lower() == condition_id.lower():
+                        slug = market.get("slug") or market.get("marketSlug")
+                        question = market.get("question") or market.get("title")
                         category = classify_market(event, slug, question)
-                else:
-                    # Fallback: classify from slug/question if available
-                    category = classify_market({}, market_slug, market_title)
-            except Exception as e:
-                logger.debug(f"[CONSENSUS] Error classifying market category: {e}")
+                        break
+                if category == "other/Unknown":
+                    slug = event.get("slug") or event.get("eventSlug")
+                    question = event.get("question") or event.get("title")
+                    category = classify_market(event, slug, question)
+            else:
                 # Fallback: classify from slug/question if available
                 category = classify_market({}, market_slug, market_title)
-            
-            logger.info(f"[CONSENSUS] Category for condition={condition_id[:20]}...: {category}")
-            
-            # Get A List status for wallets in this category
-            a_list_wallets = []
-            for wallet in wallets_in_window:
-                if self.db.is_wallet_a_list_in_category(wallet, category):
-                    a_list_wallets.append(wallet)
-            
-            logger.info(f"[CONSENSUS] A List traders in this signal: {len(a_list_wallets)}/{len(wallets_in_window)}")
-            if a_list_wallets:
-                logger.info(f"[CONSENSUS] A List wallets: {', '.join([w[:12] + '...' for w in a_list_wallets[:5]])}")
-            
-            # Send alert with prices and consensus flow (events per minute)
-            # Pass current_price (may be None) - send_consensus_alert will handle it
-            alert_id = key[:8]
-            # Use filtered events count (events within time window)
-            events_count = len(filtered_events) if 'filtered_events' in locals() else len(window_data.get("events", []))
-            
-            logger.info("=" * 80)
-            logger.info(f"[CONSENSUS] 📤 SENDING ALERT:")
-            logger.info(f"[CONSENSUS]   - Condition: {condition_id[:30]}...")
-            logger.info(f"[CONSENSUS]   - Outcome: {outcome_index}")
-            logger.info(f"[CONSENSUS]   - Side: {side}")
-            logger.info(f"[CONSENSUS]   - Category: {category}")
-            logger.info(f"[CONSENSUS]   - A List traders: {len(a_list_wallets)}/{len(wallets_in_window)}")
-            logger.info(f"[CONSENSUS]   - Wallets: {len(wallets_in_window)}")
-            logger.info(f"[CONSENSUS]   - Events: {events_count}")
-            logger.info(f"[CONSENSUS]   - Total USD: ${total_usd:.2f}")
-            logger.info(f"[CONSENSUS]   - Current Price: {current_price}")
-            logger.info(f"[CONSENSUS]   - Market Title: {market_title[:50] if market_title else 'N/A'}...")
-            logger.info("=" * 80)
-            
-            # Check for OI spike confirmation (enforce 5-minute window between samples)
-            oi_confirmed = False
-            order_flow_confirmed = False
-            try:
-                spike_result = self.db.calculate_oi_spike(condition_id, self.oi_spike_threshold_percent, max_minutes=5)
-                if spike_result:
-                    oi_confirmed = True
-                    logger.info(f"[CONSENSUS] ✅ OI confirmed: {condition_id[:20]}... spiked by {spike_result['spike_percent']:.1f}%")
-            except Exception as e:
-                logger.debug(f"[CONSENSUS] Could not check OI spike: {e}")
-            
-            # Check for order flow confirmation
-            try:
-                latest_order_flow = self.db.get_latest_order_flow(condition_id, outcome_index)
-                if latest_order_flow and latest_order_flow.get('is_imbalanced'):
-                    flow_direction = latest_order_flow.get('imbalance_direction', '').upper()
-                    
-                    # Check freshness of the order flow metric
-                    detected_at = latest_order_flow.get('detected_at')
-                    age_minutes = None
-                    if detected_at:
-                        try:
-                            # Parse detected_at as aware UTC datetime
-                            detected_time = datetime.fromisoformat(detected_at.replace('Z', '+00:00'))
-                            if detected_time.tzinfo is None:
-                                detected_time = detected_time.replace(tzinfo=timezone.utc)
-                            # Compute age in minutes
-                            age_minutes = (datetime.now(timezone.utc) - detected_time).total_seconds() / 60.0
-                        except Exception as e:
-                            logger.debug(f"[CONSENSUS] Could not parse detected_at timestamp: {e}")
-                    
-                    # Set freshness threshold (default: 2x the order flow time window)
-                    max_age_min = self.order_flow_time_window_min * 2
-                    
-                    # Confirm if order flow direction matches consensus side AND metric is fresh
-                    direction_matches = (side.upper() == 'BUY' and flow_direction == 'BUY') or \
-                                      (side.upper() == 'SELL' and flow_direction == 'SELL')
-                    
-                    if direction_matches:
-                        if age_minutes is not None and age_minutes <= max_age_min:
-                            order_flow_confirmed = True
-                            logger.info(f"[CONSENSUS] ✅ Order flow confirmed: {condition_id[:20]}... {flow_direction} imbalance matches {side} consensus (age: {age_minutes:.1f}min)")
-                        elif age_minutes is not None:
-                            logger.info(f"[CONSENSUS] ⚠️ Order flow present but too old: {condition_id[:20]}... {flow_direction} imbalance matches {side} consensus but age {age_minutes:.1f}min exceeds threshold {max_age_min:.1f}min")
-                        else:
-                            # If we can't determine age, don't confirm (safety first)
-                            logger.debug(f"[CONSENSUS] Order flow present but detected_at timestamp unavailable or invalid: {condition_id[:20]}...")
-            except Exception as e:
-                logger.debug(f"[CONSENSUS] Could not check order flow: {e}")
-            
-            # Check for news correlation (only for high-confidence consensus)
-            news_context = None
-            is_high_confidence = (
-                len(wallets_in_window) >= self.news_min_wallets_for_check or
-                len(a_list_wallets) >= self.news_min_a_list_for_check
-            )
-            
-            if is_high_confidence:
-                try:
-                    consensus_timestamp = window_data.get('last_ts', time.time())
-                    news_context = self.check_news_correlation(market_title, condition_id, consensus_timestamp)
-                    if news_context:
-                        logger.info(f"[CONSENSUS] ✅ News correlation found: {news_context.get('headline', '')[:50]}...")
+        except Exception as e:
+            logger.debug(f"[CONSENSUS] Error classifying market category: {e}")
+            # Fallback: classify from slug/question if available
+            category = classify_market({}, market_slug, market_title)
+        
+        logger.info(f"[CONSENSUS] Category for condition={condition_id[:20]}...: {category}")
+        
+        # Get A List status for wallets in this category
+        a_list_wallets = []
+        for wallet in wallets_in_window:
+            if self.db.is_wallet_a_list_in_category(wallet, category):
+                a_list_wallets.append(wallet)
+        
+        logger.info(f"[CONSENSUS] A List traders in this signal: {len(a_list_wallets)}/{len(wallets_in_window)}")
+        if a_list_wallets:
+            logger.info(f"[CONSENSUS] A List wallets: {', '.join([w[:12] + '...' for w in a_list_wallets[:5]])}")
+        
+        # Send alert with prices and consensus flow (events per minute)
+        # Pass current_price (may be None) - send_consensus_alert will handle it
+        alert_id = key[:8]
+        # Use filtered events count (events within time window)
+        events_count = len(filtered_events) if 'filtered_events' in locals() else len(window_data.get("events", []))
+        
+        logger.info("=" * 80)
+        logger.info(f"[CONSENSUS] 📤 SENDING ALERT:")
+        logger.info(f"[CONSENSUS]   - Condition: {condition_id[:30]}...")
+        logger.info(f"[CONSENSUS]   - Outcome: {outcome_index}")
+        logger.info(f"[CONSENSUS]   - Side: {side}")
+        logger.info(f"[CONSENSUS]   - Category: {category}")
+        logger.info(f"[CONSENSUS]   - A List traders: {len(a_list_wallets)}/{len(wallets_in_window)}")
+        logger.info(f"[CONSENSUS]   - Wallets: {len(wallets_in_window)}")
+        logger.info(f"[CONSENSUS]   - Events: {events_count}")
+        logger.info(f"[CONSENSUS]   - Total USD: ${total_usd:.2f}")
+        logger.info(f"[CONSENSUS]   - Current Price: {current_price}")
+        logger.info(f"[CONSENSUS]   - Market Title: {market_title[:50] if market_title else 'N/A'}...")
+        logger.info("=" * 80)
+        
+        # Check for OI spike confirmation (enforce 5-minute window between samples)
+        oi_confirmed = False
+        order_flow_confirmed = False
+        try:
+            spike_result = self.db.calculate_oi_spike(condition_id, self.oi_spike_threshold_percent, max_minutes=5)
+            if spike_result:
+                oi_confirmed = True
+                logger.info(f"[CONSENSUS] ✅ OI confirmed: {condition_id[:20]}... spiked by {spike_result['spike_percent']:.1f}%")
+        except Exception as e:
+            logger.debug(f"[CONSENSUS] Could not check OI spike: {e}")
+        
+        # Check for order flow confirmation
+        try:
+            latest_order_flow = self.db.get_latest_order_flow(condition_id, outcome_index)
+            if latest_order_flow and latest_order_flow.get('is_imbalanced'):
+                flow_direction = latest_order_flow.get('imbalance_direction', '').upper()
+                
+                # Check freshness of the order flow metric
+                detected_at = latest_order_flow.get('detected_at')
+                age_minutes = None
+                if detected_at:
+                    try:
+                        # Parse detected_at as aware UTC datetime
+                        detected_time = datetime.fromisoformat(detected_at.replace('Z', '+00:00'))
+                        if detected_time.tzinfo is None:
+                            detected_time = detected_time.replace(tzinfo=timezone.utc)
+                        # Compute age in minutes
+                        age_minutes = (datetime.now(timezone.utc) - detected_time).total_seconds() / 60.0
+                    except Exception as e:
+                        logger.debug(f"[CONSENSUS] Could not parse detected_at timestamp: {e}")
+                
+                # Set freshness threshold (default: 2x the order flow time window)
+                max_age_min = self.order_flow_time_window_min * 2
+                
+                # Confirm if order flow direction matches consensus side AND metric is fresh
+                direction_matches = (side.upper() == 'BUY' and flow_direction == 'BUY') or \
+                                  (side.upper() == 'SELL' and flow_direction == 'SELL')
+                
+                if direction_matches:
+                    if age_minutes is not None and age_minutes <= max_age_min:
+                        order_flow_confirmed = True
+                        logger.info(f"[CONSENSUS] ✅ Order flow confirmed: {condition_id[:20]}... {flow_direction} imbalance matches {side} consensus (age: {age_minutes:.1f}min)")
+                    elif age_minutes is not None:
+                        logger.info(f"[CONSENSUS] ⚠️ Order flow present but too old: {condition_id[:20]}... {flow_direction} imbalance matches {side} consensus but age {age_minutes:.1f}min exceeds threshold {max_age_min:.1f}min")
                     else:
-                        logger.info(f"[CONSENSUS] ⚠️ No news correlation found for high-confidence consensus")
-                except Exception as e:
-                    logger.debug(f"[CONSENSUS] Could not check news correlation: {e}")
-                    news_context = None
-            else:
-                logger.debug(f"[CONSENSUS] Skipping news check (low confidence: {len(wallets_in_window)} wallets, {len(a_list_wallets)} A-list)")
-            
-            logger.info(f"[NOTIFY] Preparing to send consensus alert: condition={condition_id[:20]}... outcome={outcome_index} side={side} wallets={len(wallets_in_window)} oi_confirmed={oi_confirmed} order_flow_confirmed={order_flow_confirmed} news_context={'present' if news_context else 'none'}")
-            try:
-                success = self.notifier.send_consensus_alert(
-                    condition_id, outcome_index, wallets_in_window, wallet_prices,
-                    self.alert_window_min, self.min_consensus, alert_id, market_title, market_slug, side,
-                    consensus_events=events_count,
-                    total_usd=total_usd,
-                    end_date=end_date,
-                    current_price=current_price,  # Pass current_price (may be None)
-                    oi_confirmed=oi_confirmed,  # Pass OI confirmation flag
-                    order_flow_confirmed=order_flow_confirmed,  # Pass order flow confirmation flag
-                    news_context=news_context  # Pass news context
-                    # Removed category and a_list_wallets - not in method signature
-                )
-            except Exception as e:
-                logger.error(f"[NOTIFY] ❌ Exception while calling send_consensus_alert: {e}", exc_info=True)
-                success = False
-            
-            if success:
-                if not hasattr(self, 'monitoring_stats'):
-                    self.monitoring_stats = {"total_alerts_sent": 0}
-                self.monitoring_stats["total_alerts_sent"] = self.monitoring_stats.get("total_alerts_sent", 0) + 1
-                logger.info(
-                    f"[CONSENSUS] ✅ ALERT SENT SUCCESSFULLY (#{self.monitoring_stats['total_alerts_sent']}): "
-                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                    f"wallets={len(wallets_in_window)}"
-                )
-            else:
-                if not hasattr(self, 'monitoring_stats'):
-                    self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
-                self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
-                reason = "send_failed"
-                self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
-                logger.error(
-                    f"[CONSENSUS] ❌ ALERT SEND FAILED: "
-                    f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                    f"wallets={len(wallets_in_window)}"
-                )
-                return
-            
-            # Collect wallet details (address, usd_amount, price) for saving
-            # Use filtered events (only events within time window)
-            wallet_details = []
+                        # If we can't determine age, don't confirm (safety first)
+                        logger.debug(f"[CONSENSUS] Order flow present but detected_at timestamp unavailable or invalid: {condition_id[:20]}...")
+        except Exception as e:
+            logger.debug(f"[CONSENSUS] Could not check order flow: {e}")
+        
+        # Check for news correlation (only for high-confidence consensus)
+        news_context = None
+        is_high_confidence = (
+            len(wallets_in_window) >= self.news_min_wallets_for_check or
+            len(a_list_wallets) >= self.news_min_a_list_for_check
+        )
+        
+        if is_high_confidence:
             try:
-                # Use filtered_events if available, otherwise filter from window_data
-                if 'filtered_events' in locals():
-                    events = filtered_events
+                consensus_timestamp = window_data.get('last_ts', time.time())
+                news_context = self.check_news_correlation(market_title, condition_id, consensus_timestamp)
+                if news_context:
+                    logger.info(f"[CONSENSUS] ✅ News correlation found: {news_context.get('headline', '')[:50]}...")
                 else:
-                    events = window_data.get("events", [])
-                    # Re-filter events to ensure we only use recent ones within time window
-                    if events:
-                        latest_event_ts = max(e["ts"] for e in events)
-                        window_start_ts = latest_event_ts - (self.alert_window_min * 60)
-                        events = [e for e in events if e["ts"] >= window_start_ts]
-                
-                wallet_usd_map = {}  # wallet -> total USD
-                wallet_price_map = {}  # wallet -> entry price
-                
-                for event in events:
-                    wallet = event.get("wallet", "")
-                    if not wallet:
-                        continue
-                    
-                    # Calculate USD for this event
-                    usd = float(event.get("usd", 0) or 0)
-                    quantity = float(event.get("quantity", 0) or 0)
-                    price = float(event.get("price", 0) or 0)
-                    
-                    if usd == 0 and quantity > 0 and price > 0:
-                        usd = quantity * price
-                    
-                    # Aggregate by wallet
-                    if wallet not in wallet_usd_map:
-                        wallet_usd_map[wallet] = 0.0
-                        wallet_price_map[wallet] = price
-                    
-                    wallet_usd_map[wallet] += usd
-                
-                # Build wallet_details list
-                for wallet in wallets_in_window:
-                    wallet_details.append({
-                        "wallet": wallet,
-                        "usd_amount": round(wallet_usd_map.get(wallet, 0.0), 2),
-                        "price": round(wallet_price_map.get(wallet, 0.0), 4)
-                    })
-                
-                wallet_details_json = json.dumps(wallet_details)
-                logger.info(f"[CONSENSUS] Saved wallet details for {len(wallet_details)} wallets: {wallet_details_json[:200]}...")
+                    logger.info(f"[CONSENSUS] ⚠️ No news correlation found for high-confidence consensus")
             except Exception as e:
-                logger.warning(f"[CONSENSUS] Error collecting wallet details: {e}")
-                wallet_details_json = ""
-            
-            # Mark alert as sent
-            # Use wallets_for_db (saved copy) to ensure wallets are always saved correctly
-            wallets_csv_str = ",".join(wallets_for_db) if wallets_for_db else ""
-            wallet_count_for_db = len(wallets_for_db)
-            
-            # Log warning if wallets_csv is empty but we have wallet_count > 0
-            if not wallets_csv_str and wallet_count_for_db > 0:
-                logger.warning(f"[CONSENSUS] ⚠️  wallets_csv is empty but wallets_for_db has {wallet_count_for_db} wallets!")
-            
-            # Log if wallets_in_window was modified
-            if len(wallets_in_window) != wallet_count_for_db:
-                logger.warning(f"[CONSENSUS] ⚠️  wallets_in_window was modified! Original: {wallet_count_for_db}, Current: {len(wallets_in_window)}")
-            
-            alert_saved = self.db.mark_alert_sent(
-                condition_id, outcome_index, wallet_count_for_db,
-                window_data["first_ts"], window_data["last_ts"], alert_key, side,
-                price=(current_price or 0.0), wallets_csv=wallets_csv_str,
-                wallet_details_json=wallet_details_json,
+                logger.debug(f"[CONSENSUS] Could not check news correlation: {e}")
+                news_context = None
+        else:
+            logger.debug(f"[CONSENSUS] Skipping news check (low confidence: {len(wallets_in_window)} wallets, {len(a_list_wallets)} A-list)")
+        
+        logger.info(f"[NOTIFY] Preparing to send consensus alert: condition={condition_id[:20]}... outcome={outcome_index} side={side} wallets={len(wallets_in_window)} oi_confirmed={oi_confirmed} order_flow_confirmed={order_flow_confirmed} news_context={'present' if news_context else 'none'}")
+        try:
+            success = self.notifier.send_consensus_alert(
+                condition_id, outcome_index, wallets_in_window, wallet_prices,
+                self.alert_window_min, self.min_consensus, alert_id, market_title, market_slug, side,
+                consensus_events=events_count,
                 total_usd=total_usd,
-                is_repeat=is_repeat_alert
+                end_date=end_date,
+                current_price=current_price,  # Pass current_price (may be None)
+                oi_confirmed=oi_confirmed,  # Pass OI confirmation flag
+                order_flow_confirmed=order_flow_confirmed,  # Pass order flow confirmation flag
+                news_context=news_context  # Pass news context
+                # Removed category and a_list_wallets - not in method signature
             )
-            
-            if alert_saved:
-                logger.info(
-                    f"[Consensus] ALERT condition={condition_id[:20]}... outcome={outcome_index} side={side} "
-                    f"wallets={len(wallets_in_window)} price={current_price or 0.0:.4f}"
-                )
+        except Exception as e:
+            logger.error(f"[NOTIFY] ❌ Exception while calling send_consensus_alert: {e}", exc_info=True)
+            success = False
+        
+        if success:
+            if not hasattr(self, 'monitoring_stats'):
+                self.monitoring_stats = {"total_alerts_sent": 0}
+            self.monitoring_stats["total_alerts_sent"] = self.monitoring_stats.get("total_alerts_sent", 0) + 1
+            logger.info(
+                f"[CONSENSUS] ✅ ALERT SENT SUCCESSFULLY (#{self.monitoring_stats['total_alerts_sent']}): "
+                f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                f"wallets={len(wallets_in_window)}"
+            )
+        else:
+            if not hasattr(self, 'monitoring_stats'):
+                self.monitoring_stats = {"total_alerts_blocked": 0, "blocked_reasons": {}}
+            self.monitoring_stats["total_alerts_blocked"] = self.monitoring_stats.get("total_alerts_blocked", 0) + 1
+            reason = "send_failed"
+            self.monitoring_stats["blocked_reasons"][reason] = self.monitoring_stats["blocked_reasons"].get(reason, 0) + 1
+            logger.error(
+                f"[CONSENSUS] ❌ ALERT SEND FAILED: "
+                f"condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                f"wallets={len(wallets_in_window)}"
+            )
+            return
+        
+        # Collect wallet details (address, usd_amount, price) for saving
+        # Use filtered events (only events within time window)
+        wallet_details = []
+        try:
+            # Use filtered_events if available, otherwise filter from window_data
+            if 'filtered_events' in locals():
+                events = filtered_events
             else:
-                logger.error(f"❌ Failed to save alert to database for {condition_id}:{outcome_index} "
-                            f"(alert was sent to Telegram but not saved)")
+                events = window_data.get("events", [])
+                # Re-filter events to ensure we only use recent ones within time window
+                if events:
+                    latest_event_ts = max(e.ts for e in events)
+                    window_start_ts = latest_event_ts - (self.alert_window_min * 60)
+                    events = [e for e in events if e.ts >= window_start_ts]
+            
+            wallet_usd_map = {}  # wallet -> total USD
+            wallet_price_map = {}  # wallet -> entry price
+            
+            for event in events:
+                wallet = event.wallet
+                if not wallet:
+                    continue
+                
+                # Calculate USD for this event
+                usd = event.usd
+                quantity = event.quantity
+                price = event.price
+                
+                if usd == 0 and quantity > 0 and price > 0:
+                    usd = quantity * price
+                
+                # Aggregate by wallet
+                if wallet not in wallet_usd_map:
+                    wallet_usd_map[wallet] = 0.0
+                    wallet_price_map[wallet] = price
+                
+                wallet_usd_map[wallet] += usd
+            
+            # Build wallet_details list
+            for wallet in wallets_in_window:
+                wallet_details.append({
+                    "wallet": wallet,
+                    "usd_amount": round(wallet_usd_map.get(wallet, 0.0), 2),
+                    "price": round(wallet_price_map.get(wallet, 0.0), 4)
+                })
             
+            wallet_details_json = json.dumps(wallet_details)
+            logger.info(f"[CONSENSUS] Saved wallet details for {len(wallet_details)} wallets: {wallet_details_json[:200]}...")
         except Exception as e:
-            logger.error(f"Error checking consensus: {e}")
+            logger.warning(f"[CONSENSUS] Error collecting wallet details: {e}")
+            wallet_details_json = ""
+        
+        # Mark alert as sent
+        # Use wallets_for_db (saved copy) to ensure wallets are always saved correctly
+        wallets_csv_str = ",".join(wallets_for_db) if wallets_for_db else ""
+        wallet_count_for_db = len(wallets_for_db)
+        
+        # Log warning if wallets_csv is empty but we have wallet_count > 0
+        if not wallets_csv_str and wallet_count_for_db > 0:
+            logger.warning(f"[CONSENSUS] ⚠️  wallets_csv is empty but wallets_for_db has {wallet_count_for_db} wallets!")
+        
+        # Log if wallets_in_window was modified
+        if len(wallets_in_window) != wallet_count_for_db:
+            logger.warning(f"[CONSENSUS] ⚠️  wallets_in_window was modified! Original: {wallet_count_for_db}, Current: {len(wallets_in_window)}")
+        
+        alert_saved = self.db.mark_alert_sent(
+            condition_id, outcome_index, wallet_count_for_db,
+            window_data["first_ts"], window_data["last_ts"], alert_key, side,
+            price=(current_price or 0.0), wallets_csv=wallets_csv_str,
+            wallet_details_json=wallet_details_json,
+            total_usd=total_usd,
+            is_repeat=is_repeat_alert
+        )
+        
+        if alert_saved:
+            logger.info(
+                f"[Consensus] ALERT condition={condition_id[:20]}... outcome={outcome_index} side={side} "
+                f"wallets={len(wallets_in_window)} price={current_price or 0.0:.4f}"
+            )
+        else:
+            logger.error(f"❌ Failed to save alert to database for {condition_id}:{outcome_index} "
+                        f"(alert was sent to Telegram but not saved)")
+        
+        self._close_stage(trace, dropped=False)
     
     def check_open_interest_spikes(self) -> Dict[str, int]:
         """Check for open interest spikes in active markets
@@ -3312,7 +3456,7 @@ class PolymarketNotifier:
             self.order_flow_stats['total_checks'] += 1
             
             # Get list of active markets from recent consensus alerts (last 24 hours)
-            cutoff_time = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
+            cutoff_ts = int(time.time()) - 24 * 3600
             active_markets = []
             
             try:
@@ -3321,8 +3465,8 @@ class PolymarketNotifier:
                     cursor.execute("""
                         SELECT DISTINCT condition_id, outcome_index
                         FROM alerts_sent
-                        WHERE sent_at >= ?
-                    """, (cutoff_time,))
+                        WHERE sent_ts >= ?
+                    """, (cutoff_ts,))
                     rows = cursor.fetchall()
                     active_markets = [(row[0], row[1]) for row in rows]
             except Exception as e:
@@ -3666,7 +3810,12 @@ class PolymarketNotifier:
                     cleaned = self.db.cleanup_expired_cache()
                     if cleaned > 0:
                         logger.info(f"Cleaned up {cleaned} expired cache entries")
-                
+                    evicted = self.db.evict_idle_market_trades()
+                    if evicted > 0:
+                        logger.info(f"Evicted {evicted} idle markets from first-entry cache")
+                    # Drop expired open interest partitions and old event rows
+                    self.db.prune_time_series()
+
                 # Check open interest spikes every 5 minutes (~43 loops at 7s interval)
                 if self.loop_count % 43 == 0:
                     try:
@@ -3708,10 +3857,14 @@ class PolymarketNotifier:
                 # Log OI, whale, and order flow stats periodically (every 10 loops)
                 if self.loop_count % 10 == 0:
                     logger.info(f"[STATS] OI: {self.oi_check_stats}, Whale: {self.whale_check_stats}, Order Flow: {self.order_flow_stats}")
+                    logger.info(f"[STATS] Consensus stages: {self.format_consensus_stage_stats()}")
                 
                 # Monitor each wallet
                 loop_trades_found = 0
                 loop_events_processed = 0
+                sweep_events = []
+                sold_wallets = set()  # Closed (part of) a position this sweep
+                seen_trade_ids = {}  # wallet -> newest trade ID fetched this sweep
                 for wallet in wallets:
                     try:
                         last_trade_id = self.db.get_last_seen_trade_id(wallet)
@@ -3720,6 +3873,8 @@ class PolymarketNotifier:
                         sell_events, newest_sell_id = self.get_new_trades(wallet, last_trade_id, "SELL")
                         new_events = buy_events + sell_events
                         newest_id = newest_buy_id or newest_sell_id
+                        if sell_events:
+                            sold_wallets.add(wallet)
                         
                         if new_events:
                             loop_trades_found += 1
@@ -3733,35 +3888,34 @@ class PolymarketNotifier:
                         
                         events_skipped_old = 0
                         events_skipped_invalid = 0
-                        events_skipped_closed = 0
                         recent_events = []
                         
                         for event in new_events:
                             # Skip events that are too old (likely from closed markets)
-                            event_timestamp = event.get("timestamp", 0)
+                            event_timestamp = event.ts
                             if event_timestamp and event_timestamp > 0:
                                 # Validate timestamp is reasonable
                                 if event_timestamp < 946684800 or event_timestamp > current_time + 3600:
                                     events_skipped_invalid += 1
-                                    logger.debug(f"[MONITOR] Invalid timestamp {event_timestamp} for event {event.get('trade_id', 'unknown')[:12]}..., skipping")
+                                    logger.debug(f"[MONITOR] Invalid timestamp {event_timestamp} for event {event.trade_id[:12]}..., skipping")
                                     continue
                                 
                                 event_age = current_time - event_timestamp
                                 if event_age < 0:
                                     events_skipped_invalid += 1
-                                    logger.warning(f"[MONITOR] Event {event.get('trade_id', 'unknown')[:12]}... has future timestamp (age: {event_age:.1f}s), skipping")
+                                    logger.warning(f"[MONITOR] Event {event.trade_id[:12]}... has future timestamp (age: {event_age:.1f}s), skipping")
                                     continue
                                 
                                 if event_age > max_event_age_seconds:
                                     events_skipped_old += 1
-                                    logger.debug(f"[MONITOR] Skipping old event: {event.get('trade_id', 'unknown')[:12]}... (age: {event_age/3600:.1f}h)")
+                                    logger.debug(f"[MONITOR] Skipping old event: {event.trade_id[:12]}... (age: {event_age/3600:.1f}h)")
                                     continue
                                 
                                 # Event passed age filter
                                 recent_events.append(event)
                             elif not event_timestamp or event_timestamp <= 0:
                                 events_skipped_invalid += 1
-                                logger.debug(f"[MONITOR] Event {event.get('trade_id', 'unknown')[:12]}... has no valid timestamp, skipping")
+                                logger.debug(f"[MONITOR] Event {event.trade_id[:12]}... has no valid timestamp, skipping")
                                 continue
                         
                         # Log filtering summary
@@ -3771,60 +3925,37 @@ class PolymarketNotifier:
                         
                         # Process only recent events
                         for event in recent_events:
-                            # BEST-EFFORT: Extract market_title from event (for display purposes only)
                             # NOTE: We NO LONGER extract market_slug from events - all slug normalization
                             # is handled by notify.TelegramNotifier._get_event_slug_and_market_id() and _get_market_slug()
-                            market_title = event.get("marketTitle", "")
-                            market_slug = ""  # Always empty - notify.py will fetch and normalize slug via API
-                            price = event.get("price", 0)
-                            side = event.get("side", "BUY")
-                            usd_amount = event.get("usd", 0.0)
-                            quantity = event.get("quantity", 0.0)
-                            
                             # Handle missing condition_id - use fallback identifier
-                            condition_id = event.get("conditionId")
-                            if not condition_id:
+                            if not event.condition_id:
                                 # Use market title as fallback identifier (market_slug is no longer extracted from events)
+                                market_title = event.market_title
                                 if market_title:
-                                    condition_id = f"TITLE:{market_title[:50]}"
+                                    event = event._replace(condition_id=f"TITLE:{market_title[:50]}")
                                 else:
                                     logger.warning(f"[MONITOR] Skipping event: no condition_id and no market_title")
                                     continue
                             
-                            outcome_index = event.get("outcomeIndex")
-                            if outcome_index is None:
-                                outcome_index = 0  # Default to 0
+                            # Market status is checked inside the consensus pipeline, only once
+                            # the window reaches min_consensus wallets (cached per market)
                             
-                            # EARLY CHECK: Verify market is still active before processing event
-                            # Skip this check if condition_id is a fallback (starts with SLUG: or TITLE:)
-                            # This allows signals even when condition_id is not available
-                            if condition_id and not condition_id.startswith(("SLUG:", "TITLE:")):
-                                if not self.is_market_active(condition_id, outcome_index):
-                                    events_skipped_closed += 1
-                                    logger.debug(f"[MONITOR] Skipping event for closed market: {condition_id[:20]}... outcome={outcome_index} (entry price was ${price:.3f})")
-                                    continue
-                            
-                            # Process event for consensus
+                            # Queue event for batch consensus at the end of the sweep
                             loop_events_processed += 1
                             self.monitoring_stats["total_events_processed"] += 1
                             
-                            self.check_consensus_and_alert(
-                                condition_id, outcome_index,
-                                wallet, event["trade_id"], event["timestamp"], 
-                                price, side, market_title, market_slug,
-                                usd_amount=usd_amount, quantity=quantity
-                            )
+                            sweep_events.append(event)
                         
                         # Log summary for this wallet if we processed events
                         if new_events:
-                            processed_count = len(recent_events) - events_skipped_closed
-                            if events_skipped_old > 0 or events_skipped_invalid > 0 or events_skipped_closed > 0:
+                            processed_count = len(recent_events)
+                            if events_skipped_old > 0 or events_skipped_invalid > 0:
                                 logger.info(f"[MONITOR] {wallet[:12]}...: processed {processed_count}/{len(new_events)} events "
-                                          f"(skipped: old={events_skipped_old}, invalid={events_skipped_invalid}, closed={events_skipped_closed})")
+                                          f"(skipped: old={events_skipped_old}, invalid={events_skipped_invalid})")
                         
-                        # Update last seen trade ID (always update if we got trades, even if empty list)
+                        # Last seen trade ID is persisted once the sweep's events are processed
                         if newest_id and newest_id != last_trade_id:
-                            self.db.set_last_seen_trade_id(wallet, newest_id)
+                            seen_trade_ids[wallet] = newest_id
                         elif new_events and not newest_id:
                             # If we have events but no newest_id, log warning
                             logger.warning(f"{wallet}: Have {len(new_events)} events but newest_id is None")
@@ -3836,6 +3967,20 @@ class PolymarketNotifier:
                         logger.error(f"Error monitoring wallet {wallet}: {e}")
                         continue
                 
+                # Evaluate consensus for every window touched by this sweep
+                self.process_sweep_events(sweep_events)
+                
+                # Persist first-entry marks batched during this sweep
+                self.db.flush_market_trades(wait=True)
+                
+                # Only now advance each wallet's cursor: if anything above failed,
+                # the next sweep refetches the same trades instead of losing their alerts
+                self.db.set_last_seen_trade_ids(seen_trade_ids)
+                
+                # Sells change closed positions: let those wallets be re-analyzed
+                if sold_wallets:
+                    self.db.invalidate_analysis(sold_wallets, "monitor_sell")
+                
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
                 time.sleep(self.poll_interval)
@@ -3843,6 +3988,7 @@ class PolymarketNotifier:
     def stop_monitoring(self):
         """Stop the monitoring loop"""
         self.monitoring = False
+        self.db.flush_market_trades()
         logger.info("Monitoring stopped")
     
     async def start_bet_monitoring(self):
@@ -0,0 +1,137 @@
+"""
+Columnar closed-position metrics for wallet analysis.
+
+Closed positions arrive as API dicts (camelCase or snake_case keys) or as
+ledger rows from _sync_closed_positions. PositionColumns normalizes them once
+into typed columns; win rate, PnL, volume, stake, ROI, unique markets,
+per-category totals and the insider inputs are then reductions over those
+columns instead of separate loops that each re-probe the dict keys.
+"""
+
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+def position_closed_ts(position: Dict[str, Any]) -> Optional[float]:
+    """Close time of a closed position in epoch seconds, or None if it carries no date"""
+    timestamp = (
+        position.get("closed_at") or
+        position.get("closedAt") or
+        position.get("timestamp") or
+        position.get("created_at") or
+        position.get("createdAt")
+    )
+    if isinstance(timestamp, str):
+        try:
+            return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+        except Exception:
+            return None
+    if isinstance(timestamp, (int, float)) and timestamp:
+        # Millisecond timestamps are converted to seconds
+        return timestamp / 1000.0 if timestamp > 1e10 else float(timestamp)
+    return None
+
+
+def position_amounts(position: Dict[str, Any]) -> Tuple[float, float, float, float]:
+    """(total_bought, avg_price, stake, volume) with each key probed once.
+
+    Stake is totalBought * avgPrice (totalBought alone if avgPrice is missing)
+    unless the position already carries a "stake" field; volume is the reported
+    volume field if any, otherwise the stake.
+    """
+    total_bought = float(position.get("totalBought", 0) or position.get("total_bought", 0) or 0)
+    avg_price = float(position.get("avgPrice", 0) or position.get("avg_price", 0) or 0)
+    if "stake" in position:
+        stake = float(position["stake"] or 0)
+    elif total_bought > 0 and avg_price > 0:
+        stake = total_bought * avg_price
+    else:
+        stake = total_bought if total_bought > 0 else 0.0
+
+    volume = position.get("volume") or position.get("totalVolume") or position.get("total_volume")
+    if volume is not None:
+        try:
+            return total_bought, avg_price, stake, float(volume)
+        except (ValueError, TypeError):
+            pass
+    return total_bought, avg_price, stake, stake
+
+
+class WalletMetrics(NamedTuple):
+    """Wallet-level aggregates over a closed-position window"""
+    positions: int = 0
+    wins: int = 0
+    win_rate: float = 0.0
+    pnl_total: float = 0.0
+    total_volume: float = 0.0
+    avg_stake: float = 0.0  # total_volume / positions, as in the quality filters
+    roi: float = 0.0
+    avg_pnl: float = 0.0
+    max_stake: float = 0.0
+    markets_traded: int = 0  # unique condition ids
+
+
+class PositionColumns:
+    """Closed positions as parallel typed columns"""
+
+    __slots__ = ("condition_ids", "categories", "pnl", "volume", "stake")
+
+    def __init__(self, condition_ids: List[Optional[str]], categories: List[Optional[str]],
+                 pnl: array, volume: array, stake: array):
+        self.condition_ids = condition_ids
+        self.categories = categories
+        self.pnl = pnl
+        self.volume = volume
+        self.stake = stake
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[Dict[str, Any]]) -> "PositionColumns":
+        condition_ids, categories, pnl, volume, stake = [], [], [], [], []
+        for position in positions:
+            amounts = position_amounts(position)
+            condition_ids.append(position.get("conditionId") or position.get("condition_id"))
+            categories.append(position.get("category"))
+            pnl.append(float(position.get("realizedPnl", 0) or 0))
+            stake.append(amounts[2])
+            volume.append(amounts[3])
+        return cls(condition_ids, categories, array("d", pnl), array("d", volume), array("d", stake))
+
+    def __len__(self) -> int:
+        return len(self.pnl)
+
+    def metrics(self) -> WalletMetrics:
+        count = len(self.pnl)
+        if not count:
+            return WalletMetrics()
+        wins = sum(1 for pnl in self.pnl if pnl > 0)
+        pnl_total = sum(self.pnl)
+        total_volume = sum(self.volume)
+        return WalletMetrics(
+            positions=count,
+            wins=wins,
+            win_rate=wins / count,
+            pnl_total=pnl_total,
+            total_volume=total_volume,
+            avg_stake=total_volume / count,
+            roi=pnl_total / total_volume if total_volume > 0 else 0.0,
+            avg_pnl=pnl_total / count,
+            max_stake=max(self.stake),
+            markets_traded=len(set(self.condition_ids) - {None, ""}),
+        )
+
+    def category_totals(self, categories: List[Optional[str]]) -> Dict[str, Dict[str, Any]]:
+        """Per-category markets/volume/pnl/win_markets; rows without a condition id or category are skipped"""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for condition_id, category, pnl, volume in zip(self.condition_ids, categories, self.pnl, self.volume):
+            if not condition_id or category is None:
+                continue
+            stats = totals.get(category)
+            if stats is None:
+                stats = totals[category] = {'markets': 0, 'volume': 0.0, 'pnl': 0.0, 'win_markets': 0}
+            stats['markets'] += 1
+            stats['volume'] += volume
+            stats['pnl'] += pnl
+            if pnl > 0:
+                stats['win_markets'] += 1
+        return totals
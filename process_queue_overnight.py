@@ -80,7 +80,7 @@ def main():
         return
     
     # Start workers
-    logger.info(f"🚀 Starting {config.api_max_workers} workers...")
+    logger.info(f"🚀 Starting dispatcher (up to {analyzer.max_in_flight} jobs in flight)...")
     analyzer.start_workers()
     
     start_time = datetime.now(timezone.utc)
@@ -134,12 +134,21 @@ def restore_rejected_wallets():
                     
                     # Восстановить кошелек (прямой SQL, без нового соединения)
                     cursor.execute("""
-                        INSERT OR REPLACE INTO wallets(
+                        INSERT INTO wallets(
                             address, display, traded_total, win_rate, 
                             realized_pnl_total, daily_trading_frequency, 
                             source, added_at, updated_at, last_trade_at
                         )
                         VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(address) DO UPDATE SET
+                            display = excluded.display,
+                            traded_total = excluded.traded_total,
+                            win_rate = excluded.win_rate,
+                            realized_pnl_total = excluded.realized_pnl_total,
+                            daily_trading_frequency = excluded.daily_trading_frequency,
+                            source = excluded.source,
+                            updated_at = excluded.updated_at,
+                            last_trade_at = excluded.last_trade_at
                     """, (
                         address.lower(),
                         address,
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Golden-output test and benchmark for market_utils.classify_market
+
+Cases are built from the unknown_*_analysis.json corpora (sample titles,
+slugs, question/slug pairs and top keywords) plus the ML training texts.
+Expected categories live in classifier_golden.json; any rule change that
+moves a market to another category shows up as a diff here.
+
+The ML fallback is switched off so only the rule-based path is pinned.
+
+Usage:
+    python -m pytest test_classifier_golden.py  # compare only
+    python test_classifier_golden.py            # compare + benchmark
+    python test_classifier_golden.py --update   # rewrite classifier_golden.json
+"""
+
+import json
+import os
+import sys
+import time
+
+import ml_classifier
+from market_utils import classify_market
+
+ml_classifier.SKLEARN_AVAILABLE = False
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_FILE = os.path.join(BASE_DIR, "classifier_golden.json")
+BENCH_ROUNDS = 20
+
+
+def load_cases():
+    """(slug, question) pairs from the corpora, in a stable order"""
+    cases = []
+
+    with open(os.path.join(BASE_DIR, "unknown_markets_analysis.json")) as f:
+        markets = json.load(f)
+    cases += [(None, title) for title in markets.get("sample_titles", [])]
+    cases += [(slug, None) for slug in markets.get("sample_slugs", [])]
+    cases += [(None, keyword) for keyword in markets.get("top_keywords", {})]
+
+    with open(os.path.join(BASE_DIR, "unknown_real_analysis.json")) as f:
+        real = json.load(f)
+    for samples in real.get("samples", {}).values():
+        for sample in samples:
+            cases.append((sample.get("slug"), sample.get("question")))
+            cases.append((None, sample.get("question")))
+            cases.append((sample.get("slug"), None))
+    cases += [(None, keyword) for keyword in real.get("top_keywords", {})]
+
+    cases += [(None, text) for text, _ in ml_classifier.TRAINING_DATA]
+    return cases
+
+
+def golden_mismatches():
+    """(golden entry, current category) for every case whose category moved"""
+    with open(GOLDEN_FILE) as f:
+        golden = json.load(f)
+    mismatches = []
+    for entry in golden:
+        result = classify_market({}, entry["slug"], entry["question"])
+        if result != entry["category"]:
+            mismatches.append((entry, result))
+    return golden, mismatches
+
+
+def test_golden_categories():
+    golden, mismatches = golden_mismatches()
+    assert golden
+    assert not mismatches, [
+        f"{(entry['question'] or entry['slug'])[:60]} → {result} (golden: {entry['category']})"
+        for entry, result in mismatches[:20]
+    ]
+
+
+def main():
+    cases = load_cases()
+    results = [classify_market({}, slug, question) for slug, question in cases]
+
+    if "--update" in sys.argv:
+        golden = [
+            {"slug": slug, "question": question, "category": category}
+            for (slug, question), category in zip(cases, results)
+        ]
+        with open(GOLDEN_FILE, "w") as f:
+            json.dump(golden, f, indent=1, ensure_ascii=False)
+        print(f"Wrote {len(golden)} cases to {GOLDEN_FILE}")
+        return 0
+
+    golden, mismatches = golden_mismatches()
+    failed = len(mismatches)
+    for entry, result in mismatches:
+        text = entry["question"] or entry["slug"]
+        print(f"❌ {text[:60]:<60} → {result:<20} (golden: {entry['category']})")
+
+    start = time.perf_counter()
+    for _ in range(BENCH_ROUNDS):
+        for slug, question in cases:
+            classify_market({}, slug, question)
+    elapsed = time.perf_counter() - start
+    per_call_us = elapsed / (BENCH_ROUNDS * len(cases)) * 1e6
+
+    print("=" * 80)
+    print(f"Golden cases: {len(golden)}, mismatches: {failed}")
+    print(f"Benchmark: {per_call_us:.1f} µs/call over {BENCH_ROUNDS} x {len(cases)} calls")
+    print("=" * 80)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
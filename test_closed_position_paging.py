@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Offline test for WalletAnalyzer._fetch_closed_position_pages early stop
+
+The /closed-positions pager stops before fetch_limit once a page ends before
+the lookback cutoff, but only while the stream really is newest-first. Pages
+are served from memory (no network): a newest-first stream must stop early,
+while pages that are each sorted but out of order with each other (or
+unsorted inside a page) must be scanned to the end. The aiohttp pager used
+by the dispatcher must stop at the same page as the blocking one.
+
+Usage:
+    python test_closed_position_paging.py
+"""
+
+import asyncio
+import sys
+
+from wallet_analyzer import WalletAnalyzer
+
+PAGE_LIMIT = 10
+FETCH_LIMIT = 60
+NOW = 1_700_000_000
+DAY = 86400
+STOP_TS = NOW - 5 * DAY
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def make_analyzer(pages):
+    """WalletAnalyzer whose /closed-positions endpoint serves pages by offset; returns (analyzer, offsets requested)"""
+    analyzer = WalletAnalyzer.__new__(WalletAnalyzer)
+    analyzer.closed_positions_endpoint = "https://data-api.polymarket.com/closed-positions"
+    requested = []
+
+    def fake_get(url, params=None):
+        requested.append(params["offset"])
+        return FakeResponse(pages[params["offset"] // PAGE_LIMIT])
+
+    async def fake_get_json(session, url, params=None):
+        requested.append(params["offset"])
+        return pages[params["offset"] // PAGE_LIMIT]
+
+    analyzer._http_get_resilient = fake_get
+    analyzer._http_get_json_async = fake_get_json
+    return analyzer, requested
+
+
+def page(*days_ago):
+    return [{"conditionId": f"c{NOW - d * DAY}", "timestamp": NOW - d * DAY} for d in days_ago]
+
+
+def fetch(pages):
+    analyzer, requested = make_analyzer(pages)
+    positions = analyzer._fetch_closed_position_pages("0xwallet", FETCH_LIMIT, PAGE_LIMIT, STOP_TS, 1000)
+    return positions, sorted(requested)
+
+
+def test_newest_first_stops_early():
+    pages = [page(*[p * 3 + i * 0.1 for i in range(PAGE_LIMIT)]) for p in range(FETCH_LIMIT // PAGE_LIMIT)]
+    positions, requested = fetch(pages)
+    # Page 2 (days 6..6.9) is the first to end before the 5-day cutoff
+    assert positions == [pos for batch in pages[:3] for pos in batch], len(positions)
+    assert max(requested) < FETCH_LIMIT - PAGE_LIMIT, requested
+
+
+def test_unordered_pages_scan_everything():
+    # Each page is newest-first on its own, but page 1 restarts newer than page 0 ended
+    pages = [
+        page(*[1 + i * 0.1 for i in range(PAGE_LIMIT)]),
+        page(*[0.5 + i * 0.1 for i in range(PAGE_LIMIT)]),
+    ] + [page(*[10 + p * 3 + i * 0.1 for i in range(PAGE_LIMIT)]) for p in range(4)]
+    positions, requested = fetch(pages)
+    assert len(positions) == FETCH_LIMIT, len(positions)
+    assert requested == list(range(0, FETCH_LIMIT, PAGE_LIMIT)), requested
+
+
+def test_unsorted_page_scans_everything():
+    first = page(*[10 + i for i in range(PAGE_LIMIT)])
+    first[0], first[-1] = first[-1], first[0]
+    pages = [first] + [page(*[20 + p * 3 + i * 0.1 for i in range(PAGE_LIMIT)]) for p in range(5)]
+    positions, requested = fetch(pages)
+    assert len(positions) == FETCH_LIMIT, len(positions)
+    assert requested == list(range(0, FETCH_LIMIT, PAGE_LIMIT)), requested
+
+
+def test_async_pager_matches_blocking():
+    pages = [page(*[p * 3 + i * 0.1 for i in range(PAGE_LIMIT)]) for p in range(FETCH_LIMIT // PAGE_LIMIT)]
+    analyzer, requested = make_analyzer(pages)
+    positions = asyncio.run(
+        analyzer._fetch_closed_position_pages_async(None, "0xwallet", FETCH_LIMIT, PAGE_LIMIT, STOP_TS, 1000)
+    )
+    assert positions == fetch(pages)[0], len(positions)
+    assert max(requested) < FETCH_LIMIT - PAGE_LIMIT, requested
+
+
+def main():
+    failed = 0
+    for test in (test_newest_first_stops_early, test_unordered_pages_scan_everything, test_unsorted_page_scans_everything,
+                 test_async_pager_matches_blocking):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
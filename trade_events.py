@@ -0,0 +1,90 @@
+"""
+Compact trade event records for the ingestion and consensus path.
+
+TradeEvent replaces the per-trade dicts built by get_new_trades and stored in
+rolling windows. Condition ids, wallets, sides, market titles and slugs are
+interned so repeated values share one string object. Interned strings are
+freed with their last reference, so a title goes away once the windows that
+held it expire or their market is forgotten.
+"""
+
+import sys
+from typing import Any, Dict, NamedTuple
+
+
+class TradeEvent(NamedTuple):
+    """Single trade by a tracked wallet"""
+    wallet: str
+    trade_id: str
+    ts: float
+    price: float
+    condition_id: str
+    outcome_index: int
+    side: str
+    usd: float = 0.0
+    quantity: float = 0.0
+    market_title: str = ""
+    market_slug: str = ""
+
+    @classmethod
+    def create(cls, wallet: str, trade_id: str, ts: float, price: float,
+               condition_id: str, outcome_index: int, side: str,
+               usd: float = 0.0, quantity: float = 0.0,
+               market_title: str = "", market_slug: str = "") -> "TradeEvent":
+        """Build an event with interned identifiers, title and slug"""
+        return cls(
+            sys.intern(wallet),
+            trade_id,
+            float(ts),
+            float(price or 0),
+            sys.intern(condition_id),
+            int(outcome_index),
+            sys.intern(side),
+            float(usd) if usd and usd > 0 else 0.0,
+            float(quantity) if quantity and quantity > 0 else 0.0,
+            sys.intern(market_title) if market_title else "",
+            sys.intern(market_slug) if market_slug else "",
+        )
+
+    @property
+    def window_key(self):
+        """Rolling window grouping key"""
+        return (self.condition_id, self.outcome_index, self.side)
+
+    def to_window_dict(self) -> Dict[str, Any]:
+        """Serialize in the rolling_buys JSON layout read by the diagnostic scripts"""
+        entry = {
+            "wallet": self.wallet,
+            "trade_id": self.trade_id,
+            "ts": self.ts,
+            "price": self.price,
+            "conditionId": self.condition_id,
+            "outcomeIndex": self.outcome_index,
+            "side": self.side,
+        }
+        if self.market_title:
+            entry["marketTitle"] = self.market_title
+        if self.market_slug:
+            entry["marketSlug"] = self.market_slug
+        if self.usd > 0:
+            entry["usd"] = self.usd
+        if self.quantity > 0:
+            entry["quantity"] = self.quantity
+        return entry
+
+    @classmethod
+    def from_window_dict(cls, entry: Dict[str, Any]) -> "TradeEvent":
+        """Inverse of to_window_dict (tolerates older rows with missing fields)"""
+        return cls.create(
+            entry.get("wallet", ""),
+            str(entry.get("trade_id", "")),
+            entry.get("ts", 0),
+            entry.get("price", 0),
+            entry.get("conditionId") or "",
+            entry.get("outcomeIndex") or 0,
+            entry.get("side") or "BUY",
+            usd=entry.get("usd", 0.0),
+            quantity=entry.get("quantity", 0.0),
+            market_title=entry.get("marketTitle", ""),
+            market_slug=entry.get("marketSlug", ""),
+        )
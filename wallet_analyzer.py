@@ -6,13 +6,18 @@ Handles wallet analysis with retry logic and exponential backoff
 import os
 import time
 import random
+import socket
 import logging
 import asyncio
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import aiohttp
 import requests
 import urllib3
 from requests.exceptions import RequestException, Timeout, ConnectionError
@@ -23,15 +28,118 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 from db import PolymarketDB
 from proxy_manager import ProxyManager
-from market_utils import classify_market
+from market_utils import classify_markets
+from position_metrics import PositionColumns, position_amounts, position_closed_ts
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Global semaphore to limit concurrent HTTP requests
-HTTP_SEMAPHORE = threading.Semaphore(6)  # Max 6 concurrent API requests
+# Per-host HTTP limits (shared by every analyzer in the process)
+HTTP_HOST_RATE_PER_SEC = float(os.getenv("HTTP_HOST_RATE_PER_SEC", "25"))  # Sustained requests/sec per host
+HTTP_HOST_MAX_CONCURRENT = int(os.getenv("HTTP_HOST_MAX_CONCURRENT", "64"))  # Max in-flight requests per host
+CLOSED_POSITIONS_PREFETCH_PAGES = int(os.getenv("CLOSED_POSITIONS_PREFETCH_PAGES", "3"))  # /closed-positions pages kept in flight per wallet
+
+
+class HostRateLimiter:
+    """Token bucket plus concurrency cap per host.
+
+    Replaces the old process-global Semaphore(6): each host gets its own
+    budget, so hundreds of analysis jobs can be in flight while every API
+    host still sees a bounded request rate. A 429 from a host pauses only
+    that host (penalize) instead of each thread sleeping on its own.
+    """
+
+    def __init__(self, rate_per_sec: float, max_concurrent: int):
+        self.rate_per_sec = max(rate_per_sec, 0.1)
+        self.max_concurrent = max(max_concurrent, 1)
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+
+    def _host_state(self, host: str) -> Dict[str, Any]:
+        state = self._hosts.get(host)
+        if state is None:
+            state = {
+                "slots": threading.BoundedSemaphore(self.max_concurrent),
+                "tokens": float(self.rate_per_sec),
+                "updated": time.monotonic(),
+                "paused_until": 0.0,
+            }
+            self._hosts[host] = state
+        return state
+
+    def _take_token(self, state: Dict[str, Any]) -> float:
+        """Take a rate token for the host; 0.0 if taken, else seconds to wait before retrying"""
+        with self._lock:
+            now = time.monotonic()
+            if now < state["paused_until"]:
+                return state["paused_until"] - now
+            elapsed = now - state["updated"]
+            state["tokens"] = min(self.rate_per_sec, state["tokens"] + elapsed * self.rate_per_sec)
+            state["updated"] = now
+            if state["tokens"] >= 1.0:
+                state["tokens"] -= 1.0
+                return 0.0
+            return (1.0 - state["tokens"]) / self.rate_per_sec
+
+    def acquire(self, url: str) -> Dict[str, Any]:
+        """Block until the host has a free slot and a rate token"""
+        host = urlparse(url).netloc
+        with self._lock:
+            state = self._host_state(host)
+        state["slots"].acquire()
+        try:
+            while True:
+                wait = self._take_token(state)
+                if wait <= 0:
+                    return state
+                time.sleep(wait)
+        except BaseException:
+            state["slots"].release()
+            raise
+
+    async def acquire_async(self, url: str) -> Dict[str, Any]:
+        """acquire() for coroutines: waits with asyncio.sleep, so the event loop keeps running.
+
+        Shares the same per-host slots and token bucket as the blocking callers.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            state = self._host_state(host)
+        while not state["slots"].acquire(blocking=False):
+            await asyncio.sleep(0.01)
+        try:
+            while True:
+                wait = self._take_token(state)
+                if wait <= 0:
+                    return state
+                await asyncio.sleep(wait)
+        except BaseException:
+            state["slots"].release()
+            raise
+
+    def release(self, state: Dict[str, Any]):
+        state["slots"].release()
+
+    def penalize(self, url: str, delay: float):
+        """Pause all requests to the url's host for delay seconds (429 handling)"""
+        host = urlparse(url).netloc
+        with self._lock:
+            state = self._host_state(host)
+            state["paused_until"] = max(state["paused_until"], time.monotonic() + delay)
+            state["tokens"] = 0.0
+
+
+HOST_LIMITER = HostRateLimiter(HTTP_HOST_RATE_PER_SEC, HTTP_HOST_MAX_CONCURRENT)
+
+# Closed-position page prefetches for the blocking fetch path (jobs run outside the
+# dispatcher, SOCKS proxies), shared by every WalletAnalyzer. They run on their own
+# pool so they never wait behind the jobs that issue them; threads start on demand.
+PAGE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(HTTP_HOST_MAX_CONCURRENT, 1),
+    thread_name_prefix="WalletAnalyzer-pages"
+)
 
 # Filtering criteria constants
 WIN_RATE_THRESHOLD = float(os.getenv("WIN_RATE_THRESHOLD", "0.65"))  # Minimum win rate to accept wallet (65%, configurable via .env)
@@ -92,10 +200,66 @@ INSIDER_MAX_TOTAL_TRADES = int(os.getenv("INSIDER_MAX_TOTAL_TRADES", "10"))  # M
 INSIDER_MIN_WIN_RATE = float(os.getenv("INSIDER_MIN_WIN_RATE", "0.80"))  # Min win rate for insider detection (80% default)
 INSIDER_MAX_MARKETS = int(os.getenv("INSIDER_MAX_MARKETS", "3"))  # Max markets for "concentrated" detection (3 default)
 
+# Sentinel for _resolve_market_text: fetch the Gamma event for this market
+_EVENT_LOOKUP = object()
+
+# A List trader thresholds for per-category stats (winrate >= 90% and markets > 20)
+A_LIST_MIN_WINRATE = 0.90
+A_LIST_MIN_MARKETS = 20
+
+
+class _ClosedPageCutoff:
+    """Early-stop bookkeeping for a newest-first /closed-positions page stream.
+
+    Shared by the blocking and the aiohttp pagers. reached(batch) is fed the
+    full pages in offset order and says whether paging can stop: the last
+    page ended before stop_ts, or max_positions positions at or after stop_ts
+    have been seen. It only answers True while the stream really is
+    newest-first, within each page and across page boundaries (sortBy is not
+    trusted).
+    """
+
+    def __init__(self, stop_ts: float, max_positions: int):
+        self.stop_ts = stop_ts
+        self.max_positions = max_positions
+        self.in_window = 0  # Dated positions at or after stop_ts
+        self.ordered = True
+        self.previous_ts = None
+
+    def reached(self, batch: List[Dict[str, Any]]) -> bool:
+        stamps = [ts for ts in (position_closed_ts(pos) for pos in batch) if ts is not None]
+        if not stamps:
+            return False
+        if self.previous_ts is not None and stamps[0] > self.previous_ts:
+            self.ordered = False
+        self.ordered = self.ordered and all(a >= b for a, b in zip(stamps, stamps[1:]))
+        self.previous_ts = stamps[-1]
+        self.in_window += sum(1 for ts in stamps if ts >= self.stop_ts)
+        return self.ordered and (stamps[-1] < self.stop_ts or self.in_window >= self.max_positions)
+
+
+def _positions_batch(data: Any) -> List[Dict[str, Any]]:
+    """Positions from a /closed-positions response body (bare list or {"positions": [...]})"""
+    if isinstance(data, list):
+        return data
+    return data.get("positions", []) if isinstance(data, dict) else []
+
+
+def _traded_total(data: Any) -> int:
+    """Trade count from a /traded response body"""
+    if isinstance(data, dict) and "traded" in data:
+        return int(data["traded"])
+    elif isinstance(data, list) and data:
+        return int(data[0]["traded"])
+    return 0
+
+
 @dataclass
 class AnalysisConfig:
     """Configuration for wallet analysis"""
-    api_max_workers: int = 4  # Reduced from 10 to avoid rate limiting
+    api_max_workers: int = 4  # Lower bound for max_in_flight (kept for existing callers)
+    max_in_flight: int = int(os.getenv("ANALYSIS_MAX_IN_FLIGHT", "128"))  # Concurrent jobs on the dispatcher loop
+    analysis_threads: int = int(os.getenv("ANALYSIS_THREADS", "8"))  # Threads for the DB/CPU phase of each job
     api_timeout_sec: int = 10  # Reduced from 20
     api_retry_max: int = 6
     api_retry_base: float = 1.2
@@ -123,13 +287,22 @@ class WalletAnalyzer:
         # Initialize proxy manager (optional)
         self.proxy_manager = ProxyManager()
         
-        # Thread-local storage for requests.Session
+        # Thread-local storage for requests.Session and the running job's prefetched API results
         self.local = threading.local()
         
-        # Worker state
+        # Dispatcher state
         self.running = False
         self.workers = []
         self.stop_event = threading.Event()
+        self.max_in_flight = max(self.config.max_in_flight, self.config.api_max_workers, 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        # Ids of jobs being processed; the dispatcher renews their leases
+        self._active_jobs: set = set()
+        # Lease owner recorded on claimed jobs
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._wake_dispatcher = None
     
     def _get_session(self):
         """Get or create thread-local requests.Session"""
@@ -138,127 +311,268 @@ class WalletAnalyzer:
         return self.local.session
     
     def start_workers(self):
-        """Start analysis workers"""
+        """Start the job dispatcher.
+
+        One asyncio loop claims jobs from the queue and keeps up to
+        max_in_flight of them running. Each job fetches its Data API inputs
+        (/traded, /closed-positions pages, /trades) as coroutines over a shared
+        aiohttp session on that loop, so hundreds of requests can be in flight
+        without a thread each; HOST_LIMITER bounds them per host. The DB and
+        CPU phase that turns those inputs into a verdict then runs on a small
+        pool of analysis_threads.
+        """
         if self.running:
             logger.warning("Workers already running")
             return
         
         self.running = True
         self.stop_event.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(self.config.analysis_threads, 1),
+            thread_name_prefix="WalletAnalyzer"
+        )
         
-        # Start worker threads
-        for i in range(self.config.api_max_workers):
-            worker = threading.Thread(
-                target=self._worker_loop,
-                name=f"WalletAnalyzer-{i+1}",
-                daemon=True
-            )
-            worker.start()
-            self.workers.append(worker)
+        dispatcher = threading.Thread(
+            target=self._run_dispatcher,
+            name="WalletAnalyzer-dispatcher",
+            daemon=True
+        )
+        dispatcher.start()
+        self.workers.append(dispatcher)
         
-        logger.info(f"Started {self.config.api_max_workers} wallet analysis workers")
+        logger.info(
+            f"Started wallet analysis dispatcher (max_in_flight={self.max_in_flight}, "
+            f"analysis_threads={self.config.analysis_threads}, "
+            f"per-host rate={HOST_LIMITER.rate_per_sec}/s, per-host concurrency={HOST_LIMITER.max_concurrent})"
+        )
     
     def stop_workers(self):
-        """Stop analysis workers"""
+        """Stop the dispatcher and its in-flight jobs"""
         if not self.running:
             return
         
         logger.info("Stopping wallet analysis workers...")
         self.running = False
         self.stop_event.set()
+        if self._wake_dispatcher:
+            try:
+                self._wake_dispatcher()
+            except RuntimeError:
+                pass  # Dispatcher loop already closed
         
-        # Wait for workers to finish
+        # Dispatcher waits briefly for in-flight jobs before returning
         for worker in self.workers:
-            worker.join(timeout=5)
+            worker.join(timeout=15)
+        
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
         
         self.workers.clear()
         logger.info("Wallet analysis workers stopped")
     
-    def _worker_loop(self):
-        """Main worker loop"""
-        worker_name = threading.current_thread().name
-        logger.info(f"{worker_name} started")
+    def _run_dispatcher(self):
+        """Thread entry point: run the asyncio dispatch loop"""
+        try:
+            asyncio.run(self._dispatch_loop())
+        except Exception as e:
+            logger.error(f"Wallet analysis dispatcher crashed: {e}", exc_info=True)
+    
+    async def _dispatch_loop(self):
+        """Lease jobs and keep up to max_in_flight of them running"""
+        loop = asyncio.get_running_loop()
+        tasks = set()
+        wake = asyncio.Event()
         last_idle_log = time.time()
         
-        while self.running and not self.stop_event.is_set():
-            try:
-                # Get pending jobs
-                batch_size = 10  # Get more jobs to increase chances of claiming one
-                jobs = self.db.get_pending_jobs(limit=batch_size)
-                
-                # Log how many jobs were fetched
-                logger.info(f"{worker_name} fetched {len(jobs)} jobs from get_pending_jobs(limit={batch_size})")
-                
-                if not jobs:
-                    # No jobs available, wait a bit
-                    # Log every 5 minutes that we're idle (for visibility)
-                    now = time.time()
-                    if now - last_idle_log > 300:
-                        # Check queue size using stats for better accuracy
-                        queue_stats = self.db.get_queue_stats()
-                        pending_count = queue_stats.get('pending_jobs', 0)
-                        ready_count = queue_stats.get('ready_jobs', 0)
-                        total_count = queue_stats.get('total_jobs', 0)
-                        logger.info(f"{worker_name} idle - no pending jobs (queue: {pending_count} pending, {ready_count} ready, {total_count} total)")
-                        last_idle_log = now
-                    time.sleep(1)
-                    continue
-                
-                # Try to claim a job atomically
-                job = None
-                for candidate_job in jobs:
-                    if self.db.claim_job(candidate_job['id']):
-                        job = candidate_job
-                        break
-                
-                if not job:
-                    # No job was available for claiming, wait a short moment to reduce contention
-                    logger.debug(f"{worker_name} could not claim any job from {len(jobs)} candidates (contention)")
-                    time.sleep(0.1)
-                    continue
-                
-                logger.info(f"{worker_name} start processing job_id={job['id']} address={job['address'][:12]}...")
-                
-                # Process the job with timeout monitoring
-                start_time = time.time()
-                max_analysis_time = self.config.api_timeout_sec * 5  # 5x API timeout for full analysis
-                success = False
-                
+        def on_job_queued():
+            loop.call_soon_threadsafe(wake.set)
+        
+        self.db.add_job_listener(on_job_queued)
+        self._wake_dispatcher = on_job_queued
+        logger.info(f"WalletAnalyzer dispatcher started (worker_id={self.worker_id})")
+        renewer = asyncio.ensure_future(self._renew_leases_loop())
+        # verify=False on the requests path; per-host limits come from HOST_LIMITER
+        session = aiohttp.ClientSession(
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.config.api_timeout_sec),
+            connector=aiohttp.TCPConnector(limit=0, ssl=False),
+        )
+        
+        try:
+            while self.running and not self.stop_event.is_set():
                 try:
-                    # Process the job
-                    success = self._analyze_wallet(job)
-                    elapsed = time.time() - start_time
+                    free_slots = self.max_in_flight - len(tasks)
+                    if free_slots <= 0:
+                        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                        continue
                     
-                    if elapsed > max_analysis_time:
-                        logger.warning(f"{worker_name} job {job['id']} took {elapsed:.2f}s (exceeded {max_analysis_time}s)")
-                    else:
-                        logger.debug(f"{worker_name} job {job['id']} analysis took {elapsed:.2f}s")
+                    wake.clear()
+                    jobs = await loop.run_in_executor(
+                        self._executor, self.db.claim_jobs, self.worker_id, free_slots
+                    )
+                    
+                    for job in jobs:
+                        task = asyncio.ensure_future(self._run_job(session, job))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    
+                    if len(jobs) == free_slots:
+                        continue
+                    
+                    # Queue drained: sleep until a job is queued, a slot frees up,
+                    # or the next delayed retry / lease expiry is due
+                    timeout = await loop.run_in_executor(self._executor, self.db.seconds_until_next_job)
+                    now = time.time()
+                    if not tasks and now - last_idle_log > 300:
+                        logger.info(f"WalletAnalyzer idle - no ready jobs (next check in {timeout:.0f}s)")
+                        last_idle_log = now
+                    waiters = set(tasks)
+                    wake_waiter = asyncio.ensure_future(wake.wait())
+                    waiters.add(wake_waiter)
+                    await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                    wake_waiter.cancel()
                     
                 except Exception as e:
-                    elapsed = time.time() - start_time
-                    logger.error(f"{worker_name} job {job['id']} error after {elapsed:.2f}s: {e}", exc_info=True)
-                    # Error handling is done in _analyze_wallet via _handle_analysis_error
-                    success = False
-                
-                if success:
-                    # Job completed successfully - check if DB update succeeded
-                    elapsed = time.time() - start_time
-                    if self.db.complete_job(job['id']):
-                        logger.info(f"{worker_name} completed job {job['id']} for {job['address']} in {elapsed:.2f}s")
-                    else:
-                        logger.error(f"{worker_name} failed to mark job {job['id']} as completed in DB (database locked?)")
-                else:
-                    # Job failed, will be retried later (already handled by _handle_analysis_error)
-                    logger.warning(f"{worker_name} failed job {job['id']} for {job['address']}")
-                
-                # Small delay between jobs (tuned for higher throughput)
-                time.sleep(0.05)
-                
+                    logger.error(f"WalletAnalyzer dispatcher error: {e}", exc_info=True)
+                    await asyncio.sleep(1)
+        finally:
+            self.db.remove_job_listener(on_job_queued)
+            self._wake_dispatcher = None
+            renewer.cancel()
+            
+            if tasks:
+                logger.info(f"WalletAnalyzer dispatcher waiting for {len(tasks)} in-flight jobs")
+                await asyncio.wait(tasks, timeout=10)
+            await session.close()
+        logger.info("WalletAnalyzer dispatcher stopped")
+    
+    async def _renew_leases_loop(self):
+        """Heartbeat: extend the leases of running jobs well before they expire"""
+        loop = asyncio.get_running_loop()
+        interval = max(self.db.JOB_LEASE_SECONDS / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            with self._in_flight_lock:
+                job_ids = sorted(self._active_jobs)
+            if not job_ids:
+                continue
+            renewed = await loop.run_in_executor(None, self.db.renew_job_leases, self.worker_id, job_ids)
+            if renewed < len(job_ids):
+                logger.warning(
+                    f"WalletAnalyzer lost the lease on {len(job_ids) - renewed} of {len(job_ids)} running jobs"
+                )
+    
+    async def _run_job(self, session: aiohttp.ClientSession, job: Dict[str, Any]) -> bool:
+        """Fetch a job's inputs on the loop, then analyze them on the analysis pool"""
+        loop = asyncio.get_running_loop()
+        with self._in_flight_lock:
+            self._in_flight += 1
+            self._active_jobs.add(job['id'])
+        try:
+            try:
+                prefetched = await self._prefetch_wallet(session, job)
             except Exception as e:
-                logger.error(f"{worker_name} error in worker loop: {e}", exc_info=True)
-                time.sleep(1)
+                # _analyze_wallet fetches whatever is missing on the blocking path
+                logger.warning(f"Prefetch failed for job {job['id']} ({job['address'][:12]}...): {e}")
+                prefetched = {}
+            return await loop.run_in_executor(self._executor, self._process_job, job, prefetched)
+        except Exception as e:
+            logger.error(f"WalletAnalyzer job {job['id']} crashed: {e}", exc_info=True)
+            return False
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+                self._active_jobs.discard(job['id'])
+    
+    def _process_job(self, job: Dict[str, Any], prefetched: Optional[Dict[Any, Any]] = None) -> bool:
+        """Analyze one claimed job on a pool thread and record its outcome
+        
+        prefetched holds the Data API results already fetched by _prefetch_wallet;
+        anything missing is fetched on the blocking path.
+        """
+        worker_name = threading.current_thread().name
+        logger.info(f"{worker_name} start processing job_id={job['id']} address={job['address'][:12]}...")
+        
+        # Process the job with timeout monitoring
+        start_time = time.time()
+        max_analysis_time = self.config.api_timeout_sec * 5  # 5x API timeout for full analysis
+        success = False
+        
+        self.local.prefetched = prefetched or {}
+        try:
+            success = self._analyze_wallet(job)
+            elapsed = time.time() - start_time
+            
+            if elapsed > max_analysis_time:
+                logger.warning(f"{worker_name} job {job['id']} took {elapsed:.2f}s (exceeded {max_analysis_time}s)")
+            else:
+                logger.debug(f"{worker_name} job {job['id']} analysis took {elapsed:.2f}s")
+            
+        except Exception as e:
+            elapsed = time.time() - start_time
+            logger.error(f"{worker_name} job {job['id']} error after {elapsed:.2f}s: {e}", exc_info=True)
+            # Error handling is done in _analyze_wallet via _handle_analysis_error
+            success = False
+        finally:
+            self.local.prefetched = {}
+        
+        if success:
+            # Job completed successfully - check if DB update succeeded
+            elapsed = time.time() - start_time
+            if self.db.complete_job(job['id'], job.get('leased_by')):
+                logger.info(f"{worker_name} completed job {job['id']} for {job['address']} in {elapsed:.2f}s")
+            else:
+                logger.error(f"{worker_name} failed to mark job {job['id']} as completed in DB (lease lost or database locked?)")
+        else:
+            # Job failed, will be retried later (already handled by _handle_analysis_error)
+            logger.warning(f"{worker_name} failed job {job['id']} for {job['address']}")
         
-        logger.info(f"{worker_name} stopped")
+        return success
+    
+    def _prefetched(self, key) -> Any:
+        """Result _prefetch_wallet stored under key for the current job (None if not fetched); re-raises a failed fetch"""
+        value = getattr(self.local, "prefetched", {}).pop(key, None)
+        if isinstance(value, BaseException):
+            raise value
+        return value
+    
+    async def _prefetch_wallet(self, session: aiohttp.ClientSession, job: Dict[str, Any]) -> Dict[Any, Any]:
+        """Fetch the Data API inputs _analyze_wallet will ask for, as coroutines
+        
+        Follows the same branches: a cached wallet only needs closed positions
+        (full resync for recompute jobs, incremental sync if accepted); a new
+        wallet needs /traded first and, past MIN_TRADES, closed-position pages
+        and recent trades in parallel. Results (or the exception a fetch
+        raised) are keyed "traded", ("pages", full) and "trades".
+        """
+        if not self._async_proxy_supported():
+            return {}
+        loop = asyncio.get_running_loop()
+        address = job['address']
+        cached = await loop.run_in_executor(self._executor, self.db.get_cached_analysis, address)
+        prefetched: Dict[Any, Any] = {}
+        fetches = {}
+        if cached:
+            if job.get('source') == 'recompute':
+                fetches[("pages", True)] = self._fetch_sync_pages_async(session, address, full=True)
+            if cached['analysis_result'] == "accepted":
+                fetches[("pages", False)] = self._fetch_sync_pages_async(session, address, full=False)
+        else:
+            try:
+                traded = await self._get_total_traded_async(session, address)
+            except Exception as e:
+                prefetched["traded"] = e
+                return prefetched
+            prefetched["traded"] = traded
+            if traded < MIN_TRADES:
+                return prefetched
+            fetches[("pages", False)] = self._fetch_sync_pages_async(session, address, full=False)
+            fetches["trades"] = self._get_recent_trades_async(session, address)
+        if fetches:
+            results = await asyncio.gather(*fetches.values(), return_exceptions=True)
+            prefetched.update(zip(fetches, results))
+        return prefetched
     
     def _analyze_wallet(self, job: Dict[str, Any]) -> bool:
         """Analyze a single wallet with detailed step-by-step logging"""
@@ -298,7 +612,8 @@ class WalletAnalyzer:
                 if is_recompute:
                     logger.info(f"Recompute requested for {address}, fetching closed positions for category stats...")
                     try:
-                        closed_positions = self._get_closed_positions(address)
+                        # Full resync so every position in the window is reclassified
+                        closed_positions = self._sync_closed_positions(address, full=True)
                         if closed_positions and len(closed_positions) > 0:
                             self._compute_category_stats(address, closed_positions)
                             logger.info(f"Category stats recomputed for {address}")
@@ -311,14 +626,16 @@ class WalletAnalyzer:
                 if analysis_result == "accepted":
                     # Fetch closed positions to compute insider detection for cached accepted wallets
                     try:
-                        closed_positions = self._get_closed_positions(address)
+                        closed_positions = self._sync_closed_positions(address)
                         if closed_positions and len(closed_positions) > 0:
+                            position_metrics = PositionColumns.from_positions(closed_positions).metrics()
                             # Calculate total_markets_traded from unique market IDs
-                            total_markets_traded = len(set(pos.get('conditionId') or pos.get('condition_id') for pos in closed_positions if pos.get('conditionId') or pos.get('condition_id')))
+                            total_markets_traded = position_metrics.markets_traded
                             
                             # Detect insider patterns
-                            is_insider_candidate, insider_reason = self._detect_insider_patterns(
-                                address, traded, win_rate, closed_positions, total_markets_traded
+                            is_insider_candidate, insider_reason = self._insider_from_aggregates(
+                                address, traded, win_rate, position_metrics.max_stake,
+                                total_markets_traded, position_metrics.total_volume
                             )
                             logger.info(f"[INSIDER] Detection for cached {address}: is_candidate={is_insider_candidate}, reason={insider_reason}")
                             
@@ -426,8 +743,8 @@ class WalletAnalyzer:
                     return True
                 
                 try:
-                    closed_positions = self._get_closed_positions(address)
-                    log_step("get_closed_positions")
+                    closed_positions = self._sync_closed_positions(address)
+                    log_step("sync_closed_positions")
                 except Exception as e:
                     logger.error(f"API error getting closed positions for {address}: {e}")
                     # Cache API error result
@@ -444,21 +761,24 @@ class WalletAnalyzer:
                     )
                     return True  # Successfully handled (filtered out due to API error)
                 
-                win_rate, pnl_total = self._compute_win_rate_and_pnl(closed_positions)
+                # Normalize positions into columns once; every wallet metric below reads them
+                columns = PositionColumns.from_positions(closed_positions)
+                metrics = columns.metrics()
+                win_rate, pnl_total = metrics.win_rate, metrics.pnl_total
                 
                 # Calculate total_markets_traded from unique market IDs
-                total_markets_traded = len(set(pos.get('conditionId') or pos.get('condition_id') for pos in closed_positions if pos.get('conditionId') or pos.get('condition_id')))
+                total_markets_traded = metrics.markets_traded
                 
                 # Detect insider patterns
-                is_insider_candidate, insider_reason = self._detect_insider_patterns(
-                    address, traded, win_rate, closed_positions, total_markets_traded
+                is_insider_candidate, insider_reason = self._insider_from_aggregates(
+                    address, traded, win_rate, metrics.max_stake, total_markets_traded, metrics.total_volume
                 )
                 logger.info(f"[INSIDER] Detection for {address}: is_candidate={is_insider_candidate}, reason={insider_reason}")
                 
                 # Compute category-based statistics
                 if closed_positions and len(closed_positions) > 0:
                     try:
-                        self._compute_category_stats(address, closed_positions)
+                        self._compute_category_stats(address, closed_positions, columns=columns)
                     except Exception as e:
                         logger.warning(f"Error computing category stats for {address}: {e}")
                 
@@ -478,16 +798,22 @@ class WalletAnalyzer:
                     )
                     return True  # Successfully handled (no stats available)
                 
+                # One /trades fetch feeds both daily frequency and last trade timestamp
+                try:
+                    recent_trades = self._get_recent_trades(address)
+                    log_step("get_recent_trades")
+                except Exception as e:
+                    logger.warning(f"API error getting recent trades for {address}: {e}, continuing with None")
+                    recent_trades = None
+                
                 try:
-                    daily_freq = self._get_daily_trading_frequency(address)
-                    log_step("get_daily_trading_frequency")
+                    daily_freq = self._get_daily_trading_frequency(address, trades=recent_trades) if recent_trades is not None else None
                 except Exception as e:
-                    logger.warning(f"API error getting daily frequency for {address}: {e}, continuing with None")
+                    logger.warning(f"Error computing daily frequency for {address}: {e}, continuing with None")
                     daily_freq = None  # Continue analysis without daily frequency
                 
                 # Get last trade timestamp
-                last_trade_at = self._get_last_trade_timestamp(address)
-                log_step("get_last_trade_timestamp")
+                last_trade_at = self._get_last_trade_timestamp(address, trades=recent_trades) if recent_trades is not None else None
                 
                 # Check activity filter: only reject if last_trade_at is known and older than threshold
                 if last_trade_at is None:
@@ -540,8 +866,8 @@ class WalletAnalyzer:
                     return True  # Successfully filtered out
                 
                 # Calculate new quality metrics from filtered closed positions
-                num_markets = len(closed_positions)
-                total_volume, avg_stake = self._compute_volume_and_stake(closed_positions)
+                num_markets = metrics.positions
+                total_volume, avg_stake = metrics.total_volume, metrics.avg_stake
                 
                 # Calculate ROI and average PnL per market
                 roi = (pnl_total / total_volume) if total_volume > 0 else 0.0
@@ -635,9 +961,9 @@ class WalletAnalyzer:
             # Calculate quality metrics if we have closed_positions (for logging)
             # Note: closed_positions may not be defined in all code paths (e.g., cached results)
             try:
-                if 'closed_positions' in locals() and closed_positions and len(closed_positions) > 0:
-                    num_markets = len(closed_positions)
-                    total_volume, avg_stake = self._compute_volume_and_stake(closed_positions)
+                if 'metrics' in locals() and metrics.positions > 0:
+                    num_markets = metrics.positions
+                    total_volume, avg_stake = metrics.total_volume, metrics.avg_stake
                     roi = (pnl_total / total_volume) if total_volume > 0 else 0.0
                     avg_pnl_per_market = (pnl_total / num_markets) if num_markets > 0 else 0.0
                     logger.debug(
@@ -701,9 +1027,9 @@ class WalletAnalyzer:
                 # Use insider detection results computed earlier (reuse variables from line 397-400)
                 # Calculate quality metrics if we have closed_positions
                 quality_metrics = {}
-                if 'closed_positions' in locals() and closed_positions and len(closed_positions) > 0:
-                    num_markets = len(closed_positions)
-                    total_volume, avg_stake = self._compute_volume_and_stake(closed_positions)
+                if 'metrics' in locals() and metrics.positions > 0:
+                    num_markets = metrics.positions
+                    total_volume, avg_stake = metrics.total_volume, metrics.avg_stake
                     roi = (pnl_total / total_volume) if total_volume > 0 else 0.0
                     avg_pnl_per_market = (pnl_total / num_markets) if num_markets > 0 else 0.0
                     quality_metrics = {
@@ -731,9 +1057,9 @@ class WalletAnalyzer:
                     # Try to get quality metrics from closed_positions if they were calculated
                     try:
                         # Check if we're in the branch where closed_positions exist
-                        if 'closed_positions' in locals() and closed_positions and len(closed_positions) > 0:
-                            num_markets = len(closed_positions)
-                            total_volume, avg_stake = self._compute_volume_and_stake(closed_positions)
+                        if 'metrics' in locals() and metrics.positions > 0:
+                            num_markets = metrics.positions
+                            total_volume, avg_stake = metrics.total_volume, metrics.avg_stake
                             roi = (pnl_total / total_volume) if total_volume > 0 else 0.0
                             avg_pnl_per_market = (pnl_total / num_markets) if num_markets > 0 else 0.0
                             logger.info(
@@ -772,11 +1098,11 @@ class WalletAnalyzer:
             except Exception as cache_error:
                 logger.error(f"Failed to cache error result for {address}: {cache_error}")
             
-            self._handle_analysis_error(job_id, str(e))
+            self._handle_analysis_error(job_id, str(e), job.get('leased_by'))
             return False
     
-    def _handle_analysis_error(self, job_id: int, error_message: str):
-        """Handle analysis error with retry logic"""
+    def _handle_analysis_error(self, job_id: int, error_message: str, worker_id: Optional[str] = None):
+        """Handle analysis error with retry logic (worker_id: lease owner from claim_jobs)"""
         try:
             # Get current job info directly by ID
             job = self.db.get_job_by_id(job_id)
@@ -784,7 +1110,7 @@ class WalletAnalyzer:
             if not job:
                 logger.error(f"Job {job_id} not found for error handling")
                 # Reset job to pending if it exists but wasn't found (might be stuck in processing)
-                self.db.update_job_status(job_id, 'pending', error_message)
+                self.db.update_job_status(job_id, 'pending', error_message, worker_id=worker_id)
                 return
             
             retry_count = job.get('retry_count', 0)
@@ -792,7 +1118,7 @@ class WalletAnalyzer:
             
             if retry_count >= max_retries:
                 logger.error(f"Job {job_id} exceeded max retries ({max_retries}), marking as failed")
-                self.db.update_job_status(job_id, 'failed', error_message)
+                self.db.update_job_status(job_id, 'failed', error_message, worker_id=worker_id)
                 return
             
             # Calculate next retry time with exponential backoff + jitter
@@ -820,7 +1146,7 @@ class WalletAnalyzer:
             next_retry_iso = next_retry_at.isoformat()
             
             # Update job with retry info
-            self.db.increment_job_retry(job_id, next_retry_iso, error_message)
+            self.db.increment_job_retry(job_id, next_retry_iso, error_message, worker_id)
             
             logger.warning(
                 f"Job {job_id} error='{error_message[:100]}' retry_count={retry_count + 1}/{max_retries} "
@@ -838,22 +1164,24 @@ class WalletAnalyzer:
         
         for attempt in range(max_retries):
             try:
-                # Use semaphore to limit concurrent requests
-                with HTTP_SEMAPHORE:
-                    # Get proxy if available
-                    proxy = self.proxy_manager.get_proxy(rotate=True) if self.proxy_manager.proxy_enabled else None
-                    
-                    # Add proxy-specific headers for HTTP proxies with IP rotation
-                    headers = self.headers.copy()
-                    if proxy:
-                        headers['Connection'] = 'close'  # Avoid connection reuse issues with rotating proxies
-                        headers['Proxy-Connection'] = 'close'
-                    
-                    # Use thread-local session for connection reuse
-                    session = self._get_session()
-                    
-                    # Use verify=False for proxies that might have SSL issues
+                # Get proxy if available
+                proxy = self.proxy_manager.get_proxy(rotate=True) if self.proxy_manager.proxy_enabled else None
+                
+                # Add proxy-specific headers for HTTP proxies with IP rotation
+                headers = self.headers.copy()
+                if proxy:
+                    headers['Connection'] = 'close'  # Avoid connection reuse issues with rotating proxies
+                    headers['Proxy-Connection'] = 'close'
+                
+                # Use thread-local session for connection reuse
+                session = self._get_session()
+                
+                # Per-host slot and rate token; use verify=False for proxies that might have SSL issues
+                slot = HOST_LIMITER.acquire(url)
+                try:
                     response = session.get(url, params=params, headers=headers, timeout=timeout, proxies=proxy, verify=False)
+                finally:
+                    HOST_LIMITER.release(slot)
                 
                 # Handle 429 rate limiting
                 if response.status_code == 429:
@@ -865,7 +1193,7 @@ class WalletAnalyzer:
                             if delay <= 0:
                                 delay = 5  # Minimum 5 seconds even if server says 0
                             logger.warning(f"Rate limited (429), waiting {delay}s as requested by server")
-                            time.sleep(delay)
+                            HOST_LIMITER.penalize(url, delay)
                             # Rotate proxy on retry if available
                             if self.proxy_manager.proxy_enabled:
                                 proxy = self.proxy_manager.get_proxy(rotate=True)
@@ -876,7 +1204,7 @@ class WalletAnalyzer:
                     # Fallback exponential backoff (minimum 5 seconds)
                     delay = max(5, base_delay * (2 ** attempt))
                     logger.warning(f"Rate limited (429), waiting {delay:.1f}s (attempt {attempt + 1})")
-                    time.sleep(delay)
+                    HOST_LIMITER.penalize(url, delay)
                     continue
                 
                 # Handle other HTTP errors
@@ -941,28 +1269,177 @@ class WalletAnalyzer:
         # This should never be reached, but just in case
         raise RequestException("Max retries exceeded")
     
+    def _async_proxy_supported(self) -> bool:
+        """True if every configured proxy can be used by aiohttp (HTTP proxies only, no SOCKS)"""
+        if not self.proxy_manager.proxy_enabled:
+            return True
+        return all(
+            urlparse(proxy.get("https", "")).scheme in ("http", "https")
+            for proxy in self.proxy_manager.proxies
+        )
+    
+    async def _http_get_json_async(self, session: aiohttp.ClientSession, url: str,
+                                   params: Optional[Dict[str, Any]] = None) -> Any:
+        """_http_get_resilient for the dispatcher loop: one GET through HOST_LIMITER, decoded JSON body
+        
+        A 429 pauses the host (same Retry-After handling, minimum 5s) and
+        fails the request; the job's retry schedule takes it from there. A
+        failing proxy falls back to a direct connection once.
+        """
+        proxy = None
+        headers = None
+        if self.proxy_manager.proxy_enabled:
+            proxy = (self.proxy_manager.get_proxy(rotate=True) or {}).get("https")
+            if proxy:
+                headers = {'Connection': 'close', 'Proxy-Connection': 'close'}
+        query = {key: str(value) for key, value in (params or {}).items()}
+        
+        slot = await HOST_LIMITER.acquire_async(url)
+        try:
+            try:
+                response = await session.get(url, params=query, headers=headers, proxy=proxy)
+            except (aiohttp.ClientProxyConnectionError, aiohttp.ClientHttpProxyError) as e:
+                if not proxy:
+                    raise
+                logger.warning(f"Proxy failed ({str(e)[:50]}...), retrying without proxy for {url[:80]}...")
+                response = await session.get(url, params=query)
+            async with response:
+                if response.status == 429:
+                    try:
+                        delay = int(response.headers.get('Retry-After', ''))
+                    except ValueError:
+                        delay = 0
+                    delay = max(delay, 5)  # Minimum 5 seconds even if server says 0
+                    logger.warning(f"Rate limited (429), pausing {urlparse(url).netloc} for {delay}s")
+                    HOST_LIMITER.penalize(url, delay)
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        finally:
+            HOST_LIMITER.release(slot)
+    
     def _get_total_traded(self, address: str) -> int:
         """Get total number of trades for a wallet"""
         try:
+            traded = self._prefetched("traded")
+            if traded is not None:
+                return traded
             response = self._http_get_resilient(self.traded_endpoint, params={"user": address})
-            data = response.json()
-            
-            if isinstance(data, dict) and "traded" in data:
-                return int(data["traded"])
-            elif isinstance(data, list) and data:
-                return int(data[0]["traded"])
-            return 0
+            return _traded_total(response.json())
         except Exception as e:
             logger.warning(f"Failed to get traded total for {address}: {e}")
             raise  # Re-raise to trigger retry logic
     
+    async def _get_total_traded_async(self, session: aiohttp.ClientSession, address: str) -> int:
+        """_get_total_traded over the dispatcher's aiohttp session"""
+        try:
+            return _traded_total(await self._http_get_json_async(session, self.traded_endpoint, {"user": address}))
+        except Exception as e:
+            logger.warning(f"Failed to get traded total for {address}: {e}")
+            raise
+    
+    def _fetch_closed_position_pages(self, address: str, fetch_limit: int, page_limit: int,
+                                     stop_ts: float, max_positions: int) -> List[Dict[str, Any]]:
+        """Newest-first /closed-positions pages, up to fetch_limit positions.
+
+        The first page is fetched alone; once it shows more are needed, up to
+        CLOSED_POSITIONS_PREFETCH_PAGES pages are kept in flight on the page
+        pool. Pages are consumed in offset order and paging stops at a short
+        page, at a page whose oldest position is older than stop_ts, or once
+        max_positions positions at or after stop_ts have been seen. The two
+        early stops only apply while the stream really is newest-first: every
+        page must be sorted descending and start no later than the previous
+        page ended, otherwise the fetch runs to fetch_limit.
+        Pages not yet started are cancelled; responses still in flight are
+        discarded. A failed page fails the whole fetch.
+        """
+        def fetch_page(offset: int) -> Tuple[int, List[Dict[str, Any]]]:
+            limit = min(page_limit, fetch_limit - offset)
+            params = {
+                "user": address, "limit": limit, "offset": offset,
+                "sortBy": "TIMESTAMP", "sortDirection": "DESC"
+            }
+            response = self._http_get_resilient(self.closed_positions_endpoint, params=params)
+            return limit, _positions_batch(response.json())
+        
+        offsets = range(0, fetch_limit, page_limit)
+        pending = deque()
+        next_page = 0
+        window = 1
+        positions = []
+        cutoff = _ClosedPageCutoff(stop_ts, max_positions)
+        try:
+            while True:
+                while next_page < len(offsets) and len(pending) < window:
+                    pending.append(PAGE_EXECUTOR.submit(fetch_page, offsets[next_page]))
+                    next_page += 1
+                if not pending:
+                    break
+                
+                limit, batch = pending.popleft().result()
+                if not batch:
+                    break
+                positions.extend(batch)
+                if len(batch) < limit or cutoff.reached(batch):
+                    break
+                window = max(CLOSED_POSITIONS_PREFETCH_PAGES, 1)
+        finally:
+            for future in pending:
+                future.cancel()
+        
+        logger.debug(
+            f"Fetched {len(positions)} closed positions for {address} in {next_page} page request(s)"
+        )
+        return positions
+    
+    async def _fetch_closed_position_pages_async(self, session: aiohttp.ClientSession, address: str,
+                                                 fetch_limit: int, page_limit: int,
+                                                 stop_ts: float, max_positions: int) -> List[Dict[str, Any]]:
+        """_fetch_closed_position_pages on the dispatcher loop: same window, order and stop rules, pages as tasks"""
+        async def fetch_page(offset: int) -> Tuple[int, List[Dict[str, Any]]]:
+            limit = min(page_limit, fetch_limit - offset)
+            params = {
+                "user": address, "limit": limit, "offset": offset,
+                "sortBy": "TIMESTAMP", "sortDirection": "DESC"
+            }
+            data = await self._http_get_json_async(session, self.closed_positions_endpoint, params)
+            return limit, _positions_batch(data)
+        
+        offsets = range(0, fetch_limit, page_limit)
+        pending = deque()
+        next_page = 0
+        window = 1
+        positions = []
+        cutoff = _ClosedPageCutoff(stop_ts, max_positions)
+        try:
+            while True:
+                while next_page < len(offsets) and len(pending) < window:
+                    pending.append(asyncio.ensure_future(fetch_page(offsets[next_page])))
+                    next_page += 1
+                if not pending:
+                    break
+                
+                limit, batch = await pending.popleft()
+                if not batch:
+                    break
+                positions.extend(batch)
+                if len(batch) < limit or cutoff.reached(batch):
+                    break
+                window = max(CLOSED_POSITIONS_PREFETCH_PAGES, 1)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        logger.debug(
+            f"Fetched {len(positions)} closed positions for {address} in {next_page} page request(s)"
+        )
+        return positions
+    
     def _get_closed_positions(self, address: str, max_positions: int = MAX_CLOSED_POSITIONS, page_limit: int = 500) -> List[Dict[str, Any]]:
         """Get closed positions for a wallet with pagination (up to max_positions).
         Returns positions filtered by ANALYSIS_LOOKBACK_DAYS and sorted by closed_at/timestamp descending (most recent first).
         """
-        positions = []
-        offset = 0
-        
         try:
             # Fetch more positions than needed to ensure we have enough after filtering by date
             # We'll fetch up to max_positions * 3 to account for filtering by date
@@ -970,98 +1447,23 @@ class WalletAnalyzer:
             
             # Calculate cutoff date for filtering
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=ANALYSIS_LOOKBACK_DAYS)
+            positions = self._fetch_closed_position_pages(
+                address, fetch_limit, page_limit, cutoff_date.timestamp(), max_positions
+            )
             
-            while len(positions) < fetch_limit:
-                limit = min(page_limit, fetch_limit - len(positions))
-                params = {"user": address, "limit": limit, "offset": offset}
-                
-                response = self._http_get_resilient(
-                    self.closed_positions_endpoint, 
-                    params=params
-                )
-                
-                data = response.json()
-                batch = data if isinstance(data, list) else (data.get("positions", []) if isinstance(data, dict) else [])
-                
-                if not batch:
-                    break
-                
-                positions.extend(batch)
-                offset += len(batch)
-                
-                # Protection against infinite loop: if we got fewer items than requested, we've reached the end
-                if len(batch) < limit:
-                    break
-            
-            # Sort positions by closed_at/timestamp descending (most recent first)
-            def get_timestamp(pos: Dict[str, Any]) -> float:
-                """Extract timestamp from position for sorting"""
-                # Try different possible timestamp fields
-                timestamp = (
-                    pos.get("closed_at") or 
-                    pos.get("closedAt") or 
-                    pos.get("timestamp") or 
-                    pos.get("created_at") or 
-                    pos.get("createdAt") or
-                    0
-                )
-                
-                # Handle string timestamps
-                if isinstance(timestamp, str):
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                        return dt.timestamp()
-                    except Exception:
-                        return 0.0
-                
-                # Handle numeric timestamps (might be in milliseconds)
-                if isinstance(timestamp, (int, float)):
-                    # If timestamp is > 1e10, it's likely in milliseconds, convert to seconds
-                    if timestamp > 1e10:
-                        return timestamp / 1000.0
-                    return float(timestamp)
-                
-                return 0.0
-            
-            def get_datetime(pos: Dict[str, Any]) -> Optional[datetime]:
-                """Extract datetime from position for date filtering"""
-                timestamp = (
-                    pos.get("closed_at") or 
-                    pos.get("closedAt") or 
-                    pos.get("timestamp") or 
-                    pos.get("created_at") or 
-                    pos.get("createdAt") or
-                    None
-                )
-                
-                if timestamp is None:
-                    return None
-                
-                if isinstance(timestamp, str):
-                    try:
-                        return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                    except Exception:
-                        return None
-                
-                if isinstance(timestamp, (int, float)):
-                    if timestamp > 1e10:
-                        timestamp = timestamp / 1000.0
-                    return datetime.fromtimestamp(float(timestamp), tz=timezone.utc)
-                
-                return None
-            
-            # Sort by timestamp descending (newest first)
-            positions.sort(key=get_timestamp, reverse=True)
+            # Sort positions by closed_at/timestamp descending (most recent first);
+            # each timestamp is parsed once and reused for the date filter
+            cutoff_ts = cutoff_date.timestamp()
+            stamped = [(position_closed_ts(pos), pos) for pos in positions]
+            stamped.sort(key=lambda item: item[0] or 0.0, reverse=True)
             
             # Filter by date: only keep positions within ANALYSIS_LOOKBACK_DAYS
             filtered_positions = []
-            for pos in positions:
-                pos_dt = get_datetime(pos)
-                if pos_dt is None:
+            for closed_ts, pos in stamped:
+                if closed_ts is None:
                     # If we can't determine date, include it (conservative approach)
                     filtered_positions.append(pos)
-                elif pos_dt >= cutoff_date:
+                elif closed_ts >= cutoff_ts:
                     filtered_positions.append(pos)
                 else:
                     # Position is older than cutoff, stop here since positions are sorted by date descending
@@ -1082,14 +1484,134 @@ class WalletAnalyzer:
             logger.warning(f"Failed to get closed positions for {address}: {e}")
             raise  # Re-raise to trigger retry logic
     
-    def _get_last_trade_timestamp(self, address: str) -> Optional[str]:
-        """Get timestamp of the most recent trade for a wallet"""
+    def _closed_positions_bounds(self, address: str, full: bool) -> Tuple[int, Optional[int], int]:
+        """(lookback cutoff, stored watermark, page stop_ts) for a closed-positions sync"""
+        cutoff_ts = int((datetime.now(timezone.utc) - timedelta(days=ANALYSIS_LOOKBACK_DAYS)).timestamp())
+        watermark = None if full else self.db.get_position_watermark(address)
+        return cutoff_ts, watermark, max(watermark or 0, cutoff_ts)
+    
+    async def _fetch_sync_pages_async(self, session: aiohttp.ClientSession, address: str,
+                                      full: bool) -> List[Dict[str, Any]]:
+        """The pages _sync_closed_positions(address, full=full) would fetch, fetched on the dispatcher loop"""
+        loop = asyncio.get_running_loop()
+        _, _, stop_ts = await loop.run_in_executor(self._executor, self._closed_positions_bounds, address, full)
+        return await self._fetch_closed_position_pages_async(
+            session, address, MAX_CLOSED_POSITIONS * 3, 500, stop_ts, MAX_CLOSED_POSITIONS
+        )
+    
+    def _sync_closed_positions(self, address: str, max_positions: int = MAX_CLOSED_POSITIONS,
+                               page_limit: int = 500, full: bool = False) -> List[Dict[str, Any]]:
+        """Closed positions in the analysis window, fetching only what closed since the last sync.
+
+        Pages are requested newest first and paging stops once a page reaches
+        the wallet's watermark (or the lookback cutoff on the first sync). New
+        positions are classified once and stored in wallet_closed_positions;
+        the window (same rules as _get_closed_positions) is then read back
+        from the ledger. full=True ignores the watermark and re-reads every
+        position's category from condition_categories.
+        """
+        cutoff_ts, watermark, stop_ts = self._closed_positions_bounds(address, full)
+        fetch_limit = max_positions * 3
+        
         try:
-            response = self._http_get_resilient(
-                self.trades_endpoint, 
-                params={"user": address, "limit": 1}
-            )
-            trades = response.json() if response.ok else []
+            fetched = self._prefetched(("pages", full))
+            if fetched is None:
+                fetched = self._fetch_closed_position_pages(address, fetch_limit, page_limit, stop_ts, max_positions)
+        except Exception as e:
+            logger.warning(f"Failed to get closed positions for {address}: {e}")
+            raise  # Re-raise to trigger retry logic
+        
+        rows = []
+        fetched_by_key = {}
+        newest_ts = watermark
+        for pos in fetched:
+            closed_ts = position_closed_ts(pos)
+            if closed_ts is not None:
+                if closed_ts < stop_ts:
+                    continue
+                newest_ts = max(newest_ts or 0, int(closed_ts))
+            condition_id = pos.get("conditionId") or pos.get("condition_id")
+            position_key = f"{condition_id or ''}:{pos.get('asset') or ''}:{pos.get('outcomeIndex', pos.get('outcome', ''))}"
+            fetched_by_key[position_key] = pos
+            total_bought, avg_price, stake, volume = position_amounts(pos)
+            rows.append({
+                "position_key": position_key,
+                "condition_id": condition_id,
+                "closed_ts": int(closed_ts) if closed_ts is not None else None,
+                "realized_pnl": float(pos.get("realizedPnl", 0) or 0),
+                "volume": volume,
+                "stake": stake,
+                "total_bought": total_bought,
+                "avg_price": avg_price,
+                "category": None,  # Assigned below, only for positions that land in the window
+            })
+        
+        self.db.store_closed_positions(address, rows, newest_ts if newest_ts is not None else cutoff_ts,
+                                       prune_before_ts=cutoff_ts)
+        window = self.db.get_closed_positions_window(address, cutoff_ts, max_positions)
+        
+        # Classify each market once: shared category cache, then one batched Gamma lookup
+        to_classify = [row for row in window if row["condition_id"] and (full or not row["category"])]
+        classified = []
+        if to_classify:
+            sample_positions = {}
+            for row in to_classify:
+                sample_positions.setdefault(
+                    row["condition_id"],
+                    fetched_by_key.get(row["position_key"]) or {"conditionId": row["condition_id"]}
+                )
+            categories = self._classify_conditions(sample_positions)
+            for row in to_classify:
+                row["category"] = categories[row["condition_id"]]
+                classified.append((row["category"], row["position_key"]))
+            self.db.set_closed_position_categories(address, classified)
+        
+        logger.debug(
+            f"Synced closed positions for {address}: fetched {len(fetched)} "
+            f"(watermark={watermark}), stored {len(rows)}, classified {len(classified)}, window={len(window)}"
+        )
+        
+        # Same keys the compute helpers read from API positions
+        return [
+            {
+                "conditionId": row["condition_id"],
+                "realizedPnl": row["realized_pnl"],
+                "volume": row["volume"],
+                "stake": row["stake"],
+                "timestamp": row["closed_ts"],
+                "category": row["category"],
+            }
+            for row in window
+        ]
+    
+    def _get_recent_trades(self, address: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Fetch the wallet's most recent trades (newest first) in one /trades call"""
+        if limit == 100:
+            trades = self._prefetched("trades")
+            if trades is not None:
+                return trades
+        response = self._http_get_resilient(
+            self.trades_endpoint,
+            params={"user": address, "limit": limit}
+        )
+        trades = response.json() if response.ok else []
+        return trades if isinstance(trades, list) else []
+    
+    async def _get_recent_trades_async(self, session: aiohttp.ClientSession, address: str,
+                                       limit: int = 100) -> List[Dict[str, Any]]:
+        """_get_recent_trades over the dispatcher's aiohttp session"""
+        trades = await self._http_get_json_async(session, self.trades_endpoint, {"user": address, "limit": limit})
+        return trades if isinstance(trades, list) else []
+    
+    def _get_last_trade_timestamp(self, address: str, trades: Optional[List[Dict[str, Any]]] = None) -> Optional[str]:
+        """Get timestamp of the most recent trade for a wallet (from trades if already fetched)"""
+        try:
+            if trades is None:
+                response = self._http_get_resilient(
+                    self.trades_endpoint, 
+                    params={"user": address, "limit": 1}
+                )
+                trades = response.json() if response.ok else []
             
             if not trades:
                 return None
@@ -1117,14 +1639,15 @@ class WalletAnalyzer:
             logger.debug(f"Failed to get last trade timestamp for {address}: {e}")
             return None
     
-    def _get_daily_trading_frequency(self, address: str) -> float:
-        """Calculate average trades per day for a wallet"""
+    def _get_daily_trading_frequency(self, address: str, trades: Optional[List[Dict[str, Any]]] = None) -> float:
+        """Calculate average trades per day for a wallet (from trades if already fetched)"""
         try:
-            response = self._http_get_resilient(
-                self.trades_endpoint, 
-                params={"user": address, "limit": 100}
-            )
-            trades = response.json() if response.ok else []
+            if trades is None:
+                response = self._http_get_resilient(
+                    self.trades_endpoint, 
+                    params={"user": address, "limit": 100}
+                )
+                trades = response.json() if response.ok else []
             
             if len(trades) < 10:
                 return 0.0
@@ -1157,20 +1680,8 @@ class WalletAnalyzer:
     
     def _compute_win_rate_and_pnl(self, closed_positions: List[Dict[str, Any]]) -> Tuple[float, float]:
         """Compute win rate and total PnL from closed positions"""
-        if not closed_positions:
-            return 0.0, 0.0
-        
-        wins = 0
-        pnl_sum = 0.0
-        
-        for position in closed_positions:
-            pnl = float(position.get("realizedPnl", 0) or 0)
-            pnl_sum += pnl
-            if pnl > 0:
-                wins += 1
-        
-        win_rate = wins / len(closed_positions)
-        return win_rate, pnl_sum
+        metrics = PositionColumns.from_positions(closed_positions).metrics()
+        return metrics.win_rate, metrics.pnl_total
     
     def _compute_volume_and_stake(self, closed_positions: List[Dict[str, Any]]) -> Tuple[float, float]:
         """Compute total volume and average stake from closed positions.
@@ -1180,147 +1691,135 @@ class WalletAnalyzer:
             - total_volume: Sum of all stakes (totalBought * avgPrice) across all positions
             - avg_stake: Average stake per market (total_volume / num_markets)
         """
-        if not closed_positions:
-            return 0.0, 0.0
+        metrics = PositionColumns.from_positions(closed_positions).metrics()
+        return metrics.total_volume, metrics.avg_stake
+    
+    def _classify_conditions(self, positions: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        """Categories for condition_id -> sample position, consulting the shared cache first.
+
+        Misses are resolved with one batched Gamma /markets query (falling back
+        to per-market lookups if the batch call fails) and written back to
+        condition_categories.
+        """
+        if not positions:
+            return {}
+        categories = self.db.get_condition_categories(list(positions))
+        misses = [cid for cid in positions if cid not in categories]
+        if not misses:
+            return categories
         
-        total_volume = 0.0
+        try:
+            from gamma_client import get_events_by_condition_ids
+            events = get_events_by_condition_ids(misses)
+        except Exception as e:
+            logger.debug(f"[CATEGORY] Batch Gamma lookup failed for {len(misses)} markets: {e}, using per-market lookups")
+            events = None
         
-        for position in closed_positions:
-            # Try to get volume from position data
-            # Check for existing volume field first
-            volume = position.get("volume") or position.get("totalVolume") or position.get("total_volume")
-            
-            if volume is not None:
-                try:
-                    total_volume += float(volume)
-                    continue
-                except (ValueError, TypeError):
-                    pass
-            
-            # Calculate stake from totalBought and avgPrice
-            total_bought = float(position.get("totalBought", 0) or position.get("total_bought", 0) or 0)
-            avg_price = float(position.get("avgPrice", 0) or position.get("avg_price", 0) or 0)
+        markets = []
+        for cid in misses:
+            if events is None:
+                markets.append(self._resolve_market_text(positions[cid], cid))
+            else:
+                markets.append(self._resolve_market_text(positions[cid], cid, event=events.get(cid.lower())))
+        # One classify_markets call so the ML fallback runs as a single batch
+        resolved = list(zip(misses, classify_markets(markets)))
+        for (cid, category), (_, slug, question) in zip(resolved, markets):
+            categories[cid] = category
+            if category == "other/Unknown" and (slug or question):
+                logger.debug(f"[CATEGORY] Classified as Unknown: slug={slug[:50] if slug else 'None'}, question={question[:50] if question else 'None'}")
+        self.db.save_condition_categories(resolved)
+        
+        logger.debug(f"[CATEGORY] Classified {len(positions)} markets ({len(misses)} not cached)")
+        return categories
+    
+    def _resolve_market_text(self, position: Dict[str, Any], condition_id: str,
+                             event: Optional[Dict[str, Any]] = _EVENT_LOOKUP
+                             ) -> Tuple[Optional[Dict[str, Any]], Optional[str], Optional[str]]:
+        """(event, slug, question) for a closed position's market, using Gamma/CLOB lookups when the position lacks slug/title.
+
+        Pass event (None when the batch lookup found nothing) to skip the per-market Gamma request.
+        """
+        slug = None
+        question = None
+        lookup_event = event is _EVENT_LOOKUP
+        if lookup_event:
+            event = None
+        
+        # First, try to get slug/question from closed position data itself
+        # Closed positions API returns: title, slug, eventSlug
+        slug = position.get("slug") or position.get("marketSlug") or position.get("eventSlug")
+        question = position.get("title") or position.get("question") or position.get("marketTitle")
+        
+        # Log what we got from position
+        if slug or question:
+            logger.debug(f"[CATEGORY] Got data from position: slug={slug[:50] if slug else 'None'}, question={question[:50] if question else 'None'}")
+        
+        try:
+            # Try to get event from Gamma API
+            if lookup_event:
+                from gamma_client import get_event_by_condition_id
+                event = get_event_by_condition_id(condition_id)
             
-            # If we have both values, calculate stake
-            if total_bought > 0 and avg_price > 0:
-                stake = total_bought * avg_price
-                total_volume += stake
-            elif total_bought > 0:
-                # Fallback: use totalBought as volume estimate if avgPrice is missing
-                total_volume += total_bought
+            # Extract slug and question from event
+            if event:
+                markets = event.get("markets", [])
+                for market in markets:
+                    market_condition_id = market.get("conditionId") or market.get("condition_id")
+                    if market_condition_id and market_condition_id.lower() == condition_id.lower():
+                        slug = slug or market.get("slug") or market.get("marketSlug")
+                        question = question or market.get("question") or market.get("title")
+                        break
+                
+                # If not found in markets, try event-level fields
+                if not slug:
+                    slug = slug or event.get("slug") or event.get("eventSlug")
+                if not question:
+                    question = question or event.get("question") or event.get("title")
+        except Exception as e:
+            logger.debug(f"Error getting event for condition {condition_id[:20]}...: {e}")
         
-        num_markets = len(closed_positions)
-        avg_stake = total_volume / num_markets if num_markets > 0 else 0.0
+        # Fallback: Try CLOB API if we still don't have slug/question
+        if not slug or not question:
+            try:
+                clob_url = f"https://clob.polymarket.com/markets/{condition_id}"
+                clob_response = self._http_get_resilient(clob_url)
+                if clob_response and clob_response.status_code == 200:
+                    clob_data = clob_response.json()
+                    slug = slug or clob_data.get("slug") or clob_data.get("questionSlug")
+                    question = question or clob_data.get("question") or clob_data.get("title")
+            except Exception as e:
+                logger.debug(f"Error getting market from CLOB API for condition {condition_id[:20]}...: {e}")
+        
+        # Log what we have for debugging
+        if not slug and not question:
+            logger.debug(f"[CATEGORY] No slug/question for condition {condition_id[:20]}..., using empty data")
         
-        return total_volume, avg_stake
+        return event, slug, question
     
-    def _compute_category_stats(self, address: str, closed_positions: List[Dict[str, Any]]) -> None:
+    def _compute_category_stats(self, address: str, closed_positions: List[Dict[str, Any]],
+                                columns: Optional[PositionColumns] = None) -> None:
         """Compute and save category-based statistics for a wallet"""
         if not closed_positions:
             return
+        if columns is None:
+            columns = PositionColumns.from_positions(closed_positions)
         
-        # Aggregate stats by category
-        category_stats = {}  # category -> {markets, volume, pnl, win_markets}
+        # Ledger positions carry the category assigned when they were first synced;
+        # the rest are resolved together (category cache, then one batched Gamma lookup)
+        unclassified = {}
+        for position, condition_id, category in zip(closed_positions, columns.condition_ids, columns.categories):
+            if condition_id and not category:
+                unclassified.setdefault(condition_id, position)
+        resolved = self._classify_conditions(unclassified)
         
-        for position in closed_positions:
-            condition_id = position.get("conditionId") or position.get("condition_id")
-            if not condition_id:
-                continue
-            
-            # Get event info for classification
-            event = None
-            slug = None
-            question = None
-            
-            # First, try to get slug/question from closed position data itself
-            # Closed positions API returns: title, slug, eventSlug
-            slug = position.get("slug") or position.get("marketSlug") or position.get("eventSlug")
-            question = position.get("title") or position.get("question") or position.get("marketTitle")
-            
-            # Log what we got from position
-            if slug or question:
-                logger.debug(f"[CATEGORY] Got data from position: slug={slug[:50] if slug else 'None'}, question={question[:50] if question else 'None'}")
-            
-            try:
-                # Try to get event from Gamma API
-                from gamma_client import get_event_by_condition_id
-                event = get_event_by_condition_id(condition_id)
-                
-                # Extract slug and question from event
-                if event:
-                    markets = event.get("markets", [])
-                    for market in markets:
-                        market_condition_id = market.get("conditionId") or market.get("condition_id")
-                        if market_condition_id and market_condition_id.lower() == condition_id.lower():
-                            slug = slug or market.get("slug") or market.get("marketSlug")
-                            question = question or market.get("question") or market.get("title")
-                            break
-                    
-                    # If not found in markets, try event-level fields
-                    if not slug:
-                        slug = slug or event.get("slug") or event.get("eventSlug")
-                    if not question:
-                        question = question or event.get("question") or event.get("title")
-            except Exception as e:
-                logger.debug(f"Error getting event for condition {condition_id[:20]}...: {e}")
-            
-            # Fallback: Try CLOB API if we still don't have slug/question
-            if not slug or not question:
-                try:
-                    clob_url = f"https://clob.polymarket.com/markets/{condition_id}"
-                    clob_response = self._http_get_resilient(clob_url)
-                    if clob_response and clob_response.status_code == 200:
-                        clob_data = clob_response.json()
-                        slug = slug or clob_data.get("slug") or clob_data.get("questionSlug")
-                        question = question or clob_data.get("question") or clob_data.get("title")
-                except Exception as e:
-                    logger.debug(f"Error getting market from CLOB API for condition {condition_id[:20]}...: {e}")
-            
-            # Log what we have for debugging
-            if not slug and not question:
-                logger.debug(f"[CATEGORY] No slug/question for condition {condition_id[:20]}..., using empty data")
-            
-            # Classify market
-            category = classify_market(event or {}, slug, question)
-            
-            # Log classification result for debugging
-            if category == "other/Unknown" and (slug or question):
-                logger.debug(f"[CATEGORY] Classified as Unknown: slug={slug[:50] if slug else 'None'}, question={question[:50] if question else 'None'}")
-            
-            # Get position metrics
-            pnl = float(position.get("realizedPnl", 0) or 0)
-            
-            # Calculate volume (same logic as _compute_volume_and_stake)
-            volume = position.get("volume") or position.get("totalVolume") or position.get("total_volume")
-            if volume is None:
-                total_bought = float(position.get("totalBought", 0) or position.get("total_bought", 0) or 0)
-                avg_price = float(position.get("avgPrice", 0) or position.get("avg_price", 0) or 0)
-                if total_bought > 0 and avg_price > 0:
-                    volume = total_bought * avg_price
-                elif total_bought > 0:
-                    volume = total_bought
-                else:
-                    volume = 0.0
-            else:
-                volume = float(volume)
-            
-            # Initialize category stats if needed
-            if category not in category_stats:
-                category_stats[category] = {
-                    'markets': 0,
-                    'volume': 0.0,
-                    'pnl': 0.0,
-                    'win_markets': 0
-                }
-            
-            # Aggregate stats
-            category_stats[category]['markets'] += 1
-            category_stats[category]['volume'] += volume
-            category_stats[category]['pnl'] += pnl
-            if pnl > 0:
-                category_stats[category]['win_markets'] += 1
+        # Aggregate stats by category: category -> {markets, volume, pnl, win_markets}
+        category_stats = columns.category_totals([
+            category or resolved.get(condition_id)
+            for condition_id, category in zip(columns.condition_ids, columns.categories)
+        ])
         
-        # Calculate final metrics and save to database
+        # Calculate final metrics and save to database in one batch
+        rows = []
         for category, stats in category_stats.items():
             markets = stats['markets']
             volume = stats['volume']
@@ -1333,26 +1832,26 @@ class WalletAnalyzer:
             avg_pnl = pnl / markets if markets > 0 else 0.0
             
             # Determine A List status: winrate >= 90% and markets > 20
-            is_a_list_trader = (winrate >= 0.90 and markets > 20)
+            is_a_list_trader = (winrate >= A_LIST_MIN_WINRATE and markets > A_LIST_MIN_MARKETS)
             
-            # Save to database
-            self.db.upsert_wallet_category_stats(
-                wallet_address=address,
-                category=category,
-                markets=markets,
-                volume=volume,
-                pnl=pnl,
-                winrate=winrate,
-                roi=roi,
-                avg_pnl=avg_pnl,
-                is_a_list_trader=is_a_list_trader
-            )
+            rows.append({
+                'category': category,
+                'markets': markets,
+                'volume': volume,
+                'pnl': pnl,
+                'winrate': winrate,
+                'roi': roi,
+                'avg_pnl': avg_pnl,
+                'is_a_list_trader': is_a_list_trader
+            })
             
             logger.debug(
                 f"[CATEGORY] {address[:12]}... category={category}: "
                 f"markets={markets}, winrate={winrate:.2%}, pnl=${pnl:.2f}, "
                 f"is_a_list={is_a_list_trader}"
             )
+        
+        self.db.upsert_wallet_category_stats_batch(address, rows)
     
     def _detect_insider_patterns(self, address: str, traded_total: int, win_rate: float,
                                  closed_positions: List[Dict[str, Any]], total_markets_traded: int) -> Tuple[bool, str]:
@@ -1362,66 +1861,89 @@ class WalletAnalyzer:
             Tuple[bool, str]: (is_insider_candidate, reason)
         """
         try:
-            # Pattern 1: New wallet with large position
-            if traded_total < INSIDER_MAX_TOTAL_TRADES:
-                # Calculate max position size from closed positions
-                max_position_size = 0.0
-                for pos in closed_positions:
-                    # Calculate position size: totalBought * avgPrice
-                    total_bought = float(pos.get("totalBought", 0) or pos.get("total_bought", 0) or 0)
-                    avg_price = float(pos.get("avgPrice", 0) or pos.get("avg_price", 0) or 0)
-                    if total_bought > 0 and avg_price > 0:
-                        position_size = total_bought * avg_price
-                        max_position_size = max(max_position_size, position_size)
-                    elif total_bought > 0:
-                        max_position_size = max(max_position_size, total_bought)
-                
-                if max_position_size > INSIDER_MIN_POSITION_SIZE:
-                    logger.info(f"[INSIDER] Pattern 1 detected for {address}: new wallet (trades={traded_total}) with large position (${max_position_size:.2f})")
-                    return (True, "new_wallet_large_position")
-            
-            # Pattern 2: High win rate on first trades
-            if traded_total < INSIDER_MAX_TOTAL_TRADES and win_rate >= INSIDER_MIN_WIN_RATE:
-                logger.info(f"[INSIDER] Pattern 2 detected for {address}: new wallet (trades={traded_total}) with high win rate ({win_rate:.2%})")
-                return (True, "high_winrate_new_wallet")
-            
-            # Pattern 3: Concentrated trading
-            if total_markets_traded <= INSIDER_MAX_MARKETS and traded_total >= 5:
-                # Calculate total volume from closed positions
-                total_volume = 0.0
-                for pos in closed_positions:
-                    volume = pos.get("volume") or pos.get("totalVolume") or pos.get("total_volume")
-                    if volume is not None:
-                        try:
-                            total_volume += float(volume)
-                            continue
-                        except (ValueError, TypeError):
-                            pass
-                    
-                    # Fallback: calculate from totalBought * avgPrice
-                    total_bought = float(pos.get("totalBought", 0) or pos.get("total_bought", 0) or 0)
-                    avg_price = float(pos.get("avgPrice", 0) or pos.get("avg_price", 0) or 0)
-                    if total_bought > 0 and avg_price > 0:
-                        total_volume += total_bought * avg_price
-                    elif total_bought > 0:
-                        total_volume += total_bought
-                
-                if total_volume > INSIDER_MIN_POSITION_SIZE:
-                    logger.info(f"[INSIDER] Pattern 3 detected for {address}: concentrated trading (markets={total_markets_traded}, volume=${total_volume:.2f})")
-                    return (True, "concentrated_trading")
-            
-            return (False, "")
+            metrics = PositionColumns.from_positions(closed_positions).metrics()
+            return self._insider_from_aggregates(
+                address, traded_total, win_rate, metrics.max_stake, total_markets_traded, metrics.total_volume
+            )
         except Exception as e:
             logger.error(f"Error detecting insider patterns for {address}: {e}", exc_info=True)
             return (False, "")
     
-    def add_wallets_to_queue(self, wallets: Dict[str, Dict[str, str]]) -> int:
-        """Add multiple wallets to analysis queue"""
-        added_count = 0
+    def _insider_from_aggregates(self, address: str, traded_total: int, win_rate: float,
+                                 max_position_size: float, total_markets_traded: int,
+                                 total_volume: float) -> Tuple[bool, str]:
+        """Insider pattern rules over pre-aggregated position metrics"""
+        # Pattern 1: New wallet with large position (position size: totalBought * avgPrice)
+        if traded_total < INSIDER_MAX_TOTAL_TRADES and max_position_size > INSIDER_MIN_POSITION_SIZE:
+            logger.info(f"[INSIDER] Pattern 1 detected for {address}: new wallet (trades={traded_total}) with large position (${max_position_size:.2f})")
+            return (True, "new_wallet_large_position")
+        
+        # Pattern 2: High win rate on first trades
+        if traded_total < INSIDER_MAX_TOTAL_TRADES and win_rate >= INSIDER_MIN_WIN_RATE:
+            logger.info(f"[INSIDER] Pattern 2 detected for {address}: new wallet (trades={traded_total}) with high win rate ({win_rate:.2%})")
+            return (True, "high_winrate_new_wallet")
+        
+        # Pattern 3: Concentrated trading
+        if total_markets_traded <= INSIDER_MAX_MARKETS and traded_total >= 5 and total_volume > INSIDER_MIN_POSITION_SIZE:
+            logger.info(f"[INSIDER] Pattern 3 detected for {address}: concentrated trading (markets={total_markets_traded}, volume=${total_volume:.2f})")
+            return (True, "concentrated_trading")
+        
+        return (False, "")
+    
+    def recompute_from_store(self) -> Dict[str, int]:
+        """Recompute category stats, wallet metrics and insider flags from the local
+        closed-position store in set-based passes, without any API calls.
+
+        Covers wallets synced by _sync_closed_positions; traded_total comes from
+        the wallets table, so accept/reject decisions are left to normal analysis.
+        """
+        since_ts = int((datetime.now(timezone.utc) - timedelta(days=ANALYSIS_LOOKBACK_DAYS)).timestamp())
+        category_rows = self.db.recompute_category_stats_from_positions(
+            since_ts, MAX_CLOSED_POSITIONS, A_LIST_MIN_WINRATE, A_LIST_MIN_MARKETS
+        )
+        
+        metrics = self.db.get_position_window_metrics(since_ts, MAX_CLOSED_POSITIONS)
+        updates = []
+        for m in metrics:
+            if m['traded_total'] is None:
+                continue  # Not a tracked wallet
+            positions = m['positions']
+            win_rate = (m['wins'] or 0) / positions if positions else 0.0
+            pnl_total = m['pnl_total']
+            total_volume = m['total_volume']
+            is_insider, reason = self._insider_from_aggregates(
+                m['address'], m['traded_total'], win_rate, m['max_stake'],
+                m['markets_traded'], total_volume
+            )
+            updates.append({
+                'address': m['address'],
+                'win_rate': win_rate,
+                'pnl_total': pnl_total,
+                'total_markets_traded': m['markets_traded'],
+                'total_volume': total_volume,
+                'roi': pnl_total / total_volume if total_volume > 0 else 0.0,
+                'avg_pnl_per_market': pnl_total / positions if positions else 0.0,
+                'avg_stake': total_volume / positions if positions else 0.0,
+                'is_insider_candidate': is_insider,
+                'insider_detection_reason': reason or None,
+            })
+        wallets_updated = self.db.update_wallet_metrics_batch(updates)
         
-        for addr, meta in wallets.items():
-            if self.db.add_wallet_to_queue(addr, meta.get("display"), meta.get("source")):
-                added_count += 1
+        summary = {
+            'wallets_in_store': len(metrics),
+            'category_rows': category_rows,
+            'wallets_updated': wallets_updated,
+        }
+        logger.info(f"[RECOMPUTE] Offline recompute from position store: {summary}")
+        return summary
+    
+    def add_wallets_to_queue(self, wallets: Dict[str, Dict[str, Any]]) -> int:
+        """Add multiple wallets to analysis queue.
+
+        Optional "rank", "pnl" and "in_consensus" entries in a wallet's meta
+        feed the job's priority (see job_priority).
+        """
+        added_count = self.db.add_wallets_to_queue(wallets)
         
         logger.info(f"Added {added_count} wallets to analysis queue")
         return added_count
@@ -1430,7 +1952,8 @@ class WalletAnalyzer:
         """Get current queue status"""
         stats = self.db.get_queue_stats()
         stats['workers_running'] = self.running
-        stats['active_workers'] = len(self.workers)
+        stats['active_workers'] = self._in_flight
+        stats['max_in_flight'] = self.max_in_flight
         return stats
 
 # Example usage
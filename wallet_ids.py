@@ -0,0 +1,87 @@
+"""
+Wallet id dimension: 20-byte addresses behind integer surrogate keys.
+
+Fact tables that repeat a wallet on every row (market_trades,
+whale_positions) store wallet_ids.id instead of the 42-character hex
+string, so their keys and indexes hold 8-byte integers. WalletIds is the
+in-process intern table in front of wallet_ids: each address is resolved
+against SQLite once per process, after that it is a dict hit. Ids are
+never reused (rows are not deleted from wallet_ids), so cached ids stay
+valid for the life of the database.
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+# SQL expression for the 0x-prefixed lowercase hex form of a wallet_ids.address column
+ADDRESS_HEX_SQL = "'0x' || lower(hex({}))"
+
+
+def address_bytes(address: Any) -> Optional[bytes]:
+    """20-byte form of a 0x-prefixed hex address, or None if it is not one"""
+    if not isinstance(address, str) or len(address) != 42 or address[:2] not in ("0x", "0X"):
+        return None
+    try:
+        return bytes.fromhex(address[2:])
+    except ValueError:
+        return None
+
+
+def address_hex(blob: bytes) -> str:
+    """0x-prefixed lowercase hex address for a wallet_ids.address value"""
+    return "0x" + bytes(blob).hex()
+
+
+class WalletIds:
+    """Address <-> wallet_ids.id cache; misses are resolved through a cursor"""
+
+    # Cached addresses before the cache is cleared (re-resolved lazily)
+    MAX_CACHED = 200_000
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, address: str) -> Optional[int]:
+        """Id of an address already resolved in this process, without touching SQLite"""
+        return self._ids.get(address)
+
+    def lookup(self, cursor: sqlite3.Cursor, address: str) -> Optional[int]:
+        """Id of an address that is already in wallet_ids, or None"""
+        wallet_id = self._ids.get(address)
+        if wallet_id is not None:
+            return wallet_id
+        blob = address_bytes(address)
+        if blob is None:
+            return None
+        cursor.execute("SELECT id FROM wallet_ids WHERE address = ?", (blob,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return self._remember(address, row[0])
+
+    def addresses(self, cursor: sqlite3.Cursor, wallet_ids: Iterable[int]) -> Dict[int, str]:
+        """Hex addresses for a set of ids, in one query"""
+        wallet_ids = list(wallet_ids)
+        if not wallet_ids:
+            return {}
+        cursor.execute(
+            "SELECT id, address FROM wallet_ids WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(wallet_ids),)
+        )
+        return {row[0]: address_hex(row[1]) for row in cursor.fetchall()}
+
+    def _remember(self, address: str, wallet_id: int) -> int:
+        with self._lock:
+            if len(self._ids) >= self.MAX_CACHED:
+                self._ids.clear()
+            self._ids[address] = wallet_id
+            canonical = address.lower()
+            if canonical != address:
+                self._ids[canonical] = wallet_id
+        return wallet_id
+
+    def __len__(self) -> int:
+        return len(self._ids)